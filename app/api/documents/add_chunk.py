@@ -1,23 +1,26 @@
-from typing import Dict, List
+from typing import Dict
 
 from fastapi import APIRouter, Depends, status
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.api.embedding_input import EmbeddingInput
 from app.application.documents import AddChunkCommand, AddChunkHandler
-from app.dependencies import get_document_repository
+from app.dependencies import get_document_repository, get_library_repository
 from app.domain.documents import DocumentRepository
+from app.domain.libraries import LibraryRepository
 
 add_chunk_router = APIRouter()
 
 
 def get_add_chunk_handler(
     document_repo: DocumentRepository = Depends(get_document_repository),
+    library_repo: LibraryRepository = Depends(get_library_repository),
 ) -> AddChunkHandler:
     """DI provider for AddChunkHandler"""
-    return AddChunkHandler(document_repo)
+    return AddChunkHandler(document_repo, library_repo)
 
 
-class AddChunkRequest(BaseModel):
+class AddChunkRequest(EmbeddingInput):
     class ChunkMetadataRequest(BaseModel):
         source: str | None = Field(None, description="Source of the chunk")
         page_number: int | None = Field(None, description="Optional page number")
@@ -26,7 +29,6 @@ class AddChunkRequest(BaseModel):
         )
 
     text: str = Field(..., min_length=1)
-    embedding: List[float]
     metadata: ChunkMetadataRequest = Field(default_factory=ChunkMetadataRequest)
 
     model_config = ConfigDict(
@@ -59,7 +61,7 @@ def add_chunk(
     command = AddChunkCommand(
         document_id=document_id,
         text=request.text,
-        embedding=request.embedding,
+        embedding=request.embedding_values(),
         metadata=request.metadata.model_dump(),
     )
     response = handler.handle(command)
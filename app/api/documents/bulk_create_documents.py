@@ -0,0 +1,134 @@
+from typing import Annotated, AsyncIterator, List, Tuple
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
+
+from app.api.documents.create_document import CreateDocumentRequest, to_command
+from app.application.documents import (
+    BulkCreateDocumentsCommand,
+    BulkCreateDocumentsHandler,
+)
+from app.dependencies import get_document_repository, get_library_repository
+from app.domain.documents import DocumentRepository
+from app.domain.libraries import LibraryRepository
+
+bulk_create_documents_router = APIRouter()
+
+NDJSON = "application/x-ndjson"
+
+
+def get_bulk_create_documents_handler(
+    document_repo: DocumentRepository = Depends(get_document_repository),
+    library_repo: LibraryRepository = Depends(get_library_repository),
+) -> BulkCreateDocumentsHandler:
+    """DI provider for BulkCreateDocumentsHandler"""
+    return BulkCreateDocumentsHandler(document_repo, library_repo)
+
+
+class BulkLineResult(BaseModel):
+    line: int = Field(..., description="1-based line number in the request body")
+    document_id: str | None = Field(None, description="Set when the line was saved")
+    error: str | None = Field(None, description="Set when the line was rejected")
+
+
+class BulkCreateDocumentsResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkLineResult]
+
+
+async def _lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield the non-blank lines of a streamed body with their line numbers."""
+    pending = b""
+    number = 0
+    async for data in request.stream():
+        pending += data
+        *complete, pending = pending.split(b"\n")
+        for line in complete:
+            number += 1
+            if line.strip():
+                yield number, line
+    if pending.strip():
+        yield number + 1, pending
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'record'}: {e['msg']}"
+        for e in exc.errors()
+    )
+
+
+def _create_batch(
+    handler: BulkCreateDocumentsHandler,
+    lines: List[Tuple[int, bytes]],
+    library_id: str | None,
+) -> List[BulkLineResult]:
+    results: List[BulkLineResult] = []
+    accepted: List[Tuple[int, CreateDocumentRequest]] = []
+    for number, line in lines:
+        try:
+            accepted.append((number, CreateDocumentRequest.model_validate_json(line)))
+        except ValidationError as exc:
+            results.append(BulkLineResult(line=number, error=_validation_message(exc)))
+    command = BulkCreateDocumentsCommand(
+        documents=[to_command(request) for _, request in accepted],
+        library_id=library_id,
+    )
+    outcomes = handler.handle(command).outcomes
+    results.extend(
+        BulkLineResult(line=number, document_id=o.document_id, error=o.error)
+        for (number, _), o in zip(accepted, outcomes)
+    )
+    return sorted(results, key=lambda r: r.line)
+
+
+@bulk_create_documents_router.post(
+    "/bulk",
+    response_model=BulkCreateDocumentsResponse,
+    response_model_exclude_none=True,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON: {
+                    "schema": {"$ref": "#/components/schemas/CreateDocumentRequest"}
+                }
+            },
+            "description": "One CreateDocumentRequest JSON object per line",
+        }
+    },
+)
+async def bulk_create_documents(
+    request: Request,
+    handler: BulkCreateDocumentsHandler = Depends(get_bulk_create_documents_handler),
+    library_id: Annotated[
+        str | None, Query(description="Also add every created document to it")
+    ] = None,
+    batch_size: Annotated[
+        int, Query(ge=1, le=10_000, description="Lines validated and saved together")
+    ] = 1000,
+):
+    """Create documents from a streamed NDJSON body.
+
+    The body is read incrementally; each batch of lines is validated and
+    saved in one repository call. Invalid lines are reported in `results`
+    without stopping the import.
+    """
+    results: List[BulkLineResult] = []
+    batch: List[Tuple[int, bytes]] = []
+    async for number, line in _lines(request):
+        batch.append((number, line))
+        if len(batch) == batch_size:
+            results += await run_in_threadpool(
+                _create_batch, handler, batch, library_id
+            )
+            batch = []
+    if batch:
+        results += await run_in_threadpool(_create_batch, handler, batch, library_id)
+
+    failed = sum(1 for r in results if r.error is not None)
+    return BulkCreateDocumentsResponse(
+        created=len(results) - failed, failed=failed, results=results
+    )
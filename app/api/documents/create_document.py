@@ -1,8 +1,9 @@
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, status
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.api.embedding_input import EmbeddingInput
 from app.application.documents import (
     CreateDocumentCommand,
     CreateDocumentHandler,
@@ -20,9 +21,8 @@ def get_create_document_handler(
     return CreateDocumentHandler(document_repo)
 
 
-class ChunkRequest(BaseModel):
+class ChunkRequest(EmbeddingInput):
     text: str = Field(..., description="Chunk text")
-    embedding: List[float] = Field(..., description="Chunk embedding as list of floats")
 
     class ChunkMetadataRequest(BaseModel):
         source: str | None = Field(None, description="Source of the chunk")
@@ -109,9 +109,20 @@ def create_document(
     handler: CreateDocumentHandler = Depends(get_create_document_handler),
 ):
     """Create a new document."""
-    command = CreateDocumentCommand(
+    result = handler.handle(to_command(request))
+    return CreateDocumentResponse.model_validate(result)
+
+
+def to_command(request: CreateDocumentRequest) -> CreateDocumentCommand:
+    return CreateDocumentCommand(
         metadata=request.metadata.model_dump(),
-        chunks=[c.model_dump() for c in request.chunks] if request.chunks else None,
+        chunks=[
+            {
+                **c.model_dump(exclude={"embedding", "embedding_b64"}),
+                "embedding": c.embedding_values(),
+            }
+            for c in request.chunks
+        ]
+        if request.chunks
+        else None,
     )
-    result = handler.handle(command)
-    return CreateDocumentResponse.model_validate(result)
@@ -4,17 +4,19 @@ from app.application.documents import (
     DeleteChunkCommand,
     DeleteChunkHandler,
 )
-from app.dependencies import get_document_repository
+from app.dependencies import get_document_repository, get_library_repository
 from app.domain.documents import DocumentRepository
+from app.domain.libraries import LibraryRepository
 
 delete_chunk_router = APIRouter()
 
 
 def get_delete_chunk_handler(
     document_repo: DocumentRepository = Depends(get_document_repository),
+    library_repo: LibraryRepository = Depends(get_library_repository),
 ) -> DeleteChunkHandler:
     """DI provider for DeleteChunkHandler"""
-    return DeleteChunkHandler(document_repo)
+    return DeleteChunkHandler(document_repo, library_repo)
 
 
 @delete_chunk_router.delete(
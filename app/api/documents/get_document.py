@@ -1,6 +1,6 @@
-from typing import Any, Dict, List
+from typing import Annotated, Any, Dict, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
 from app.application.documents import (
@@ -29,8 +29,9 @@ class ChunkMetadataResponse(BaseModel):
 
 class ChunkResponse(BaseModel):
     chunk_id: str
-    text: str
-    embedding: List[float]
+    # Omitted when excluded with include_text / include_embedding
+    text: str | None = None
+    embedding: List[float] | None = None
     metadata: ChunkMetadataResponse
 
 
@@ -49,11 +50,24 @@ class GetDocumentResponse(BaseModel):
     chunks: List[ChunkResponse]
 
 
-@get_document_router.get("/{document_id}", response_model=GetDocumentResponse)
+@get_document_router.get(
+    "/{document_id}",
+    response_model=GetDocumentResponse,
+    response_model_exclude_unset=True,
+)
 def get_document(
-    document_id: str, handler: GetDocumentHandler = Depends(get_get_document_handler)
+    document_id: str,
+    handler: GetDocumentHandler = Depends(get_get_document_handler),
+    include_text: Annotated[bool, Query(description="Return chunk texts")] = True,
+    include_embedding: Annotated[
+        bool, Query(description="Return chunk embeddings")
+    ] = True,
 ):
-    query = GetDocumentQuery(document_id=document_id)
+    query = GetDocumentQuery(
+        document_id=document_id,
+        include_text=include_text,
+        include_embedding=include_embedding,
+    )
     result = handler.handle(query)
     return GetDocumentResponse(
         document_id=result.document_id,
@@ -0,0 +1,55 @@
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+
+from app.api.documents.get_document import ChunkResponse
+from app.api.pagination import Cursor, Limit
+from app.application.documents import ListChunksHandler, ListChunksQuery
+from app.dependencies import get_document_repository
+from app.domain.documents.document_repository import DocumentRepository
+
+list_chunks_router = APIRouter()
+
+
+def get_list_chunks_handler(
+    document_repo: DocumentRepository = Depends(get_document_repository),
+) -> ListChunksHandler:
+    return ListChunksHandler(document_repo)
+
+
+class ListChunksResponse(BaseModel):
+    document_id: str
+    chunks: List[ChunkResponse]
+    next_cursor: str | None
+
+
+@list_chunks_router.get(
+    "/{document_id}/chunks",
+    response_model=ListChunksResponse,
+    response_model_exclude_unset=True,
+)
+def list_chunks(
+    document_id: str,
+    handler: ListChunksHandler = Depends(get_list_chunks_handler),
+    cursor: Cursor = None,
+    limit: Limit = 100,
+    include_text: Annotated[bool, Query(description="Return chunk texts")] = True,
+    include_embedding: Annotated[
+        bool, Query(description="Return chunk embeddings")
+    ] = True,
+):
+    """List a document's chunks one page at a time, in insertion order."""
+    query = ListChunksQuery(
+        document_id=document_id,
+        cursor=cursor,
+        limit=limit,
+        include_text=include_text,
+        include_embedding=include_embedding,
+    )
+    result = handler.handle(query)
+    return ListChunksResponse(
+        document_id=result.document_id,
+        chunks=result.chunks,
+        next_cursor=result.next_cursor,
+    )
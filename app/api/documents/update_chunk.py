@@ -1,28 +1,36 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, status
-from pydantic import BaseModel
 
+from app.api.embedding_input import (
+    EmbeddingBody,
+    EmbeddingContentType,
+    EmbeddingInput,
+    decode_embedding_body,
+)
 from app.application.documents import (
     UpdateChunkCommand,
     UpdateChunkHandler,
 )
-from app.dependencies import get_document_repository
+from app.dependencies import get_document_repository, get_library_repository
 from app.domain.documents.document_repository import DocumentRepository
+from app.domain.libraries import LibraryRepository
 
 update_chunk_router = APIRouter()
 
 
 def get_update_chunk_handler(
     document_repo: DocumentRepository = Depends(get_document_repository),
+    library_repo: LibraryRepository = Depends(get_library_repository),
 ) -> UpdateChunkHandler:
     """DI provider for UpdateChunkHandler"""
-    return UpdateChunkHandler(document_repo)
+    return UpdateChunkHandler(document_repo, library_repo)
+
 
+class UpdateChunkRequest(EmbeddingInput):
+    embedding_required = False
 
-class UpdateChunkRequest(BaseModel):
     text: Optional[str] = None
-    embedding: Optional[List[float]] = None
     metadata: Optional[Dict[str, Any]] = None
 
 
@@ -41,7 +49,27 @@ def update_chunk(
         document_id=document_id,
         chunk_id=chunk_id,
         text=request.text,
-        embedding=request.embedding,
+        embedding=request.embedding_values(),
         metadata=request.metadata,
     )
     handler.handle(command)
+
+
+@update_chunk_router.put(
+    "/{document_id}/chunks/{chunk_id}/embedding",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+def replace_chunk_embedding(
+    document_id: str,
+    chunk_id: str,
+    body: EmbeddingBody,
+    content_type: EmbeddingContentType,
+    handler: UpdateChunkHandler = Depends(get_update_chunk_handler),
+):
+    """Replace a chunk's embedding with one sent as the raw request body."""
+    command = UpdateChunkCommand(
+        document_id=document_id,
+        chunk_id=chunk_id,
+        embedding=decode_embedding_body(body, content_type),
+    )
+    handler.handle(command)
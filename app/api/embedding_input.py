@@ -0,0 +1,87 @@
+import base64
+import binascii
+import io
+from typing import Annotated, ClassVar, List
+
+import numpy as np
+from fastapi import Body, Header
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from app.domain.common.embedding import FLOAT32_LE
+from app.errors import InvalidEntityError
+
+OCTET_STREAM = "application/octet-stream"
+NPY = "application/x-npy"
+
+# Raw request bodies holding a single embedding, for endpoints where the
+# vector is the whole payload
+EmbeddingBody = Annotated[
+    bytes,
+    Body(
+        media_type=OCTET_STREAM,
+        description=(
+            "Little-endian float32 values, or a 1-D .npy array"
+            f" with Content-Type: {NPY}"
+        ),
+    ),
+]
+EmbeddingContentType = Annotated[str, Header(alias="Content-Type")]
+
+
+class EmbeddingInput(BaseModel):
+    """Request fields carrying an embedding as JSON floats or base64.
+
+    `embedding_b64` holds little-endian float32 bytes and decodes straight
+    into a NumPy array, skipping the per-value float parsing and validation
+    a JSON list goes through.
+    """
+
+    # Subclasses where the embedding may be left out set this to False
+    embedding_required: ClassVar[bool] = True
+
+    embedding: List[float] | None = Field(
+        None, description="Embedding as a list of floats"
+    )
+    embedding_b64: str | None = Field(
+        None,
+        description="Embedding as base64-encoded little-endian float32 values",
+    )
+
+    _decoded: np.ndarray | None = PrivateAttr(None)
+
+    @model_validator(mode="after")
+    def _decode_embedding(self):
+        if self.embedding is not None and self.embedding_b64 is not None:
+            raise ValueError("Give either embedding or embedding_b64, not both")
+        if self.embedding_b64 is not None:
+            try:
+                raw = base64.b64decode(self.embedding_b64, validate=True)
+            except binascii.Error as exc:
+                raise ValueError("embedding_b64 is not valid base64") from exc
+            if len(raw) % FLOAT32_LE.itemsize:
+                raise ValueError("embedding_b64 must hold whole float32 values")
+            self._decoded = np.frombuffer(raw, dtype=FLOAT32_LE)
+        elif self.embedding is None and self.embedding_required:
+            raise ValueError("One of embedding or embedding_b64 is required")
+        return self
+
+    def embedding_values(self) -> List[float] | np.ndarray | None:
+        """The embedding in whichever form it was sent, ready for `Embedding`."""
+        return self._decoded if self._decoded is not None else self.embedding
+
+
+def decode_embedding_body(body: bytes, content_type: str) -> np.ndarray:
+    """Read a raw float32 or .npy request body into an array of its values."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type == NPY:
+        try:
+            return np.load(io.BytesIO(body), allow_pickle=False)
+        except (ValueError, EOFError) as exc:
+            raise InvalidEntityError("Request body is not a valid .npy array") from exc
+    if media_type != OCTET_STREAM:
+        raise InvalidEntityError(
+            f"Embedding bodies must be sent as {OCTET_STREAM} or {NPY}"
+        )
+    if len(body) % FLOAT32_LE.itemsize:
+        raise InvalidEntityError("Embedding buffer must hold whole float32 values")
+    return np.frombuffer(body, dtype=FLOAT32_LE)
@@ -1,4 +1,4 @@
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, status
@@ -22,7 +22,9 @@ create_library_router = APIRouter()
 def get_create_library_handler(
     library_repo: LibraryRepository = Depends(get_library_repository),
     document_repo: DocumentRepository = Depends(get_document_repository),
-    vector_index_factory: Callable[[], VectorIndex] = Depends(get_vector_index_factory),
+    vector_index_factory: Callable[..., VectorIndex] = Depends(
+        get_vector_index_factory
+    ),
 ) -> CreateLibraryHandler:
     """DI provider for CreateLibraryHandler"""
 
@@ -44,6 +46,16 @@ class CreateLibraryRequest(BaseModel):
         default_factory=list,
         description="Optional list of document IDs (UUID) to add to the library on creation",
     )
+    index_params: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Optional construction parameters for the configured vector index "
+        "(e.g. {'m': 16, 'ef_construction': 200} for HNSW)",
+    )
+    metric: Literal["cosine", "dot", "l2"] = Field(
+        "cosine",
+        description="Distance metric used to rank chunks: cosine similarity, "
+        "dot product or Euclidean distance (reported as 1 / (1 + distance))",
+    )
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -76,6 +88,8 @@ def create_library(
     command = CreateLibraryCommand(
         metadata=request.metadata.model_dump(),
         documents=[str(d) for d in request.documents],
+        index_params=request.index_params,
+        metric=request.metric,
     )
     response = handler.handle(command)
     return CreateLibraryResponse(library_id=response.library_id)
@@ -0,0 +1,69 @@
+from typing import Annotated, Iterator, List
+
+import orjson
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.application.libraries import (
+    ExportLibraryChunksHandler,
+    ExportLibraryChunksQuery,
+)
+from app.application.libraries.export_library_chunks_query import ExportedChunkDict
+from app.dependencies import get_library_repository
+from app.domain.libraries.library_repository import LibraryRepository
+
+export_library_chunks_router = APIRouter()
+
+NDJSON = "application/x-ndjson"
+
+
+def get_export_library_chunks_handler(
+    library_repo: LibraryRepository = Depends(get_library_repository),
+) -> ExportLibraryChunksHandler:
+    return ExportLibraryChunksHandler(library_repo)
+
+
+def _ndjson(batches: Iterator[List[ExportedChunkDict]]) -> Iterator[bytes]:
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+    for batch in batches:
+        yield b"".join(orjson.dumps(chunk, option=option) for chunk in batch)
+
+
+@export_library_chunks_router.get(
+    "/{library_id}/chunks",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": (
+                "One indexed chunk per line: chunk_id, document_id, text,"
+                " embedding and metadata"
+            ),
+            "content": {NDJSON: {}},
+        }
+    },
+)
+def export_library_chunks(
+    library_id: str,
+    handler: ExportLibraryChunksHandler = Depends(get_export_library_chunks_handler),
+    include_text: Annotated[bool, Query(description="Return chunk texts")] = True,
+    include_embedding: Annotated[
+        bool, Query(description="Return chunk embeddings")
+    ] = True,
+):
+    """Stream a library's indexed chunks as NDJSON.
+
+    Chunks are serialized a batch at a time while the response is sent.
+    Beyond one reference per chunk, taken when the request starts, memory
+    use does not grow with the size of the library.
+    """
+    query = ExportLibraryChunksQuery(
+        library_id=library_id,
+        include_text=include_text,
+        include_embedding=include_embedding,
+    )
+    result = handler.handle(query)
+    return StreamingResponse(
+        _ndjson(result.batches),
+        media_type=NDJSON,
+        headers={"X-Chunk-Count": str(result.chunk_count)},
+    )
@@ -1,13 +1,22 @@
-from typing import Any, Dict, List
+from typing import Annotated, Any, Dict, List
 
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+import orjson
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import BaseModel, Field
 
+from app.api.embedding_input import (
+    EmbeddingBody,
+    EmbeddingContentType,
+    EmbeddingInput,
+    decode_embedding_body,
+)
 from app.application.libraries.find_similar_chunks_query import (
     FindSimilarChunksHandler,
     FindSimilarChunksQuery,
+    FindSimilarChunksResult,
 )
-from app.dependencies import get_library_repository
+from app.application.libraries.query_result_cache import QueryResultCache
+from app.dependencies import get_library_repository, get_query_result_cache
 from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
 from app.domain.libraries.library_repository import LibraryRepository
 
@@ -16,8 +25,9 @@ find_similar_chunks_router = APIRouter()
 
 def get_find_similar_chunks_handler(
     library_repo: LibraryRepository = Depends(get_library_repository),
+    cache: QueryResultCache | None = Depends(get_query_result_cache),
 ) -> FindSimilarChunksHandler:
-    return FindSimilarChunksHandler(library_repo)
+    return FindSimilarChunksHandler(library_repo, cache)
 
 
 class ChunkMetadataResponse(BaseModel):
@@ -32,16 +42,20 @@ class ChunkResponse(BaseModel):
     chunk_id: str
     document_id: str
     similarity: float
-    text: str
-    embedding: List[float]
+    # Omitted when excluded with include_text / include_embedding
+    text: str | None = None
+    embedding: List[float] | None = None
     metadata: ChunkMetadataResponse
 
 
-class FindSimilarRequest(BaseModel):
-    embedding: List[float]
+class FindSimilarRequest(EmbeddingInput):
     k: int = 5
     min_similarity: float = 0.0
     filters: ChunkMetadataFilterDict | None = None
+    search_params: Dict[str, Any] | None = Field(
+        None,
+        description="Index-specific tuning, e.g. {'ef_search': 100} for HNSW",
+    )
 
 
 class FindSimilarResponse(BaseModel):
@@ -57,13 +71,66 @@ def find_similar_chunks(
     library_id: str,
     req: FindSimilarRequest,
     handler: FindSimilarChunksHandler = Depends(get_find_similar_chunks_handler),
+    include_text: Annotated[bool, Query(description="Return chunk texts")] = True,
+    include_embedding: Annotated[
+        bool, Query(description="Return chunk embeddings")
+    ] = True,
 ):
     query = FindSimilarChunksQuery(
         library_id=library_id,
-        embedding=req.embedding,
+        embedding=req.embedding_values(),
         k=req.k,
         min_similarity=req.min_similarity,
         filters=req.filters,
+        search_params=req.search_params,
+        include_text=include_text,
+        include_embedding=include_embedding,
+    )
+    return _respond(handler.handle(query))
+
+
+@find_similar_chunks_router.post(
+    "/{library_id}/find-similar/binary",
+    response_model=FindSimilarResponse,
+)
+def find_similar_chunks_binary(
+    library_id: str,
+    body: EmbeddingBody,
+    content_type: EmbeddingContentType,
+    handler: FindSimilarChunksHandler = Depends(get_find_similar_chunks_handler),
+    k: int = 5,
+    min_similarity: float = 0.0,
+    include_text: Annotated[bool, Query(description="Return chunk texts")] = True,
+    include_embedding: Annotated[
+        bool, Query(description="Return chunk embeddings")
+    ] = True,
+):
+    """Search with the query embedding sent as the raw request body."""
+    query = FindSimilarChunksQuery(
+        library_id=library_id,
+        embedding=decode_embedding_body(body, content_type),
+        k=k,
+        min_similarity=min_similarity,
+        include_text=include_text,
+        include_embedding=include_embedding,
     )
-    res = handler.handle(query)
-    return FindSimilarResponse(library_id=res.library_id, chunks=res.chunks)
+    return _respond(handler.handle(query))
+
+
+def _respond(res: FindSimilarChunksResult) -> Response:
+    if res.response_body is None:
+        res.response_body = encode_json(
+            {"library_id": res.library_id, "chunks": res.chunks}
+        )
+    # Cache hits go out without re-serializing
+    return Response(content=res.response_body, media_type="application/json")
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode a search response without validating it against its model.
+
+    The handlers already produce exactly the shape of the response models, so
+    going through pydantic would only copy every chunk twice. Embedding rows
+    are numpy arrays, written out by orjson without becoming Python floats.
+    """
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
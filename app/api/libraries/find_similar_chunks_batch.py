@@ -0,0 +1,75 @@
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import BaseModel, Field
+
+from app.api.libraries.find_similar_chunks import (
+    ChunkResponse,
+    FindSimilarRequest,
+    encode_json,
+)
+from app.application.libraries import (
+    FindSimilarChunksBatchHandler,
+    FindSimilarChunksBatchQuery,
+)
+from app.dependencies import get_library_repository
+from app.domain.libraries.library_repository import LibraryRepository
+
+find_similar_chunks_batch_router = APIRouter()
+
+
+def get_find_similar_chunks_batch_handler(
+    library_repo: LibraryRepository = Depends(get_library_repository),
+) -> FindSimilarChunksBatchHandler:
+    return FindSimilarChunksBatchHandler(library_repo)
+
+
+class FindSimilarBatchRequest(BaseModel):
+    queries: List[FindSimilarRequest] = Field(
+        ..., min_length=1, description="Queries to run, each with its own k and filters"
+    )
+
+
+class FindSimilarBatchResult(BaseModel):
+    chunks: List[ChunkResponse]
+
+
+class FindSimilarBatchResponse(BaseModel):
+    library_id: str
+    results: List[FindSimilarBatchResult]
+
+
+@find_similar_chunks_batch_router.post(
+    "/{library_id}/find-similar/batch",
+    response_model=FindSimilarBatchResponse,
+)
+def find_similar_chunks_batch(
+    library_id: str,
+    req: FindSimilarBatchRequest,
+    handler: FindSimilarChunksBatchHandler = Depends(
+        get_find_similar_chunks_batch_handler
+    ),
+    include_text: Annotated[bool, Query(description="Return chunk texts")] = True,
+    include_embedding: Annotated[
+        bool, Query(description="Return chunk embeddings")
+    ] = True,
+):
+    """Run several similarity searches against a library in one request."""
+    query = FindSimilarChunksBatchQuery(
+        library_id=library_id,
+        queries=[
+            {
+                **q.model_dump(exclude={"embedding", "embedding_b64"}),
+                "embedding": q.embedding_values(),
+            }
+            for q in req.queries
+        ],
+        include_text=include_text,
+        include_embedding=include_embedding,
+    )
+    res = handler.handle(query)
+    content = {
+        "library_id": res.library_id,
+        "results": [{"chunks": chunks} for chunks in res.results],
+    }
+    return Response(content=encode_json(content), media_type="application/json")
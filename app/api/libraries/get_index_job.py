@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from app.application.libraries import (
+    GetIndexJobHandler,
+    GetIndexJobQuery,
+)
+from app.dependencies import get_index_job_repository
+from app.domain.libraries import IndexJobRepository
+
+get_index_job_router = APIRouter()
+
+
+def get_get_index_job_handler(
+    job_repo: IndexJobRepository = Depends(get_index_job_repository),
+) -> GetIndexJobHandler:
+    """DI provider for GetIndexJobHandler"""
+    return GetIndexJobHandler(job_repo)
+
+
+class IndexJobResponse(BaseModel):
+    job_id: str
+    library_id: str
+    status: str
+    error: str | None
+    created_at: str
+    started_at: str | None
+    finished_at: str | None
+
+
+@get_index_job_router.get(
+    "/{library_id}/index/jobs/{job_id}",
+    response_model=IndexJobResponse,
+)
+def get_index_job(
+    library_id: str,
+    job_id: str,
+    handler: GetIndexJobHandler = Depends(get_get_index_job_handler),
+):
+    """Get the status of a background index build."""
+    result = handler.handle(GetIndexJobQuery(library_id=library_id, job_id=job_id))
+    return IndexJobResponse(
+        job_id=result.job_id,
+        library_id=result.library_id,
+        status=result.status,
+        error=result.error,
+        created_at=result.created_at,
+        started_at=result.started_at,
+        finished_at=result.finished_at,
+    )
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
@@ -19,21 +19,6 @@ def get_get_library_handler(
     return GetLibraryHandler(library_repo)
 
 
-class ChunkMetadataResponse(BaseModel):
-    source: str
-    page_number: int | None
-    created_at: str
-    updated_at: str
-    custom_fields: Dict[str, Any]
-
-
-class ChunkResponse(BaseModel):
-    chunk_id: str
-    text: str
-    embedding: List[float]
-    metadata: ChunkMetadataResponse
-
-
 class LibraryMetadataResponse(BaseModel):
     name: str
     description: str
@@ -44,9 +29,11 @@ class LibraryMetadataResponse(BaseModel):
 
 class LibraryResponse(BaseModel):
     library_id: str
-    document_ids: List[str]
+    document_count: int
     metadata: LibraryMetadataResponse
-    indexed_chunks: List[ChunkResponse]
+    metric: str
+    is_indexed: bool
+    indexed_chunk_count: int
 
 
 @get_library_router.get(
@@ -54,13 +41,20 @@ class LibraryResponse(BaseModel):
     response_model=LibraryResponse,
 )
 def get_library(
-    library_id: str, handler: GetLibraryHandler = Depends(get_get_library_handler)
+    library_id: str,
+    handler: GetLibraryHandler = Depends(get_get_library_handler),
 ):
-    query = GetLibraryQuery(library_id=library_id)
-    result = handler.handle(query)
+    """Return a library's summary.
+
+    Its documents are listed by GET .../documents and its chunks exported by
+    GET .../chunks.
+    """
+    result = handler.handle(GetLibraryQuery(library_id=library_id))
     return LibraryResponse(
         library_id=result.library_id,
-        document_ids=result.document_ids,
+        document_count=result.document_count,
         metadata=result.metadata,
-        indexed_chunks=result.indexed_chunks,
+        metric=result.metric,
+        is_indexed=result.is_indexed,
+        indexed_chunk_count=result.indexed_chunk_count,
     )
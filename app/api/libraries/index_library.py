@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, status
+from concurrent.futures import Executor
+
+from fastapi import APIRouter, Depends, Response, status
 from pydantic import BaseModel, ConfigDict
 
 from app.application.libraries import (
     IndexLibraryCommand,
     IndexLibraryHandler,
 )
-from app.dependencies import get_document_repository, get_library_repository
+from app.dependencies import (
+    get_document_repository,
+    get_index_build_executor,
+    get_index_job_repository,
+    get_library_repository,
+)
 from app.domain.documents.document_repository import DocumentRepository
-from app.domain.libraries import LibraryIndexerService, LibraryRepository
+from app.domain.libraries import (
+    IndexJobRepository,
+    LibraryIndexerService,
+    LibraryRepository,
+)
 
 index_library_router = APIRouter()
 
@@ -22,22 +33,36 @@ def get_library_indexer_service(
 def get_index_library_handler(
     library_repo: LibraryRepository = Depends(get_library_repository),
     indexer_service: LibraryIndexerService = Depends(get_library_indexer_service),
+    job_repo: IndexJobRepository = Depends(get_index_job_repository),
+    executor: Executor = Depends(get_index_build_executor),
 ) -> IndexLibraryHandler:
     """DI provider for IndexLibraryHandler"""
-    return IndexLibraryHandler(library_repo, indexer_service)
+    return IndexLibraryHandler(library_repo, indexer_service, job_repo, executor)
 
 
 class IndexLibraryResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
+    job_id: str
+    status: str
+
 
 @index_library_router.patch(
     "/{library_id}/index",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=IndexLibraryResponse,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 def index_library(
     library_id: str,
+    response: Response,
     handler: IndexLibraryHandler = Depends(get_index_library_handler),
 ):
+    """Start rebuilding the library's index in the background.
+
+    Searches keep using the current index until the new one is swapped in;
+    poll the returned job for completion.
+    """
     command = IndexLibraryCommand(library_id=library_id)
-    handler.handle(command)
+    result = handler.handle(command)
+    response.headers["Location"] = f"/libraries/{library_id}/index/jobs/{result.job_id}"
+    return IndexLibraryResponse(job_id=result.job_id, status=result.status)
@@ -0,0 +1,42 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from app.api.pagination import Cursor, Limit
+from app.application.libraries import ListLibrariesHandler, ListLibrariesQuery
+from app.dependencies import get_library_repository
+from app.domain.libraries.library_repository import LibraryRepository
+
+list_libraries_router = APIRouter()
+
+
+def get_list_libraries_handler(
+    library_repo: LibraryRepository = Depends(get_library_repository),
+) -> ListLibrariesHandler:
+    return ListLibrariesHandler(library_repo)
+
+
+class LibrarySummaryResponse(BaseModel):
+    library_id: str
+    name: str
+    document_count: int
+    is_indexed: bool
+
+
+class ListLibrariesResponse(BaseModel):
+    libraries: List[LibrarySummaryResponse]
+    next_cursor: str | None
+
+
+@list_libraries_router.get("/", response_model=ListLibrariesResponse)
+def list_libraries(
+    handler: ListLibrariesHandler = Depends(get_list_libraries_handler),
+    cursor: Cursor = None,
+    limit: Limit = 100,
+):
+    """List libraries one page at a time, ordered by id."""
+    result = handler.handle(ListLibrariesQuery(cursor=cursor, limit=limit))
+    return ListLibrariesResponse(
+        libraries=result.libraries, next_cursor=result.next_cursor
+    )
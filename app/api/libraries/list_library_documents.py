@@ -0,0 +1,53 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from app.api.pagination import Cursor, Limit
+from app.application.libraries import (
+    ListLibraryDocumentsHandler,
+    ListLibraryDocumentsQuery,
+)
+from app.dependencies import get_document_repository, get_library_repository
+from app.domain.documents import DocumentRepository
+from app.domain.libraries import LibraryRepository
+
+list_library_documents_router = APIRouter()
+
+
+def get_list_library_documents_handler(
+    library_repo: LibraryRepository = Depends(get_library_repository),
+    document_repo: DocumentRepository = Depends(get_document_repository),
+) -> ListLibraryDocumentsHandler:
+    return ListLibraryDocumentsHandler(library_repo, document_repo)
+
+
+class LibraryDocumentResponse(BaseModel):
+    document_id: str
+    title: str
+    chunk_count: int
+
+
+class ListLibraryDocumentsResponse(BaseModel):
+    library_id: str
+    documents: List[LibraryDocumentResponse]
+    next_cursor: str | None
+
+
+@list_library_documents_router.get(
+    "/{library_id}/documents", response_model=ListLibraryDocumentsResponse
+)
+def list_library_documents(
+    library_id: str,
+    handler: ListLibraryDocumentsHandler = Depends(get_list_library_documents_handler),
+    cursor: Cursor = None,
+    limit: Limit = 100,
+):
+    """List a library's documents one page at a time, in the order added."""
+    query = ListLibraryDocumentsQuery(library_id=library_id, cursor=cursor, limit=limit)
+    result = handler.handle(query)
+    return ListLibraryDocumentsResponse(
+        library_id=result.library_id,
+        documents=result.documents,
+        next_cursor=result.next_cursor,
+    )
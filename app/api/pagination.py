@@ -0,0 +1,10 @@
+from typing import Annotated
+
+from fastapi import Query
+
+# Query parameters shared by the paginated listing endpoints
+Cursor = Annotated[
+    str | None,
+    Query(description="`next_cursor` from the previous page; omit for the first"),
+]
+Limit = Annotated[int, Query(ge=1, le=1000, description="Maximum items per page")]
@@ -3,6 +3,12 @@ from app.application.documents.add_chunk_command import (
     AddChunkHandler,
     AddChunkResult,
 )
+from app.application.documents.bulk_create_documents_command import (
+    BulkCreateDocumentOutcome,
+    BulkCreateDocumentsCommand,
+    BulkCreateDocumentsHandler,
+    BulkCreateDocumentsResult,
+)
 from app.application.documents.create_document_command import (
     CreateDocumentCommand,
     CreateDocumentHandler,
@@ -26,6 +32,11 @@ from app.application.documents.get_document_query import (
     GetDocumentQuery,
     GetDocumentResult,
 )
+from app.application.documents.list_chunks_query import (
+    ListChunksHandler,
+    ListChunksQuery,
+    ListChunksResult,
+)
 from app.application.documents.update_chunk_command import (
     UpdateChunkCommand,
     UpdateChunkHandler,
@@ -39,6 +50,10 @@ __all__ = [
     "AddChunkCommand",
     "AddChunkHandler",
     "AddChunkResult",
+    "BulkCreateDocumentOutcome",
+    "BulkCreateDocumentsCommand",
+    "BulkCreateDocumentsHandler",
+    "BulkCreateDocumentsResult",
     "CreateDocumentCommand",
     "CreateDocumentHandler",
     "CreateDocumentResult",
@@ -52,6 +67,9 @@ __all__ = [
     "GetDocumentHandler",
     "GetDocumentQuery",
     "GetDocumentResult",
+    "ListChunksHandler",
+    "ListChunksQuery",
+    "ListChunksResult",
     "UpdateChunkCommand",
     "UpdateChunkHandler",
     "UpdateDocumentCommand",
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Any, Dict, List, NotRequired, TypedDict
 
+import numpy as np
+
 from app.domain.common import Embedding
 from app.domain.documents import (
     Chunk,
@@ -9,6 +11,7 @@ from app.domain.documents import (
     DocumentId,
     DocumentRepository,
 )
+from app.domain.libraries import IndexedChunk, Library, LibraryRepository
 from app.errors import NotFoundError
 
 
@@ -23,7 +26,7 @@ class AddChunkCommand:
 
     document_id: str
     text: str
-    embedding: List[float]
+    embedding: List[float] | np.ndarray
     metadata: ChunkMetadataInput
 
 
@@ -35,6 +38,8 @@ class AddChunkResult:
 @dataclass
 class AddChunkHandler:
     _document_repo: DocumentRepository
+    # When given, libraries holding the document are updated in place
+    _library_repo: LibraryRepository | None = None
 
     def handle(self, command: AddChunkCommand) -> AddChunkResult:
         # Validate Document exists
@@ -56,8 +61,30 @@ class AddChunkHandler:
             ),
         )
 
+        # Index it first: a library rejecting the chunk leaves the document
+        # untouched
+        libraries = self._index_chunk(IndexedChunk.from_chunk(chunk, document_id))
+
         # Add Chunk to Document aggregate
         document.add_chunk(chunk)
         self._document_repo.save(document)
+        for library in libraries:
+            self._library_repo.save(library)
 
         return AddChunkResult(chunk_id=str(chunk_id))
+
+    def _index_chunk(self, chunk: IndexedChunk) -> List[Library]:
+        """Add the chunk to every library holding its document, or to none."""
+        if self._library_repo is None:
+            return []
+        updated: List[Library] = []
+        try:
+            for library in self._library_repo.find_by_document(chunk.document_id):
+                if library.contains_document(chunk.document_id):
+                    library.upsert_chunks([chunk])
+                    updated.append(library)
+        except Exception:
+            for library in updated:
+                library.remove_chunks([chunk.id])
+            raise
+        return updated
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import List
+
+from app.application.documents.create_document_command import (
+    CreateDocumentCommand,
+    build_document,
+)
+from app.domain.documents import Document, DocumentRepository
+from app.domain.libraries import IndexedChunk, LibraryId, LibraryRepository
+from app.errors import InvalidEntityError, NotFoundError
+
+
+@dataclass
+class BulkCreateDocumentsCommand:
+    """Create a batch of documents, optionally adding them to a library."""
+
+    documents: List[CreateDocumentCommand]
+    library_id: str | None = None
+
+
+@dataclass
+class BulkCreateDocumentOutcome:
+    # Exactly one is set: the new document's id, or why it was rejected
+    document_id: str | None = None
+    error: str | None = None
+
+
+@dataclass
+class BulkCreateDocumentsResult:
+    # One outcome per command, in order
+    outcomes: List[BulkCreateDocumentOutcome]
+
+
+@dataclass
+class BulkCreateDocumentsHandler:
+    _document_repo: DocumentRepository
+    # Required only for commands that name a library
+    _library_repo: LibraryRepository | None = None
+
+    def handle(self, command: BulkCreateDocumentsCommand) -> BulkCreateDocumentsResult:
+        library = None
+        if command.library_id is not None:
+            library_id = LibraryId.from_string(command.library_id)
+            if self._library_repo is not None:
+                library = self._library_repo.find_by_id(library_id)
+            if library is None:
+                raise NotFoundError(f"Library {command.library_id} not found")
+
+        # Invalid documents are reported and skipped; the rest are saved
+        documents: List[Document] = []
+        outcomes: List[BulkCreateDocumentOutcome] = []
+        for document_command in command.documents:
+            try:
+                document = build_document(document_command)
+            except InvalidEntityError as exc:
+                outcomes.append(BulkCreateDocumentOutcome(error=str(exc)))
+                continue
+            documents.append(document)
+            outcomes.append(BulkCreateDocumentOutcome(document_id=str(document.id)))
+
+        # Add to the library first: chunks its index rejects leave nothing
+        # behind
+        if library is not None and documents:
+            library.add_documents(
+                [d.id for d in documents],
+                [IndexedChunk.from_chunk(c, d.id) for d in documents for c in d.chunks],
+            )
+        self._document_repo.save_many(documents)
+        if library is not None and documents:
+            self._library_repo.save(library)
+
+        return BulkCreateDocumentsResult(outcomes=outcomes)
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, TypedDict
 
+import numpy as np
+
 from app.domain.common import Embedding
 from app.domain.documents import (
     Chunk,
@@ -22,7 +24,7 @@ class CreateDocumentCommand:
 
     class ChunkInput(TypedDict):
         text: str
-        embedding: List[float]
+        embedding: List[float] | np.ndarray
 
         class ChunkMetadataInput(TypedDict):
             source: str
@@ -45,38 +47,42 @@ class CreateDocumentHandler:
     _repository: DocumentRepository
 
     def handle(self, command: CreateDocumentCommand) -> CreateDocumentResult:
-        # build chunk entities if any were provided
-        chunks: List[Chunk] = []
-        if command.chunks:
-            for c in command.chunks:
-                meta = c.get("metadata", {})
-                chunk = Chunk(
-                    id=ChunkId.generate(),
-                    text=c["text"],
-                    embedding=Embedding.from_list(c["embedding"]),
-                    metadata=ChunkMetadata(
-                        source=meta.get("source") or "unknown",
-                        page_number=meta.get("page_number"),
-                        custom_fields=meta.get("custom_fields") or {},
-                    ),
-                )
-                chunks.append(chunk)
-
-        # Extract document metadata required fields and custom fields
-        meta = command.metadata or {}
-        title = meta.get("title")
-        author = meta.get("author")
-        # Ensure custom_fields is a dict even if the request provided None
-        custom_fields = meta.get("custom_fields") or {}
-
-        document = Document(
-            id=DocumentId.generate(),
-            chunks=chunks,
-            metadata=DocumentMetadata(
-                title=title, author=author, custom_fields=custom_fields
-            ),
-        )
-
+        document = build_document(command)
         self._repository.save(document)
 
         return CreateDocumentResult(document_id=str(document.id))
+
+
+def build_document(command: CreateDocumentCommand) -> Document:
+    """Create the Document aggregate described by `command`, unsaved."""
+    # build chunk entities if any were provided
+    chunks: List[Chunk] = []
+    if command.chunks:
+        for c in command.chunks:
+            meta = c.get("metadata", {})
+            chunk = Chunk(
+                id=ChunkId.generate(),
+                text=c["text"],
+                embedding=Embedding.from_list(c["embedding"]),
+                metadata=ChunkMetadata(
+                    source=meta.get("source") or "unknown",
+                    page_number=meta.get("page_number"),
+                    custom_fields=meta.get("custom_fields") or {},
+                ),
+            )
+            chunks.append(chunk)
+
+    # Extract document metadata required fields and custom fields
+    meta = command.metadata or {}
+    title = meta.get("title")
+    author = meta.get("author")
+    # Ensure custom_fields is a dict even if the request provided None
+    custom_fields = meta.get("custom_fields") or {}
+
+    return Document(
+        id=DocumentId.generate(),
+        chunks=chunks,
+        metadata=DocumentMetadata(
+            title=title, author=author, custom_fields=custom_fields
+        ),
+    )
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from app.domain.documents import ChunkId, DocumentId, DocumentRepository
+from app.domain.libraries import LibraryRepository
 from app.errors import NotFoundError
 
 
@@ -13,6 +14,8 @@ class DeleteChunkCommand:
 @dataclass
 class DeleteChunkHandler:
     _repository: DocumentRepository
+    # When given, libraries holding the document are updated in place
+    _library_repo: LibraryRepository | None = None
 
     def handle(self, command: DeleteChunkCommand) -> None:
         document_id = DocumentId.from_string(command.document_id)
@@ -28,3 +31,9 @@ class DeleteChunkHandler:
 
         document.remove_chunk(chunk_id)
         self._repository.save(document)
+
+        if self._library_repo is not None:
+            for library in self._library_repo.find_by_document(document_id):
+                if library.contains_document(document_id):
+                    library.remove_chunks([chunk_id])
+                    self._library_repo.save(library)
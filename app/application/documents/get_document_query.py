@@ -9,6 +9,9 @@ from app.errors import NotFoundError
 @dataclass
 class GetDocumentQuery:
     document_id: str
+    # Leave chunk texts / embeddings out of the result
+    include_text: bool = True
+    include_embedding: bool = True
 
 
 @dataclass
@@ -41,7 +44,7 @@ class GetDocumentHandler:
         # serialize chunks
         chunks_list: List[ChunkDict] = []
         for c in document.chunks:
-            chunks_list.append(c.to_dict())
+            chunks_list.append(c.to_dict(query.include_text, query.include_embedding))
 
         return GetDocumentResult(
             document_id=str(document.id),
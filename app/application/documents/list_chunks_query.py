@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import List
+
+from app.application.pagination import page_of
+from app.domain.documents import DocumentId, DocumentRepository
+from app.domain.documents.chunk import ChunkDict
+from app.errors import NotFoundError
+
+
+@dataclass
+class ListChunksQuery:
+    document_id: str
+    # Returned as `next_cursor` by the previous page
+    cursor: str | None = None
+    limit: int = 100
+    # Leave chunk texts / embeddings out of the result
+    include_text: bool = True
+    include_embedding: bool = True
+
+
+@dataclass
+class ListChunksResult:
+    document_id: str
+    chunks: List[ChunkDict]
+    # None on the last page
+    next_cursor: str | None
+
+
+@dataclass
+class ListChunksHandler:
+    _repository: DocumentRepository
+
+    def handle(self, query: ListChunksQuery) -> ListChunksResult:
+        document_id = DocumentId.from_string(query.document_id)
+        document = self._repository.find_by_id(document_id)
+        if document is None:
+            raise NotFoundError(f"Document {query.document_id} not found")
+
+        # Chunks keep their insertion order; only the page is copied and
+        # serialized
+        with document.lock.read():
+            page, next_cursor = page_of(
+                document.chunks_view, lambda c: str(c.id), query.cursor, query.limit
+            )
+            chunks = [
+                c.to_dict(query.include_text, query.include_embedding) for c in page
+            ]
+
+        return ListChunksResult(
+            document_id=str(document.id), chunks=chunks, next_cursor=next_cursor
+        )
@@ -1,7 +1,11 @@
+import copy
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from app.domain.documents import ChunkId, DocumentId, DocumentRepository
+from app.domain.libraries import IndexedChunk, Library, LibraryRepository
 from app.errors import NotFoundError
 
 
@@ -10,13 +14,15 @@ class UpdateChunkCommand:
     document_id: str
     chunk_id: str
     text: Optional[str] = None
-    embedding: Optional[List[float]] = None
+    embedding: Optional[List[float] | np.ndarray] = None
     metadata: Optional[Dict[str, Any]] = None
 
 
 @dataclass
 class UpdateChunkHandler:
     _repository: DocumentRepository
+    # When given, libraries holding the document are updated in place
+    _library_repo: LibraryRepository | None = None
 
     def handle(self, command: UpdateChunkCommand) -> None:
         document_id = DocumentId.from_string(command.document_id)
@@ -25,6 +31,18 @@ class UpdateChunkHandler:
             raise NotFoundError(f"Document {command.document_id} not found")
 
         chunk_id = ChunkId.from_string(command.chunk_id)
+        current = document.get_chunk(chunk_id)
+
+        # Index the updated chunk first, on a copy: a library rejecting it
+        # leaves the document untouched
+        updated = copy.copy(current)
+        updated.update(
+            text=command.text, embedding=command.embedding, metadata=command.metadata
+        )
+        libraries = self._index_chunk(
+            IndexedChunk.from_chunk(updated, document_id),
+            IndexedChunk.from_chunk(current, document_id),
+        )
 
         # delegate update to domain
         document.update_chunk(
@@ -36,3 +54,23 @@ class UpdateChunkHandler:
 
         # persist
         self._repository.save(document)
+        for library in libraries:
+            self._library_repo.save(library)
+
+    def _index_chunk(
+        self, chunk: IndexedChunk, previous: IndexedChunk
+    ) -> List[Library]:
+        """Replace the chunk in every library holding its document, or in none."""
+        if self._library_repo is None:
+            return []
+        updated: List[Library] = []
+        try:
+            for library in self._library_repo.find_by_document(chunk.document_id):
+                if library.contains_document(chunk.document_id):
+                    library.upsert_chunks([chunk])
+                    updated.append(library)
+        except Exception:
+            for library in updated:
+                library.upsert_chunks([previous])
+            raise
+        return updated
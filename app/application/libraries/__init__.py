@@ -11,11 +11,26 @@ from app.application.libraries.delete_library_command import (
     DeleteLibraryCommand,
     DeleteLibraryHandler,
 )
+from app.application.libraries.export_library_chunks_query import (
+    ExportLibraryChunksHandler,
+    ExportLibraryChunksQuery,
+    ExportLibraryChunksResult,
+)
+from app.application.libraries.find_similar_chunks_batch_query import (
+    FindSimilarChunksBatchHandler,
+    FindSimilarChunksBatchQuery,
+    FindSimilarChunksBatchResult,
+)
 from app.application.libraries.find_similar_chunks_query import (
     FindSimilarChunksHandler,
     FindSimilarChunksQuery,
     FindSimilarChunksResult,
 )
+from app.application.libraries.get_index_job_query import (
+    GetIndexJobHandler,
+    GetIndexJobQuery,
+    GetIndexJobResult,
+)
 from app.application.libraries.get_library_query import (
     GetLibraryHandler,
     GetLibraryQuery,
@@ -24,6 +39,21 @@ from app.application.libraries.get_library_query import (
 from app.application.libraries.index_library_command import (
     IndexLibraryCommand,
     IndexLibraryHandler,
+    IndexLibraryResult,
+)
+from app.application.libraries.list_libraries_query import (
+    ListLibrariesHandler,
+    ListLibrariesQuery,
+    ListLibrariesResult,
+)
+from app.application.libraries.list_library_documents_query import (
+    ListLibraryDocumentsHandler,
+    ListLibraryDocumentsQuery,
+    ListLibraryDocumentsResult,
+)
+from app.application.libraries.query_result_cache import (
+    QueryCacheStats,
+    QueryResultCache,
 )
 from app.application.libraries.remove_document_command import (
     RemoveDocumentCommand,
@@ -41,14 +71,32 @@ __all__ = [
     "CreateLibraryResult",
     "DeleteLibraryCommand",
     "DeleteLibraryHandler",
+    "ExportLibraryChunksHandler",
+    "ExportLibraryChunksQuery",
+    "ExportLibraryChunksResult",
+    "GetIndexJobHandler",
+    "GetIndexJobQuery",
+    "GetIndexJobResult",
     "GetLibraryHandler",
     "GetLibraryQuery",
     "GetLibraryResult",
+    "FindSimilarChunksBatchHandler",
+    "FindSimilarChunksBatchQuery",
+    "FindSimilarChunksBatchResult",
     "FindSimilarChunksHandler",
     "FindSimilarChunksQuery",
     "FindSimilarChunksResult",
     "IndexLibraryCommand",
     "IndexLibraryHandler",
+    "IndexLibraryResult",
+    "ListLibrariesHandler",
+    "ListLibrariesQuery",
+    "ListLibrariesResult",
+    "ListLibraryDocumentsHandler",
+    "ListLibraryDocumentsQuery",
+    "ListLibraryDocumentsResult",
+    "QueryCacheStats",
+    "QueryResultCache",
     "UpdateLibraryCommand",
     "UpdateLibraryHandler",
     "AddDocumentCommand",
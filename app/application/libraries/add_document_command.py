@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 from app.domain.documents import DocumentId, DocumentRepository
-from app.domain.libraries import LibraryId, LibraryRepository
+from app.domain.libraries import IndexedChunk, LibraryId, LibraryRepository
 from app.errors import NotFoundError
 
 
@@ -24,8 +24,13 @@ class AddDocumentHandler:
         if library is None:
             raise NotFoundError(f"Library {command.library_id} not found")
 
-        if not self._document_repo.exists(document_id):
+        document = self._document_repo.find_by_id(document_id)
+        if document is None:
             raise NotFoundError(f"Document {command.document_id} not found")
 
-        library.add_document(document_id)
+        # Hand over the chunks so an indexed library indexes them in place
+        library.add_document(
+            document_id,
+            [IndexedChunk.from_chunk(chunk, document_id) for chunk in document.chunks],
+        )
         self._library_repo.save(library)
@@ -3,13 +3,14 @@ from typing import Any, Callable, Dict, TypedDict
 
 from app.domain.documents import DocumentId, DocumentRepository
 from app.domain.libraries import (
+    DistanceMetric,
     Library,
     LibraryId,
     LibraryMetadata,
     LibraryRepository,
     VectorIndex,
 )
-from app.errors import NotFoundError
+from app.errors import InvalidEntityError, NotFoundError
 
 
 @dataclass
@@ -22,6 +23,10 @@ class CreateLibraryCommand:
     metadata: LibraryMetadataInput
     # Optional list of document ids to add to the library during creation.
     documents: list[str] | None = None
+    # Optional construction parameters for the library's vector index.
+    index_params: Dict[str, Any] | None = None
+    # Distance metric used to rank chunks: 'cosine', 'dot' or 'l2'.
+    metric: str = "cosine"
 
 
 @dataclass
@@ -33,7 +38,7 @@ class CreateLibraryResult:
 class CreateLibraryHandler:
     _repository: LibraryRepository
     _document_repository: DocumentRepository
-    vector_index_factory: Callable[[], VectorIndex]
+    vector_index_factory: Callable[..., VectorIndex]
 
     def handle(self, command: CreateLibraryCommand) -> CreateLibraryResult:
         meta = command.metadata or {}
@@ -50,7 +55,14 @@ class CreateLibraryHandler:
                     raise NotFoundError(f"Document {document_id} not found")
                 doc_ids.append(document_id)
 
-        vector_index = self.vector_index_factory()
+        index_params = dict(command.index_params or {})
+        if "metric" in index_params:
+            raise InvalidEntityError(
+                "Set the distance metric through 'metric', not index_params"
+            )
+        vector_index = self.vector_index_factory(
+            metric=DistanceMetric.parse(command.metric), **index_params
+        )
         library = Library(
             id=LibraryId.generate(),
             documents=doc_ids,
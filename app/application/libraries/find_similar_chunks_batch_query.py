@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, NotRequired, TypedDict
+
+import numpy as np
+
+from app.application.libraries.find_similar_chunks_query import (
+    SimilarChunkDict,
+    similar_chunk_dicts,
+)
+from app.domain.common import Embedding
+from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.libraries import LibraryId, LibraryRepository
+from app.errors import InvalidEntityError, NotFoundError
+
+
+@dataclass
+class FindSimilarChunksBatchQuery:
+    """Run several similarity searches against one library."""
+
+    class QueryInput(TypedDict):
+        embedding: List[float] | np.ndarray
+        k: NotRequired[int]
+        min_similarity: NotRequired[float]
+        filters: NotRequired[ChunkMetadataFilterDict | None]
+        search_params: NotRequired[Dict[str, Any] | None]
+
+    library_id: str
+    queries: List[QueryInput]
+    # Leave chunk texts / embeddings out of every result
+    include_text: bool = True
+    include_embedding: bool = True
+
+
+@dataclass
+class FindSimilarChunksBatchResult:
+    library_id: str
+    results: List[List[SimilarChunkDict]]
+
+
+@dataclass
+class FindSimilarChunksBatchHandler:
+    _repository: LibraryRepository
+
+    def handle(
+        self, query: FindSimilarChunksBatchQuery
+    ) -> FindSimilarChunksBatchResult:
+        lib_id = LibraryId.from_string(query.library_id)
+        library = self._repository.find_by_id(lib_id)
+        if library is None:
+            raise NotFoundError(f"Library {query.library_id} not found")
+        if not query.queries:
+            raise InvalidEntityError("At least one query is required")
+
+        raw = library.find_similar_chunks_batch(
+            [Embedding.from_list(q["embedding"]) for q in query.queries],
+            [q.get("k", 5) for q in query.queries],
+            [q.get("filters") for q in query.queries],
+            [q.get("min_similarity", 0.0) for q in query.queries],
+            [q.get("search_params") for q in query.queries],
+        )
+
+        results = [
+            similar_chunk_dicts(scored, query.include_text, query.include_embedding)
+            for scored in raw
+        ]
+        return FindSimilarChunksBatchResult(library_id=str(library.id), results=results)
@@ -1,23 +1,38 @@
-from dataclasses import dataclass
-from typing import List
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, NotRequired, Sequence, Tuple, TypedDict
 
+import numpy as np
+
+from app.application.libraries.query_result_cache import QueryResultCache
 from app.domain.common import Embedding
 from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
-from app.domain.libraries import LibraryId, LibraryRepository
-from app.domain.libraries.indexed_chunk import IndexedChunkDict
+from app.domain.libraries import IndexedChunk, Library, LibraryId, LibraryRepository
+from app.domain.libraries.indexed_chunk import ChunkMetadataDict
 from app.errors import NotFoundError
 
 
 @dataclass
 class FindSimilarChunksQuery:
     library_id: str
-    embedding: List[float]
+    embedding: List[float] | np.ndarray
     k: int = 5
     min_similarity: float = 0.0
     filters: ChunkMetadataFilterDict | None = None
+    search_params: Dict[str, Any] | None = None
+    # Leave chunk texts / embeddings out of the result
+    include_text: bool = True
+    include_embedding: bool = True
 
 
-class SimilarChunkDict(IndexedChunkDict):
+class SimilarChunkDict(TypedDict):
+    chunk_id: str
+    document_id: str
+    text: NotRequired[str]
+    # One float32 row per chunk; encoded straight from the array
+    embedding: NotRequired[np.ndarray]
+    metadata: ChunkMetadataDict
     similarity: float
 
 
@@ -25,11 +40,16 @@ class SimilarChunkDict(IndexedChunkDict):
 class FindSimilarChunksResult:
     library_id: str
     chunks: List[SimilarChunkDict]
+    # Encoded response, kept by the API layer so cached results are only
+    # serialized once
+    response_body: bytes | None = field(default=None, repr=False, compare=False)
 
 
 @dataclass
 class FindSimilarChunksHandler:
     _repository: LibraryRepository
+    # When given, repeated queries are answered without searching the index
+    _cache: QueryResultCache | None = None
 
     def handle(self, query: FindSimilarChunksQuery) -> FindSimilarChunksResult:
         lib_id = LibraryId.from_string(query.library_id)
@@ -38,6 +58,21 @@ class FindSimilarChunksHandler:
             raise NotFoundError(f"Library {query.library_id} not found")
 
         emb = Embedding.from_list(query.embedding)
+        if self._cache is None:
+            return self._search(library, emb, query)
+        # Read the version and search under one lock, so a result is never
+        # cached under a version it was not computed from
+        with library.lock.read():
+            key = _cache_key(library, emb, query)
+            result = self._cache.get(key)
+            if result is None:
+                result = self._search(library, emb, query)
+                self._cache.put(key, result)
+        return result
+
+    def _search(
+        self, library: Library, emb: Embedding, query: FindSimilarChunksQuery
+    ) -> FindSimilarChunksResult:
         # Delegate to domain - let domain validation errors (e.g. index not built)
         # propagate to the application/API layer so callers receive a clear error.
         raw = library.find_similar_chunks(
@@ -45,10 +80,48 @@ class FindSimilarChunksHandler:
             query.k,
             query.filters,
             query.min_similarity,
+            query.search_params,
         )
 
-        chunks: List[SimilarChunkDict] = []
-        for c, score in raw:
-            chunks.append({**c.to_dict(), "similarity": score})
-
+        chunks = similar_chunk_dicts(raw, query.include_text, query.include_embedding)
         return FindSimilarChunksResult(library_id=str(library.id), chunks=chunks)
+
+
+def similar_chunk_dicts(
+    scored: Sequence[Tuple[IndexedChunk, float]],
+    include_text: bool = True,
+    include_embedding: bool = True,
+) -> List[SimilarChunkDict]:
+    """Shape search hits for the response.
+
+    Embeddings are gathered into one float32 matrix and handed out as its
+    rows rather than converted to Python floats chunk by chunk, so the API
+    layer can encode them in a single pass.
+    """
+    chunks: List[SimilarChunkDict] = [
+        {**c.to_dict(include_text, include_embedding=False), "similarity": score}
+        for c, score in scored
+    ]
+    if include_embedding and chunks:
+        matrix = np.stack([c.embedding.values for c, _ in scored])
+        for chunk, row in zip(chunks, matrix):
+            chunk["embedding"] = row
+    return chunks
+
+
+def _cache_key(
+    library: Library, emb: Embedding, query: FindSimilarChunksQuery
+) -> Hashable:
+    return (
+        str(library.id),
+        library.instance_id,
+        library.index_version,
+        hashlib.blake2b(emb.values.tobytes(), digest_size=16).digest(),
+        query.k,
+        query.min_similarity,
+        # Key order does not change what filters and params select
+        json.dumps(query.filters, sort_keys=True, default=str),
+        json.dumps(query.search_params, sort_keys=True, default=str),
+        query.include_text,
+        query.include_embedding,
+    )
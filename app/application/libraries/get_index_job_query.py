@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+from app.domain.libraries import IndexJobId, IndexJobRepository, LibraryId
+from app.errors import NotFoundError
+
+
+@dataclass
+class GetIndexJobQuery:
+    library_id: str
+    job_id: str
+
+
+@dataclass
+class GetIndexJobResult:
+    job_id: str
+    library_id: str
+    status: str
+    error: str | None
+    created_at: str
+    started_at: str | None
+    finished_at: str | None
+
+
+@dataclass
+class GetIndexJobHandler:
+    _jobs: IndexJobRepository
+
+    def handle(self, query: GetIndexJobQuery) -> GetIndexJobResult:
+        lib_id = LibraryId.from_string(query.library_id)
+        job = self._jobs.find_by_id(IndexJobId.from_string(query.job_id))
+        if job is None or job.library_id != lib_id:
+            raise NotFoundError(
+                f"Index job {query.job_id} not found for library {query.library_id}"
+            )
+
+        return GetIndexJobResult(
+            job_id=str(job.id),
+            library_id=str(job.library_id),
+            status=job.status.value,
+            error=job.error,
+            created_at=job.created_at.isoformat(),
+            started_at=job.started_at.isoformat() if job.started_at else None,
+            finished_at=job.finished_at.isoformat() if job.finished_at else None,
+        )
@@ -1,7 +1,6 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-from app.domain.documents.chunk import ChunkDict
 from app.domain.libraries import LibraryId, LibraryRepository
 from app.errors import NotFoundError
 
@@ -14,9 +13,11 @@ class GetLibraryQuery:
 @dataclass
 class GetLibraryResult:
     library_id: str
-    document_ids: List[str]
+    document_count: int
     metadata: Dict[str, Any]
-    indexed_chunks: List[ChunkDict]
+    metric: str
+    is_indexed: bool
+    indexed_chunk_count: int
 
 
 @dataclass
@@ -38,18 +39,17 @@ class GetLibraryHandler:
             "custom_fields": dict(library.metadata.custom_fields),
         }
 
-        # document ids as strings
-        doc_ids = [str(d) for d in library.documents]
-
-        # get indexed chunks via the Library public API
-        raw_chunks = library.get_indexed_chunks()
-        indexed_chunks: List[ChunkDict] = []
-        for c in raw_chunks:
-            indexed_chunks.append(c.to_dict())
+        # Documents are paged by ListLibraryDocumentsHandler and chunks are
+        # streamed by ExportLibraryChunksHandler
+        with library.lock.read():
+            is_indexed = library.is_indexed
+            chunk_count = library.vector_index.size if is_indexed else 0
 
         return GetLibraryResult(
             library_id=str(library.id),
-            document_ids=doc_ids,
+            document_count=library.document_count,
             metadata=meta,
-            indexed_chunks=indexed_chunks,
+            metric=library.metric.value,
+            is_indexed=is_indexed,
+            indexed_chunk_count=chunk_count,
         )
@@ -1,7 +1,18 @@
+from concurrent.futures import Executor
 from dataclasses import dataclass
 
-from app.domain.libraries import LibraryId, LibraryIndexerService, LibraryRepository
-from app.errors import NotFoundError
+from app.domain.libraries import (
+    IndexJob,
+    IndexJobId,
+    IndexJobRepository,
+    LibraryId,
+    LibraryIndexerService,
+    LibraryRepository,
+)
+from app.errors import ApplicationError, NotFoundError
+
+# Builds restarted when the library changes while its index is being built
+_MAX_BUILD_ATTEMPTS = 3
 
 
 @dataclass
@@ -9,16 +20,54 @@ class IndexLibraryCommand:
     library_id: str
 
 
+@dataclass
+class IndexLibraryResult:
+    job_id: str
+    status: str
+
+
 @dataclass
 class IndexLibraryHandler:
+    """Starts a background rebuild of a library's index.
+
+    The new index is built on `_executor` next to the live one and swapped
+    in once ready; progress is tracked as an `IndexJob`.
+    """
+
     _repository: LibraryRepository
     _indexer: LibraryIndexerService
+    _jobs: IndexJobRepository
+    _executor: Executor
 
-    def handle(self, command: IndexLibraryCommand) -> None:
+    def handle(self, command: IndexLibraryCommand) -> IndexLibraryResult:
         lib_id = LibraryId.from_string(command.library_id)
-        library = self._repository.find_by_id(lib_id)
-        if library is None:
+        if not self._repository.exists(lib_id):
             raise NotFoundError(f"Library {command.library_id} not found")
 
-        self._indexer.index(library)
-        self._repository.save(library)
+        job = IndexJob(id=IndexJobId.generate(), library_id=lib_id)
+        self._jobs.save(job)
+        self._executor.submit(self._run, job)
+        return IndexLibraryResult(job_id=str(job.id), status=job.status.value)
+
+    def _run(self, job: IndexJob) -> None:
+        job.start()
+        self._jobs.save(job)
+        try:
+            for _ in range(_MAX_BUILD_ATTEMPTS):
+                library = self._repository.find_by_id(job.library_id)
+                if library is None:
+                    raise NotFoundError(f"Library {job.library_id} not found")
+
+                revision = library.index_revision
+                index = library.build_index(self._indexer.collect_chunks(library))
+                if library.swap_index(index, revision):
+                    self._repository.save(library)
+                    job.succeed()
+                    return
+            raise ApplicationError(
+                "Library kept changing while its index was being built"
+            )
+        except Exception as exc:
+            job.fail(str(exc))
+        finally:
+            self._jobs.save(job)
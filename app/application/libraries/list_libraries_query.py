@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import List, TypedDict
+
+from app.application.pagination import decode_cursor, encode_cursor
+from app.domain.libraries import LibraryId, LibraryRepository
+
+
+@dataclass
+class ListLibrariesQuery:
+    # Returned as `next_cursor` by the previous page
+    cursor: str | None = None
+    limit: int = 100
+
+
+class LibrarySummaryDict(TypedDict):
+    library_id: str
+    name: str
+    document_count: int
+    is_indexed: bool
+
+
+@dataclass
+class ListLibrariesResult:
+    libraries: List[LibrarySummaryDict]
+    # None on the last page
+    next_cursor: str | None
+
+
+@dataclass
+class ListLibrariesHandler:
+    _repository: LibraryRepository
+
+    def handle(self, query: ListLibrariesQuery) -> ListLibrariesResult:
+        after = None
+        if query.cursor is not None:
+            after = LibraryId.from_string(decode_cursor(query.cursor)[0])
+
+        # One extra library tells whether another page follows
+        page = self._repository.find_page(after, query.limit + 1)
+        libraries: List[LibrarySummaryDict] = []
+        for library in page[: query.limit]:
+            with library.lock.read():
+                libraries.append(
+                    {
+                        "library_id": str(library.id),
+                        "name": library.metadata.name,
+                        "document_count": library.document_count,
+                        "is_indexed": library.is_indexed,
+                    }
+                )
+
+        next_cursor = None
+        if len(page) > query.limit:
+            next_cursor = encode_cursor(libraries[-1]["library_id"])
+        return ListLibrariesResult(libraries=libraries, next_cursor=next_cursor)
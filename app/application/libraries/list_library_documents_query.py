@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import List, TypedDict
+
+from app.application.pagination import page_of
+from app.domain.documents import DocumentRepository
+from app.domain.libraries import LibraryId, LibraryRepository
+from app.errors import NotFoundError
+
+
+@dataclass
+class ListLibraryDocumentsQuery:
+    library_id: str
+    # Returned as `next_cursor` by the previous page
+    cursor: str | None = None
+    limit: int = 100
+
+
+class LibraryDocumentDict(TypedDict):
+    document_id: str
+    title: str
+    chunk_count: int
+
+
+@dataclass
+class ListLibraryDocumentsResult:
+    library_id: str
+    documents: List[LibraryDocumentDict]
+    # None on the last page
+    next_cursor: str | None
+
+
+@dataclass
+class ListLibraryDocumentsHandler:
+    _library_repo: LibraryRepository
+    _document_repo: DocumentRepository
+
+    def handle(self, query: ListLibraryDocumentsQuery) -> ListLibraryDocumentsResult:
+        library_id = LibraryId.from_string(query.library_id)
+        library = self._library_repo.find_by_id(library_id)
+        if library is None:
+            raise NotFoundError(f"Library {query.library_id} not found")
+
+        # Documents keep the order they were added to the library in; only
+        # the page is copied
+        with library.lock.read():
+            page, next_cursor = page_of(
+                library.documents_view, str, query.cursor, query.limit
+            )
+
+        # Documents deleted since they were added are left out
+        documents: List[LibraryDocumentDict] = []
+        for document in self._document_repo.find_by_ids(page):
+            with document.lock.read():
+                documents.append(
+                    {
+                        "document_id": str(document.id),
+                        "title": document.metadata.title,
+                        "chunk_count": document.chunk_count,
+                    }
+                )
+
+        return ListLibraryDocumentsResult(
+            library_id=str(library.id), documents=documents, next_cursor=next_cursor
+        )
@@ -0,0 +1,71 @@
+"""Opaque cursors for paging through ordered listings.
+
+A cursor records the key of the last item returned and, for listings kept
+in a list, the position after it. Clients pass it back unchanged to get the
+next page.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from itertools import islice
+from typing import Callable, Collection, List, Tuple, TypeVar
+
+from app.errors import InvalidEntityError
+
+T = TypeVar("T")
+
+
+def encode_cursor(after: str, position: int = 0) -> str:
+    state = json.dumps([after, position], separators=(",", ":"))
+    return base64.urlsafe_b64encode(state.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Return the key and position stored by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after, position = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(after, str) or not isinstance(position, int):
+            raise ValueError(cursor)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidEntityError(f"Invalid cursor: {cursor}") from exc
+    return after, position
+
+
+def page_of(
+    items: Collection[T], key: Callable[[T], str], cursor: str | None, limit: int
+) -> Tuple[List[T], str | None]:
+    """Slice one page out of `items`, kept in a stable order.
+
+    `items` may be a live view, such as a dict's values; only the page is
+    copied. While the collection is unchanged, resuming skips to the stored
+    position without comparing keys. When items before the cursor were
+    inserted or removed, the last returned item is looked up by key
+    instead; if it was itself removed, paging resumes where it stood.
+    """
+    start = 0
+    if cursor is not None:
+        after, position = decode_cursor(cursor)
+        start = _resume_at(items, key, after, position)
+    page = list(islice(items, start, start + limit))
+    end = start + len(page)
+    next_cursor = (
+        encode_cursor(key(page[-1]), end) if page and end < len(items) else None
+    )
+    return page, next_cursor
+
+
+def _resume_at(
+    items: Collection[T], key: Callable[[T], str], after: str, position: int
+) -> int:
+    if 0 < position <= len(items):
+        if key(next(islice(items, position - 1, None))) == after:
+            return position
+    for index, item in enumerate(items):
+        if key(item) == after:
+            return index + 1
+    # Removed: the items after it moved up into its place
+    return min(max(position - 1, 0), len(items))
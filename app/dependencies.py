@@ -1,22 +1,61 @@
-from typing import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Type
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.application.libraries.query_result_cache import QueryResultCache
 from app.domain.documents import DocumentRepository
 from app.domain.libraries import (
     BruteForceIndex,
+    HNSWIndex,
+    IndexJobRepository,
+    IVFIndex,
     KDTreeIndex,
     LibraryRepository,
+    PQIndex,
     VectorIndex,
 )
+from app.errors import InvalidEntityError
 from app.infrastructure import (
     InMemoryDocumentRepository,
+    InMemoryIndexJobRepository,
+    IndexFileStore,
     InMemoryLibraryRepository,
+    LoggedDocumentRepository,
+    LoggedLibraryRepository,
+    SnapshotService,
+    SqliteDatabase,
+    SqliteDocumentRepository,
+    SqliteLibraryRepository,
+    WriteAheadLog,
 )
 
 
 class Settings(BaseSettings):
-    vector_index_type: str = "kd"  # 'kd' (KDTreeIndex) or 'brute' (BruteForceIndex)
+    # 'kd' (KDTreeIndex), 'brute' (BruteForceIndex), 'hnsw' (HNSWIndex)
+    # 'ivf' (IVFIndex) or 'pq' (PQIndex)
+    vector_index_type: str = "kd"
+    # Threads running background index builds
+    index_build_workers: int = 2
+    # Where documents and libraries are stored: 'memory' or 'sqlite'
+    repository_backend: str = "memory"
+    # Database file used by the 'sqlite' backend
+    sqlite_path: str = "vector_db.sqlite3"
+    # Directory where the 'sqlite' backend keeps built indexes as
+    # memory-mapped files; unset keeps indexes in memory only
+    index_dir: str | None = None
+    # File the in-memory repositories are snapshotted to; unset disables
+    # snapshots. Not used by the 'sqlite' backend, which is durable already
+    snapshot_path: str | None = None
+    # Seconds between periodic snapshots
+    snapshot_interval_seconds: float = 300.0
+    # Directory of the write-ahead log replayed on top of the snapshot;
+    # only used together with snapshot_path
+    write_ahead_log_dir: str | None = None
+    # fsync each group of log writes; disable to trade durability for speed
+    write_ahead_log_sync: bool = True
+    # Find-similar results kept in the LRU query cache; 0 disables it
+    query_cache_size: int = 1024
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -28,15 +67,91 @@ settings = Settings()
 # repository objects across the application lifetime.
 _document_repository_instance = InMemoryDocumentRepository()
 _library_repository_instance = InMemoryLibraryRepository()
+_index_job_repository_instance = InMemoryIndexJobRepository()
 
+# Index builds run here rather than on the request worker threads
+_index_build_executor = ThreadPoolExecutor(
+    max_workers=settings.index_build_workers, thread_name_prefix="index-build"
+)
+
+_in_memory = settings.repository_backend != "sqlite"
+
+_write_ahead_log_instance = (
+    WriteAheadLog(settings.write_ahead_log_dir, sync=settings.write_ahead_log_sync)
+    if _in_memory and settings.snapshot_path and settings.write_ahead_log_dir
+    else None
+)
 
-def _default_vector_index_factory() -> Callable[[], VectorIndex]:
-    """Return a factory that constructs the chosen VectorIndex implementation."""
+_snapshot_service_instance = (
+    SnapshotService(
+        settings.snapshot_path,
+        _document_repository_instance,
+        _library_repository_instance,
+        interval_seconds=settings.snapshot_interval_seconds,
+        log=_write_ahead_log_instance,
+    )
+    if _in_memory and settings.snapshot_path
+    else None
+)
+
+# Handlers write through the log when it is enabled; snapshots and replay
+# use the in-memory repositories directly
+_document_repository: DocumentRepository = _document_repository_instance
+_library_repository: LibraryRepository = _library_repository_instance
+if not _in_memory:
+    _sqlite_database = SqliteDatabase(settings.sqlite_path)
+    _document_repository = SqliteDocumentRepository(_sqlite_database)
+    _library_repository = SqliteLibraryRepository(
+        _sqlite_database,
+        index_store=IndexFileStore(settings.index_dir) if settings.index_dir else None,
+    )
+elif _write_ahead_log_instance is not None:
+    _document_repository = LoggedDocumentRepository(
+        _document_repository_instance, _write_ahead_log_instance
+    )
+    _library_repository = LoggedLibraryRepository(
+        _library_repository_instance, _write_ahead_log_instance
+    )
+
+
+_query_result_cache_instance = (
+    QueryResultCache(settings.query_cache_size)
+    if settings.query_cache_size > 0
+    else None
+)
+
+
+_VECTOR_INDEX_TYPES: Dict[str, Type[VectorIndex]] = {
+    "brute": BruteForceIndex,
+    "hnsw": HNSWIndex,
+    "ivf": IVFIndex,
+    "kd": KDTreeIndex,
+    "pq": PQIndex,
+}
+
+
+def _default_vector_index_factory() -> Callable[..., VectorIndex]:
+    """Return a factory that constructs the chosen VectorIndex implementation.
+
+    The factory accepts the index's construction parameters as keyword
+    arguments, so each library can tune its own index.
+    """
     print(f"Using vector index type: {settings.vector_index_type}")
-    if settings.vector_index_type == "brute":
-        return lambda: BruteForceIndex()
     # default to KDTree
-    return lambda: KDTreeIndex()
+    index_cls = _VECTOR_INDEX_TYPES.get(settings.vector_index_type, KDTreeIndex)
+
+    def factory(**params: Any) -> VectorIndex:
+        private = [name for name in params if name.startswith("_")]
+        if private:
+            raise InvalidEntityError(f"Unknown index parameters: {private}")
+        try:
+            return index_cls(**params)
+        except TypeError as exc:
+            raise InvalidEntityError(
+                f"Invalid parameters for {index_cls.__name__}: {exc}"
+            ) from exc
+
+    return factory
 
 
 # ---------
@@ -46,15 +161,40 @@ def _default_vector_index_factory() -> Callable[[], VectorIndex]:
 
 def get_document_repository() -> DocumentRepository:
     """DI provider for DocumentRepository"""
-    return _document_repository_instance  # Singleton
+    return _document_repository  # Singleton
 
 
 def get_library_repository() -> LibraryRepository:
     """DI provider for LibraryRepository"""
-    return _library_repository_instance  # Singleton
+    return _library_repository  # Singleton
+
+
+def get_index_job_repository() -> IndexJobRepository:
+    """DI provider for IndexJobRepository"""
+    return _index_job_repository_instance  # Singleton
+
+
+def get_index_build_executor() -> Executor:
+    """DI provider for the executor running background index builds"""
+    return _index_build_executor  # Singleton
+
+
+def get_snapshot_service() -> SnapshotService | None:
+    """DI provider for the snapshot service; None when snapshots are disabled"""
+    return _snapshot_service_instance  # Singleton
+
+
+def get_write_ahead_log() -> WriteAheadLog | None:
+    """DI provider for the write-ahead log; None when it is disabled"""
+    return _write_ahead_log_instance  # Singleton
+
+
+def get_query_result_cache() -> QueryResultCache | None:
+    """DI provider for the find-similar result cache; None when it is disabled"""
+    return _query_result_cache_instance  # Singleton
 
 
-def get_vector_index_factory() -> Callable[[], VectorIndex]:
+def get_vector_index_factory() -> Callable[..., VectorIndex]:
     """DI provider for a VectorIndex factory.
 
     Returns a callable that when called produces a new VectorIndex instance.
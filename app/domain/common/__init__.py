@@ -1,5 +1,7 @@
 from app.domain.common.embedding import Embedding
+from app.domain.common.locks import ReadWriteLock
 
 __all__ = [
     "Embedding",
+    "ReadWriteLock",
 ]
@@ -18,3 +18,29 @@ def refresh_timestamp_after(fn: Callable) -> Callable:
         return result
 
     return wrapper
+
+
+def read_locked(fn: Callable) -> Callable:
+    """Decorator that runs a method under the aggregate's read lock (`_lock`)."""
+
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs) -> Any:
+        with self._lock.read():
+            return fn(self, *args, **kwargs)
+
+    return wrapper
+
+
+def write_locked(fn: Callable) -> Callable:
+    """Decorator that runs a method under the aggregate's write lock (`_lock`).
+
+    Apply it above `refresh_timestamp_after`, so the timestamp is refreshed
+    while the lock is still held.
+    """
+
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs) -> Any:
+        with self._lock.write():
+            return fn(self, *args, **kwargs)
+
+    return wrapper
@@ -1,53 +1,136 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from typing import Any, List
 
 import numpy as np
 
 from app.errors import InvalidEntityError
 
-
-@dataclass(frozen=True)
+# Little-endian float32, the wire format accepted by `Embedding.from_buffer`
+FLOAT32_LE = np.dtype("<f4")
+
+
+def _as_readonly_float32(values: Any) -> np.ndarray:
+    """Return `values` as a read-only 1-D float32 array.
+
+    Float32 arrays and buffer-protocol objects (e.g. `array('f')`,
+    `memoryview`) are wrapped without copying; anything else is converted.
+    """
+    try:
+        array = np.asarray(values)
+    except (TypeError, ValueError) as exc:
+        raise InvalidEntityError("All embedding values must be numeric") from exc
+    if array.dtype.kind not in "biuf":
+        raise InvalidEntityError("All embedding values must be numeric")
+    if array.ndim != 1:
+        raise InvalidEntityError("Embedding must be a one-dimensional vector")
+    if array.dtype != np.float32:
+        array = array.astype(np.float32)
+    elif array.flags.writeable:
+        # A view lets us flip the flag without touching the caller's array
+        array = array.view()
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True, eq=False)
 class Embedding:
-    """Immutable vector representation"""
+    """Immutable vector representation backed by a read-only float32 array.
+
+    The norm is computed once at construction and reused by every
+    similarity computation.
+    """
 
-    values: Tuple[float, ...]
+    values: np.ndarray
+    norm: float = field(init=False, repr=False)
 
     def __post_init__(self):
-        if len(self.values) == 0:
+        array = _as_readonly_float32(self.values)
+        if array.size == 0:
             raise InvalidEntityError("Embedding cannot be empty")
-        if not all(isinstance(v, (int, float)) for v in self.values):
-            raise InvalidEntityError("All embedding values must be numeric")
+        object.__setattr__(self, "values", array)
+        object.__setattr__(self, "norm", float(np.linalg.norm(array)))
 
     @property
     def dimension(self) -> int:
-        return len(self.values)
+        return self.values.shape[0]
+
+    @classmethod
+    def from_list(cls, values: List[float] | np.ndarray) -> Embedding:
+        """Build from a list of floats; arrays are wrapped as they are."""
+        return cls(values)
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | bytearray | memoryview) -> Embedding:
+        """Wrap raw little-endian float32 bytes without copying them."""
+        if len(buffer) % FLOAT32_LE.itemsize:
+            raise InvalidEntityError("Embedding buffer must hold whole float32 values")
+        return cls(
+            np.frombuffer(buffer, dtype=FLOAT32_LE).astype(np.float32, copy=False)
+        )
 
     @classmethod
-    def from_list(cls, values: List[float]) -> Embedding:
-        return cls(tuple(values))
+    def from_block(cls, values: np.ndarray, offsets: np.ndarray) -> List[Embedding]:
+        """Wrap consecutive slices of a flat float32 block as embeddings.
+
+        Embedding i is `values[offsets[i]:offsets[i + 1]]`, a read-only view
+        of the block; all norms are computed in one vectorized pass.
+        """
+        values = _as_readonly_float32(values)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if len(offsets) < 2:
+            return []
+        if (
+            offsets[0] != 0
+            or offsets[-1] != values.size
+            or np.any(np.diff(offsets) <= 0)
+        ):
+            raise InvalidEntityError(
+                "Embedding offsets must split the block into vectors"
+            )
+        lengths = np.diff(offsets)
+        if (lengths == lengths[0]).all():
+            # Equal dimensions: norms without a temporary copy of the block
+            matrix = values.reshape(len(lengths), int(lengths[0]))
+            norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix)).tolist()
+        else:
+            norms = np.sqrt(np.add.reduceat(values * values, offsets[:-1])).tolist()
+        bounds = offsets.tolist()
+        embeddings = []
+        for start, end, norm in zip(bounds, bounds[1:], norms):
+            # The block is already validated, so skip the per-vector checks
+            embedding = object.__new__(cls)
+            object.__setattr__(embedding, "values", values[start:end])
+            object.__setattr__(embedding, "norm", norm)
+            embeddings.append(embedding)
+        return embeddings
+
+    def to_list(self) -> List[float]:
+        """Return the values as plain Python floats."""
+        return self.values.tolist()
 
     def cosine_similarity(self, other: Embedding) -> float:
         if self.dimension != other.dimension:
             raise InvalidEntityError("Embeddings must have same dimension")
 
-        a = np.asarray(self.values, dtype=float)
-        b = np.asarray(other.values, dtype=float)
-
-        dot = float(np.dot(a, b))
-        norm_a = float(np.linalg.norm(a))
-        norm_b = float(np.linalg.norm(b))
-
-        if norm_a == 0 or norm_b == 0:
+        if self.norm == 0 or other.norm == 0:
             return 0.0
-        return dot / (norm_a * norm_b)
+        return float(np.dot(self.values, other.values)) / (self.norm * other.norm)
 
     def euclidean_distance(self, other: Embedding) -> float:
         if self.dimension != other.dimension:
             raise InvalidEntityError("Embeddings must have same dimension")
 
-        a = np.asarray(self.values, dtype=float)
-        b = np.asarray(other.values, dtype=float)
+        return float(np.linalg.norm(self.values - other.values))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Embedding):
+            return NotImplemented
+        return np.array_equal(self.values, other.values)
+
+    def __hash__(self) -> int:
+        return hash(self.values.tobytes())
 
-        return float(np.linalg.norm(a - b))
+    def __len__(self) -> int:
+        return self.dimension
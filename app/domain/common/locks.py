@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """Lets many threads read at once, or a single thread write.
+
+    Waiting writers hold back new readers, so a steady stream of searches
+    cannot starve a mutation. The writing thread may take the lock again,
+    for reading or writing; a reading thread may read again, but cannot
+    upgrade to writing.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._waiting_writers = 0
+        self._writer: int | None = None
+        self._writes = 0
+        # Per-thread read depth, so nested reads never queue behind a writer
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def acquire_read(self) -> None:
+        local = self._local
+        depth = getattr(local, "reads", 0)
+        if depth == 0:
+            # The writer reads under its own write lock
+            local.shared = self._writer != threading.get_ident()
+            if local.shared:
+                with self._condition:
+                    while self._writer is not None or self._waiting_writers:
+                        self._condition.wait()
+                    self._readers += 1
+        local.reads = depth + 1
+
+    def release_read(self) -> None:
+        local = self._local
+        local.reads -= 1
+        if local.reads == 0 and local.shared:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writes += 1
+            return
+        if getattr(self._local, "reads", 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writes = 1
+
+    def release_write(self) -> None:
+        self._writes -= 1
+        if self._writes == 0:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
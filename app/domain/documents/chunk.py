@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, TypedDict
+from typing import Any, Dict, List, NotRequired, TypedDict
+
+import numpy as np
 
 from app.domain.common.decorators import refresh_timestamp_after
 from app.domain.common.embedding import Embedding
@@ -20,8 +22,8 @@ class ChunkMetadataDict(TypedDict):
 
 class ChunkDict(TypedDict):
     chunk_id: str
-    text: str
-    embedding: List[float]
+    text: NotRequired[str]
+    embedding: NotRequired[List[float]]
     metadata: ChunkMetadataDict
 
 
@@ -46,7 +48,7 @@ class Chunk:
     def update(
         self,
         text: str | None = None,
-        embedding: list | None = None,
+        embedding: list | np.ndarray | None = None,
         metadata: dict | None = None,
     ) -> None:
         """Update this chunk's fields using domain-validated methods.
@@ -75,17 +77,23 @@ class Chunk:
         """
         self.metadata = self.metadata.updated()
 
-    def to_dict(self) -> ChunkDict:
-        """Serialize chunk to a dictionary with primitive types."""
-        return {
-            "chunk_id": str(self.id),
-            "text": self.text,
-            "embedding": list(self.embedding.values),
-            "metadata": {
-                "source": self.metadata.source,
-                "page_number": self.metadata.page_number,
-                "created_at": self.metadata.created_at.isoformat(),
-                "updated_at": self.metadata.updated_at.isoformat(),
-                "custom_fields": dict(self.metadata.custom_fields),
-            },
+    def to_dict(
+        self, include_text: bool = True, include_embedding: bool = True
+    ) -> ChunkDict:
+        """Serialize chunk to a dictionary with primitive types.
+
+        Excluded fields are left out rather than converted.
+        """
+        data: ChunkDict = {"chunk_id": str(self.id)}
+        if include_text:
+            data["text"] = self.text
+        if include_embedding:
+            data["embedding"] = self.embedding.to_list()
+        data["metadata"] = {
+            "source": self.metadata.source,
+            "page_number": self.metadata.page_number,
+            "created_at": self.metadata.created_at.isoformat(),
+            "updated_at": self.metadata.updated_at.isoformat(),
+            "custom_fields": dict(self.metadata.custom_fields),
         }
+        return data
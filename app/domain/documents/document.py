@@ -1,59 +1,129 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
-
-from app.domain.common.decorators import refresh_timestamp_after
+import bisect
+import operator
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, ValuesView
+
+import numpy as np
+
+from app.domain.common.decorators import (
+    read_locked,
+    refresh_timestamp_after,
+    write_locked,
+)
+from app.domain.common.locks import ReadWriteLock
 from app.domain.documents.chunk import Chunk
 from app.domain.documents.chunk_id import ChunkId
 from app.domain.documents.document_id import DocumentId
 from app.domain.documents.document_metadata import DocumentMetadata
 from app.errors import InvalidEntityError, NotFoundError
 
+# Kinds of chunk change recorded in a document's change log
+_ADDED, _UPDATED, _REMOVED = range(3)
+
+# Chunk changes kept for repositories at least, however small the document
+_CHANGE_LOG_MIN = 1024
+
 
-@dataclass
+@dataclass(init=False)
 class Document:
-    """Document entity - collection of chunks"""
+    """Document entity - collection of chunks
+
+    Chunks are kept in an insertion-ordered dict keyed by id, so adding,
+    finding, updating and removing a chunk take constant time while
+    `chunks` still lists them in document order.
+
+    Mutations take the document's write lock; hold `lock.read()` to read
+    several chunks consistently.
+
+    Chunk changes are also logged, so repositories can store just the
+    chunks changed since they last saved the document.
+    """
 
     id: DocumentId
-    chunks: List[Chunk]
     metadata: DocumentMetadata
-
-    def __post_init__(self):
+    _chunks: Dict[ChunkId, Chunk]
+    _lock: ReadWriteLock = field(repr=False, compare=False)
+    # Bumped whenever a chunk is added, updated or removed
+    _chunks_version: int = field(repr=False, compare=False)
+    # Chunk changes with the _chunks_version they were made at, covering
+    # the changes made after _change_log_start
+    _change_log: List[Tuple[int, ChunkId, int]] = field(repr=False, compare=False)
+    _change_log_start: int = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        id: DocumentId,
+        chunks: List[Chunk] | None,
+        metadata: DocumentMetadata,
+    ):
+        self.id = id
+        self.metadata = metadata
+        self._lock = ReadWriteLock()
+        self._chunks_version = 0
         # Documents are allowed to start with zero chunks. Chunks can be
         # added later via application commands (e.g. AddChunk).
-        if self.chunks is None:
-            self.chunks = []
+        self.chunks = chunks or []
 
+    @property
+    def chunks(self) -> List[Chunk]:
+        """The chunks in document order, as a new list."""
+        return list(self._chunks.values())
+
+    @chunks.setter
+    def chunks(self, chunks: List[Chunk]) -> None:
+        by_id = {c.id: c for c in chunks}
+        if len(by_id) != len(chunks):
+            raise InvalidEntityError("Chunk ids must be unique within a document")
+        self._chunks = by_id
+        self._chunks_version += 1
+        self._change_log = []
+        self._change_log_start = self._chunks_version
+
+    @property
+    def chunks_view(self) -> ValuesView[Chunk]:
+        """Live read-only view of the chunks in document order.
+
+        Hold `lock.read()` while using it; unlike `chunks`, nothing is copied.
+        """
+        return self._chunks.values()
+
+    @write_locked
     @refresh_timestamp_after
     def add_chunk(self, chunk: Chunk) -> None:
-        if any(c.id == chunk.id for c in self.chunks):
+        if chunk.id in self._chunks:
             raise InvalidEntityError(f"Chunk {chunk.id} already exists in document")
-        self.chunks.append(chunk)
+        self._chunks[chunk.id] = chunk
+        self._log_change(chunk.id, _ADDED)
 
+    @write_locked
     @refresh_timestamp_after
     def remove_chunk(self, chunk_id: ChunkId) -> None:
-        self.chunks = [c for c in self.chunks if c.id != chunk_id]
+        if self._chunks.pop(chunk_id, None) is not None:
+            self._log_change(chunk_id, _REMOVED)
 
+    @write_locked
     @refresh_timestamp_after
     def update_chunk(
         self,
         chunk_id: ChunkId,
         *,
         text: str | None = None,
-        embedding: list | None = None,
+        embedding: list | np.ndarray | None = None,
         metadata: dict | None = None,
     ) -> None:
         """Find the chunk by id and delegate update to the Chunk entity.
 
         Raises NotFoundError if chunk not found.
         """
-        for c in self.chunks:
-            if c.id == chunk_id:
-                c.update(text=text, embedding=embedding, metadata=metadata)
-                return
-        raise NotFoundError(f"Chunk {chunk_id} not found in document {self.id}")
+        chunk = self._chunks.get(chunk_id)
+        if chunk is None:
+            raise NotFoundError(f"Chunk {chunk_id} not found in document {self.id}")
+        chunk.update(text=text, embedding=embedding, metadata=metadata)
+        self._log_change(chunk_id, _UPDATED)
 
+    @write_locked
     def update_metadata(
         self,
         *,
@@ -73,20 +143,74 @@ class Document:
         """Refresh this document's metadata updated_at timestamp."""
         self.metadata = self.metadata.updated()
 
+    @property
+    def lock(self) -> ReadWriteLock:
+        return self._lock
+
+    @property
+    def chunks_version(self) -> int:
+        """Changes whenever a chunk is added, updated or removed."""
+        return self._chunks_version
+
+    @read_locked
+    def chunk_changes_since(
+        self, version: int
+    ) -> Tuple[List[Chunk], List[ChunkId]] | None:
+        """Return the chunks changed and the ids removed after
+        `chunks_version` was `version`, or None when changes that old are no
+        longer kept.
+
+        Chunks added since are listed after the others, in document order.
+        A chunk removed and added again is in both lists, as it moved to
+        the end; apply the removals first.
+        """
+        if not self._change_log_start <= version <= self._chunks_version:
+            return None
+        start = bisect.bisect_right(
+            self._change_log, version, key=operator.itemgetter(0)
+        )
+        # Per chunk: whether it existed before, and the log entry of its
+        # latest addition (-1 if none)
+        changes: Dict[ChunkId, Tuple[bool, int]] = {}
+        for entry, (_, chunk_id, kind) in enumerate(self._change_log[start:]):
+            existed, added_at = changes.get(chunk_id, (kind != _ADDED, -1))
+            changes[chunk_id] = (existed, entry if kind == _ADDED else added_at)
+        changed = sorted(
+            (c for c in changes if c in self._chunks), key=lambda c: changes[c][1]
+        )
+        removed = [
+            c
+            for c, (existed, added_at) in changes.items()
+            if existed and (added_at >= 0 or c not in self._chunks)
+        ]
+        return [self._chunks[c] for c in changed], removed
+
+    def _log_change(self, chunk_id: ChunkId, kind: int) -> None:
+        self._chunks_version += 1
+        log = self._change_log
+        log.append((self._chunks_version, chunk_id, kind))
+        if len(log) > max(_CHANGE_LOG_MIN, 2 * len(self._chunks)):
+            # Every change has its own version, so any cut is clean
+            cut = len(log) // 2
+            self._change_log_start = log[cut - 1][0]
+            del log[:cut]
+
     @property
     def chunk_count(self) -> int:
-        return len(self.chunks)
+        return len(self._chunks)
 
+    @read_locked
     def contains_chunk(self, chunk_id: ChunkId) -> bool:
         """Return True if this document contains a chunk with the given id."""
-        return any(c.id == chunk_id for c in self.chunks)
+        return chunk_id in self._chunks
 
+    @read_locked
     def get_chunk(self, chunk_id: ChunkId) -> Chunk:
         """Return the chunk with the given id.
 
         Raises InvalidEntityError if chunk not found.
         """
-        for c in self.chunks:
-            if c.id == chunk_id:
-                return c
-        raise NotFoundError(f"Chunk {chunk_id} not found in document {self.id}")
+        chunk = self._chunks.get(chunk_id)
+        if chunk is None:
+            raise NotFoundError(f"Chunk {chunk_id} not found in document {self.id}")
+        return chunk
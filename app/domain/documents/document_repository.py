@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from app.domain.documents.document import Document
 from app.domain.documents.document_id import DocumentId
@@ -18,6 +18,23 @@ class DocumentRepository(ABC):
     def find_by_id(self, document_id: DocumentId) -> Optional[Document]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def find_all(self) -> List[Document]:
+        raise NotImplementedError()
+
+    def find_by_ids(self, document_ids: Iterable[DocumentId]) -> List[Document]:
+        """Return the documents that exist among `document_ids`, in that order.
+
+        Backends that can fetch many documents in one round trip override this.
+        """
+        documents = (self.find_by_id(document_id) for document_id in document_ids)
+        return [document for document in documents if document is not None]
+
+    def save_many(self, documents: Iterable[Document]) -> None:
+        """Save several documents; backends may do so in a single transaction."""
+        for document in documents:
+            self.save(document)
+
     @abstractmethod
     def delete(self, document_id: DocumentId) -> None:
         raise NotImplementedError()
@@ -1,8 +1,14 @@
 """Library aggregate public API."""
 
+from app.domain.libraries.distance_metric import DistanceMetric
+from app.domain.libraries.index_job import IndexJob, IndexJobId, IndexJobStatus
+from app.domain.libraries.index_job_repository import IndexJobRepository
 from app.domain.libraries.indexed_chunk import IndexedChunk
 from app.domain.libraries.indexes.brute_force_index import BruteForceIndex
+from app.domain.libraries.indexes.hnsw_index import HNSWIndex
+from app.domain.libraries.indexes.ivf_index import IVFIndex
 from app.domain.libraries.indexes.kd_tree_index import KDTreeIndex
+from app.domain.libraries.indexes.pq_index import PQIndex
 from app.domain.libraries.library import Library
 from app.domain.libraries.library_id import LibraryId
 from app.domain.libraries.library_indexer_service import LibraryIndexerService
@@ -11,7 +17,12 @@ from app.domain.libraries.library_repository import LibraryRepository
 from app.domain.libraries.vector_index import VectorIndex
 
 __all__ = [
+    "DistanceMetric",
     "IndexedChunk",
+    "IndexJob",
+    "IndexJobId",
+    "IndexJobRepository",
+    "IndexJobStatus",
     "Library",
     "LibraryId",
     "LibraryMetadata",
@@ -19,5 +30,8 @@ __all__ = [
     "VectorIndex",
     "LibraryIndexerService",
     "BruteForceIndex",
+    "HNSWIndex",
+    "IVFIndex",
     "KDTreeIndex",
+    "PQIndex",
 ]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import math
+from enum import Enum
+
+import numpy as np
+
+from app.domain.common.embedding import Embedding
+from app.errors import InvalidEntityError
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length in place; zero rows are left as zeros."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return positions of the k highest scores, best first.
+
+    Ties keep their original order, so results stay deterministic.
+    """
+    if k < scores.size:
+        candidates = np.sort(np.argpartition(-scores, k - 1)[:k])
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class DistanceMetric(str, Enum):
+    """How a library compares embeddings.
+
+    Every metric is exposed as a similarity where higher is better:
+    - cosine: cosine similarity in [-1, 1]
+    - dot: raw inner product
+    - l2: 1 / (1 + euclidean distance), in (0, 1]
+
+    Indexes rank chunks with `scores`, computed over rows passed through
+    `prepare`. Scores preserve the similarity order but are cheaper to
+    compute (e.g. negative squared distances for l2).
+    """
+
+    COSINE = "cosine"
+    DOT = "dot"
+    L2 = "l2"
+
+    @classmethod
+    def parse(cls, value: DistanceMetric | str) -> DistanceMetric:
+        try:
+            return cls(value)
+        except ValueError as exc:
+            options = ", ".join(m.value for m in cls)
+            raise InvalidEntityError(
+                f"Unknown distance metric '{value}'. Use one of: {options}"
+            ) from exc
+
+    def similarity(self, a: Embedding, b: Embedding) -> float:
+        """Exact similarity between two embeddings under this metric."""
+        if self is DistanceMetric.COSINE:
+            return a.cosine_similarity(b)
+        if self is DistanceMetric.DOT:
+            if a.dimension != b.dimension:
+                raise InvalidEntityError("Embeddings must have same dimension")
+            return float(np.dot(a.values, b.values))
+        return 1.0 / (1.0 + a.euclidean_distance(b))
+
+    def prepare(self, matrix: np.ndarray) -> np.ndarray:
+        """Return `matrix` as float32 rows ready to be passed to `scores`.
+
+        Cosine rows are normalized to unit length so cosine similarity
+        becomes an inner product; the input is never modified.
+        """
+        prepared = np.array(matrix, dtype=np.float32)
+        if self is DistanceMetric.COSINE:
+            normalize_rows(prepared)
+        return prepared
+
+    def scores(self, queries: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        """Score prepared query row(s) against prepared vectors.
+
+        Returns an array of shape `queries.shape[:-1] + (len(vectors),)`.
+        """
+        products = queries @ vectors.T
+        if self is not DistanceMetric.L2:
+            return products
+        # -||q - v||^2 = 2 q.v - ||v||^2 - ||q||^2
+        vector_norms = np.einsum("ij,ij->i", vectors, vectors)
+        query_norms = np.einsum("...j,...j->...", queries, queries)
+        return 2 * products - vector_norms - np.expand_dims(query_norms, -1)
+
+    def score_threshold(self, min_similarity: float | None) -> float:
+        """Map a similarity threshold to the matching `scores` threshold.
+
+        The result is relaxed slightly so float32 rounding never prunes a
+        chunk whose exact similarity reaches the threshold.
+        """
+        if min_similarity is None:
+            return -math.inf
+        if self is DistanceMetric.L2:
+            if min_similarity <= 0:
+                return -math.inf
+            threshold = -((1.0 / min_similarity - 1.0) ** 2)
+        else:
+            threshold = min_similarity
+        return threshold - 1e-5 * max(1.0, abs(threshold))
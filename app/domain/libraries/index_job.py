@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from uuid import UUID, uuid4
+
+from app.domain.libraries.library_id import LibraryId
+from app.errors import InvalidEntityError
+
+
+class IndexJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class IndexJobId:
+    value: UUID
+
+    @classmethod
+    def generate(cls) -> "IndexJobId":
+        return cls(uuid4())
+
+    @classmethod
+    def from_string(cls, id_str: str) -> "IndexJobId":
+        try:
+            return cls(UUID(id_str))
+        except (ValueError, TypeError) as exc:
+            raise InvalidEntityError(f"Invalid index job id: {id_str}") from exc
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+@dataclass
+class IndexJob:
+    """A background build of a library's vector index.
+
+    Jobs move from pending to running to either succeeded or failed; a
+    failed job keeps the error that stopped it.
+    """
+
+    id: IndexJobId
+    library_id: LibraryId
+    status: IndexJobStatus = IndexJobStatus.PENDING
+    error: str | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    def start(self) -> None:
+        self.status = IndexJobStatus.RUNNING
+        self.started_at = datetime.now(timezone.utc)
+
+    def succeed(self) -> None:
+        self.status = IndexJobStatus.SUCCEEDED
+        self.finished_at = datetime.now(timezone.utc)
+
+    def fail(self, error: str) -> None:
+        self.status = IndexJobStatus.FAILED
+        self.error = error
+        self.finished_at = datetime.now(timezone.utc)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (IndexJobStatus.SUCCEEDED, IndexJobStatus.FAILED)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+from app.domain.libraries.index_job import IndexJob, IndexJobId
+
+
+class IndexJobRepository(ABC):
+    """Repository contract for background index build jobs"""
+
+    @abstractmethod
+    def save(self, job: IndexJob) -> None:
+        """Save or update job"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def find_by_id(self, job_id: IndexJobId) -> IndexJob | None:
+        """Find job by ID"""
+        raise NotImplementedError()
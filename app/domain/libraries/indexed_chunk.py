@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, TypedDict
+from typing import Any, Dict, List, NotRequired, TypedDict
 
 from app.domain.common.embedding import Embedding
 from app.domain.documents.chunk_id import ChunkId
@@ -20,8 +20,8 @@ class ChunkMetadataDict(TypedDict):
 class IndexedChunkDict(TypedDict):
     chunk_id: str
     document_id: str
-    text: str
-    embedding: List[float]
+    text: NotRequired[str]
+    embedding: NotRequired[List[float]]
     metadata: ChunkMetadataDict
 
 
@@ -32,7 +32,9 @@ class IndexedChunk:
     id: ChunkId
     document_id: DocumentId
     text: str
-    embedding: Embedding
+    # None in the rows of indexes that keep only codes (PQIndex); chunks
+    # handed out by an index always carry one
+    embedding: Embedding | None
     metadata: ChunkMetadata | None = None
 
     def similarity(self, other: Embedding) -> float:
@@ -50,26 +52,30 @@ class IndexedChunk:
     def dimension(self) -> int:
         return self.embedding.dimension
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    def to_dict(
+        self, include_text: bool = True, include_embedding: bool = True
+    ) -> Dict[str, Any]:
+        """Serialize to primitives; excluded fields are left out, not converted."""
+        data: Dict[str, Any] = {
             "chunk_id": str(self.id),
             "document_id": str(self.document_id),
-            "text": self.text,
-            "embedding": list(self.embedding.values),
-            "metadata": {
-                "source": self.metadata.source if self.metadata else None,
-                "page_number": self.metadata.page_number if self.metadata else None,
-                "created_at": self.metadata.created_at.isoformat()
-                if self.metadata
-                else None,
-                "updated_at": self.metadata.updated_at.isoformat()
-                if self.metadata
-                else None,
-                "custom_fields": dict(self.metadata.custom_fields)
-                if self.metadata
-                else {},
-            },
         }
+        if include_text:
+            data["text"] = self.text
+        if include_embedding:
+            data["embedding"] = self.embedding.to_list()
+        data["metadata"] = {
+            "source": self.metadata.source if self.metadata else None,
+            "page_number": self.metadata.page_number if self.metadata else None,
+            "created_at": self.metadata.created_at.isoformat()
+            if self.metadata
+            else None,
+            "updated_at": self.metadata.updated_at.isoformat()
+            if self.metadata
+            else None,
+            "custom_fields": dict(self.metadata.custom_fields) if self.metadata else {},
+        }
+        return data
 
     @classmethod
     def from_chunk(cls, chunk, document_id: DocumentId) -> "IndexedChunk":
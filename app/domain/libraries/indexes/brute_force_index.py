@@ -1,10 +1,13 @@
-import heapq
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
 
 from app.domain.common import Embedding
 from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.libraries.distance_metric import top_k
 from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.domain.libraries.indexes.metadata_index import MetadataIndex
 from app.domain.libraries.vector_index import VectorIndex
 from app.errors import IndexNotBuiltError, InvalidEntityError
 
@@ -14,16 +17,23 @@ class BruteForceIndex(VectorIndex):
     """
     Brute-force k-NN vector index implementation
 
+    Embeddings are packed into a single contiguous float32 matrix prepared
+    for the index's metric (rows are pre-normalized for cosine), so scoring
+    every chunk is one matrix-vector product.
+
     Time Complexity:
-    - Build: O(1) - just stores the references
+    - Build: O(n * d) - copies (and normalizes) all embeddings once
     - Search: O(n * d) where n is number of chunks and d is embedding dimension
 
-    Space Complexity: O(n) - stores all chunks in memory
+    Space Complexity: O(n * d) - one float32 row per chunk
 
-    Use case: Suitable for small datasets or testing purposes.
+    Use case: Exact results for any dimensionality; fast enough for libraries
+    with hundreds of thousands of chunks.
     """
 
-    _chunks: List[IndexedChunk] = field(init=False, default_factory=list)
+    _matrix: np.ndarray | None = field(init=False, default=None, repr=False)
+    # Capacity-grown storage behind _matrix, so adds are amortized O(d)
+    _buffer: np.ndarray | None = field(init=False, default=None, repr=False)
 
     def build(self, chunks: List[IndexedChunk]) -> None:
         if not chunks:
@@ -36,11 +46,113 @@ class BruteForceIndex(VectorIndex):
                 "All chunks must have the same embedding dimension"
             )
 
-        self._chunks = chunks
+        self._buffer = self._matrix = self.metric.prepare(
+            np.stack([chunk.embedding.values for chunk in chunks])
+        )
+        self._metadata = MetadataIndex.build(chunks)
+        self._chunks = list(chunks)
+
+    def export_state(self) -> Tuple[List[IndexedChunk], Dict[str, Any]]:
+        chunks, state = super().export_state()
+        # Spare capacity is not saved; _matrix covers every row
+        del state["_buffer"]
+        return chunks, state
+
+    def restore_state(self, chunks: List[IndexedChunk], state: Dict[str, Any]) -> None:
+        super().restore_state(chunks, state)
+        self._buffer = self._matrix
+
+    def add(self, chunks: List[IndexedChunk]) -> None:
+        """Append chunks to the matrix; existing rows are left untouched."""
+        if not chunks:
+            return
+        if self._matrix is None:
+            self.build(chunks)
+            return
+        if any(chunk.dimension != self._matrix.shape[1] for chunk in chunks):
+            raise InvalidEntityError(
+                "All chunks must have the same embedding dimension"
+            )
+
+        rows = self.metric.prepare(
+            np.stack([chunk.embedding.values for chunk in chunks])
+        )
+        start, size = len(self._chunks), len(self._chunks) + len(chunks)
+        if size > len(self._buffer):
+            grown = np.empty(
+                (max(size, 2 * len(self._buffer)), rows.shape[1]), np.float32
+            )
+            grown[:start] = self._matrix
+            self._buffer = grown
+        self._buffer[start:size] = rows
+        self._matrix = self._buffer[:size]
+        self._metadata.extend(chunks)
+        self._chunks.extend(chunks)
+        self._compact_if_needed()
 
     def search(
-        self, query: Embedding, k: int, filters: ChunkMetadataFilterDict | None = None
+        self,
+        query: Embedding,
+        k: int,
+        filters: ChunkMetadataFilterDict | None = None,
+        min_similarity: float | None = None,
     ) -> List[IndexedChunk]:
+        self._check_searchable(k)
+        q = self._query_matrix([query])[0]
+
+        # Apply filters (and tombstones) first so only matching rows are scored
+        rows = self._filter_rows(filters)
+        if rows is None:
+            scores = self.metric.scores(q, self._matrix)
+        elif rows.size == 0:
+            return []
+        elif rows.size * 4 < len(self._chunks):
+            scores = self.metric.scores(q, self._matrix[rows])
+        else:
+            # Most rows match: scoring in place beats copying them out
+            scores = self.metric.scores(q, self._matrix)[rows]
+        return self._select(scores, k, rows, min_similarity)
+
+    def search_batch(
+        self,
+        queries: List[Embedding],
+        ks: List[int],
+        filters: List[ChunkMetadataFilterDict | None] | None = None,
+        search_params: List[Dict[str, Any] | None] | None = None,
+        min_similarities: List[float | None] | None = None,
+    ) -> List[List[IndexedChunk]]:
+        """Score every query against every chunk with one matrix-matrix product."""
+        if len(ks) != len(queries):
+            raise InvalidEntityError("A k value is required for every query")
+        if filters is None:
+            filters = [None] * len(queries)
+        elif len(filters) != len(queries):
+            raise InvalidEntityError("Filters must be given for every query")
+        if min_similarities is None:
+            min_similarities = [None] * len(queries)
+        elif len(min_similarities) != len(queries):
+            raise InvalidEntityError("Thresholds must be given for every query")
+        if not queries:
+            return []
+        for k in ks:
+            self._check_searchable(k)
+
+        scores = self.metric.scores(self._query_matrix(queries), self._matrix)
+
+        results: List[List[IndexedChunk]] = []
+        for row_scores, k, query_filters, min_similarity in zip(
+            scores, ks, filters, min_similarities
+        ):
+            rows = self._filter_rows(query_filters)
+            if rows is None:
+                results.append(self._select(row_scores, k, None, min_similarity))
+            elif rows.size == 0:
+                results.append([])
+            else:
+                results.append(self._select(row_scores[rows], k, rows, min_similarity))
+        return results
+
+    def _check_searchable(self, k: int) -> None:
         if not self._chunks:
             raise IndexNotBuiltError(
                 "Index is empty. Build the index before searching."
@@ -49,32 +161,40 @@ class BruteForceIndex(VectorIndex):
         if k <= 0:
             raise InvalidEntityError("k must be a positive integer")
 
-        # Apply filters first
-        candidates = self._chunks
-        if filters:
-            candidates = [c for c in candidates if c.matches_filter(filters)]
-
-        if not candidates:
-            return []
-
-        # Compute similarity for all chunks.
-        # Use an index as a tie-breaker so the heap never needs to
-        # compare Chunk instances directly when similarities are equal.
-        similarities: List[tuple[float, int, IndexedChunk]] = []
-        for idx, chunk in enumerate(candidates):
-            similarity = chunk.similarity(query)
-            # Use negative similarity for min-heap (to get max values).
-            # Tuple layout: ( -similarity, index, chunk )
-            heapq.heappush(similarities, (-similarity, idx, chunk))
-
-        # Get top-k chunks
-        top_k = heapq.nsmallest(min(k, len(similarities)), similarities)
-        return [chunk for _, _, chunk in top_k]
+    def _query_matrix(self, queries: List[Embedding]) -> np.ndarray:
+        """Stack the queries into a float32 matrix prepared for the metric."""
+        if any(q.dimension != self._matrix.shape[1] for q in queries):
+            raise InvalidEntityError("Embeddings must have same dimension")
+        return self.metric.prepare(np.stack([q.values for q in queries]))
+
+    def _filter_rows(
+        self, filters: ChunkMetadataFilterDict | None
+    ) -> np.ndarray | None:
+        """Return the row positions matching the filters, or None when unfiltered."""
+        return self._metadata.rows(filters)
+
+    def _select(
+        self,
+        scores: np.ndarray,
+        k: int,
+        rows: np.ndarray | None,
+        min_similarity: float | None = None,
+    ) -> List[IndexedChunk]:
+        if min_similarity is not None:
+            # Drop chunks below the threshold before taking the top k
+            passing = np.flatnonzero(
+                scores >= self.metric.score_threshold(min_similarity)
+            )
+            scores = scores[passing]
+            rows = passing if rows is None else rows[passing]
+        top = top_k(scores, k)
+        if rows is not None:
+            top = rows[top]
+        return [self._chunks[i] for i in top]
 
     def clear(self) -> None:
         """Clear the index"""
         self._chunks = []
-
-    def get_chunks(self) -> List[IndexedChunk]:
-        """Return the chunks stored in the index."""
-        return list(self._chunks)
+        self._matrix = None
+        self._buffer = None
+        self._metadata = None
@@ -0,0 +1,335 @@
+import heapq
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, FrozenSet, List, Tuple
+
+import numpy as np
+
+from app.domain.common import Embedding
+from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.domain.libraries.indexes.metadata_index import MetadataIndex
+from app.domain.libraries.vector_index import VectorIndex
+from app.errors import IndexNotBuiltError, InvalidEntityError
+
+
+@dataclass
+class HNSWIndex(VectorIndex):
+    """
+    Hierarchical Navigable Small World graph for approximate k-NN search.
+
+    Every chunk becomes a node in a stack of proximity graphs, linked by the
+    index's metric. Upper layers
+    are sparse and used to descend quickly towards the query; the bottom
+    layer holds every node and is explored with a bounded best-first search.
+
+    Parameters:
+    - m: links kept per node on upper layers (2 * m on the bottom layer)
+    - ef_construction: candidate list size used while inserting
+    - ef_search: default candidate list size used while searching; can be
+      overridden per query through the `ef_search` search parameter
+
+    Time Complexity:
+    - Build: O(n log n) expected
+    - Search: O(log n) expected
+
+    Space Complexity: O(n * (d + m))
+
+    Use case: Large, high-dimensional libraries where approximate results
+    with high recall are acceptable. Supports incremental inserts.
+    """
+
+    supported_search_params: ClassVar[FrozenSet[str]] = frozenset({"ef_search"})
+
+    m: int = 16
+    ef_construction: int = 200
+    ef_search: int = 50
+    seed: int | None = None
+
+    _vectors: np.ndarray = field(
+        init=False, default_factory=lambda: np.empty((0, 0), np.float32), repr=False
+    )
+    # _links[node][level] lists the neighbours of `node` on `level`
+    _links: List[List[List[int]]] = field(init=False, default_factory=list, repr=False)
+    _entry_point: int | None = field(init=False, default=None)
+    _max_level: int = field(init=False, default=-1)
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.m < 2:
+            raise InvalidEntityError("m must be at least 2")
+        if self.ef_construction < 1 or self.ef_search < 1:
+            raise InvalidEntityError("ef_construction and ef_search must be positive")
+        self._rng = random.Random(self.seed)
+
+    def build(self, chunks: List[IndexedChunk]) -> None:
+        if not chunks:
+            raise InvalidEntityError("No chunks provided for indexing")
+
+        self.clear()
+        self.add(chunks)
+
+    def add(self, chunks: List[IndexedChunk]) -> None:
+        """Insert chunks into the graph without rebuilding it.
+
+        Chunks already in the graph are tombstoned and inserted again.
+        """
+        if not chunks:
+            return
+
+        # Validate all embeddings have the same dimension
+        dimensions = {chunk.dimension for chunk in chunks}
+        if self._chunks:
+            dimensions.add(self._vectors.shape[1])
+        if len(dimensions) != 1:
+            raise InvalidEntityError(
+                "All chunks must have the same embedding dimension"
+            )
+
+        start = len(self._chunks)
+        self._reserve(start + len(chunks), dimensions.pop())
+        self._vectors[start : start + len(chunks)] = self.metric.prepare(
+            np.stack([c.embedding.values for c in chunks])
+        )
+
+        if self._metadata is None:
+            self._metadata = MetadataIndex()
+        self._metadata.extend(chunks)
+        for offset, chunk in enumerate(chunks):
+            self._chunks.append(chunk)
+            self._insert(start + offset)
+        self._compact_if_needed()
+
+    def search(
+        self,
+        query: Embedding,
+        k: int,
+        filters: ChunkMetadataFilterDict | None = None,
+        min_similarity: float | None = None,
+        ef_search: int | None = None,
+    ) -> List[IndexedChunk]:
+        if self._entry_point is None:
+            raise IndexNotBuiltError(
+                "Index is empty. Build the index before searching."
+            )
+
+        if k <= 0:
+            raise InvalidEntityError("k must be a positive integer")
+        if ef_search is not None and ef_search <= 0:
+            raise InvalidEntityError("ef_search must be a positive integer")
+        if query.dimension != self._vectors.shape[1]:
+            raise InvalidEntityError("Embeddings must have same dimension")
+
+        q = self.metric.prepare(query.values[None])[0]
+        threshold = self.metric.score_threshold(min_similarity)
+
+        # Filtered-out and removed nodes still route the traversal but are
+        # never returned
+        allowed: np.ndarray | None = None
+        matching = self._metadata.rows(filters)
+        if matching is not None:
+            if matching.size == 0:
+                return []
+            # Very selective filters leave the graph too sparse to navigate;
+            # scoring the few matching rows directly is both exact and cheaper.
+            if matching.size <= max(k, self.ef_search) * 4:
+                scores = self._scores(matching, q)
+                order = np.argsort(-scores, kind="stable")[:k]
+                order = order[scores[order] >= threshold]
+                return [self._chunks[i] for i in matching[order]]
+            allowed = np.zeros(len(self._chunks), dtype=bool)
+            allowed[matching] = True
+
+        ef = max(ef_search or self.ef_search, k)
+        entry = self._descend(q, self._entry_point, self._max_level, 1)
+        found = self._search_layer(q, [entry], ef, 0, allowed)
+        # The candidate list is ranked, so the threshold cuts a prefix
+        return [self._chunks[node] for score, node in found[:k] if score >= threshold]
+
+    def clear(self) -> None:
+        """Clear the index"""
+        self._chunks = []
+        self._metadata = None
+        self._vectors = np.empty((0, 0), np.float32)
+        self._links = []
+        self._entry_point = None
+        self._max_level = -1
+
+    def export_state(self) -> Tuple[List[IndexedChunk], Dict[str, Any]]:
+        """Export the graph with its adjacency lists flattened into arrays.
+
+        The level generator is not saved; a restored index draws levels for
+        new nodes from a fresh generator.
+        """
+        chunks, state = super().export_state()
+        del state["_rng"]
+        links = state.pop("_links")
+        state["_vectors"] = self._vectors[: len(chunks)]
+        state["link_levels"] = np.fromiter(
+            (len(levels) for levels in links), np.intp, len(links)
+        )
+        state["link_counts"] = np.fromiter(
+            (len(level) for levels in links for level in levels), np.intp
+        )
+        state["link_targets"] = np.fromiter(
+            (node for levels in links for level in levels for node in level), np.intp
+        )
+        return chunks, state
+
+    def restore_state(self, chunks: List[IndexedChunk], state: Dict[str, Any]) -> None:
+        state = dict(state)
+        levels = state.pop("link_levels").tolist()
+        counts = state.pop("link_counts").tolist()
+        targets = state.pop("link_targets").tolist()
+        super().restore_state(chunks, state)
+
+        self._links = []
+        cursor = position = 0
+        for n_levels in levels:
+            node_links = []
+            for count in counts[cursor : cursor + n_levels]:
+                node_links.append(targets[position : position + count])
+                position += count
+            cursor += n_levels
+            self._links.append(node_links)
+
+    # -- graph construction -------------------------------------------------
+
+    def _reserve(self, size: int, dimension: int) -> None:
+        """Grow the vector buffer geometrically so inserts stay amortized O(d)."""
+        capacity = self._vectors.shape[0]
+        if self._vectors.shape[1] == dimension and capacity >= size:
+            return
+        grown = np.empty((max(size, capacity * 2, 16), dimension), np.float32)
+        if self._chunks:
+            grown[: len(self._chunks)] = self._vectors[: len(self._chunks)]
+        self._vectors = grown
+
+    def _random_level(self) -> int:
+        return int(-math.log(1.0 - self._rng.random()) / math.log(self.m))
+
+    def _insert(self, node: int) -> None:
+        level = self._random_level()
+        self._links.append([[] for _ in range(level + 1)])
+        if self._entry_point is None:
+            self._entry_point, self._max_level = node, level
+            return
+
+        q = self._vectors[node]
+        entry = self._descend(q, self._entry_point, self._max_level, level + 1)
+        entries = [entry]
+        for lc in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(q, entries, self.ef_construction, lc)
+            neighbours = self._select_neighbours(candidates, self.m)
+            self._links[node][lc] = neighbours
+            max_links = self.m * 2 if lc == 0 else self.m
+            for neighbour in neighbours:
+                links = self._links[neighbour][lc]
+                links.append(node)
+                if len(links) > max_links:
+                    self._shrink(neighbour, lc, max_links)
+            entries = [n for _, n in candidates]
+
+        if level > self._max_level:
+            self._entry_point, self._max_level = node, level
+
+    def _shrink(self, node: int, level: int, max_links: int) -> None:
+        links = self._links[node][level]
+        scores = self._scores(links, self._vectors[node])
+        candidates = sorted(zip(scores.tolist(), links), reverse=True)
+        self._links[node][level] = self._select_neighbours(candidates, max_links)
+
+    def _select_neighbours(
+        self, candidates: List[Tuple[float, int]], m: int
+    ) -> List[int]:
+        """Pick up to m diverse neighbours from candidates sorted best first.
+
+        A candidate is kept only if it is closer to the base node than to any
+        neighbour already kept, which spreads links across directions. Pruned
+        candidates fill any remaining slots.
+        """
+        if len(candidates) <= m:
+            return [node for _, node in candidates]
+        nodes = [node for _, node in candidates]
+        scores = np.fromiter((score for score, _ in candidates), np.float32)
+        vectors = self._vectors[nodes]
+        pairwise = self.metric.scores(vectors, vectors)
+        # Highest similarity of each candidate to any neighbour kept so far
+        closest_kept = np.full(len(nodes), -np.inf, np.float32)
+        selected: List[int] = []
+        pruned: List[int] = []
+        for i, node in enumerate(nodes):
+            if len(selected) >= m:
+                break
+            if closest_kept[i] > scores[i]:
+                pruned.append(node)
+                continue
+            selected.append(node)
+            np.maximum(closest_kept, pairwise[i], out=closest_kept)
+        return selected + pruned[: m - len(selected)]
+
+    # -- graph traversal ----------------------------------------------------
+
+    def _scores(self, nodes: List[int] | np.ndarray, q: np.ndarray) -> np.ndarray:
+        """Score nodes against a prepared vector; higher is closer."""
+        return self.metric.scores(q, self._vectors[nodes])
+
+    def _descend(self, q: np.ndarray, entry: int, top: int, bottom: int) -> int:
+        """Greedily walk from `top` down to `bottom` layer towards q."""
+        best = float(self._scores([entry], q)[0])
+        for level in range(top, bottom - 1, -1):
+            improved = True
+            while improved:
+                improved = False
+                links = self._links[entry][level]
+                if not links:
+                    break
+                scores = self._scores(links, q)
+                i = int(np.argmax(scores))
+                if scores[i] > best:
+                    best, entry, improved = float(scores[i]), links[i], True
+        return entry
+
+    def _search_layer(
+        self,
+        q: np.ndarray,
+        entries: List[int],
+        ef: int,
+        level: int,
+        allowed: np.ndarray | None = None,
+    ) -> List[Tuple[float, int]]:
+        """Best-first search on one layer; returns (score, node) best first.
+
+        When `allowed` is given the whole graph is still traversed, but only
+        allowed nodes are collected as results.
+        """
+        visited = set(entries)
+        scores = self._scores(entries, q).tolist()
+        candidates = [(-s, n) for s, n in zip(scores, entries)]
+        heapq.heapify(candidates)
+        results: List[Tuple[float, int]] = [
+            (s, n) for s, n in zip(scores, entries) if allowed is None or allowed[n]
+        ]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            neg_score, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_score < results[0][0]:
+                break
+            fresh = [n for n in self._links[node][level] if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            for s, n in zip(self._scores(fresh, q).tolist(), fresh):
+                if len(results) < ef or s > results[0][0]:
+                    heapq.heappush(candidates, (-s, n))
+                    if allowed is None or allowed[n]:
+                        heapq.heappush(results, (s, n))
+                        if len(results) > ef:
+                            heapq.heappop(results)
+
+        return sorted(results, reverse=True)
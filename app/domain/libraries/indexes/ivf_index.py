@@ -0,0 +1,204 @@
+from dataclasses import dataclass, field
+from typing import ClassVar, FrozenSet, List
+
+import numpy as np
+
+from app.domain.common import Embedding
+from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.libraries.distance_metric import DistanceMetric, top_k
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.domain.libraries.indexes.metadata_index import MetadataIndex
+from app.domain.libraries.indexes import kmeans
+from app.domain.libraries.vector_index import VectorIndex
+from app.errors import IndexNotBuiltError, InvalidEntityError
+
+
+@dataclass
+class IVFIndex(VectorIndex):
+    """
+    Inverted file index with a k-means coarse quantizer.
+
+    The build step trains `n_lists` centroids over the library's embeddings
+    (spherical k-means for cosine, Euclidean otherwise) and files every chunk
+    under its closest centroid. A search only scans the
+    posting lists of the `nprobe` centroids closest to the query.
+
+    Parameters:
+    - n_lists: number of centroids / posting lists (defaults to sqrt(n))
+    - nprobe: lists scanned per query; can be overridden per query through
+      the `nprobe` search parameter
+    - n_iter: k-means iterations
+    - max_training_points: sample size used to train the centroids
+
+    Time Complexity:
+    - Build: O(n * n_lists * d * n_iter) over the training sample
+    - Search: O((n_lists + n * nprobe / n_lists) * d)
+
+    Space Complexity: O(n * d + n_lists * d)
+
+    Use case: Large libraries that are re-indexed often, where builds must be
+    cheap and approximate results are acceptable.
+    """
+
+    supported_search_params: ClassVar[FrozenSet[str]] = frozenset({"nprobe"})
+
+    n_lists: int | None = None
+    nprobe: int = 8
+    n_iter: int = 20
+    max_training_points: int = 100_000
+    seed: int | None = None
+
+    _centroids: np.ndarray | None = field(init=False, default=None, repr=False)
+    # Vectors stored grouped by posting list: list i occupies rows
+    # _offsets[i]:_offsets[i + 1] of _vectors, and _rows maps those rows
+    # back to positions in _chunks.
+    _vectors: np.ndarray | None = field(init=False, default=None, repr=False)
+    _rows: np.ndarray | None = field(init=False, default=None, repr=False)
+    _offsets: np.ndarray | None = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.n_lists is not None and self.n_lists < 1:
+            raise InvalidEntityError("n_lists must be a positive integer")
+        if self.nprobe < 1 or self.n_iter < 1 or self.max_training_points < 1:
+            raise InvalidEntityError(
+                "nprobe, n_iter and max_training_points must be positive"
+            )
+
+    def build(self, chunks: List[IndexedChunk]) -> None:
+        if not chunks:
+            raise InvalidEntityError("No chunks provided for indexing")
+
+        # Validate all embeddings have the same dimension
+        dimensions = {chunk.dimension for chunk in chunks}
+        if len(dimensions) != 1:
+            raise InvalidEntityError(
+                "All chunks must have the same embedding dimension"
+            )
+
+        matrix = self.metric.prepare(
+            np.stack([chunk.embedding.values for chunk in chunks])
+        )
+        spherical = self.metric is DistanceMetric.COSINE
+        rng = np.random.default_rng(self.seed)
+
+        sample = matrix
+        if len(matrix) > self.max_training_points:
+            sample = matrix[
+                rng.choice(len(matrix), self.max_training_points, replace=False)
+            ]
+        # Each list needs at least one training point for its centroid
+        n_lists = min(self.n_lists or max(1, int(np.sqrt(len(chunks)))), len(sample))
+        centroids = kmeans.train(sample, n_lists, self.n_iter, rng, spherical)
+        assignments = kmeans.assign(matrix, centroids, spherical)
+        order = np.argsort(assignments, kind="stable")
+
+        self._chunks = list(chunks)
+        self._metadata = MetadataIndex.build(chunks)
+        self._centroids = centroids
+        self._vectors = matrix[order]
+        self._rows = order
+        self._offsets = np.searchsorted(
+            assignments[order], np.arange(len(centroids) + 1), side="left"
+        )
+
+    def add(self, chunks: List[IndexedChunk]) -> None:
+        """File new chunks under their closest trained centroid.
+
+        Centroids are not retrained; they are refreshed whenever the index
+        is rebuilt, including on compaction.
+        """
+        if not chunks:
+            return
+        if self._centroids is None:
+            self.build(chunks)
+            return
+        if any(chunk.dimension != self._vectors.shape[1] for chunk in chunks):
+            raise InvalidEntityError(
+                "All chunks must have the same embedding dimension"
+            )
+
+        matrix = self.metric.prepare(
+            np.stack([chunk.embedding.values for chunk in chunks])
+        )
+        n_lists = len(self._centroids)
+        lists = np.concatenate(
+            (
+                np.repeat(np.arange(n_lists), np.diff(self._offsets)),
+                kmeans.assign(
+                    matrix, self._centroids, self.metric is DistanceMetric.COSINE
+                ),
+            )
+        )
+        rows = np.concatenate(
+            (self._rows, np.arange(len(self._chunks), len(self._chunks) + len(chunks)))
+        )
+        order = np.argsort(lists, kind="stable")
+
+        self._metadata.extend(chunks)
+        self._chunks.extend(chunks)
+        self._vectors = np.concatenate((self._vectors, matrix))[order]
+        self._rows = rows[order]
+        self._offsets = np.searchsorted(lists[order], np.arange(n_lists + 1))
+        self._compact_if_needed()
+
+    def search(
+        self,
+        query: Embedding,
+        k: int,
+        filters: ChunkMetadataFilterDict | None = None,
+        min_similarity: float | None = None,
+        nprobe: int | None = None,
+    ) -> List[IndexedChunk]:
+        if not self._chunks:
+            raise IndexNotBuiltError(
+                "Index is empty. Build the index before searching."
+            )
+
+        if k <= 0:
+            raise InvalidEntityError("k must be a positive integer")
+        if nprobe is not None and nprobe <= 0:
+            raise InvalidEntityError("nprobe must be a positive integer")
+        if query.dimension != self._vectors.shape[1]:
+            raise InvalidEntityError("Embeddings must have same dimension")
+
+        q = self.metric.prepare(query.values[None])[0]
+
+        allowed = self._metadata.mask(filters)
+        if allowed is not None and not allowed.any():
+            return []
+
+        # Visit lists from the closest centroid outwards. With filters, keep
+        # probing past nprobe until k matching chunks have been seen.
+        probes = np.argsort(-self.metric.scores(q, self._centroids), kind="stable")
+        budget = nprobe or self.nprobe
+        positions: List[np.ndarray] = []
+        found = 0
+        for visited, centroid in enumerate(probes):
+            if visited >= budget and (allowed is None or found >= k):
+                break
+            start, end = self._offsets[centroid], self._offsets[centroid + 1]
+            span = np.arange(start, end)
+            if allowed is not None:
+                span = span[allowed[self._rows[span]]]
+            positions.append(span)
+            found += span.size
+
+        candidates = np.concatenate(positions)
+        if candidates.size == 0:
+            return []
+        scores = self.metric.scores(q, self._vectors[candidates])
+        if min_similarity is not None:
+            passing = scores >= self.metric.score_threshold(min_similarity)
+            candidates, scores = candidates[passing], scores[passing]
+        top = top_k(scores, k)
+        return [self._chunks[i] for i in self._rows[candidates[top]]]
+
+    def clear(self) -> None:
+        """Clear the index"""
+        self._chunks = []
+        self._metadata = None
+        self._centroids = None
+        self._vectors = None
+        self._rows = None
+        self._offsets = None
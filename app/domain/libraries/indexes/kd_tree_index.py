@@ -1,22 +1,26 @@
 import heapq
-from dataclasses import dataclass
-from typing import List, Optional
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
 
 from app.domain.common import Embedding
 from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.libraries.distance_metric import DistanceMetric, normalize_rows
 from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.domain.libraries.indexes.metadata_index import MetadataIndex
 from app.domain.libraries.vector_index import VectorIndex
 from app.errors import IndexNotBuiltError, InvalidEntityError
 
+# Axis stored for leaf nodes in `_axes`
+_LEAF = -1
 
-@dataclass
-class KDNode:
-    """Node in a KD-Tree"""
+# Rows sampled per node to pick the split axis with the widest spread
+_SPREAD_SAMPLE = 256
 
-    chunk: IndexedChunk
-    left: Optional["KDNode"] = None
-    right: Optional["KDNode"] = None
-    axis: int = 0  # Axis on which the node splits
+# Share of the tree's rows the add buffer may reach before it is merged
+_BUFFER_SHARE = 0.25
 
 
 @dataclass
@@ -25,18 +29,64 @@ class KDTreeIndex(VectorIndex):
 
     KD-Tree for approximate nearest neighbor search in high-dimensional spaces.
 
+    The tree is stored as flat parallel arrays (split axis, left and right
+    child) over a float32 matrix whose rows are ordered so that every node
+    covers a contiguous range. Leaves hold up to `leaf_size` rows and are
+    scanned with vectorized distance computations.
+
+    The tree searches by Euclidean distance, so every metric is mapped onto
+    it at build time: cosine rows are normalized to unit length, and dot
+    product rows get an extra coordinate that makes the largest inner
+    product the nearest neighbour.
+
+    Chunks added after the build go to a buffer that every search scans
+    next to the tree. Once the buffer holds a quarter as many rows as the
+    tree, the tree is rebuilt with them.
+
+    Parameters:
+    - leaf_size: maximum number of chunks per leaf bucket
+
     Time Complexity:
     - Build: O(n log n) where n is the number of chunks
-    - Search: O(log n) average case, O(n) worst case
+    - Add: amortized O(log n) per chunk
+    - Search: O(log n + b) average case, O(n) worst case, where b is the
+      number of buffered chunks
 
-    Space Complexity: O(n) - stores all chunks in the tree
+    Space Complexity: O(n * d) - stores all embeddings in a single matrix
 
     Use case: Suitable for moderate-sized datasets where faster search is needed.
     Note: Performance degrades in very high dimensions due to the curse of dimensionality.
     """
 
-    _root: Optional[KDNode] = None
+    leaf_size: int = 32
+
+    _root: int | None = None
     _dimension: int = 0
+    # Largest embedding norm, used to map dot products onto distances
+    _max_norm: float = 0.0
+
+    # Embeddings in tree order: node i covers rows _starts[i]:_ends[i], and
+    # _order maps those rows back to positions in _chunks.
+    _vectors: np.ndarray | None = field(init=False, default=None, repr=False)
+    _order: np.ndarray | None = field(init=False, default=None, repr=False)
+    _axes: np.ndarray | None = field(init=False, default=None, repr=False)
+    _lefts: np.ndarray | None = field(init=False, default=None, repr=False)
+    _rights: np.ndarray | None = field(init=False, default=None, repr=False)
+    _starts: np.ndarray | None = field(init=False, default=None, repr=False)
+    _ends: np.ndarray | None = field(init=False, default=None, repr=False)
+    # Per-node bounding boxes, used as lower bounds while searching
+    _lows: np.ndarray | None = field(init=False, default=None, repr=False)
+    _highs: np.ndarray | None = field(init=False, default=None, repr=False)
+    # Embedded rows of the chunks added since the build, which follow the
+    # tree's rows in _chunks
+    _added: np.ndarray | None = field(init=False, default=None, repr=False)
+    # Capacity-grown storage behind _added, so adds are amortized O(d)
+    _added_buffer: np.ndarray | None = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.leaf_size < 1:
+            raise InvalidEntityError("leaf_size must be a positive integer")
 
     def build(self, chunks: List[IndexedChunk]) -> None:
         if not chunks:
@@ -49,104 +99,300 @@ class KDTreeIndex(VectorIndex):
                 "All chunks must have the same embedding dimension"
             )
 
+        raw = np.stack([chunk.embedding.values for chunk in chunks]).astype(np.float32)
+        if self.metric is DistanceMetric.DOT:
+            self._max_norm = float(np.sqrt(np.einsum("ij,ij->i", raw, raw).max()))
+        matrix = self._embed_rows(raw)
+        order = np.arange(len(chunks))
+
+        # A balanced tree with leaves of at least leaf_size / 2 rows has
+        # fewer than 4n / leaf_size + 1 nodes.
+        capacity = 4 * len(chunks) // self.leaf_size + 1
+        axes = np.full(capacity, _LEAF, dtype=np.intp)
+        lefts = np.full(capacity, -1, dtype=np.intp)
+        rights = np.full(capacity, -1, dtype=np.intp)
+        starts = np.zeros(capacity, dtype=np.intp)
+        ends = np.zeros(capacity, dtype=np.intp)
+
+        # Split nodes with an explicit stack rather than recursion so skewed
+        # data cannot exhaust the interpreter's recursion limit.
+        starts[0], ends[0] = 0, len(chunks)
+        count = 1
+        pending = [0]
+        while pending:
+            node = pending.pop()
+            start, end = starts[node], ends[node]
+            if end - start <= self.leaf_size:
+                continue
+
+            rows = order[start:end]
+            step = max(1, len(rows) // _SPREAD_SAMPLE)
+            sample = matrix[rows[::step]]
+            axis = int(np.argmax(sample.max(axis=0) - sample.min(axis=0)))
+
+            # Partition the node's rows around the median on `axis`
+            middle = len(rows) // 2
+            rows = rows[np.argpartition(matrix[rows, axis], middle)]
+            order[start:end] = rows
+
+            left, right = count, count + 1
+            count += 2
+            axes[node] = axis
+            lefts[node], rights[node] = left, right
+            starts[left], ends[left] = start, start + middle
+            starts[right], ends[right] = start + middle, end
+            pending.extend((left, right))
+
+        vectors = matrix[order]
+        leaves = np.flatnonzero(axes[:count] == _LEAF)
+        leaves = leaves[np.argsort(starts[leaves])]
+        lows = np.empty((count, vectors.shape[1]), dtype=np.float32)
+        highs = np.empty_like(lows)
+        lows[leaves] = np.minimum.reduceat(vectors, starts[leaves])
+        highs[leaves] = np.maximum.reduceat(vectors, starts[leaves])
+        # Children are always numbered after their parent
+        for node in np.flatnonzero(axes[:count] != _LEAF)[::-1]:
+            left, right = lefts[node], rights[node]
+            np.minimum(lows[left], lows[right], out=lows[node])
+            np.maximum(highs[left], highs[right], out=highs[node])
+
+        self._chunks = list(chunks)
+        self._metadata = MetadataIndex.build(chunks)
         self._dimension = chunks[0].dimension
-        self._root = self._build_tree(chunks, depth=0)
-
-    def _build_tree(self, chunks: List[IndexedChunk], depth: int) -> Optional[KDNode]:
+        self._vectors = vectors
+        self._order = order
+        self._axes = axes[:count]
+        self._lefts = lefts[:count]
+        self._rights = rights[:count]
+        self._starts = starts[:count]
+        self._ends = ends[:count]
+        self._lows = lows
+        self._highs = highs
+        self._added_buffer = self._added = np.empty(
+            (0, vectors.shape[1]), dtype=np.float32
+        )
+        self._root = 0
+
+    def export_state(self) -> Tuple[List[IndexedChunk], Dict[str, Any]]:
+        chunks, state = super().export_state()
+        # Spare capacity is not saved; _added covers every buffered row
+        del state["_added_buffer"]
+        return chunks, state
+
+    def restore_state(self, chunks: List[IndexedChunk], state: Dict[str, Any]) -> None:
+        super().restore_state(chunks, state)
+        if self._added is None and self._vectors is not None:
+            # Saved before chunks could be buffered
+            self._added = np.empty((0, self._vectors.shape[1]), dtype=np.float32)
+        self._added_buffer = self._added
+
+    def add(self, chunks: List[IndexedChunk]) -> None:
+        """Buffer chunks for searches to scan next to the tree.
+
+        The tree is rebuilt to take them in once the buffer grows past a
+        share of its rows.
+        """
         if not chunks:
-            return None
-
-        # Select axis based on depth so that the tree is balanced
-        axis = depth % self._dimension
-
-        # Sort chunks by the selected axis
-        sorted_chunks = sorted(chunks, key=lambda chunk: chunk.embedding.values[axis])
-
-        # Select median as pivot element
-        median_idx = len(sorted_chunks) // 2
-        median_chunk = sorted_chunks[median_idx]
+            return
+        if self._root is None:
+            self.build(chunks)
+            return
+        if any(chunk.dimension != self._dimension for chunk in chunks):
+            raise InvalidEntityError(
+                "All chunks must have the same embedding dimension"
+            )
 
-        # Recursively build subtrees
-        return KDNode(
-            chunk=median_chunk,
-            left=self._build_tree(sorted_chunks[:median_idx], depth + 1),
-            right=self._build_tree(sorted_chunks[median_idx + 1 :], depth + 1),
-            axis=axis,
-        )
+        raw = np.stack([chunk.embedding.values for chunk in chunks]).astype(np.float32)
+        if (
+            self.metric is DistanceMetric.DOT
+            and np.einsum("ij,ij->i", raw, raw).max() > self._max_norm**2
+        ):
+            # Longer rows than any in the tree change the dot product mapping
+            super().add(chunks)
+            return
+
+        rows = self._embed_rows(raw)
+        start = len(self._added)
+        size = start + len(rows)
+        if size > len(self._added_buffer):
+            grown = np.empty(
+                (max(size, 2 * len(self._added_buffer)), rows.shape[1]), np.float32
+            )
+            grown[:start] = self._added
+            self._added_buffer = grown
+        self._added_buffer[start:size] = rows
+        self._added = self._added_buffer[:size]
+        self._metadata.extend(chunks)
+        self._chunks.extend(chunks)
+        if size > _BUFFER_SHARE * len(self._order):
+            self.compact()
+        else:
+            self._compact_if_needed()
 
     def search(
-        self, query: Embedding, k: int, filters: ChunkMetadataFilterDict | None = None
+        self,
+        query: Embedding,
+        k: int,
+        filters: ChunkMetadataFilterDict | None = None,
+        min_similarity: float | None = None,
     ) -> List[IndexedChunk]:
-        if not self._root:
+        if self._root is None:
             raise IndexNotBuiltError(
                 "Index is empty. Build the index before searching."
             )
 
         if k <= 0:
             raise InvalidEntityError("k must be a positive integer")
-        # Use max-heap to track top-k nearest neighbors.
-        # Include an index as a tie-breaker so the heap never needs
-        # to compare IndexedChunk objects directly when distances are equal.
-        neighbors: List[tuple[float, int, IndexedChunk]] = []
-        _counter = 0
-
-        def search_tree(
-            node: Optional[KDNode],
-            depth: int,
-        ) -> None:
-            if node is None:
-                return
-
-            # Check if node matches filters
-            if filters and not node.chunk.matches_filter(filters):
-                pass  # Continue searching tree but don't add this node
-            else:
-                # Compute distance
-                distance = node.chunk.distance(query)
-                nonlocal _counter
-                if len(neighbors) < k:
-                    heapq.heappush(neighbors, (-distance, _counter, node.chunk))
-                    _counter += 1
-                elif distance < -neighbors[0][0]:
-                    # Replace the worst neighbor with the current one
-                    heapq.heapreplace(neighbors, (-distance, _counter, node.chunk))
-                    _counter += 1
-
-            # Determine which branch to search next
-            axis = depth % self._dimension
-            diff = query.values[axis] - node.chunk.embedding.values[axis]
-
-            if diff < 0:
-                near_node, far_node = node.left, node.right
-            else:
-                near_node, far_node = node.right, node.left
-
-            # Search nearer subtree first
-            search_tree(near_node, depth + 1)
-
-            # Check if we need to search the farther subtree
-            if len(neighbors) < k or abs(diff) < -neighbors[0][0]:
-                search_tree(far_node, depth + 1)
-
-        search_tree(self._root, depth=0)
+        if query.dimension != self._dimension:
+            raise InvalidEntityError("Embeddings must have same dimension")
+
+        allowed = self._metadata.mask(filters)
+        if allowed is not None and not allowed.any():
+            return []
+
+        q = self._embed_query(query.values)
+        radius = self._radius(q, min_similarity)
+        # Best chunks found so far as (squared distance, row in _chunks),
+        # nearest first; buffered chunks are scanned first
+        best_distances, best_positions = self._scan_added(q, k, allowed, radius)
+        if allowed is not None:
+            # Filter mask in tree order, so leaf ranges can be masked directly
+            allowed = allowed[self._order]
+
+        # Visit nodes in order of their lower-bound squared distance to q
+        pending: List[Tuple[float, int]] = [(0.0, self._root)]
+        while pending:
+            bound, node = heapq.heappop(pending)
+            if bound > radius or (
+                best_positions.size >= k and bound > best_distances[-1]
+            ):
+                break
+
+            axis = self._axes[node]
+            if axis == _LEAF:
+                rows = np.arange(self._starts[node], self._ends[node])
+                if allowed is not None:
+                    rows = rows[allowed[rows]]
+                    if rows.size == 0:
+                        continue
+                diff = self._vectors[rows] - q
+                distances = np.einsum("ij,ij->i", diff, diff)
+                if radius < math.inf:
+                    within = distances <= radius
+                    rows, distances = rows[within], distances[within]
+                best_distances, best_positions = self._merge(
+                    best_distances, best_positions, distances, self._order[rows], k
+                )
+                continue
+
+            children = (self._lefts[node], self._rights[node])
+            gaps = np.maximum(self._lows[children,] - q, 0) + np.maximum(
+                q - self._highs[children,], 0
+            )
+            for child, child_bound in zip(
+                children, np.einsum("ij,ij->i", gaps, gaps).tolist()
+            ):
+                heapq.heappush(pending, (child_bound, child))
+
         # Return chunks ordered from nearest to farthest
-        return [chunk for _, _, chunk in sorted(neighbors, key=lambda x: -x[0])]
+        return [self._chunks[i] for i in best_positions]
 
     def clear(self) -> None:
         """Clear the index"""
         self._root = None
         self._dimension = 0
+        self._max_norm = 0.0
+        self._chunks = []
+        self._metadata = None
+        self._vectors = None
+        self._order = None
+        self._axes = None
+        self._lefts = None
+        self._rights = None
+        self._starts = None
+        self._ends = None
+        self._lows = None
+        self._highs = None
+        self._added = None
+        self._added_buffer = None
+
+    def _embed_rows(self, matrix: np.ndarray) -> np.ndarray:
+        """Map embeddings to points whose Euclidean order matches the metric."""
+        matrix = matrix.astype(np.float32)
+        if self.metric is DistanceMetric.L2:
+            return matrix
+        if self.metric is DistanceMetric.COSINE:
+            # Zero rows sit at distance sqrt(2) from any unit query, like
+            # an orthogonal row, matching their cosine similarity of 0.
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            return np.hstack((normalize_rows(matrix), (norms == 0).astype(np.float32)))
+        # ||[x, e] - [q, 0]||^2 = M^2 + ||q||^2 - 2 q.x with e = sqrt(M^2 - ||x||^2),
+        # where M is the largest norm in the tree
+        squared_norms = np.einsum("ij,ij->i", matrix, matrix)
+        extra = np.sqrt(np.maximum(self._max_norm**2 - squared_norms, 0))
+        return np.hstack((matrix, extra[:, None].astype(np.float32)))
+
+    def _embed_query(self, values: np.ndarray) -> np.ndarray:
+        if self.metric is DistanceMetric.L2:
+            return values.astype(np.float32)
+        q = values.astype(np.float32)
+        if self.metric is DistanceMetric.COSINE:
+            normalize_rows(q)
+        return np.append(q, np.float32(0))
+
+    def _radius(self, q: np.ndarray, min_similarity: float | None) -> float:
+        """Squared search radius matching a similarity threshold."""
+        if min_similarity is None:
+            return math.inf
+        if self.metric is DistanceMetric.L2:
+            if min_similarity <= 0:
+                return math.inf
+            radius = (1.0 / min_similarity - 1.0) ** 2
+        elif self.metric is DistanceMetric.COSINE:
+            if not q.any():
+                # A zero query has similarity 0 to every chunk
+                return math.inf if min_similarity <= 0 else -1.0
+            radius = 2.0 - 2.0 * min_similarity
+        else:
+            radius = self._max_norm**2 + float(q @ q) - 2.0 * min_similarity
+        # Relax slightly so float32 rounding never drops a boundary chunk
+        return radius + 1e-5 * max(1.0, abs(radius))
+
+    def _scan_added(
+        self, q: np.ndarray, k: int, allowed: np.ndarray | None, radius: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k buffered chunks within `radius`, as (distances, positions)."""
+        positions = np.arange(len(self._order), len(self._chunks))
+        rows = self._added
+        if allowed is not None:
+            keep = allowed[len(self._order) :]
+            positions, rows = positions[keep], rows[keep]
+        diff = rows - q
+        distances = np.einsum("ij,ij->i", diff, diff)
+        if radius < math.inf:
+            within = distances <= radius
+            positions, distances = positions[within], distances[within]
+        return self._merge(
+            np.empty(0, dtype=np.float32),
+            np.empty(0, dtype=np.intp),
+            distances,
+            positions,
+            k,
+        )
 
-    def get_chunks(self) -> List[IndexedChunk]:
-        """Return all chunks stored in the KD-tree via DFS traversal."""
-        chunks: List[IndexedChunk] = []
-
-        def dfs(node: Optional[KDNode]) -> None:
-            if node is None:
-                return
-            chunks.append(node.chunk)
-            dfs(node.left)
-            dfs(node.right)
-
-        dfs(self._root)
-        return chunks
+    @staticmethod
+    def _merge(
+        best_distances: np.ndarray,
+        best_positions: np.ndarray,
+        distances: np.ndarray,
+        positions: np.ndarray,
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge scanned rows into the running top-k, nearest first.
+
+        Ties are broken by chunk position, which keeps results deterministic.
+        """
+        distances = np.concatenate((best_distances, distances))
+        positions = np.concatenate((best_positions, positions))
+        ranking = np.lexsort((positions, distances))[:k]
+        return distances[ranking], positions[ranking]
@@ -0,0 +1,68 @@
+"""Vectorized k-means used to train the quantizers of approximate indexes."""
+
+import numpy as np
+
+from app.domain.libraries.distance_metric import normalize_rows
+
+# Rows scored per block while assigning vectors to centroids, which bounds
+# the temporary (rows x n_clusters) score matrix.
+_ASSIGN_BLOCK_ROWS = 65536
+
+
+def assign(
+    matrix: np.ndarray, centroids: np.ndarray, spherical: bool = False
+) -> np.ndarray:
+    """Return the index of the closest centroid for every row.
+
+    Spherical assignment maximizes the inner product (cosine for unit
+    vectors); otherwise the squared Euclidean distance is minimized.
+    """
+    bias = 0.0 if spherical else 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    assignments = np.empty(len(matrix), dtype=np.intp)
+    for start in range(0, len(matrix), _ASSIGN_BLOCK_ROWS):
+        block = matrix[start : start + _ASSIGN_BLOCK_ROWS]
+        assignments[start : start + len(block)] = np.argmax(
+            block @ centroids.T - bias, axis=1
+        )
+    return assignments
+
+
+def train(
+    sample: np.ndarray,
+    n_clusters: int,
+    n_iter: int,
+    rng: np.random.Generator,
+    spherical: bool = False,
+) -> np.ndarray:
+    """Run Lloyd iterations over `sample` and return the centroids.
+
+    Spherical k-means re-normalizes centroids after every update, which
+    clusters unit vectors by cosine similarity.
+    """
+    n_clusters = min(n_clusters, len(sample))
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = assign(sample, centroids, spherical)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        # Sum each cluster's members as contiguous runs of the sorted sample
+        order = np.argsort(assignments, kind="stable")
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(sample[order], starts, axis=0)
+
+        if spherical:
+            updated = normalize_rows(sums)
+        else:
+            updated = sums / np.maximum(counts, 1)[:, None]
+
+        # Re-seed empty clusters with random sample points
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            updated[empty] = sample[rng.choice(len(sample), empty.size)]
+
+        converged = np.allclose(updated, centroids, atol=1e-6)
+        centroids = updated
+        if converged:
+            break
+    return centroids
@@ -0,0 +1,236 @@
+"""Inverted indexes over chunk metadata used to pre-filter vector searches."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+import numpy as np
+
+from app.domain.documents.chunk_id import ChunkId
+from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.libraries.indexed_chunk import IndexedChunk
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime) -> int:
+    """Microseconds since the epoch; naive datetimes are read as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+@dataclass
+class _Postings:
+    """Rows grouped by value: value i owns rows[offsets[i]:offsets[i + 1]].
+
+    Codes are appended as chunks are added; the grouped rows are rebuilt
+    lazily on the next lookup.
+    """
+
+    codes: np.ndarray = field(default_factory=lambda: np.empty(0, np.intp))
+    lookup: Dict[Hashable, int] = field(default_factory=dict)
+    _groups: Tuple[np.ndarray, np.ndarray] | None = None
+
+    def extend(self, values: List[Hashable], present: np.ndarray) -> None:
+        lookup = self.lookup
+        codes = np.fromiter(
+            (
+                lookup.setdefault(value, len(lookup)) if has else -1
+                for value, has in zip(values, present)
+            ),
+            dtype=np.intp,
+            count=len(values),
+        )
+        self.codes = np.concatenate((self.codes, codes))
+        self._groups = None
+
+    def code(self, value: Any) -> int | None:
+        try:
+            return self.lookup.get(value)
+        except TypeError:  # unhashable filter values match nothing
+            return None
+
+    def rows_for(self, code: int) -> np.ndarray:
+        rows, offsets = self._grouped()
+        return rows[offsets[code] : offsets[code + 1]]
+
+    def count(self, code: int) -> int:
+        _, offsets = self._grouped()
+        return int(offsets[code + 1] - offsets[code])
+
+    def _grouped(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._groups is None:
+            # Rows without metadata (code -1) sort first and are never looked up
+            order = np.argsort(self.codes, kind="stable")
+            offsets = np.searchsorted(
+                self.codes[order], np.arange(len(self.lookup) + 1)
+            )
+            self._groups = (order, offsets)
+        return self._groups
+
+
+@dataclass
+class MetadataIndex:
+    """
+    Pre-computed filter structures over the metadata of indexed chunks.
+
+    `source` and `page_number` are stored as inverted postings (sorted row
+    lists per distinct value) and `created_at` as a sorted array of
+    timestamps, so a filter resolves to its matching rows by intersecting
+    postings and range slices instead of testing every chunk.
+
+    The index also tracks each chunk's row and tombstones removed rows, so
+    vector indexes can delete chunks without rebuilding: tombstoned rows
+    never match, and an unfiltered lookup returns the live rows once any
+    row has been removed.
+
+    Matches `ChunkMetadata.matches_filter`: chunks without metadata never
+    match a non-empty filter and unknown filter keys are ignored.
+    """
+
+    _rows_by_id: Dict[ChunkId, int] = field(default_factory=dict, repr=False)
+    _live: np.ndarray = field(default_factory=lambda: np.empty(0, bool), repr=False)
+    _has_metadata: np.ndarray = field(
+        default_factory=lambda: np.empty(0, bool), repr=False
+    )
+    _sources: _Postings = field(default_factory=_Postings, repr=False)
+    _pages: _Postings = field(default_factory=_Postings, repr=False)
+    # created_at in microseconds per row, plus (rows, timestamps) sorted by
+    # it, rebuilt lazily after rows are added
+    _created: np.ndarray = field(
+        default_factory=lambda: np.empty(0, np.int64), repr=False
+    )
+    _created_sorted: Tuple[np.ndarray, np.ndarray] | None = field(
+        default=None, repr=False
+    )
+
+    @classmethod
+    def build(cls, chunks: List[IndexedChunk]) -> MetadataIndex:
+        index = cls()
+        index.extend(chunks)
+        return index
+
+    @property
+    def size(self) -> int:
+        """Number of rows, including tombstoned ones."""
+        return self._live.size
+
+    @property
+    def deleted_count(self) -> int:
+        return self.size - len(self._rows_by_id)
+
+    def extend(self, chunks: List[IndexedChunk]) -> None:
+        """Append rows for `chunks`; a chunk already present is replaced."""
+        self.delete(chunk.id for chunk in chunks)
+        start = self.size
+        for offset, chunk in enumerate(chunks):
+            self._rows_by_id[chunk.id] = start + offset
+
+        metadata = [chunk.metadata for chunk in chunks]
+        present = np.fromiter(
+            (m is not None for m in metadata), dtype=bool, count=len(chunks)
+        )
+        created = np.fromiter(
+            (_to_micros(m.created_at) if m is not None else 0 for m in metadata),
+            dtype=np.int64,
+            count=len(chunks),
+        )
+        self._live = np.concatenate((self._live, np.ones(len(chunks), bool)))
+        self._has_metadata = np.concatenate((self._has_metadata, present))
+        self._created = np.concatenate((self._created, created))
+        self._created_sorted = None
+        self._sources.extend(
+            [m.source if m is not None else None for m in metadata], present
+        )
+        self._pages.extend(
+            [m.page_number if m is not None else None for m in metadata], present
+        )
+
+    def delete(self, chunk_ids: Iterable[ChunkId]) -> int:
+        """Tombstone the rows of the given chunks; returns how many were live."""
+        rows = [
+            row
+            for row in (self._rows_by_id.pop(chunk_id, None) for chunk_id in chunk_ids)
+            if row is not None
+        ]
+        self._live[rows] = False
+        return len(rows)
+
+    def delete_rows(self, rows: np.ndarray) -> None:
+        """Tombstone rows by position, e.g. when restoring a snapshot."""
+        if len(rows) == 0:
+            return
+        self._live[rows] = False
+        self._rows_by_id = {
+            chunk_id: row
+            for chunk_id, row in self._rows_by_id.items()
+            if self._live[row]
+        }
+
+    def deleted_rows(self) -> np.ndarray:
+        return np.flatnonzero(~self._live)
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self._live)
+
+    def rows(self, filters: ChunkMetadataFilterDict | None) -> np.ndarray | None:
+        """Return the sorted rows matching `filters`, or None for every row."""
+        if not filters:
+            return self.live_rows() if self.deleted_count else None
+
+        rows = self._matching(filters)
+        if self.deleted_count:
+            rows = rows[self._live[rows]]
+        return rows
+
+    def mask(self, filters: ChunkMetadataFilterDict | None) -> np.ndarray | None:
+        """Return a boolean mask of the rows matching `filters`, or None."""
+        if not filters:
+            return self._live.copy() if self.deleted_count else None
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.rows(filters)] = True
+        return mask
+
+    def _matching(self, filters: ChunkMetadataFilterDict) -> np.ndarray:
+        equalities = []
+        for key, postings in (("source", self._sources), ("page_number", self._pages)):
+            if key in filters:
+                code = postings.code(filters[key])
+                if code is None:
+                    return np.empty(0, dtype=np.intp)
+                equalities.append((postings, code))
+
+        lower = filters.get("created_after")
+        upper = filters.get("created_before")
+        if equalities:
+            # Start from the shortest posting list and check the remaining
+            # constraints only on its rows
+            equalities.sort(key=lambda e: e[0].count(e[1]))
+            postings, code = equalities[0]
+            rows = postings.rows_for(code)
+            for postings, code in equalities[1:]:
+                rows = rows[postings.codes[rows] == code]
+            if lower is not None:
+                rows = rows[self._created[rows] > _to_micros(lower)]
+            if upper is not None:
+                rows = rows[self._created[rows] < _to_micros(upper)]
+            return rows
+
+        if lower is None and upper is None:
+            return np.flatnonzero(self._has_metadata)
+
+        if self._created_sorted is None:
+            order = np.flatnonzero(self._has_metadata)
+            order = order[np.argsort(self._created[order], kind="stable")]
+            self._created_sorted = (order, self._created[order])
+        order, timestamps = self._created_sorted
+        start, stop = 0, timestamps.size
+        if lower is not None:
+            start = np.searchsorted(timestamps, _to_micros(lower), "right")
+        if upper is not None:
+            stop = np.searchsorted(timestamps, _to_micros(upper), "left")
+        return np.sort(order[start : max(start, stop)])
@@ -0,0 +1,278 @@
+from dataclasses import dataclass, field, replace
+from typing import ClassVar, FrozenSet, List, Tuple
+
+import numpy as np
+
+from app.domain.common import Embedding
+from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.libraries.distance_metric import top_k
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.domain.libraries.indexes.metadata_index import MetadataIndex
+from app.domain.libraries.indexes import kmeans
+from app.domain.libraries.vector_index import VectorIndex
+from app.errors import IndexNotBuiltError, InvalidEntityError
+
+
+@dataclass
+class PQIndex(VectorIndex):
+    """
+    Product-quantization index scoring chunks from one byte per sub-vector.
+
+    Each embedding (normalized for cosine) is split into `n_subvectors`
+    slices and every slice is replaced by the id of its closest centroid in
+    a per-slice codebook of up to 256 entries, so a query scans
+    `n_subvectors` bytes per chunk instead of 4 * d. Queries are scored with
+    asymmetric distance computation: the query stays exact and is compared
+    against codebook entries through a precomputed lookup table of per-slice
+    scores under the index's metric.
+
+    Rows keep only ids, text and metadata: embeddings are dropped once
+    encoded, so the index holds n_subvectors bytes per chunk instead of the
+    full vector. Returned chunks carry an embedding decoded from their codes
+    (in the metric's space, so unit length for cosine); the document store
+    still has the exact vectors. With `keep_vectors`, a float32 side array
+    of the original vectors is kept for exact re-ranking and results.
+    Compaction drops tombstoned codes without retraining; codebooks are
+    refreshed when the library is re-indexed.
+
+    Parameters:
+    - n_subvectors: number of slices (bytes per chunk)
+    - n_centroids: codebook size per slice (at most 256)
+    - rerank: number of top approximate candidates re-scored exactly from
+      the side array (0 disables it); can be overridden per query through
+      the `rerank` search parameter. Requires `keep_vectors`
+    - keep_vectors: keep the original vectors for re-ranking and results
+    - n_iter / max_training_points: k-means training budget
+
+    Time Complexity:
+    - Build: O(n * n_centroids * d * n_iter) over the training sample
+    - Search: O(n * n_subvectors + n_centroids * d)
+
+    Space Complexity: O(n * n_subvectors) bytes of codes, plus O(n * d)
+    floats with `keep_vectors`
+
+    Use case: Very large libraries where the cost of scanning every vector
+    per query matters more than exact scores.
+    """
+
+    supported_search_params: ClassVar[FrozenSet[str]] = frozenset({"rerank"})
+
+    n_subvectors: int = 8
+    n_centroids: int = 256
+    rerank: int = 0
+    keep_vectors: bool = False
+    n_iter: int = 20
+    max_training_points: int = 65_536
+    seed: int | None = None
+
+    _dimension: int = field(init=False, default=0)
+    # Codebooks have shape (n_subvectors, n_centroids, sub_dimension)
+    _codebooks: np.ndarray | None = field(init=False, default=None, repr=False)
+    _codes: np.ndarray | None = field(init=False, default=None, repr=False)
+    # Original vectors by row, only with `keep_vectors`
+    _vectors: np.ndarray | None = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.n_subvectors < 1:
+            raise InvalidEntityError("n_subvectors must be a positive integer")
+        if not 1 <= self.n_centroids <= 256:
+            raise InvalidEntityError("n_centroids must be between 1 and 256")
+        if self.rerank < 0:
+            raise InvalidEntityError("rerank cannot be negative")
+        if self.rerank and not self.keep_vectors:
+            raise InvalidEntityError("rerank requires keep_vectors")
+        if self.n_iter < 1 or self.max_training_points < 1:
+            raise InvalidEntityError("n_iter and max_training_points must be positive")
+
+    def build(self, chunks: List[IndexedChunk]) -> None:
+        if not chunks:
+            raise InvalidEntityError("No chunks provided for indexing")
+
+        # Validate all embeddings have the same dimension
+        dimensions = {chunk.dimension for chunk in chunks}
+        if len(dimensions) != 1:
+            raise InvalidEntityError(
+                "All chunks must have the same embedding dimension"
+            )
+
+        dimension = dimensions.pop()
+        vectors = np.stack([c.embedding.values for c in chunks])
+        slices = self._split(self.metric.prepare(vectors))
+        rng = np.random.default_rng(self.seed)
+
+        n_centroids = min(self.n_centroids, len(chunks))
+        sample_rows = np.arange(len(chunks))
+        if len(chunks) > self.max_training_points:
+            sample_rows = rng.choice(
+                len(chunks), self.max_training_points, replace=False
+            )
+
+        codebooks = np.empty(
+            (self.n_subvectors, n_centroids, slices.shape[2]), dtype=np.float32
+        )
+        codes = np.empty((len(chunks), self.n_subvectors), dtype=np.uint8)
+        for m in range(self.n_subvectors):
+            codebooks[m] = kmeans.train(
+                slices[sample_rows, m], n_centroids, self.n_iter, rng
+            )
+            codes[:, m] = kmeans.assign(slices[:, m], codebooks[m])
+
+        self._chunks = _strip(chunks)
+        self._metadata = MetadataIndex.build(self._chunks)
+        self._dimension = dimension
+        self._codebooks = codebooks
+        self._codes = codes
+        self._vectors = vectors if self.keep_vectors else None
+
+    def add(self, chunks: List[IndexedChunk]) -> None:
+        """Encode new chunks with the trained codebooks and append them.
+
+        Codebooks are not retrained; they are refreshed whenever the index
+        is rebuilt, including on compaction.
+        """
+        if not chunks:
+            return
+        if self._codebooks is None:
+            self.build(chunks)
+            return
+        if any(chunk.dimension != self._dimension for chunk in chunks):
+            raise InvalidEntityError(
+                "All chunks must have the same embedding dimension"
+            )
+
+        vectors = np.stack([c.embedding.values for c in chunks])
+        slices = self._split(self.metric.prepare(vectors))
+        codes = np.empty((len(chunks), self.n_subvectors), dtype=np.uint8)
+        for m in range(self.n_subvectors):
+            codes[:, m] = kmeans.assign(slices[:, m], self._codebooks[m])
+
+        rows = _strip(chunks)
+        self._metadata.extend(rows)
+        self._chunks.extend(rows)
+        self._codes = np.concatenate((self._codes, codes))
+        if self._vectors is not None:
+            self._vectors = np.concatenate((self._vectors, vectors))
+        self._compact_if_needed()
+
+    def search(
+        self,
+        query: Embedding,
+        k: int,
+        filters: ChunkMetadataFilterDict | None = None,
+        min_similarity: float | None = None,
+        rerank: int | None = None,
+    ) -> List[IndexedChunk]:
+        if not self._chunks:
+            raise IndexNotBuiltError(
+                "Index is empty. Build the index before searching."
+            )
+
+        if k <= 0:
+            raise InvalidEntityError("k must be a positive integer")
+        if rerank is not None and rerank < 0:
+            raise InvalidEntityError("rerank cannot be negative")
+        if rerank and self._vectors is None:
+            raise InvalidEntityError("rerank requires keep_vectors")
+        if query.dimension != self._dimension:
+            raise InvalidEntityError("Embeddings must have same dimension")
+
+        q = self.metric.prepare(query.values[None])
+
+        rows = self._metadata.rows(filters)
+        if rows is not None and rows.size == 0:
+            return []
+
+        # Lookup table: score of each query slice against every centroid of
+        # its codebook; a chunk's score is the sum of its codes' entries.
+        # Inner products and squared distances both add up across slices.
+        table = np.stack(
+            [
+                self.metric.scores(query_slice, codebook)
+                for query_slice, codebook in zip(self._split(q)[0], self._codebooks)
+            ]
+        )
+        codes = self._codes if rows is None else self._codes[rows]
+        offsets = np.arange(self.n_subvectors) * table.shape[1]
+        scores = table.ravel()[codes + offsets].sum(axis=1)
+
+        depth = max(k, self.rerank if rerank is None else rerank)
+        top = top_k(scores, depth)
+        top_scores = scores[top]
+        if rows is not None:
+            top = rows[top]
+        if depth > k:
+            top, top_scores = self._rerank(top, q[0])
+        if min_similarity is not None:
+            top = top[top_scores >= self.metric.score_threshold(min_similarity)]
+        return self._rows(top[:k])
+
+    def get_chunks(self) -> List[IndexedChunk]:
+        """Return the live chunks, with embeddings rebuilt for each row."""
+        if not self._chunks:
+            return []
+        if self._metadata is None or not self._metadata.deleted_count:
+            return self._rows(np.arange(len(self._chunks)))
+        return self._rows(self._metadata.live_rows())
+
+    def compact(self) -> None:
+        """Drop tombstoned rows, keeping the live codes as they are."""
+        live = self._metadata.live_rows()
+        if not live.size:
+            self.clear()
+            return
+        self._chunks = [self._chunks[i] for i in live]
+        self._metadata = MetadataIndex.build(self._chunks)
+        self._codes = self._codes[live]
+        if self._vectors is not None:
+            self._vectors = self._vectors[live]
+
+    def clear(self) -> None:
+        """Clear the index"""
+        self._chunks = []
+        self._metadata = None
+        self._dimension = 0
+        self._codebooks = None
+        self._codes = None
+        self._vectors = None
+
+    def _rows(self, rows: np.ndarray) -> List[IndexedChunk]:
+        """Return the chunks at `rows` with their exact or decoded embedding."""
+        if self._vectors is not None:
+            # Row views, so a memory-mapped side array is not copied
+            vectors = [self._vectors[i] for i in rows.tolist()]
+        else:
+            codes = self._codes[rows]
+            vectors = np.stack(
+                [self._codebooks[m][codes[:, m]] for m in range(self.n_subvectors)],
+                axis=1,
+            ).reshape(len(rows), -1)[:, : self._dimension]
+        return [
+            replace(self._chunks[i], embedding=Embedding.from_list(vector))
+            for i, vector in zip(rows.tolist(), vectors)
+        ]
+
+    def _split(self, matrix: np.ndarray) -> np.ndarray:
+        """Reshape (n, d) rows into (n, n_subvectors, d / n_subvectors) slices.
+
+        Rows are zero-padded when d is not a multiple of n_subvectors, which
+        leaves inner products unchanged.
+        """
+        pad = -matrix.shape[1] % self.n_subvectors
+        if pad:
+            matrix = np.pad(matrix, ((0, 0), (0, pad)))
+        return matrix.reshape(len(matrix), self.n_subvectors, -1)
+
+    def _rerank(
+        self, candidates: np.ndarray, q: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Order candidate rows by their exact score, returning both."""
+        exact = self.metric.prepare(self._vectors[candidates])
+        scores = self.metric.scores(q, exact)
+        order = np.argsort(-scores, kind="stable")
+        return candidates[order], scores[order]
+
+
+def _strip(chunks: List[IndexedChunk]) -> List[IndexedChunk]:
+    """Drop the embeddings of rows; the codes stand in for them."""
+    return [replace(chunk, embedding=None) for chunk in chunks]
@@ -1,74 +1,294 @@
 from __future__ import annotations
 
+import bisect
+import operator
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Dict, Iterable, KeysView, List, Tuple
+from uuid import uuid4
 
-from app.domain.common.decorators import refresh_timestamp_after
+from app.domain.common.decorators import (
+    read_locked,
+    refresh_timestamp_after,
+    write_locked,
+)
 from app.domain.common.embedding import Embedding
-from app.domain.documents import DocumentId
+from app.domain.common.locks import ReadWriteLock
+from app.domain.documents import ChunkId, DocumentId
+from app.domain.libraries.distance_metric import DistanceMetric
 from app.domain.libraries.indexed_chunk import IndexedChunk
 from app.domain.libraries.library_id import LibraryId
 from app.domain.libraries.library_metadata import LibraryMetadata
 from app.domain.libraries.vector_index import VectorIndex
 from app.errors import InvalidEntityError
 
+# Membership changes kept for repositories at least, however small the library
+_MEMBERSHIP_LOG_MIN = 1024
 
-def invalidate_index_after(fn: Callable) -> Callable:
-    def wrapper(self: Library, *args, **kwargs) -> Any:
-        result = fn(self, *args, **kwargs)
-        # keep behavior: mark index invalid & refresh metadata
-        self.invalidate_index()
-        return result
 
-    return wrapper
-
-
-@dataclass
+@dataclass(init=False)
 class Library:
     """Library Aggregate Root - stores references to documents (DocumentId).
 
     Documents themselves are separate aggregates; this Library keeps only
-    DocumentId references and manages index state.
+    DocumentId references and manages index state. The references are kept
+    in an insertion-ordered dict, so adding, removing and checking a
+    document take constant time while `documents` keeps the order they
+    were added in.
+
+    Once indexed, document and chunk changes are applied to the vector index
+    in place, so the library stays searchable without a full re-index.
+
+    Full re-indexes build a new index next to the live one and swap it in,
+    so searches keep using the previous index until the new one is ready.
+
+    Searches share the library's read lock and run in parallel; mutations
+    take its write lock, so readers never see a half-applied change.
     """
 
     id: LibraryId
-    documents: List[DocumentId]
     metadata: LibraryMetadata
     vector_index: VectorIndex
-    _is_indexed: bool = field(default=False, init=False, repr=False)
+    _documents: Dict[DocumentId, None] = field(repr=False)
+    _is_indexed: bool = field(repr=False)
+    # Bumped on every change to the indexed content, so an index built from
+    # an older snapshot is never swapped in
+    _index_revision: int = field(repr=False)
+    # Bumped on every change that can alter search results, swaps included
+    _index_version: int = field(repr=False)
+    # Bumped whenever document references are added or removed
+    _documents_version: int = field(repr=False)
+    # References added (True) or removed (False) with the documents_version
+    # they were made at, so repositories can store membership changes
+    # without comparing every reference; it covers changes made after
+    # _membership_log_start
+    _membership_log: List[Tuple[int, DocumentId, bool]] = field(
+        repr=False, compare=False
+    )
+    _membership_log_start: int = field(repr=False, compare=False)
+    # Tells this copy apart from others with the same id, such as one
+    # reloaded from storage, whose versions start again from 0
+    _instance_id: str = field(repr=False, compare=False)
+    _lock: ReadWriteLock = field(repr=False, compare=False)
 
-    def __post_init__(self):
-        if not self.metadata:
+    def __init__(
+        self,
+        id: LibraryId,
+        documents: List[DocumentId],
+        metadata: LibraryMetadata,
+        vector_index: VectorIndex,
+    ):
+        if not metadata:
             raise InvalidEntityError("Library metadata cannot be empty")
+        self.id = id
+        self.metadata = metadata
+        self.vector_index = vector_index
+        self._is_indexed = False
+        self._index_revision = 0
+        self._index_version = 0
+        self._documents_version = 0
+        self._instance_id = uuid4().hex
+        self._lock = ReadWriteLock()
+        self.documents = documents
+
+    @property
+    def documents(self) -> List[DocumentId]:
+        """The document references in the order they were added, as a new list."""
+        return list(self._documents)
+
+    @documents.setter
+    def documents(self, documents: List[DocumentId]) -> None:
+        members = dict.fromkeys(documents)
+        if len(members) != len(documents):
+            raise InvalidEntityError(
+                f"Document ids must be unique within library {self.id}"
+            )
+        self._documents = members
+        self._documents_version += 1
+        self._membership_log = []
+        self._membership_log_start = self._documents_version
+
+    @property
+    def documents_view(self) -> KeysView[DocumentId]:
+        """Live read-only view of the document references in order.
+
+        Hold `lock.read()` while using it; unlike `documents`, nothing is
+        copied.
+        """
+        return self._documents.keys()
+
+    @write_locked
+    @refresh_timestamp_after
+    def add_document(
+        self, document_id: DocumentId, chunks: List[IndexedChunk] | None = None
+    ) -> None:
+        """Add a document reference and index its `chunks`.
 
-    @invalidate_index_after
-    def add_document(self, document_id: DocumentId) -> None:
-        if any(d == document_id for d in self.documents):
+        Without `chunks`, an indexed library cannot know what to index, so
+        its index is invalidated instead. Chunks the index rejects leave the
+        library unchanged.
+        """
+        if document_id in self._documents:
             raise InvalidEntityError(
                 f"Document {document_id} already exists in library {self.id}"
             )
-        self.documents.append(document_id)
+        if chunks is None:
+            if self.is_indexed:
+                self.invalidate_index()
+        else:
+            self.upsert_chunks(chunks)
+        self._documents[document_id] = None
+        self._documents_version += 1
+        self._log_membership([document_id], True)
+        self._index_revision += 1
+        self._index_version += 1
 
-    @invalidate_index_after
+    @write_locked
+    @refresh_timestamp_after
+    def add_documents(
+        self, document_ids: List[DocumentId], chunks: List[IndexedChunk]
+    ) -> None:
+        """Add several document references and index their `chunks` at once.
+
+        Either all documents are added or, if any is already present or the
+        index rejects the chunks, none.
+        """
+        added = dict.fromkeys(document_ids)
+        duplicates = [d for d in added if d in self._documents]
+        if duplicates or len(added) != len(document_ids):
+            raise InvalidEntityError(
+                f"Document {(duplicates or document_ids)[0]} already exists"
+                f" in library {self.id}"
+            )
+        self.upsert_chunks(chunks)
+        self._documents.update(added)
+        self._documents_version += 1
+        self._log_membership(added, True)
+        self._index_revision += 1
+        self._index_version += 1
+
+    @write_locked
+    @refresh_timestamp_after
     def remove_document(self, document_id: DocumentId) -> None:
-        self.documents = [d for d in self.documents if d != document_id]
+        self.remove_documents([document_id])
+
+    @write_locked
+    @refresh_timestamp_after
+    def remove_documents(self, document_ids: Iterable[DocumentId]) -> None:
+        """Drop several document references and their indexed chunks at once.
+
+        Ids not in the library are ignored.
+        """
+        removed = {d for d in document_ids if d in self._documents}
+        for document_id in removed:
+            del self._documents[document_id]
+        if removed:
+            self._documents_version += 1
+            self._log_membership(removed, False)
+        self._index_revision += 1
+        self._index_version += 1
+        if self.is_indexed and removed:
+            self.remove_chunks(self.vector_index.chunk_ids_of(removed))
+
+    @read_locked
+    def membership_changes_since(
+        self, version: int
+    ) -> Tuple[List[DocumentId], List[DocumentId]] | None:
+        """Return the references added and removed after `documents_version`
+        was `version`, or None when changes that old are no longer kept.
+
+        A reference removed and added again since is in both lists, as it
+        moved to the end; apply the removals first.
+        """
+        if not self._membership_log_start <= version <= self._documents_version:
+            return None
+        start = bisect.bisect_right(
+            self._membership_log, version, key=operator.itemgetter(0)
+        )
+        # Membership before and after the changes, in the order last changed
+        changes: Dict[DocumentId, Tuple[bool, bool]] = {}
+        for _, document_id, member in self._membership_log[start:]:
+            before, _ = changes.pop(document_id, (not member, member))
+            changes[document_id] = (before, member)
+        added = [d for d, (_, after) in changes.items() if after]
+        removed = [d for d, (before, _) in changes.items() if before]
+        return added, removed
+
+    def _log_membership(self, document_ids: Iterable[DocumentId], added: bool) -> None:
+        log = self._membership_log
+        log.extend((self._documents_version, d, added) for d in document_ids)
+        if len(log) <= max(_MEMBERSHIP_LOG_MIN, 2 * len(self._documents)):
+            return
+        # Drop the older half, keeping every change of a version or none
+        cut = len(log) // 2
+        self._membership_log_start = log[cut - 1][0]
+        while cut < len(log) and log[cut][0] == self._membership_log_start:
+            cut += 1
+        del log[:cut]
+
+    @write_locked
+    @refresh_timestamp_after
+    def upsert_chunks(self, chunks: List[IndexedChunk]) -> None:
+        """Insert or replace chunks in the index; no-op until indexed."""
+        self._index_revision += 1
+        self._index_version += 1
+        if self.is_indexed and chunks:
+            self.vector_index.add(chunks)
+
+    @write_locked
+    @refresh_timestamp_after
+    def remove_chunks(self, chunk_ids: Iterable[ChunkId]) -> None:
+        """Drop chunks from the index; no-op until indexed."""
+        self._index_revision += 1
+        self._index_version += 1
+        if not self.is_indexed:
+            return
+        self.vector_index.remove(chunk_ids)
+        if not self.vector_index.size:
+            # Nothing left to search: behave like a library never indexed
+            self.invalidate_index()
 
+    @write_locked
     @refresh_timestamp_after
     def index(self, chunks: List[IndexedChunk]) -> None:
         """Build the vector index from the provided indexed chunks"""
+        self.swap_index(self.build_index(chunks), self._index_revision)
+
+    def build_index(self, chunks: List[IndexedChunk]) -> VectorIndex:
+        """Build a new index configured like the live one, leaving it untouched.
+
+        Safe to call off the request path; pair it with `swap_index`.
+        """
         if not chunks:
             raise InvalidEntityError("No chunks provided for indexing")
-        if self.is_indexed:
-            self.vector_index.clear()
+        index = self.vector_index.spawn()
+        index.build(chunks)
+        return index
+
+    @write_locked
+    @refresh_timestamp_after
+    def swap_index(self, index: VectorIndex, revision: int) -> bool:
+        """Replace the live index with `index` if it is still up to date.
 
-        self.vector_index.build(chunks)
+        `revision` is the `index_revision` read before collecting the chunks
+        `index` was built from; if the library changed since, nothing is
+        swapped and False is returned.
+        """
+        if revision != self._index_revision:
+            return False
+        self.vector_index = index
         self._is_indexed = True
+        self._index_version += 1
+        return True
 
+    @write_locked
     @refresh_timestamp_after
     def invalidate_index(self) -> None:
         self._is_indexed = False
+        self._index_revision += 1
+        self._index_version += 1
         self.vector_index.clear()
 
+    @write_locked
     @refresh_timestamp_after
     def update_metadata(
         self,
@@ -87,41 +307,144 @@ class Library:
         self.metadata = self.metadata.updated()
 
     def contains_document(self, document_id: DocumentId) -> bool:
-        return any(d == document_id for d in self.documents)
+        return document_id in self._documents
 
+    @read_locked
     def find_similar_chunks(
         self,
         query_embedding: Embedding,
         k: int,
         filters: Dict[str, Any] | None = None,
         min_similarity: float = 0.0,
+        search_params: Dict[str, Any] | None = None,
     ) -> List[Tuple[IndexedChunk, float]]:
-        """Find the k most similar chunks to the given query embedding"""
+        """Find the k most similar chunks to the given query embedding.
+
+        Similarity follows the library's distance metric. Chunks below
+        `min_similarity` are pruned inside the index, so up to k chunks above
+        the threshold are returned.
+
+        `search_params` tunes index-specific behaviour (e.g. `ef_search` for
+        HNSW) and must be supported by the library's index.
+        """
         if k <= 0:
             raise InvalidEntityError("k must be a positive integer")
-        results = self.vector_index.search(query_embedding, k, filters)
+        self._check_search_params(search_params)
+        results = self.vector_index.search(
+            query_embedding,
+            k,
+            filters,
+            min_similarity=min_similarity,
+            **(search_params or {}),
+        )
+        return self._score(results, query_embedding, min_similarity)
+
+    @read_locked
+    def find_similar_chunks_batch(
+        self,
+        query_embeddings: List[Embedding],
+        ks: List[int],
+        filters: List[Dict[str, Any] | None],
+        min_similarities: List[float],
+        search_params: List[Dict[str, Any] | None] | None = None,
+    ) -> List[List[Tuple[IndexedChunk, float]]]:
+        """Run several similarity searches against the index in one pass.
+
+        The i-th result list answers the i-th query embedding with its own
+        k, filters and minimum similarity.
+        """
+        if (
+            not len(query_embeddings)
+            == len(ks)
+            == len(filters)
+            == len(min_similarities)
+        ):
+            raise InvalidEntityError(
+                "Every query needs its own k, filters and threshold"
+            )
+        if any(k <= 0 for k in ks):
+            raise InvalidEntityError("k must be a positive integer")
+        for params in search_params or []:
+            self._check_search_params(params)
+        batches = self.vector_index.search_batch(
+            query_embeddings, ks, filters, search_params, min_similarities
+        )
+        return [
+            self._score(results, query, min_similarity)
+            for results, query, min_similarity in zip(
+                batches, query_embeddings, min_similarities
+            )
+        ]
 
-        # Compute similarity and filter
+    def _check_search_params(self, search_params: Dict[str, Any] | None) -> None:
+        unsupported = set(search_params or {}) - set(
+            self.vector_index.supported_search_params
+        )
+        if unsupported:
+            raise InvalidEntityError(
+                f"Unsupported search parameters for this index: {sorted(unsupported)}"
+            )
+        # Every supported parameter is a count; the index checks its range
+        for name, value in (search_params or {}).items():
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise InvalidEntityError(f"Search parameter {name} must be an integer")
+
+    def _score(
+        self,
+        results: List[IndexedChunk],
+        query_embedding: Embedding,
+        min_similarity: float,
+    ) -> List[Tuple[IndexedChunk, float]]:
+        # Compute exact similarity under the library's metric and filter
         scored: List[Tuple[IndexedChunk, float]] = []
         for chunk in results:
-            score = chunk.similarity(query_embedding)
+            score = self.metric.similarity(chunk.embedding, query_embedding)
             if score >= min_similarity:
                 scored.append((chunk, score))
 
         return scored
 
+    @read_locked
     def get_indexed_chunks(self) -> List[IndexedChunk]:
         """Return all indexed chunks currently indexed for this library."""
         return list(self.vector_index.get_chunks() or [])
 
+    @property
+    def lock(self) -> ReadWriteLock:
+        """Hold `lock.read()` to see a consistent state across several calls."""
+        return self._lock
+
+    @property
+    def metric(self) -> DistanceMetric:
+        return self.vector_index.metric
+
+    @property
+    def index_revision(self) -> int:
+        return self._index_revision
+
+    @property
+    def index_version(self) -> int:
+        """Changes whenever search results may change; keys cached results."""
+        return self._index_version
+
+    @property
+    def instance_id(self) -> str:
+        """Unique to this in-memory copy; versions are only comparable within it."""
+        return self._instance_id
+
+    @property
+    def documents_version(self) -> int:
+        """Changes whenever document references are added or removed."""
+        return self._documents_version
+
     @property
     def is_indexed(self) -> bool:
         return self._is_indexed
 
     @property
     def document_count(self) -> int:
-        return len(self.documents)
+        return len(self._documents)
 
     @property
     def total_documents(self) -> int:
-        return len(self.documents)
+        return len(self._documents)
@@ -1,8 +1,13 @@
+from typing import List
+
 from app.domain.documents import DocumentRepository
 from app.domain.libraries import Library
 from app.domain.libraries.indexed_chunk import IndexedChunk
 from app.errors import NotFoundError
 
+# Documents fetched per repository call while collecting chunks
+_BATCH_SIZE = 500
+
 
 class LibraryIndexerService:
     """Indexes a library with the chunks from its documents"""
@@ -14,12 +19,24 @@ class LibraryIndexerService:
 
     def index(self, library: Library) -> None:
         """Load the library's documents, and index the collection of all the chunks they contain"""
+        library.index(self.collect_chunks(library))
+
+    def collect_chunks(self, library: Library) -> List[IndexedChunk]:
+        """Return the chunks of every document in the library, in order.
+
+        Documents are fetched in batches, so storage backends can stream
+        them with a few large reads instead of one lookup per document.
+        """
         indexed_chunks = []
-        for document_id in library.documents:
-            document = self._document_repository.find_by_id(document_id)
-            if not document:
-                raise NotFoundError(f"Document {document_id} not found")
-            for chunk in document.chunks:
-                indexed_chunks.append(IndexedChunk.from_chunk(chunk, document_id))
-
-        library.index(indexed_chunks)
+        document_ids = list(library.documents)
+        for start in range(0, len(document_ids), _BATCH_SIZE):
+            batch = document_ids[start : start + _BATCH_SIZE]
+            documents = self._document_repository.find_by_ids(batch)
+            if len(documents) != len(batch):
+                found = {document.id for document in documents}
+                missing = next(d for d in batch if d not in found)
+                raise NotFoundError(f"Document {missing} not found")
+            for document in documents:
+                for chunk in document.chunks:
+                    indexed_chunks.append(IndexedChunk.from_chunk(chunk, document.id))
+        return indexed_chunks
@@ -3,6 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List
 
+from app.domain.documents.document_id import DocumentId
 from app.domain.libraries.library import Library
 from app.domain.libraries.library_id import LibraryId
 
@@ -25,6 +26,29 @@ class LibraryRepository(ABC):
         """Get all libraries"""
         raise NotImplementedError()
 
+    def find_page(self, after: LibraryId | None, limit: int) -> List[Library]:
+        """Return up to `limit` libraries ordered by id, starting after `after`.
+
+        Backends that can seek to `after` without loading every library
+        override this.
+        """
+        libraries = sorted(self.find_all(), key=lambda library: str(library.id))
+        if after is not None:
+            libraries = [lib for lib in libraries if str(lib.id) > str(after)]
+        return libraries[:limit]
+
+    def find_by_document(self, document_id: DocumentId) -> List[Library]:
+        """Return the libraries holding a reference to `document_id`.
+
+        Backends that can look libraries up by document without loading
+        every library override this.
+        """
+        return [
+            library
+            for library in self.find_all()
+            if library.contains_document(document_id)
+        ]
+
     @abstractmethod
     def delete(self, library_id: LibraryId) -> None:
         """Delete library"""
@@ -1,15 +1,88 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Container, Dict, FrozenSet, Iterable, List, Tuple
+
+import numpy as np
 
 from app.domain.common import Embedding
+from app.domain.documents.chunk_id import ChunkId
 from app.domain.documents.chunk_metadata import ChunkMetadataFilterDict
+from app.domain.documents.document_id import DocumentId
+from app.domain.libraries.distance_metric import DistanceMetric
 from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.domain.libraries.indexes.metadata_index import MetadataIndex
+from app.errors import InvalidEntityError
 
 
 @dataclass
 class VectorIndex(ABC):
-    """Interface for indexing strategies"""
+    """Interface for indexing strategies
+
+    Every index ranks chunks by its `metric`, chosen when the library is
+    created.
+
+    Built indexes are maintained in place: `add` inserts chunks and `remove`
+    tombstones them in `_metadata`, so searches skip them immediately. Once
+    tombstones exceed `compaction_threshold` of the rows, the index is
+    rebuilt from its live chunks.
+    """
+
+    # Names of the keyword arguments `search` accepts on top of the common
+    # ones (e.g. a tunable candidate list size for approximate indexes).
+    supported_search_params: ClassVar[FrozenSet[str]] = frozenset()
+    # Share of tombstoned rows that triggers a compaction
+    compaction_threshold: ClassVar[float] = 0.25
+
+    metric: DistanceMetric = DistanceMetric.COSINE
+
+    # Indexed chunks by row, including tombstoned ones
+    _chunks: List[IndexedChunk] = field(init=False, default_factory=list, repr=False)
+    # Metadata postings and tombstones over the rows of `_chunks`
+    _metadata: MetadataIndex | None = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        self.metric = DistanceMetric.parse(self.metric)
+
+    def params(self) -> Dict[str, Any]:
+        """Return the public constructor parameters of this index."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.init and not f.name.startswith("_")
+        }
+
+    def spawn(self) -> "VectorIndex":
+        """Return a new, empty index with the same configuration.
+
+        Only public constructor parameters are carried over, so the new
+        index shares no state with this one.
+        """
+        return type(self)(**self.params())
+
+    def export_state(self) -> Tuple[List[IndexedChunk], Dict[str, Any]]:
+        """Return the indexed rows and the built structures, for snapshots.
+
+        The state maps private field names to arrays or plain values, plus
+        `deleted_rows` for tombstoned rows. Arrays are not copied.
+        """
+        state = {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name.startswith("_") and f.name not in ("_chunks", "_metadata")
+        }
+        deleted = self._metadata.deleted_rows() if self._metadata else None
+        state["deleted_rows"] = deleted if deleted is not None else np.empty(0, np.intp)
+        return list(self._chunks), state
+
+    def restore_state(self, chunks: List[IndexedChunk], state: Dict[str, Any]) -> None:
+        """Load rows and structures produced by `export_state`."""
+        state = dict(state)
+        deleted_rows = state.pop("deleted_rows")
+        self._chunks = list(chunks)
+        self._metadata = MetadataIndex.build(self._chunks)
+        self._metadata.delete_rows(deleted_rows)
+        for name, value in state.items():
+            setattr(self, name, value)
 
     @abstractmethod
     def build(self, chunks: List[IndexedChunk]) -> None:
@@ -18,17 +91,110 @@ class VectorIndex(ABC):
 
     @abstractmethod
     def search(
-        self, query: Embedding, k: int, filters: ChunkMetadataFilterDict | None = None
+        self,
+        query: Embedding,
+        k: int,
+        filters: ChunkMetadataFilterDict | None = None,
+        min_similarity: float | None = None,
     ) -> List[IndexedChunk]:
-        """Search the index for the k most similar chunks to the query embedding"""
+        """Search the index for the k most similar chunks to the query embedding
+
+        When `min_similarity` is given, chunks below it are pruned inside the
+        index, so up to k chunks above the threshold are returned.
+        """
         ...
 
+    def search_batch(
+        self,
+        queries: List[Embedding],
+        ks: List[int],
+        filters: List[ChunkMetadataFilterDict | None] | None = None,
+        search_params: List[Dict[str, Any] | None] | None = None,
+        min_similarities: List[float | None] | None = None,
+    ) -> List[List[IndexedChunk]]:
+        """Search the index for several queries, each with its own k, filters
+        and minimum similarity.
+
+        Results are returned in query order. The default runs each query
+        through `search`; implementations may override it to score all
+        queries together.
+        """
+        if len(ks) != len(queries):
+            raise InvalidEntityError("A k value is required for every query")
+        if filters is None:
+            filters = [None] * len(queries)
+        elif len(filters) != len(queries):
+            raise InvalidEntityError("Filters must be given for every query")
+        if search_params is None:
+            search_params = [None] * len(queries)
+        elif len(search_params) != len(queries):
+            raise InvalidEntityError("Search parameters must be given for every query")
+        if min_similarities is None:
+            min_similarities = [None] * len(queries)
+        elif len(min_similarities) != len(queries):
+            raise InvalidEntityError("Thresholds must be given for every query")
+        return [
+            self.search(q, k, f, s, **(p or {}))
+            for q, k, f, s, p in zip(
+                queries, ks, filters, min_similarities, search_params
+            )
+        ]
+
     @abstractmethod
     def clear(self) -> None:
         """Clear the index"""
         ...
 
-    @abstractmethod
+    @property
+    def size(self) -> int:
+        """Number of live chunks in the index."""
+        if self._metadata is None:
+            return len(self._chunks)
+        return len(self._chunks) - self._metadata.deleted_count
+
     def get_chunks(self) -> List[IndexedChunk]:
         """Return the chunks currently stored in the index."""
-        ...
+        if self._metadata is None or not self._metadata.deleted_count:
+            return list(self._chunks)
+        return [self._chunks[i] for i in self._metadata.live_rows()]
+
+    def chunk_ids_of(self, document_ids: Container[DocumentId]) -> List[ChunkId]:
+        """Return the ids of the live chunks belonging to `document_ids`."""
+        if self._metadata is None or not self._metadata.deleted_count:
+            rows = self._chunks
+        else:
+            rows = [self._chunks[i] for i in self._metadata.live_rows()]
+        return [chunk.id for chunk in rows if chunk.document_id in document_ids]
+
+    def add(self, chunks: List[IndexedChunk]) -> None:
+        """Insert chunks into the index; chunks already indexed are replaced.
+
+        The default rebuilds the index with the new chunks; implementations
+        that can insert in place override it.
+        """
+        if not chunks:
+            return
+        replaced = {chunk.id for chunk in chunks}
+        kept = [chunk for chunk in self.get_chunks() if chunk.id not in replaced]
+        self.build(kept + list(chunks))
+
+    def remove(self, chunk_ids: Iterable[ChunkId]) -> int:
+        """Remove chunks from the index and return how many were indexed."""
+        if self._metadata is None:
+            return 0
+        removed = self._metadata.delete(chunk_ids)
+        self._compact_if_needed()
+        return removed
+
+    def _compact_if_needed(self) -> None:
+        deleted = self._metadata.deleted_count
+        if deleted and deleted > self.compaction_threshold * self._metadata.size:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rebuild the index from its live chunks, dropping tombstoned rows."""
+        live = self.get_chunks()
+        if live:
+            self.build(live)
+        else:
+            self.clear()
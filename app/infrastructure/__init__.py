@@ -1,4 +1,25 @@
 from .in_memory_document_repository import InMemoryDocumentRepository
+from .in_memory_index_job_repository import InMemoryIndexJobRepository
 from .in_memory_library_repository import InMemoryLibraryRepository
+from .index_file_store import IndexFileStore
+from .logged_document_repository import LoggedDocumentRepository
+from .logged_library_repository import LoggedLibraryRepository
+from .snapshot import SnapshotService
+from .sqlite_database import SqliteDatabase
+from .sqlite_document_repository import SqliteDocumentRepository
+from .sqlite_library_repository import SqliteLibraryRepository
+from .write_ahead_log import WriteAheadLog
 
-__all__ = ["InMemoryDocumentRepository", "InMemoryLibraryRepository"]
+__all__ = [
+    "InMemoryDocumentRepository",
+    "InMemoryIndexJobRepository",
+    "InMemoryLibraryRepository",
+    "IndexFileStore",
+    "LoggedDocumentRepository",
+    "LoggedLibraryRepository",
+    "SnapshotService",
+    "SqliteDatabase",
+    "SqliteDocumentRepository",
+    "SqliteLibraryRepository",
+    "WriteAheadLog",
+]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from threading import RLock
-from typing import Dict
+from typing import Dict, Iterable, List
 
 from app.domain.documents import Document, DocumentId
 from app.domain.documents.document_repository import DocumentRepository
@@ -9,6 +9,13 @@ from app.errors import NotFoundError
 
 
 class InMemoryDocumentRepository(DocumentRepository):
+    """Keeps documents in a dict.
+
+    The repository lock only guards the dict and is held for a single
+    lookup or update, never while a document is read or changed; concurrent
+    use of one document is guarded by the aggregate's own read-write lock.
+    """
+
     def __init__(self):
         self._store: Dict[str, Document] = {}
         self._lock = RLock()
@@ -17,10 +24,20 @@ class InMemoryDocumentRepository(DocumentRepository):
         with self._lock:
             self._store[str(document.id)] = document
 
+    def save_many(self, documents: Iterable[Document]) -> None:
+        batch = {str(d.id): d for d in documents}
+        # One update under the lock, so a batch appears to readers all at once
+        with self._lock:
+            self._store.update(batch)
+
     def find_by_id(self, document_id: DocumentId) -> Document | None:
         with self._lock:
             return self._store.get(str(document_id))
 
+    def find_all(self) -> List[Document]:
+        with self._lock:
+            return list(self._store.values())
+
     def delete(self, document_id: DocumentId) -> None:
         with self._lock:
             removed = self._store.pop(str(document_id), None)
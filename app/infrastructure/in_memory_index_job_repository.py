@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from threading import RLock
+from typing import Dict, Optional
+
+from app.domain.libraries import IndexJob, IndexJobId
+from app.domain.libraries.index_job_repository import IndexJobRepository
+
+
+class InMemoryIndexJobRepository(IndexJobRepository):
+    def __init__(self):
+        self._store: Dict[str, IndexJob] = {}
+        self._lock = RLock()
+
+    def save(self, job: IndexJob) -> None:
+        with self._lock:
+            self._store[str(job.id)] = job
+
+    def find_by_id(self, job_id: IndexJobId) -> Optional[IndexJob]:
+        with self._lock:
+            return self._store.get(str(job_id))
+
+    def clear(self) -> None:
+        """Clear all stored jobs (thread-safe)."""
+        with self._lock:
+            self._store.clear()
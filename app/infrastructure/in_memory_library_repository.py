@@ -1,21 +1,87 @@
 from __future__ import annotations
 
+import bisect
 from threading import RLock
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+from app.domain.documents import DocumentId
 from app.domain.libraries import Library, LibraryId
 from app.domain.libraries.library_repository import LibraryRepository
 from app.errors import NotFoundError
 
 
 class InMemoryLibraryRepository(LibraryRepository):
+    """Keeps libraries in a dict.
+
+    The repository lock only guards its dicts and is held for a single
+    lookup or update, never while a library is searched or changed;
+    concurrent use of one library is guarded by the aggregate's own
+    read-write lock.
+
+    Library ids are also kept sorted, so `find_page` seeks to its cursor
+    with a binary search instead of scanning every id.
+
+    A reverse map from documents to the libraries referencing them answers
+    `find_by_document` without visiting every library. Saves refresh it
+    only when the library's references changed, with just the references
+    added or removed since the library was last saved.
+    """
+
     def __init__(self):
         self._store: Dict[str, Library] = {}
+        self._sorted_ids: List[str] = []
+        # Library ids by referenced document, and per library the instance,
+        # documents_version and references the map was last updated from
+        self._by_document: Dict[DocumentId, Set[str]] = {}
+        self._members: Dict[str, Tuple[Library, int, Set[DocumentId]]] = {}
         self._lock = RLock()
 
     def save(self, library: Library) -> None:
+        key = str(library.id)
+        with self._lock:
+            if key not in self._store:
+                bisect.insort(self._sorted_ids, key)
+            self._store[key] = library
+        while True:
+            with self._lock:
+                if self._store.get(key) is not library or self._members_current(
+                    key, library, library.documents_version
+                ):
+                    return
+                previous = self._members.get(key)
+            # Read the references outside the repository lock: the library's
+            # write lock may be held for a while, e.g. while it is indexed
+            with library.lock.read():
+                version = library.documents_version
+                changes = None
+                if previous is not None and previous[0] is library:
+                    changes = library.membership_changes_since(previous[1])
+                if changes is None:
+                    current = set(library.documents)
+            with self._lock:
+                if self._store.get(key) is not library or self._members_current(
+                    key, library, version
+                ):
+                    return
+                if self._members.get(key) is not previous:
+                    # Another save updated the map meanwhile; start over
+                    continue
+                if changes is not None:
+                    added, removed = changes
+                    current = previous[2]
+                    current.difference_update(removed)
+                    current.update(added)
+                else:
+                    before = previous[2] if previous is not None else set()
+                    removed, added = before - current, current - before
+                self._update_members(key, removed, added)
+                self._members[key] = (library, version, current)
+                return
+
+    def find_by_document(self, document_id: DocumentId) -> List[Library]:
         with self._lock:
-            self._store[str(library.id)] = library
+            keys = self._by_document.get(document_id, ())
+            return [self._store[key] for key in keys]
 
     def find_by_id(self, library_id: LibraryId) -> Optional[Library]:
         with self._lock:
@@ -25,9 +91,22 @@ class InMemoryLibraryRepository(LibraryRepository):
         with self._lock:
             return list(self._store.values())
 
+    def find_page(self, after: LibraryId | None, limit: int) -> List[Library]:
+        start = str(after) if after is not None else ""
+        with self._lock:
+            first = bisect.bisect_right(self._sorted_ids, start)
+            return [self._store[key] for key in self._sorted_ids[first : first + limit]]
+
     def delete(self, library_id: LibraryId) -> None:
         with self._lock:
             removed = self._store.pop(str(library_id), None)
+            if removed is not None:
+                del self._sorted_ids[
+                    bisect.bisect_left(self._sorted_ids, str(library_id))
+                ]
+            previous = self._members.pop(str(library_id), None)
+            if previous is not None:
+                self._update_members(str(library_id), previous[2], ())
         if removed is None:
             raise NotFoundError(f"Library {library_id} not found")
 
@@ -39,3 +118,25 @@ class InMemoryLibraryRepository(LibraryRepository):
         """Clear all stored libraries (thread-safe)."""
         with self._lock:
             self._store.clear()
+            self._sorted_ids.clear()
+            self._by_document.clear()
+            self._members.clear()
+
+    def _members_current(self, key: str, library: Library, version: int) -> bool:
+        previous = self._members.get(key)
+        return (
+            previous is not None and previous[0] is library and previous[1] >= version
+        )
+
+    def _update_members(
+        self, key: str, removed: Iterable[DocumentId], added: Iterable[DocumentId]
+    ) -> None:
+        for document_id in removed:
+            holders = self._by_document.get(document_id)
+            if holders is None:
+                continue
+            holders.discard(key)
+            if not holders:
+                del self._by_document[document_id]
+        for document_id in added:
+            self._by_document.setdefault(document_id, set()).add(key)
@@ -0,0 +1,101 @@
+"""Built vector indexes stored as flat `.npy` files and opened with memmap.
+
+Each library's index lives in its own directory:
+
+    <root>/<library id>/CURRENT          name of the live version
+    <root>/<library id>/<version>/       index.json plus one .npy per array
+
+A save writes and fsyncs a new version directory and then replaces
+`CURRENT`, so readers, and restarts after a crash, always see a complete
+index. Opening maps the arrays copy-on-write:
+pages come straight from the OS page cache and are shared by every process
+that opens the same version, while any in-place update stays private to the
+process that makes it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+from uuid import uuid4
+
+import numpy as np
+
+from app.domain.libraries import LibraryId, VectorIndex
+from app.infrastructure.snapshot import export_index, import_index, sync_directory
+
+INDEX_FILE_VERSION = 1
+
+
+class IndexFileStore:
+    """Saves built indexes to disk and maps them back into memory."""
+
+    def __init__(self, directory: str | Path):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def save(self, library_id: LibraryId, index: VectorIndex) -> None:
+        arrays, description = export_index(index)
+        root = self._directory / str(library_id)
+        version = uuid4().hex
+        target = root / version
+        created = not root.exists()
+        target.mkdir(parents=True)
+        for name, array in arrays.items():
+            with _synced(target / _file_name(name)) as f:
+                np.save(f, np.ascontiguousarray(array))
+        description["format"] = INDEX_FILE_VERSION
+        description["files"] = list(arrays)
+        with _synced(target / "index.json") as f:
+            f.write(json.dumps(description).encode())
+        sync_directory(target)
+
+        # Every file of the version is on disk before CURRENT points at it
+        pointer = root / f"CURRENT.{version}"
+        with _synced(pointer) as f:
+            f.write(version.encode())
+        os.replace(pointer, root / "CURRENT")
+        sync_directory(root)
+        if created:
+            sync_directory(self._directory)
+        # Processes still mapping older versions keep their pages until they
+        # unmap them, so the files can go right away
+        for entry in root.iterdir():
+            if entry.is_dir() and entry.name != version:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def open(self, library_id: LibraryId) -> VectorIndex | None:
+        """Map the saved index of a library; None if there is none."""
+        root = self._directory / str(library_id)
+        try:
+            version = (root / "CURRENT").read_text().strip()
+            description = json.loads((root / version / "index.json").read_text())
+        except FileNotFoundError:
+            return None
+        if description.get("format") != INDEX_FILE_VERSION:
+            return None
+        arrays = {
+            name: np.load(root / version / _file_name(name), mmap_mode="c")
+            for name in description["files"]
+        }
+        return import_index(description, arrays)
+
+    def delete(self, library_id: LibraryId) -> None:
+        shutil.rmtree(self._directory / str(library_id), ignore_errors=True)
+
+
+@contextmanager
+def _synced(path: Path) -> Iterator[BinaryIO]:
+    """Open `path` for writing and fsync it once the block completes."""
+    with open(path, "wb") as f:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _file_name(array_name: str) -> str:
+    return array_name.replace("/", ".") + ".npy"
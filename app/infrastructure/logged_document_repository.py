@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, Document, DocumentId
+from app.domain.documents.document_repository import DocumentRepository
+from app.infrastructure.serialization import metadata_to_dict
+from app.infrastructure.write_ahead_log import WriteAheadLog, chunk_record
+
+# Chunk fields as last logged; compared by identity, since chunk updates
+# always replace the text, embedding and metadata objects
+_LoggedChunk = Tuple[str, Embedding, ChunkMetadata]
+
+
+class LoggedDocumentRepository(DocumentRepository):
+    """Records every change to a wrapped repository in a write-ahead log.
+
+    Each `save` logs only the chunks added, changed or removed since the
+    document was last logged, and returns once the record is durable.
+    """
+
+    def __init__(self, repository: DocumentRepository, log: WriteAheadLog):
+        self._repository = repository
+        self._log = log
+        self._lock = RLock()
+        self._logged: Dict[DocumentId, Dict[ChunkId, _LoggedChunk]] = {}
+
+    def save(self, document: Document) -> None:
+        self.save_many([document])
+
+    def save_many(self, documents: Iterable[Document]) -> None:
+        sequence = 0
+        with self._lock:
+            for document in documents:
+                sequence = self._log_save(document)
+        self._log.wait(sequence)
+
+    def _log_save(self, document: Document) -> int:
+        previous = self._logged.get(document.id)
+        with document.lock.read():
+            current = {c.id: (c.text, c.embedding, c.metadata) for c in document.chunks}
+            if previous is None:
+                changed = list(document.chunks)
+                removed = []
+            else:
+                changed = [
+                    c
+                    for c in document.chunks
+                    if c.id not in previous
+                    or any(a is not b for a, b in zip(previous[c.id], current[c.id]))
+                ]
+                removed = [str(i) for i in previous if i not in current]
+            header = {
+                "type": "document",
+                "id": str(document.id),
+                "metadata": metadata_to_dict(document.metadata),
+                "full": previous is None,
+                "upsert": [chunk_record(c) for c in changed],
+                "delete": removed,
+            }
+            embeddings = [c.embedding for c in changed]
+        self._repository.save(document)
+        self._logged[document.id] = current
+        return self._log.append(header, embeddings)
+
+    def find_by_id(self, document_id: DocumentId) -> Optional[Document]:
+        return self._repository.find_by_id(document_id)
+
+    def find_by_ids(self, document_ids: Iterable[DocumentId]) -> List[Document]:
+        return self._repository.find_by_ids(document_ids)
+
+    def find_all(self) -> List[Document]:
+        return self._repository.find_all()
+
+    def delete(self, document_id: DocumentId) -> None:
+        with self._lock:
+            self._repository.delete(document_id)
+            self._logged.pop(document_id, None)
+            sequence = self._log.append(
+                {"type": "document_deleted", "id": str(document_id)}
+            )
+        self._log.wait(sequence)
+
+    def exists(self, document_id: DocumentId) -> bool:
+        return self._repository.exists(document_id)
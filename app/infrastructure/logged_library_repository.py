@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
+
+from app.domain.documents import DocumentId
+from app.domain.libraries import Library, LibraryId
+from app.domain.libraries.library_repository import LibraryRepository
+from app.infrastructure.serialization import metadata_to_dict
+from app.infrastructure.write_ahead_log import WriteAheadLog
+
+
+class LoggedLibraryRepository(LibraryRepository):
+    """Records every change to a wrapped repository in a write-ahead log.
+
+    Each `save` logs the metadata, the index state and the documents added
+    or removed since the library was last logged, and returns once the
+    record is durable. Documents removed and added again are in both lists
+    and are replayed removals first. Index contents are not logged; replay re-indexes.
+    """
+
+    def __init__(self, repository: LibraryRepository, log: WriteAheadLog):
+        self._repository = repository
+        self._log = log
+        self._lock = RLock()
+        # Per library, the instance and documents_version last logged and
+        # the references logged so far
+        self._logged: Dict[LibraryId, Tuple[Library, int, Dict[DocumentId, None]]] = {}
+
+    def save(self, library: Library) -> None:
+        with self._lock:
+            previous = self._logged.get(library.id)
+            with library.lock.read():
+                version = library.documents_version
+                changes = None
+                if previous is not None and previous[0] is library:
+                    changes = library.membership_changes_since(previous[1])
+                if changes is not None:
+                    added, removed = changes
+                    current = previous[2]
+                    for document_id in removed:
+                        current.pop(document_id, None)
+                    current.update(dict.fromkeys(added))
+                else:
+                    # A library not logged from this instance before, or
+                    # changed too much since: compare every reference
+                    before = previous[2] if previous is not None else {}
+                    current = dict.fromkeys(library.documents)
+                    added = [d for d in current if d not in before]
+                    removed = [d for d in before if d not in current]
+                record = {
+                    "type": "library",
+                    "id": str(library.id),
+                    "metadata": metadata_to_dict(library.metadata),
+                    "full": previous is None,
+                    "indexed": library.is_indexed,
+                    "added": [str(d) for d in added],
+                    "removed": [str(d) for d in removed],
+                }
+                if previous is None:
+                    index = library.vector_index
+                    record["index"] = {
+                        "type": type(index).__name__,
+                        "params": index.params(),
+                    }
+            self._repository.save(library)
+            self._logged[library.id] = (library, version, current)
+            sequence = self._log.append(record)
+        self._log.wait(sequence)
+
+    def find_by_id(self, library_id: LibraryId) -> Optional[Library]:
+        return self._repository.find_by_id(library_id)
+
+    def find_all(self) -> List[Library]:
+        return self._repository.find_all()
+
+    def find_page(self, after: LibraryId | None, limit: int) -> List[Library]:
+        return self._repository.find_page(after, limit)
+
+    def find_by_document(self, document_id: DocumentId) -> List[Library]:
+        return self._repository.find_by_document(document_id)
+
+    def delete(self, library_id: LibraryId) -> None:
+        with self._lock:
+            self._repository.delete(library_id)
+            self._logged.pop(library_id, None)
+            sequence = self._log.append(
+                {"type": "library_deleted", "id": str(library_id)}
+            )
+        self._log.wait(sequence)
+
+    def exists(self, library_id: LibraryId) -> bool:
+        return self._repository.exists(library_id)
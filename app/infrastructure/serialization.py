@@ -0,0 +1,55 @@
+"""Plain-data encodings shared by snapshots and the write-ahead log."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict
+
+from app.domain.documents import ChunkMetadata, DocumentMetadata
+from app.domain.libraries import (
+    BruteForceIndex,
+    HNSWIndex,
+    IVFIndex,
+    KDTreeIndex,
+    LibraryMetadata,
+    PQIndex,
+)
+
+# Index classes by name, as stored alongside their parameters
+INDEX_TYPES = {
+    cls.__name__: cls
+    for cls in (BruteForceIndex, HNSWIndex, IVFIndex, KDTreeIndex, PQIndex)
+}
+
+
+def metadata_to_dict(
+    metadata: ChunkMetadata | DocumentMetadata | LibraryMetadata,
+) -> Dict[str, Any]:
+    """JSON-ready fields of a metadata value object, timestamps included."""
+    fields = {
+        name: getattr(metadata, name)
+        for name in (
+            "title",
+            "author",
+            "name",
+            "description",
+            "source",
+            "page_number",
+            "custom_fields",
+        )
+        if hasattr(metadata, name)
+    }
+    fields["created_at"] = metadata.created_at.isoformat()
+    fields["updated_at"] = metadata.updated_at.isoformat()
+    return fields
+
+
+def metadata_from_dict(cls, fields: Dict[str, Any]):
+    """Inverse of `metadata_to_dict` for the metadata class `cls`."""
+    fields = dict(fields)
+    updated_at = datetime.fromisoformat(fields.pop("updated_at"))
+    metadata = cls(
+        **{**fields, "created_at": datetime.fromisoformat(fields["created_at"])}
+    )
+    metadata.updated_at = updated_at
+    return metadata
@@ -0,0 +1,574 @@
+"""Binary snapshots of the in-memory repositories.
+
+A snapshot is a single uncompressed NumPy `.npz` archive:
+
+- `embeddings` / `embedding_offsets`: every distinct embedding, stored once
+  in one contiguous float32 block
+- `strings` / `string_offsets`: a UTF-8 pool holding chunk texts, sources
+  and custom fields (as JSON)
+- `metadata/*`: a columnar table of every distinct chunk metadata
+- `chunks/*` and `rows/*`: columnar tables of document chunks and of the
+  rows of built indexes, pointing into the pools above
+- `index/<n>/*`: the arrays of each built index
+- `manifest`: JSON describing documents, libraries and index parameters
+
+Chunks and index rows share embeddings and metadata in memory, so each is
+written and restored once. Restoring rebuilds the aggregates without
+re-running any index build.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.domain.common import Embedding
+from app.domain.documents import (
+    Chunk,
+    ChunkId,
+    ChunkMetadata,
+    Document,
+    DocumentId,
+    DocumentMetadata,
+    DocumentRepository,
+)
+from app.domain.libraries import (
+    IndexedChunk,
+    Library,
+    LibraryId,
+    LibraryMetadata,
+    LibraryRepository,
+    VectorIndex,
+)
+from app.errors import ApplicationError
+from app.infrastructure.serialization import (
+    INDEX_TYPES,
+    metadata_from_dict,
+    metadata_to_dict,
+)
+from app.infrastructure.write_ahead_log import WriteAheadLog, replay_write_ahead_log
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend cyclic garbage collection while allocating many objects.
+
+    Snapshots create or visit millions of acyclic objects; letting the
+    collector rescan them every few thousand allocations dominates the run.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _to_datetime64(values: List[datetime]) -> np.ndarray:
+    """UTC microsecond timestamps; naive datetimes are read as UTC."""
+    return np.array(
+        [
+            v.astimezone(timezone.utc).replace(tzinfo=None) if v.tzinfo else v
+            for v in values
+        ],
+        dtype="datetime64[us]",
+    )
+
+
+def _from_datetime64(values: np.ndarray) -> List[datetime]:
+    return [v.replace(tzinfo=timezone.utc) for v in values.astype(datetime).tolist()]
+
+
+class _Pools:
+    """Deduplicating pools of ids, strings, embeddings and metadata.
+
+    Strings and ids are deduplicated by value; embeddings and metadata,
+    which chunks share with the index rows built from them, by identity.
+    """
+
+    def __init__(self):
+        self._strings: Dict[str, int] = {}
+        self._embedding_rows: Dict[int, int] = {}
+        self._embeddings: List[Embedding] = []
+        self._metadata_rows: Dict[int, int] = {}
+        self._metadata: List[ChunkMetadata] = []
+
+    def string(self, value: str) -> int:
+        return self._strings.setdefault(value, len(self._strings))
+
+    def embedding(self, embedding: Embedding | None) -> int:
+        if embedding is None:
+            return -1
+        row = self._embedding_rows.get(id(embedding))
+        if row is None:
+            row = self._embedding_rows[id(embedding)] = len(self._embeddings)
+            self._embeddings.append(embedding)
+        return row
+
+    def metadata(self, metadata: ChunkMetadata | None) -> int:
+        if metadata is None:
+            return -1
+        row = self._metadata_rows.get(id(metadata))
+        if row is None:
+            row = self._metadata_rows[id(metadata)] = len(self._metadata)
+            self._metadata.append(metadata)
+        return row
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        # Metadata strings are pooled first, as they add to the string pool
+        metadata = self._metadata
+        sources = np.fromiter(
+            (self.string(m.source) for m in metadata), np.int64, len(metadata)
+        )
+        custom_fields = np.fromiter(
+            (self.string(json.dumps(m.custom_fields)) for m in metadata),
+            np.int64,
+            len(metadata),
+        )
+        encoded = [s.encode("utf-8") for s in self._strings]
+        lengths = np.fromiter((e.dimension for e in self._embeddings), np.int64)
+        values = (
+            np.concatenate([e.values for e in self._embeddings])
+            if self._embeddings
+            else np.empty(0, np.float32)
+        )
+        return {
+            "strings": np.frombuffer(b"".join(encoded), np.uint8),
+            "string_offsets": np.concatenate(
+                ([0], np.cumsum([len(e) for e in encoded], dtype=np.int64))
+            ),
+            "embeddings": values,
+            "embedding_offsets": np.concatenate(([0], np.cumsum(lengths))),
+            "metadata/source": sources,
+            "metadata/has_page": np.fromiter(
+                (m.page_number is not None for m in metadata), bool, len(metadata)
+            ),
+            "metadata/page": np.fromiter(
+                (m.page_number or 0 for m in metadata), np.int64, len(metadata)
+            ),
+            "metadata/created_at": _to_datetime64([m.created_at for m in metadata]),
+            "metadata/updated_at": _to_datetime64([m.updated_at for m in metadata]),
+            "metadata/custom_fields": custom_fields,
+        }
+
+
+class _Decoder:
+    """Rebuilds pooled values, sharing objects the way the writer found them."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        blob = arrays["strings"].tobytes()
+        offsets = arrays["string_offsets"].tolist()
+        self.strings = [
+            blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])
+        ]
+        self.embeddings = Embedding.from_block(
+            arrays["embeddings"], arrays["embedding_offsets"]
+        )
+        self.metadata = self._metadata(arrays)
+        self._ids: Dict[bytes, UUID] = {}
+
+    def _metadata(self, arrays: Dict[str, np.ndarray]) -> List[ChunkMetadata]:
+        custom_fields: Dict[int, Dict[str, Any]] = {}
+        result = []
+        for source, has_page, page, created, updated, custom in zip(
+            arrays["metadata/source"].tolist(),
+            arrays["metadata/has_page"].tolist(),
+            arrays["metadata/page"].tolist(),
+            _from_datetime64(arrays["metadata/created_at"]),
+            _from_datetime64(arrays["metadata/updated_at"]),
+            arrays["metadata/custom_fields"].tolist(),
+        ):
+            if custom not in custom_fields:
+                custom_fields[custom] = json.loads(self.strings[custom])
+            metadata = ChunkMetadata(
+                source=self.strings[source],
+                page_number=page if has_page else None,
+                created_at=created,
+                custom_fields=dict(custom_fields[custom]),
+            )
+            metadata.updated_at = updated
+            result.append(metadata)
+        return result
+
+    def uuids(self, array: np.ndarray) -> List[UUID]:
+        raw = array.tobytes()
+        result = []
+        for i in range(0, len(raw), 16):
+            key = raw[i : i + 16]
+            value = self._ids.get(key)
+            if value is None:
+                value = self._ids[key] = UUID(bytes=key)
+            result.append(value)
+        return result
+
+    def lookup(self, pool: List[Any], rows: np.ndarray) -> List[Any]:
+        return [pool[row] if row >= 0 else None for row in rows.tolist()]
+
+
+def _encode_columns(
+    pools: _Pools, ids: List[UUID], texts: List[str], embeddings, metadata
+) -> Dict[str, np.ndarray]:
+    return {
+        "id": np.frombuffer(b"".join(i.bytes for i in ids), np.uint8).reshape(-1, 16),
+        "text": np.fromiter(map(pools.string, texts), np.int64, len(texts)),
+        "embedding": np.fromiter(map(pools.embedding, embeddings), np.int64, len(ids)),
+        "metadata": np.fromiter(map(pools.metadata, metadata), np.int64, len(ids)),
+    }
+
+
+def _encode_rows(pools: _Pools, rows: List[IndexedChunk]) -> Dict[str, np.ndarray]:
+    columns = _encode_columns(
+        pools,
+        [r.id.value for r in rows],
+        [r.text for r in rows],
+        [r.embedding for r in rows],
+        [r.metadata for r in rows],
+    )
+    columns["document"] = np.frombuffer(
+        b"".join(r.document_id.value.bytes for r in rows), np.uint8
+    ).reshape(-1, 16)
+    return columns
+
+
+def _decode_rows(
+    pools: _Decoder, arrays: Dict[str, np.ndarray], prefix: str
+) -> List[IndexedChunk]:
+    return [
+        IndexedChunk(
+            id=ChunkId(chunk_id),
+            document_id=DocumentId(document_id),
+            text=text,
+            embedding=embedding,
+            metadata=metadata,
+        )
+        for chunk_id, document_id, text, embedding, metadata in zip(
+            pools.uuids(arrays[f"{prefix}id"]),
+            pools.uuids(arrays[f"{prefix}document"]),
+            pools.lookup(pools.strings, arrays[f"{prefix}text"]),
+            pools.lookup(pools.embeddings, arrays[f"{prefix}embedding"]),
+            pools.lookup(pools.metadata, arrays[f"{prefix}metadata"]),
+        )
+    ]
+
+
+def _split_state(
+    state: Dict[str, Any],
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Separate an exported index state into arrays and JSON-ready values."""
+    arrays, values = {}, {}
+    for name, value in state.items():
+        if isinstance(value, np.ndarray):
+            arrays[name] = value
+        else:
+            values[name] = value.item() if isinstance(value, np.generic) else value
+    return arrays, values
+
+
+def export_index(index: VectorIndex) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Flatten a built index into named arrays and a JSON-ready description.
+
+    The arrays hold the index structures and its rows, in the same layout
+    as a snapshot; `import_index` reverses this.
+    """
+    pools = _Pools()
+    with _gc_paused():
+        rows, state = index.export_state()
+        state_arrays, values = _split_state(state)
+        arrays = {f"state/{name}": value for name, value in state_arrays.items()}
+        for column, value in _encode_rows(pools, rows).items():
+            arrays[f"rows/{column}"] = value
+        arrays.update(pools.arrays())
+    description = {
+        "type": type(index).__name__,
+        "params": index.params(),
+        "arrays": list(state_arrays),
+        "values": values,
+    }
+    return arrays, description
+
+
+def import_index(
+    description: Dict[str, Any], arrays: Dict[str, np.ndarray]
+) -> VectorIndex:
+    """Rebuild an index from `export_index` output without re-running the build.
+
+    Arrays are used as given, so memory-mapped arrays stay mapped.
+    """
+    index: VectorIndex = INDEX_TYPES[description["type"]](**description["params"])
+    with _gc_paused():
+        rows = _decode_rows(_Decoder(arrays), arrays, "rows/")
+        state = dict(description["values"])
+        for name in description["arrays"]:
+            state[name] = arrays[f"state/{name}"]
+        index.restore_state(rows, state)
+    return index
+
+
+def write_snapshot(
+    path: str | Path, documents: List[Document], libraries: List[Library]
+) -> None:
+    """Write documents and libraries, with their built indexes, to `path`.
+
+    The archive is written next to `path`, flushed to disk and moved into
+    place, so a crash mid-write never leaves a truncated snapshot behind and
+    the snapshot is durable once this returns.
+    """
+    with _gc_paused():
+        arrays = _encode(documents, libraries)
+
+    path = Path(path)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+    sync_directory(path.parent)
+
+
+def sync_directory(directory: str | Path) -> None:
+    """fsync a directory, so files created or renamed in it survive a crash."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _encode(
+    documents: List[Document], libraries: List[Library]
+) -> Dict[str, np.ndarray]:
+    pools = _Pools()
+    arrays: Dict[str, np.ndarray] = {}
+
+    # Chunk fields are read under each document's lock, so an update in
+    # progress is captured whole or not at all
+    ids: List[Any] = []
+    texts: List[str] = []
+    embeddings: List[Embedding] = []
+    chunk_metadata: List[ChunkMetadata] = []
+    document_entries = []
+    for document in documents:
+        with document.lock.read():
+            for c in document.chunks:
+                ids.append(c.id.value)
+                texts.append(c.text)
+                embeddings.append(c.embedding)
+                chunk_metadata.append(c.metadata)
+            document_entries.append(
+                {
+                    "id": str(document.id),
+                    "metadata": metadata_to_dict(document.metadata),
+                    "chunks": len(document.chunks),
+                }
+            )
+    for column, values in _encode_columns(
+        pools, ids, texts, embeddings, chunk_metadata
+    ).items():
+        arrays[f"chunks/{column}"] = values
+
+    rows: List[IndexedChunk] = []
+    library_entries = []
+    for n, library in enumerate(libraries):
+        with library.lock.read():
+            index = library.vector_index
+            index_entry: Dict[str, Any] = {
+                "type": type(index).__name__,
+                "params": index.params(),
+                "indexed": library.is_indexed,
+            }
+            if library.is_indexed:
+                index_rows, state = index.export_state()
+                rows.extend(index_rows)
+                state_arrays, index_entry["values"] = _split_state(state)
+                index_entry["rows"] = len(index_rows)
+                index_entry["arrays"] = list(state_arrays)
+                for name, value in state_arrays.items():
+                    arrays[f"index/{n}/{name}"] = value
+            library_entries.append(
+                {
+                    "id": str(library.id),
+                    "documents": [str(d) for d in library.documents],
+                    "metadata": metadata_to_dict(library.metadata),
+                    "index": index_entry,
+                }
+            )
+    for column, values in _encode_rows(pools, rows).items():
+        arrays[f"rows/{column}"] = values
+
+    arrays.update(pools.arrays())
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "documents": document_entries,
+        "libraries": library_entries,
+    }
+    arrays["manifest"] = np.frombuffer(json.dumps(manifest).encode("utf-8"), np.uint8)
+    return arrays
+
+
+def read_snapshot(path: str | Path) -> Tuple[List[Document], List[Library]]:
+    """Load the documents and libraries stored by `write_snapshot`."""
+    with np.load(path) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    with _gc_paused():
+        return _decode(arrays)
+
+
+def _decode(arrays: Dict[str, np.ndarray]) -> Tuple[List[Document], List[Library]]:
+    manifest = json.loads(arrays["manifest"].tobytes().decode("utf-8"))
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ApplicationError(
+            f"Unsupported snapshot version: {manifest.get('version')}"
+        )
+    pools = _Decoder(arrays)
+
+    chunks = [
+        Chunk(id=ChunkId(chunk_id), text=text, embedding=embedding, metadata=metadata)
+        for chunk_id, text, embedding, metadata in zip(
+            pools.uuids(arrays["chunks/id"]),
+            pools.lookup(pools.strings, arrays["chunks/text"]),
+            pools.lookup(pools.embeddings, arrays["chunks/embedding"]),
+            pools.lookup(pools.metadata, arrays["chunks/metadata"]),
+        )
+    ]
+    documents = []
+    start = 0
+    for entry in manifest["documents"]:
+        end = start + entry["chunks"]
+        documents.append(
+            Document(
+                id=DocumentId.from_string(entry["id"]),
+                chunks=chunks[start:end],
+                metadata=metadata_from_dict(DocumentMetadata, entry["metadata"]),
+            )
+        )
+        start = end
+
+    rows = _decode_rows(pools, arrays, "rows/")
+    libraries = []
+    start = 0
+    for n, entry in enumerate(manifest["libraries"]):
+        metadata = metadata_from_dict(LibraryMetadata, entry["metadata"])
+        index_entry = entry["index"]
+        index: VectorIndex = INDEX_TYPES[index_entry["type"]](**index_entry["params"])
+        library = Library(
+            id=LibraryId.from_string(entry["id"]),
+            documents=[DocumentId.from_string(d) for d in entry["documents"]],
+            metadata=metadata,
+            vector_index=index,
+        )
+        if index_entry["indexed"]:
+            end = start + index_entry["rows"]
+            state = dict(index_entry["values"])
+            for name in index_entry["arrays"]:
+                state[name] = arrays[f"index/{n}/{name}"]
+            index.restore_state(rows[start:end], state)
+            library.swap_index(index, library.index_revision)
+            # Swapping refreshes updated_at; keep the saved timestamp
+            library.metadata = metadata
+            start = end
+        libraries.append(library)
+
+    return documents, libraries
+
+
+class SnapshotService:
+    """Saves the repositories to a snapshot file and restores them.
+
+    `start` saves every `interval_seconds` on a background thread and `stop`
+    takes a final snapshot. Aggregates are captured one at a time without
+    pausing writers; each aggregate's read lock is held only while it is
+    captured.
+
+    With a write-ahead `log`, each snapshot rotates the log and drops the
+    segments it covers, and `restore` replays what was logged since. The
+    repositories given here must be the unlogged ones, so restoring does
+    not log everything again.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        document_repository: DocumentRepository,
+        library_repository: LibraryRepository,
+        interval_seconds: float = 300.0,
+        log: WriteAheadLog | None = None,
+    ):
+        self._path = Path(path)
+        self._documents = document_repository
+        self._libraries = library_repository
+        self._interval = interval_seconds
+        self._log = log
+        # Serializes saves so periodic and shutdown snapshots never overlap
+        self._save_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def save(self) -> None:
+        with self._save_lock:
+            # Changes logged from here on may or may not make it into the
+            # snapshot; replaying them on top of it is harmless
+            segment = self._log.rotate() if self._log is not None else None
+            write_snapshot(
+                self._path, self._documents.find_all(), self._libraries.find_all()
+            )
+            # The snapshot is on disk now, so the segments it covers can go
+            if segment is not None:
+                self._log.discard_before(segment)
+
+    def restore(self) -> bool:
+        """Load the snapshot and replay the log; False if there was neither."""
+        restored = False
+        if self._path.exists():
+            documents, libraries = read_snapshot(self._path)
+            for document in documents:
+                self._documents.save(document)
+            for library in libraries:
+                self._libraries.save(library)
+            restored = True
+        if self._log is not None:
+            with _gc_paused():
+                replayed = replay_write_ahead_log(
+                    self._log, self._documents, self._libraries
+                )
+            restored = restored or replayed > 0
+        return restored
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop periodic snapshots and write a final one."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            try:
+                self.save()
+            except Exception:
+                # A failed snapshot (e.g. a full disk) must not end periodic
+                # snapshots; the log keeps every change until the next one
+                logger.exception("Periodic snapshot to %s failed", self._path)
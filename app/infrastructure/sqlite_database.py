@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    document_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    source TEXT NOT NULL,
+    page_number INTEGER,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    custom_fields TEXT NOT NULL,
+    PRIMARY KEY (document_id, position)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS chunks_by_id ON chunks (document_id, id);
+CREATE TABLE IF NOT EXISTS libraries (
+    id TEXT PRIMARY KEY,
+    metadata TEXT NOT NULL,
+    index_type TEXT NOT NULL,
+    index_params TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS library_documents (
+    library_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    document_id TEXT NOT NULL,
+    PRIMARY KEY (library_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS library_documents_by_document
+    ON library_documents (document_id);
+"""
+
+
+class SqliteDatabase:
+    """SQLite database file shared by the SQLite repositories.
+
+    The database runs in WAL mode, so readers never wait for the writer.
+    Each thread gets its own connection, opened on first use and reused for
+    the thread's lifetime.
+    """
+
+    def __init__(self, path: str | Path, busy_timeout_seconds: float = 30.0):
+        self._path = str(path)
+        self._timeout = busy_timeout_seconds
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # executescript manages its own transaction
+        self.connection().executescript(_SCHEMA)
+        self._migrate()
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode: transactions are opened explicitly below
+            connection = sqlite3.connect(
+                self._path,
+                timeout=self._timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Run several queries against one consistent view of the data."""
+        with self._transaction("BEGIN") as connection:
+            yield connection
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction, committed on success.
+
+        The write lock is taken upfront, so concurrent writers queue on the
+        busy timeout instead of failing when upgrading a read transaction.
+        """
+        with self._transaction("BEGIN IMMEDIATE") as connection:
+            yield connection
+
+    def _migrate(self) -> None:
+        """Bring databases created by earlier versions up to `_SCHEMA`."""
+        with self.write() as connection:
+            columns = {
+                row[1] for row in connection.execute("PRAGMA table_info(libraries)")
+            }
+            if "version" not in columns:
+                connection.execute(
+                    "ALTER TABLE libraries"
+                    " ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def close(self) -> None:
+        """Close every connection opened so far."""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    @contextmanager
+    def _transaction(self, begin: str) -> Iterator[sqlite3.Connection]:
+        connection = self.connection()
+        if connection.in_transaction:
+            # Nested use joins the enclosing transaction
+            yield connection
+            return
+        connection.execute(begin)
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
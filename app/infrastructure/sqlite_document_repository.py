@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import weakref
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.domain.common import Embedding
+from app.domain.common.embedding import FLOAT32_LE
+from app.domain.documents import (
+    Chunk,
+    ChunkId,
+    ChunkMetadata,
+    Document,
+    DocumentId,
+    DocumentMetadata,
+)
+from app.domain.documents.document_repository import DocumentRepository
+from app.errors import NotFoundError
+from app.infrastructure.serialization import metadata_from_dict, metadata_to_dict
+from app.infrastructure.sqlite_database import SqliteDatabase
+
+# Documents per query when loading many at once; keeps the number of bound
+# parameters well below SQLite's limit
+_BATCH_SIZE = 500
+
+
+class SqliteDocumentRepository(DocumentRepository):
+    """Stores documents and their chunks in SQLite.
+
+    Embeddings are stored as little-endian float32 BLOBs and wrapped without
+    copying when read back. Documents are loaded on demand, so the corpus
+    does not need to fit in memory.
+
+    Documents in use are kept in a weak identity map, so concurrent requests
+    for the same document share one aggregate and its lock instead of each
+    loading a copy. Saves read the document inside the write transaction,
+    which SQLite serializes, so the last save always writes every change
+    made before it.
+
+    Saving a document this repository loaded or saved before writes only
+    the chunks changed since. New chunks go after the highest position in
+    use, so removals never renumber the rest.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self._database = database
+        self._documents: weakref.WeakValueDictionary[str, Document] = (
+            weakref.WeakValueDictionary()
+        )
+        # Per document id, the instance and chunks_version last written
+        self._written: Dict[str, Tuple[weakref.ref[Document], int]] = {}
+        self._lock = Lock()
+
+    def save(self, document: Document) -> None:
+        self.save_many([document])
+
+    def save_many(self, documents: Iterable[Document]) -> None:
+        documents = list(documents)
+        with self._database.write() as connection:
+            rows = []
+            replaced = []
+            chunk_rows = []
+            removed_rows = []
+            upserted_rows = []
+            written = []
+            for d in documents:
+                key = str(d.id)
+                with self._lock:
+                    previous = self._written.get(key)
+                with d.lock.read():
+                    rows.append((key, json.dumps(metadata_to_dict(d.metadata))))
+                    changes = None
+                    if previous is not None and previous[0]() is d:
+                        changes = d.chunk_changes_since(previous[1])
+                    if changes is None:
+                        replaced.append((key,))
+                        chunk_rows.extend(
+                            (key, position, *_chunk_row(c))
+                            for position, c in enumerate(d.chunks)
+                        )
+                    else:
+                        changed, removed = changes
+                        removed_rows.extend((key, str(i)) for i in removed)
+                        upserted_rows.extend(
+                            (key, key, *_chunk_row(c)) for c in changed
+                        )
+                    written.append((key, d, d.chunks_version))
+            connection.executemany(
+                "INSERT INTO documents (id, metadata) VALUES (?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET metadata = excluded.metadata",
+                rows,
+            )
+            connection.executemany("DELETE FROM chunks WHERE document_id = ?", replaced)
+            connection.executemany(_INSERT_CHUNK, chunk_rows)
+            connection.executemany(
+                "DELETE FROM chunks WHERE document_id = ? AND id = ?", removed_rows
+            )
+            connection.executemany(_UPSERT_CHUNK, upserted_rows)
+        with self._lock:
+            for key, d, version in written:
+                self._documents[key] = d
+                self._remember(key, d, version)
+
+    def find_by_id(self, document_id: DocumentId) -> Optional[Document]:
+        documents = self.find_by_ids([document_id])
+        return documents[0] if documents else None
+
+    def find_by_ids(self, document_ids: Iterable[DocumentId]) -> List[Document]:
+        ids = [str(document_id) for document_id in document_ids]
+        found: Dict[str, Document] = {}
+        with self._database.read() as connection:
+            for start in range(0, len(ids), _BATCH_SIZE):
+                found.update(self._load(connection, ids[start : start + _BATCH_SIZE]))
+        return [found[i] for i in ids if i in found]
+
+    def find_all(self) -> List[Document]:
+        with self._database.read() as connection:
+            ids = [row[0] for row in connection.execute("SELECT id FROM documents")]
+            documents = []
+            for start in range(0, len(ids), _BATCH_SIZE):
+                batch = ids[start : start + _BATCH_SIZE]
+                loaded = self._load(connection, batch)
+                documents.extend(loaded[i] for i in batch if i in loaded)
+        return documents
+
+    def delete(self, document_id: DocumentId) -> None:
+        with self._database.write() as connection:
+            deleted = connection.execute(
+                "DELETE FROM documents WHERE id = ?", (str(document_id),)
+            ).rowcount
+            connection.execute(
+                "DELETE FROM chunks WHERE document_id = ?", (str(document_id),)
+            )
+        with self._lock:
+            self._documents.pop(str(document_id), None)
+            self._written.pop(str(document_id), None)
+        if not deleted:
+            raise NotFoundError(f"Document {document_id} not found")
+
+    def exists(self, document_id: DocumentId) -> bool:
+        row = (
+            self._database.connection()
+            .execute("SELECT 1 FROM documents WHERE id = ?", (str(document_id),))
+            .fetchone()
+        )
+        return row is not None
+
+    def _load(
+        self, connection: sqlite3.Connection, ids: Sequence[str]
+    ) -> Dict[str, Document]:
+        """Load a batch of documents with two queries, keyed by id.
+
+        Documents already in the identity map are returned from it.
+        """
+        with self._lock:
+            shared = {i: d for i in ids if (d := self._documents.get(i)) is not None}
+        ids = [i for i in ids if i not in shared]
+        if not ids:
+            return shared
+        placeholders = ",".join("?" * len(ids))
+        documents = {
+            document_id: Document(
+                id=DocumentId.from_string(document_id),
+                chunks=[],
+                metadata=metadata_from_dict(DocumentMetadata, json.loads(metadata)),
+            )
+            for document_id, metadata in connection.execute(
+                f"SELECT id, metadata FROM documents WHERE id IN ({placeholders})",
+                ids,
+            )
+        }
+        rows = connection.execute(
+            "SELECT document_id, id, text, embedding, source, page_number,"
+            " created_at, updated_at, custom_fields FROM chunks"
+            f" WHERE document_id IN ({placeholders})"
+            " ORDER BY document_id, position",
+            ids,
+        )
+        chunks: Dict[str, List[Chunk]] = {document_id: [] for document_id in documents}
+        for (
+            document_id,
+            chunk_id,
+            text,
+            embedding,
+            source,
+            page_number,
+            created_at,
+            updated_at,
+            custom_fields,
+        ) in rows:
+            metadata = ChunkMetadata(
+                source=source,
+                page_number=page_number,
+                created_at=datetime.fromisoformat(created_at),
+                custom_fields=json.loads(custom_fields),
+            )
+            metadata.updated_at = datetime.fromisoformat(updated_at)
+            chunks[document_id].append(
+                Chunk(
+                    id=ChunkId.from_string(chunk_id),
+                    text=text,
+                    embedding=Embedding.from_buffer(embedding),
+                    metadata=metadata,
+                )
+            )
+        for document_id, document in documents.items():
+            document.chunks = chunks[document_id]
+        with self._lock:
+            for document_id, document in documents.items():
+                # Another thread may have loaded or saved it meanwhile
+                shared_document = self._documents.setdefault(document_id, document)
+                if shared_document is document:
+                    self._remember(document_id, document, document.chunks_version)
+                documents[document_id] = shared_document
+        return shared | documents
+
+    def _remember(self, key: str, document: Document, version: int) -> None:
+        """Record the chunks_version `document` was written or loaded at.
+
+        Call with `_lock` held. The entry goes away with the document.
+        """
+
+        def forget(ref: weakref.ref[Document]) -> None:
+            # Runs during garbage collection, so `_lock` cannot be taken; a
+            # newer entry dropped by a race only costs a full write
+            if self._written.get(key, (None,))[0] is ref:
+                self._written.pop(key, None)
+
+        previous = self._written.get(key)
+        if previous is not None and previous[0]() is document:
+            self._written[key] = (previous[0], version)
+        else:
+            self._written[key] = (weakref.ref(document, forget), version)
+
+
+_INSERT_CHUNK = (
+    "INSERT INTO chunks (document_id, position, id, text, embedding, source,"
+    " page_number, created_at, updated_at, custom_fields)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# Changed chunks keep their position; new ones go after the last one
+_UPSERT_CHUNK = (
+    "INSERT INTO chunks (document_id, position, id, text, embedding, source,"
+    " page_number, created_at, updated_at, custom_fields)"
+    " VALUES (?, (SELECT COALESCE(MAX(position) + 1, 0) FROM chunks"
+    " WHERE document_id = ?), ?, ?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT (document_id, id) DO UPDATE SET text = excluded.text,"
+    " embedding = excluded.embedding, source = excluded.source,"
+    " page_number = excluded.page_number, created_at = excluded.created_at,"
+    " updated_at = excluded.updated_at, custom_fields = excluded.custom_fields"
+)
+
+
+def _chunk_row(c: Chunk) -> Tuple[Any, ...]:
+    """Column values of a chunk row after `document_id` and `position`."""
+    return (
+        str(c.id),
+        c.text,
+        c.embedding.values.astype(FLOAT32_LE, copy=False).tobytes(),
+        c.metadata.source,
+        c.metadata.page_number,
+        c.metadata.created_at.isoformat(),
+        c.metadata.updated_at.isoformat(),
+        json.dumps(c.metadata.custom_fields),
+    )
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from threading import Lock, RLock
+from typing import Dict, List, Optional, Tuple
+
+from app.domain.documents import DocumentId
+from app.domain.libraries import Library, LibraryId, LibraryMetadata, VectorIndex
+from app.domain.libraries.library_repository import LibraryRepository
+from app.errors import NotFoundError
+from app.infrastructure.index_file_store import IndexFileStore
+from app.infrastructure.serialization import (
+    INDEX_TYPES,
+    metadata_from_dict,
+    metadata_to_dict,
+)
+from app.infrastructure.sqlite_database import SqliteDatabase
+
+
+class SqliteLibraryRepository(LibraryRepository):
+    """Stores libraries, their document references and index settings in SQLite.
+
+    Vector indexes stay in memory: libraries loaded from the database are
+    kept in an identity map, so every caller shares the same aggregate and
+    its index. Each save bumps the library's version; a cached library
+    whose version no longer matches the database (because another worker
+    saved it) is reloaded on the next lookup.
+
+    Saving a cached library writes only the document references added or
+    removed since it was loaded or last saved. New references go after the
+    highest position in use, so removals never renumber the rest.
+
+    With an `index_store`, each newly built index is also written to disk
+    and libraries loaded later (after a restart, or by another worker)
+    map it instead of starting unindexed. Once an index is changed in place
+    its files are dropped, as they no longer match it.
+    """
+
+    def __init__(
+        self, database: SqliteDatabase, index_store: IndexFileStore | None = None
+    ):
+        self._database = database
+        self._index_store = index_store
+        self._lock = RLock()
+        # Loaded libraries with the version and documents_version they were
+        # loaded or saved at
+        self._libraries: Dict[str, Tuple[Library, int, int]] = {}
+        # Index and revision last written to the index store, per library
+        self._stored_indexes: Dict[str, Tuple[VectorIndex, int]] = {}
+        self._index_lock = Lock()
+
+    def save(self, library: Library) -> None:
+        key = str(library.id)
+        with self._lock:
+            cached = self._libraries.get(key)
+        with library.lock.read():
+            index = library.vector_index
+            row = (
+                key,
+                json.dumps(metadata_to_dict(library.metadata)),
+                type(index).__name__,
+                json.dumps(index.params()),
+            )
+            documents_version = library.documents_version
+            changes = None
+            if cached is not None and cached[0] is library:
+                changes = library.membership_changes_since(cached[2])
+        with self._lock, self._database.write() as connection:
+            (version,) = connection.execute(
+                "INSERT INTO libraries (id, metadata, index_type, index_params)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET"
+                " metadata = excluded.metadata, index_type = excluded.index_type,"
+                " index_params = excluded.index_params, version = version + 1"
+                " RETURNING version",
+                row,
+            ).fetchone()
+            # The changes apply only to the rows this library was stored as,
+            # if no one has saved it since
+            stored = self._libraries.get(key)
+            if (
+                changes is not None
+                and stored is not None
+                and stored[0] is library
+                and stored[1:] == (version - 1, cached[2])
+            ):
+                self._update_documents(connection, key, *changes)
+            else:
+                with library.lock.read():
+                    documents_version = library.documents_version
+                    documents = library.documents
+                connection.execute(
+                    "DELETE FROM library_documents WHERE library_id = ?", (key,)
+                )
+                self._insert_documents(connection, key, 0, documents)
+            self._libraries[key] = (library, version, documents_version)
+        if self._index_store is not None:
+            # Outside the repository lock: writing a large index takes a while
+            self._store_index(library)
+
+    def find_by_id(self, library_id: LibraryId) -> Optional[Library]:
+        with self._lock, self._database.read() as connection:
+            row = connection.execute(
+                "SELECT version FROM libraries WHERE id = ?", (str(library_id),)
+            ).fetchone()
+            if row is None:
+                self._libraries.pop(str(library_id), None)
+                return None
+            return self._current(connection, str(library_id), row[0])
+
+    def find_all(self) -> List[Library]:
+        with self._lock, self._database.read() as connection:
+            rows = connection.execute("SELECT id, version FROM libraries").fetchall()
+            return [self._current(connection, *row) for row in rows]
+
+    def find_page(self, after: LibraryId | None, limit: int) -> List[Library]:
+        with self._lock, self._database.read() as connection:
+            rows = connection.execute(
+                "SELECT id, version FROM libraries WHERE id > ? ORDER BY id LIMIT ?",
+                (str(after) if after is not None else "", limit),
+            ).fetchall()
+            return [self._current(connection, *row) for row in rows]
+
+    def find_by_document(self, document_id: DocumentId) -> List[Library]:
+        with self._lock, self._database.read() as connection:
+            rows = connection.execute(
+                "SELECT id, version FROM libraries WHERE id IN (SELECT library_id"
+                " FROM library_documents WHERE document_id = ?)",
+                (str(document_id),),
+            ).fetchall()
+            return [self._current(connection, *row) for row in rows]
+
+    def delete(self, library_id: LibraryId) -> None:
+        with self._lock, self._database.write() as connection:
+            deleted = connection.execute(
+                "DELETE FROM libraries WHERE id = ?", (str(library_id),)
+            ).rowcount
+            connection.execute(
+                "DELETE FROM library_documents WHERE library_id = ?",
+                (str(library_id),),
+            )
+            self._libraries.pop(str(library_id), None)
+        if self._index_store is not None:
+            with self._index_lock:
+                self._stored_indexes.pop(str(library_id), None)
+                self._index_store.delete(library_id)
+        if not deleted:
+            raise NotFoundError(f"Library {library_id} not found")
+
+    def exists(self, library_id: LibraryId) -> bool:
+        row = (
+            self._database.connection()
+            .execute("SELECT 1 FROM libraries WHERE id = ?", (str(library_id),))
+            .fetchone()
+        )
+        return row is not None
+
+    @classmethod
+    def _update_documents(
+        cls,
+        connection: sqlite3.Connection,
+        library_id: str,
+        added: List[DocumentId],
+        removed: List[DocumentId],
+    ) -> None:
+        connection.executemany(
+            "DELETE FROM library_documents WHERE library_id = ? AND document_id = ?",
+            [(library_id, str(document_id)) for document_id in removed],
+        )
+        if added:
+            (last,) = connection.execute(
+                "SELECT MAX(position) FROM library_documents WHERE library_id = ?",
+                (library_id,),
+            ).fetchone()
+            start = last + 1 if last is not None else 0
+            cls._insert_documents(connection, library_id, start, added)
+
+    @staticmethod
+    def _insert_documents(
+        connection: sqlite3.Connection,
+        library_id: str,
+        start: int,
+        documents: List[DocumentId],
+    ) -> None:
+        connection.executemany(
+            "INSERT INTO library_documents (library_id, position, document_id)"
+            " VALUES (?, ?, ?)",
+            [
+                (library_id, position, str(document_id))
+                for position, document_id in enumerate(documents, start)
+            ],
+        )
+
+    def _current(
+        self, connection: sqlite3.Connection, library_id: str, version: int
+    ) -> Library:
+        """Return the cached library, reloading it if saved elsewhere since."""
+        cached = self._libraries.get(library_id)
+        if cached is not None and cached[1] == version:
+            return cached[0]
+        return self._load(connection, library_id)
+
+    def _load(self, connection: sqlite3.Connection, library_id: str) -> Library | None:
+        row = connection.execute(
+            "SELECT metadata, index_type, index_params, version FROM libraries"
+            " WHERE id = ?",
+            (library_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        metadata, index_type, index_params, version = row
+        documents = connection.execute(
+            "SELECT document_id FROM library_documents WHERE library_id = ?"
+            " ORDER BY position",
+            (library_id,),
+        )
+        library = Library(
+            id=LibraryId.from_string(library_id),
+            documents=[DocumentId.from_string(d) for (d,) in documents],
+            metadata=metadata_from_dict(LibraryMetadata, json.loads(metadata)),
+            vector_index=INDEX_TYPES[index_type](**json.loads(index_params)),
+        )
+        if self._index_store is not None:
+            index = self._index_store.open(library.id)
+            if index is not None:
+                library.swap_index(index, library.index_revision)
+                # Swapping refreshes updated_at; keep the stored timestamp
+                library.metadata = metadata_from_dict(
+                    LibraryMetadata, json.loads(metadata)
+                )
+                with self._index_lock:
+                    self._stored_indexes[library_id] = (index, library.index_revision)
+        self._libraries[library_id] = (library, version, library.documents_version)
+        return library
+
+    def _store_index(self, library: Library) -> None:
+        key = str(library.id)
+        with self._index_lock, library.lock.read():
+            stored = self._stored_indexes.get(key)
+            index, revision = library.vector_index, library.index_revision
+            if stored is not None and stored[0] is index and stored[1] == revision:
+                return
+            if library.is_indexed and (stored is None or stored[0] is not index):
+                self._index_store.save(library.id, index)
+                self._stored_indexes[key] = (index, revision)
+            elif stored is not None:
+                self._index_store.delete(library.id)
+                del self._stored_indexes[key]
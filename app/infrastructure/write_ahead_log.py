@@ -0,0 +1,351 @@
+"""Append-only write-ahead log of repository changes.
+
+The log is a directory of numbered segment files. Each record is framed as
+
+    <u32 length> <u32 crc32> <u32 header length> <JSON header> <float32 block>
+
+where the header describes the change and the block holds the embeddings of
+the chunks it writes, back to back. A torn or corrupt record ends its
+segment, so a crash mid-append loses at most the writes that were never
+acknowledged.
+
+Writers append under the log's lock and then wait for durability outside
+it: whichever writer finds no flush in progress writes and fsyncs every
+pending record at once, so concurrent writes share a single fsync.
+
+`SnapshotService` rotates to a new segment before each snapshot and deletes
+the older segments once the snapshot is on disk; `replay_write_ahead_log`
+applies the remaining records on top of the restored snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from app.domain.common import Embedding
+from app.domain.documents import (
+    Chunk,
+    ChunkId,
+    ChunkMetadata,
+    Document,
+    DocumentId,
+    DocumentMetadata,
+    DocumentRepository,
+)
+from app.domain.libraries import (
+    IndexedChunk,
+    Library,
+    LibraryId,
+    LibraryMetadata,
+    LibraryRepository,
+)
+from app.errors import ApplicationError
+from app.infrastructure.serialization import (
+    INDEX_TYPES,
+    metadata_from_dict,
+    metadata_to_dict,
+)
+
+# Frame prefix: payload length and its CRC32
+_FRAME = struct.Struct("<II")
+_HEADER_LENGTH = struct.Struct("<I")
+
+Record = Tuple[Dict[str, Any], List[Embedding]]
+
+
+def encode_record(
+    header: Dict[str, Any], embeddings: Sequence[Embedding] = ()
+) -> bytes:
+    """Frame a record header and its embeddings for the log."""
+    header = {**header, "dims": [e.dimension for e in embeddings]}
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    block = b"".join(e.values.astype("<f4", copy=False).tobytes() for e in embeddings)
+    payload = _HEADER_LENGTH.pack(len(encoded)) + encoded + block
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _decode_payload(payload: bytes) -> Record:
+    (length,) = _HEADER_LENGTH.unpack_from(payload)
+    start = _HEADER_LENGTH.size
+    header = json.loads(payload[start : start + length])
+    block = np.frombuffer(payload, dtype="<f4", offset=start + length)
+    offsets = np.concatenate(([0], np.cumsum(header["dims"], dtype=np.int64)))
+    return header, Embedding.from_block(block, offsets)
+
+
+def _read_segment(path: Path) -> Iterator[Record]:
+    data = path.read_bytes()
+    position = 0
+    while position + _FRAME.size <= len(data):
+        length, checksum = _FRAME.unpack_from(data, position)
+        start = position + _FRAME.size
+        payload = data[start : start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return  # torn tail of an interrupted append
+        yield _decode_payload(payload)
+        position = start + length
+
+
+class WriteAheadLog:
+    """Durable, append-only record of repository changes.
+
+    `append` queues a record and returns its sequence number; `wait` blocks
+    until that record is on disk. With `sync=False` records are flushed to
+    the OS but not fsynced, trading durability on power loss for speed.
+    """
+
+    def __init__(self, directory: str | Path, sync: bool = True):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._sync = sync
+        self._condition = threading.Condition()
+        self._pending: List[bytes] = []
+        self._appended = 0
+        self._durable = 0
+        self._flushing = False
+        self._error: BaseException | None = None
+        # Always start a fresh segment, so an earlier torn tail stays behind
+        segments = self.segments()
+        self._segment = segments[-1] + 1 if segments else 1
+        self._file = open(self._segment_path(self._segment), "ab")
+
+    def segments(self) -> List[int]:
+        """Numbers of the segment files on disk, oldest first."""
+        return sorted(
+            int(p.stem.split("-")[1]) for p in self._directory.glob("wal-*.log")
+        )
+
+    def append(
+        self, header: Dict[str, Any], embeddings: Sequence[Embedding] = ()
+    ) -> int:
+        record = encode_record(header, embeddings)
+        with self._condition:
+            self._pending.append(record)
+            self._appended += 1
+            return self._appended
+
+    def wait(self, sequence: int) -> None:
+        """Block until every record up to `sequence` is durable."""
+        with self._condition:
+            while self._durable < sequence:
+                if self._error is not None:
+                    raise ApplicationError(
+                        "Write-ahead log is unavailable"
+                    ) from self._error
+                if self._flushing:
+                    self._condition.wait()
+                    continue
+                # Become the flush leader for everything queued so far
+                batch, self._pending = self._pending, []
+                upto = self._appended
+                self._flushing = True
+                self._condition.release()
+                try:
+                    self._write(batch)
+                except BaseException as exc:
+                    self._error = exc
+                    raise
+                finally:
+                    self._condition.acquire()
+                    self._flushing = False
+                    self._condition.notify_all()
+                self._durable = upto
+
+    def write(
+        self, header: Dict[str, Any], embeddings: Sequence[Embedding] = ()
+    ) -> None:
+        self.wait(self.append(header, embeddings))
+
+    def rotate(self) -> int:
+        """Flush, then continue in a new segment; returns its number."""
+        with self._condition:
+            while self._flushing:
+                self._condition.wait()
+            self._write(self._pending)
+            self._pending = []
+            self._durable = self._appended
+            self._file.close()
+            self._segment += 1
+            self._file = open(self._segment_path(self._segment), "ab")
+            self._condition.notify_all()
+            return self._segment
+
+    def discard_before(self, segment: int) -> None:
+        """Delete the segments older than `segment`."""
+        for number in self.segments():
+            if number < segment:
+                self._segment_path(number).unlink(missing_ok=True)
+
+    def records(self) -> Iterator[Record]:
+        """Yield every record on disk, oldest first."""
+        for number in self.segments():
+            yield from _read_segment(self._segment_path(number))
+
+    def close(self) -> None:
+        with self._condition:
+            while self._flushing:
+                self._condition.wait()
+            self._write(self._pending)
+            self._pending = []
+            self._durable = self._appended
+            self._file.close()
+
+    def _write(self, batch: List[bytes]) -> None:
+        if not batch:
+            return
+        self._file.write(b"".join(batch))
+        self._file.flush()
+        if self._sync:
+            os.fsync(self._file.fileno())
+
+    def _segment_path(self, number: int) -> Path:
+        return self._directory / f"wal-{number:08d}.log"
+
+
+def chunk_record(chunk: Chunk) -> Dict[str, Any]:
+    return {
+        "id": str(chunk.id),
+        "text": chunk.text,
+        "metadata": metadata_to_dict(chunk.metadata),
+    }
+
+
+def replay_write_ahead_log(
+    log: WriteAheadLog,
+    document_repository: DocumentRepository,
+    library_repository: LibraryRepository,
+) -> int:
+    """Apply every logged change to the repositories; returns the record count.
+
+    Records are folded into plain per-aggregate state first and each touched
+    aggregate is saved once, without going through the domain handlers.
+    Indexed libraries whose documents changed are re-indexed once at the
+    end. Replaying a record already reflected in the repositories is a
+    no-op, so the log may overlap the snapshot it is applied to.
+    """
+    documents: Dict[DocumentId, Document] = {
+        d.id: d for d in document_repository.find_all()
+    }
+    libraries: Dict[LibraryId, Library] = {
+        lib.id: lib for lib in library_repository.find_all()
+    }
+    # Chunks and members keyed by id, in aggregate order, for touched aggregates
+    chunks: Dict[DocumentId, Dict[ChunkId, Chunk]] = {}
+    members: Dict[LibraryId, Dict[DocumentId, None]] = {}
+    indexed: Dict[LibraryId, bool] = {}
+    deleted_documents: set = set()
+    deleted_libraries: set = set()
+
+    count = 0
+    for header, embeddings in log.records():
+        count += 1
+        kind = header["type"]
+        if kind == "document":
+            document_id = DocumentId.from_string(header["id"])
+            metadata = metadata_from_dict(DocumentMetadata, header["metadata"])
+            document = documents.get(document_id)
+            if document is None:
+                document = documents[document_id] = Document(
+                    id=document_id, chunks=[], metadata=metadata
+                )
+            document.metadata = metadata
+            deleted_documents.discard(document_id)
+            if header["full"] or document_id not in chunks:
+                current = {} if header["full"] else {c.id: c for c in document.chunks}
+                chunks[document_id] = current
+            current = chunks[document_id]
+            for entry, embedding in zip(header["upsert"], embeddings):
+                chunk = Chunk(
+                    id=ChunkId.from_string(entry["id"]),
+                    text=entry["text"],
+                    embedding=embedding,
+                    metadata=metadata_from_dict(ChunkMetadata, entry["metadata"]),
+                )
+                current[chunk.id] = chunk
+            for chunk_id in header["delete"]:
+                current.pop(ChunkId.from_string(chunk_id), None)
+        elif kind == "document_deleted":
+            document_id = DocumentId.from_string(header["id"])
+            documents.pop(document_id, None)
+            chunks.pop(document_id, None)
+            deleted_documents.add(document_id)
+        elif kind == "library":
+            library_id = LibraryId.from_string(header["id"])
+            metadata = metadata_from_dict(LibraryMetadata, header["metadata"])
+            library = libraries.get(library_id)
+            if library is None:
+                index = header["index"]
+                library = libraries[library_id] = Library(
+                    id=library_id,
+                    documents=[],
+                    metadata=metadata,
+                    vector_index=INDEX_TYPES[index["type"]](**index["params"]),
+                )
+            library.metadata = metadata
+            deleted_libraries.discard(library_id)
+            if header["full"]:
+                members[library_id] = {}
+            current = members.setdefault(library_id, dict.fromkeys(library.documents))
+            for document_id in header["removed"]:
+                current.pop(DocumentId.from_string(document_id), None)
+            for document_id in header["added"]:
+                current[DocumentId.from_string(document_id)] = None
+            indexed[library_id] = header["indexed"]
+        elif kind == "library_deleted":
+            library_id = LibraryId.from_string(header["id"])
+            libraries.pop(library_id, None)
+            members.pop(library_id, None)
+            indexed.pop(library_id, None)
+            deleted_libraries.add(library_id)
+        else:
+            raise ApplicationError(f"Unknown write-ahead log record: {kind}")
+
+    for document_id, current in chunks.items():
+        documents[document_id].chunks = list(current.values())
+        document_repository.save(documents[document_id])
+    for document_id in deleted_documents:
+        if document_repository.exists(document_id):
+            document_repository.delete(document_id)
+
+    changed = set(chunks) | deleted_documents
+    for library_id, library in libraries.items():
+        stale = any(d in changed for d in library.documents)
+        if library_id in members:
+            member_ids = list(members[library_id])
+            stale = stale or member_ids != library.documents
+            library.documents = member_ids
+        if not indexed.get(library_id, library.is_indexed):
+            if library.is_indexed:
+                library.invalidate_index()
+        elif stale or not library.is_indexed:
+            _reindex(library, documents)
+        if stale or library_id in indexed:
+            library_repository.save(library)
+    for library_id in deleted_libraries:
+        if library_repository.exists(library_id):
+            library_repository.delete(library_id)
+    return count
+
+
+def _reindex(library: Library, documents: Dict[DocumentId, Document]) -> None:
+    metadata = library.metadata
+    indexed_chunks = [
+        IndexedChunk.from_chunk(chunk, document_id)
+        for document_id in library.documents
+        if document_id in documents
+        for chunk in documents[document_id].chunks
+    ]
+    if indexed_chunks:
+        library.index(indexed_chunks)
+    else:
+        library.invalidate_index()
+    # Indexing refreshes updated_at; keep the logged timestamp
+    library.metadata = metadata
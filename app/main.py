@@ -1,13 +1,37 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, status
 from fastapi.responses import JSONResponse
 
 from app.api.routers import documents_router, libraries_router
+from app.dependencies import (
+    get_query_result_cache,
+    get_snapshot_service,
+    get_write_ahead_log,
+)
 from app.errors import IndexNotBuiltError, InvalidEntityError, NotFoundError
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Restore the last snapshot before serving, save one more on shutdown
+    snapshots = get_snapshot_service()
+    if snapshots is not None:
+        snapshots.restore()
+        snapshots.start()
+    yield
+    if snapshots is not None:
+        snapshots.stop()
+    log = get_write_ahead_log()
+    if log is not None:
+        log.close()
+
+
 app = FastAPI(
     title="Vector DB API",
     description="An API for managing vector databases, libraries, and documents.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.include_router(documents_router)
@@ -24,6 +48,24 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", status_code=status.HTTP_200_OK)
+def metrics():
+    cache = get_query_result_cache()
+    if cache is None:
+        return {"query_cache": None}
+    stats = cache.stats()
+    return {
+        "query_cache": {
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "hit_ratio": stats.hit_ratio,
+            "evictions": stats.evictions,
+            "size": stats.size,
+            "capacity": stats.capacity,
+        }
+    }
+
+
 @app.exception_handler(InvalidEntityError)
 def invalid_entity_handler(request, exc: InvalidEntityError):
     return JSONResponse(
@@ -0,0 +1,25 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture
+def index_library():
+    """Start a background index build and wait until its job finishes."""
+    client = TestClient(app)
+
+    def _index(library_id: str, timeout: float = 10.0) -> dict:
+        r = client.patch(f"/libraries/{library_id}/index")
+        assert r.status_code == 202
+        deadline = time.monotonic() + timeout
+        while True:
+            job = client.get(r.headers["location"]).json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            assert time.monotonic() < deadline, "index build timed out"
+            time.sleep(0.01)
+
+    return _index
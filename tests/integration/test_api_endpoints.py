@@ -1,3 +1,8 @@
+import base64
+import io
+import json
+
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
@@ -26,6 +31,69 @@ def test_health_check():
     assert r.json() == {"status": "healthy"}
 
 
+def test_metrics_report_query_cache_hits(index_library):
+    r = client.post(
+        "/documents/",
+        json={
+            "metadata": {"title": "Doc"},
+            "chunks": [{"text": "c", "embedding": [1.0, 0.0], "metadata": {}}],
+        },
+    )
+    lib_payload = {"metadata": {"name": "L"}, "documents": [r.json()["document_id"]]}
+    lib_id = client.post("/libraries/", json=lib_payload).json()["library_id"]
+    assert index_library(lib_id)["status"] == "succeeded"
+
+    before = client.get("/metrics").json()["query_cache"]
+    q = {"embedding": [1.0, 0.0], "k": 1}
+    first = client.post(f"/libraries/{lib_id}/find-similar", json=q)
+    second = client.post(f"/libraries/{lib_id}/find-similar", json=q)
+    after = client.get("/metrics").json()["query_cache"]
+
+    assert second.json() == first.json()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert set(after) >= {"hit_ratio", "evictions", "size", "capacity"}
+
+
+def test_projection_leaves_out_texts_and_embeddings(index_library):
+    r = client.post(
+        "/documents/",
+        json={
+            "metadata": {"title": "Doc"},
+            "chunks": [{"text": "c", "embedding": [1.0, 0.0], "metadata": {}}],
+        },
+    )
+    doc_id = r.json()["document_id"]
+    lib_payload = {
+        "metadata": {"name": "L", "description": "D"},
+        "documents": [doc_id],
+    }
+    lib_id = client.post("/libraries/", json=lib_payload).json()["library_id"]
+    assert index_library(lib_id)["status"] == "succeeded"
+    metadata_only = "?include_text=false&include_embedding=false"
+
+    q = {"embedding": [1.0, 0.0], "k": 1}
+    full = client.post(f"/libraries/{lib_id}/find-similar", json=q).json()
+    assert {"text", "embedding"} <= set(full["chunks"][0])
+    r = client.post(f"/libraries/{lib_id}/find-similar{metadata_only}", json=q)
+    chunk = r.json()["chunks"][0]
+    assert "text" not in chunk and "embedding" not in chunk
+    assert chunk["similarity"] == full["chunks"][0]["similarity"]
+
+    r = client.post(
+        f"/libraries/{lib_id}/find-similar/batch{metadata_only}", json={"queries": [q]}
+    )
+    assert "embedding" not in r.json()["results"][0]["chunks"][0]
+
+    r = client.get(f"/libraries/{lib_id}/chunks?include_embedding=false")
+    chunk = json.loads(r.text.splitlines()[0])
+    assert chunk["text"] == "c" and "embedding" not in chunk
+
+    chunk = client.get(f"/documents/{doc_id}{metadata_only}").json()["chunks"][0]
+    assert set(chunk) == {"chunk_id", "metadata"}
+    assert chunk["metadata"]["page_number"] is None
+
+
 def test_create_and_get_document():
     payload = {
         "metadata": {"title": "Doc 1", "author": "A"},
@@ -73,7 +141,7 @@ def test_add_get_update_delete_chunk_flow():
     assert r.status_code == 404
 
 
-def test_library_flow_and_find_similar():
+def test_library_flow_and_find_similar(index_library):
     # create a doc
     r = client.post(
         "/documents/",
@@ -91,8 +159,7 @@ def test_library_flow_and_find_similar():
     lib_id = r.json()["library_id"]
 
     # index library
-    r = client.patch(f"/libraries/{lib_id}/index")
-    assert r.status_code == 204
+    assert index_library(lib_id)["status"] == "succeeded"
 
     # find similar (should return 200 and list)
     q = {"embedding": [1.0, 0.0], "k": 1}
@@ -113,7 +180,300 @@ def test_library_flow_and_find_similar():
     assert len(body2["chunks"]) == 0
 
 
+def _b64(values) -> str:
+    return base64.b64encode(np.asarray(values, "<f4").tobytes()).decode()
+
+
+def test_binary_and_base64_embeddings(index_library):
+    r = client.post(
+        "/documents/",
+        json={
+            "metadata": {"title": "Doc"},
+            "chunks": [
+                {"text": "x", "embedding_b64": _b64([1.0, 0.0]), "metadata": {}},
+                {"text": "y", "embedding": [0.0, 1.0], "metadata": {}},
+            ],
+        },
+    )
+    assert r.status_code == 201
+    doc_id = r.json()["document_id"]
+    lib_payload = {
+        "metadata": {"name": "L", "description": "d"},
+        "documents": [doc_id],
+    }
+    lib_id = client.post("/libraries/", json=lib_payload).json()["library_id"]
+    assert index_library(lib_id)["status"] == "succeeded"
+
+    q = {"embedding_b64": _b64([1.0, 0.1]), "k": 1}
+    r = client.post(f"/libraries/{lib_id}/find-similar", json=q)
+    assert [c["text"] for c in r.json()["chunks"]] == ["x"]
+
+    r = client.post(
+        f"/libraries/{lib_id}/find-similar/binary?k=1",
+        content=np.asarray([0.1, 1.0], "<f4").tobytes(),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert r.status_code == 200
+    assert [c["text"] for c in r.json()["chunks"]] == ["y"]
+
+    # Re-point chunk x with a .npy body; it now wins the query for y
+    chunk_x = next(
+        c["chunk_id"]
+        for c in client.get(f"/documents/{doc_id}").json()["chunks"]
+        if c["text"] == "x"
+    )
+    npy = io.BytesIO()
+    np.save(npy, np.array([0.1, 1.0]))
+    r = client.put(
+        f"/documents/{doc_id}/chunks/{chunk_x}/embedding",
+        content=npy.getvalue(),
+        headers={"Content-Type": "application/x-npy"},
+    )
+    assert r.status_code == 204
+    r = client.post(
+        f"/libraries/{lib_id}/find-similar/binary?k=1",
+        content=np.asarray([0.1, 1.0], "<f4").tobytes(),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert [c["text"] for c in r.json()["chunks"]] == ["x"]
+
+
+def test_malformed_embedding_encodings_return_422():
+    doc = {"metadata": {"title": "Doc"}}
+    chunk = {"text": "x", "metadata": {}}
+    for fields in (
+        {},
+        {"embedding": [1.0], "embedding_b64": _b64([1.0])},
+        {"embedding_b64": "not base64!"},
+        {"embedding_b64": base64.b64encode(b"abc").decode()},
+    ):
+        r = client.post("/documents/", json={**doc, "chunks": [{**chunk, **fields}]})
+        assert r.status_code == 422, fields
+
+    doc_id = client.post("/documents/", json=doc).json()["document_id"]
+    r = client.post(
+        f"/documents/{doc_id}/chunks",
+        json={**chunk, "embedding": [1.0, 0.0]},
+    )
+    chunk_id = r.json()["chunk_id"]
+    for body, content_type in (
+        (b"abc", "application/octet-stream"),
+        (b"not npy", "application/x-npy"),
+        (np.zeros(2, "<f4").tobytes(), "text/plain"),
+    ):
+        r = client.put(
+            f"/documents/{doc_id}/chunks/{chunk_id}/embedding",
+            content=body,
+            headers={"Content-Type": content_type},
+        )
+        assert r.status_code == 422, content_type
+
+
+def test_bulk_create_documents_from_ndjson(index_library):
+    r = client.post(
+        "/documents/",
+        json={
+            "metadata": {"title": "Seed"},
+            "chunks": [{"text": "seed", "embedding": [0.0, 1.0], "metadata": {}}],
+        },
+    )
+    lib_payload = {"metadata": {"name": "L"}, "documents": [r.json()["document_id"]]}
+    lib_id = client.post("/libraries/", json=lib_payload).json()["library_id"]
+    assert index_library(lib_id)["status"] == "succeeded"
+
+    record = {
+        "metadata": {"title": "Bulk"},
+        "chunks": [{"text": "bulk", "embedding": [1.0, 0.0], "metadata": {}}],
+    }
+    lines = [json.dumps(record), "", "{not json", json.dumps({"metadata": {}})]
+    lines.append(json.dumps(record))
+
+    def body():
+        # Split mid-line to check records spanning stream chunks
+        data = "\n".join(lines).encode()
+        yield data[:10]
+        yield data[10:]
+
+    r = client.post(
+        f"/documents/bulk?library_id={lib_id}&batch_size=2",
+        content=body(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [x["line"] for x in body["results"]] == [1, 3, 4, 5]
+    assert "error" in body["results"][1] and "error" in body["results"][2]
+    doc_id = body["results"][0]["document_id"]
+    assert client.get(f"/documents/{doc_id}").status_code == 200
+
+    # Added to the indexed library without a rebuild
+    q = {"embedding": [1.0, 0.0], "k": 2}
+    chunks = client.post(f"/libraries/{lib_id}/find-similar", json=q).json()["chunks"]
+    assert [c["text"] for c in chunks] == ["bulk", "bulk"]
+
+
+def test_paginated_listings():
+    chunks = [{"text": f"c{i}", "embedding": [1.0, 0.0]} for i in range(5)]
+    r = client.post("/documents/", json={"metadata": {"title": "D"}, "chunks": chunks})
+    doc_id = r.json()["document_id"]
+    lib_ids = [
+        client.post(
+            "/libraries/",
+            json={"metadata": {"name": f"L{i}"}, "documents": [doc_id]},
+        ).json()["library_id"]
+        for i in range(3)
+    ]
+
+    def walk(url, key, limit):
+        items, cursor = [], None
+        while True:
+            params = {"limit": limit} | ({"cursor": cursor} if cursor else {})
+            body = client.get(url, params=params).json()
+            items += body[key]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return items
+
+    texts = [c["text"] for c in walk(f"/documents/{doc_id}/chunks", "chunks", 2)]
+    assert texts == [f"c{i}" for i in range(5)]
+    libraries = walk("/libraries/", "libraries", 2)
+    assert [lib["library_id"] for lib in libraries] == sorted(lib_ids)
+    documents = walk(f"/libraries/{lib_ids[0]}/documents", "documents", 1)
+    assert documents == [{"document_id": doc_id, "title": "D", "chunk_count": 5}]
+
+    assert client.get("/libraries/", params={"cursor": "bogus"}).status_code == 422
+    assert client.get("/libraries/", params={"limit": 0}).status_code == 422
+
+
 def test_invalid_id_returns_422():
     # malformed uuid should return 422 from InvalidEntityError mapping
     r = client.get("/documents/not-a-uuid")
     assert r.status_code == 422
+
+
+def test_find_similar_batch(index_library):
+    r = client.post(
+        "/documents/",
+        json={
+            "metadata": {"title": "Doc 4"},
+            "chunks": [
+                {"text": "x", "embedding": [1.0, 0.0], "metadata": {"source": "a"}},
+                {"text": "y", "embedding": [0.0, 1.0], "metadata": {"source": "b"}},
+            ],
+        },
+    )
+    doc_id = r.json()["document_id"]
+    r = client.post(
+        "/libraries/", json={"metadata": {"name": "L"}, "documents": [doc_id]}
+    )
+    lib_id = r.json()["library_id"]
+    index_library(lib_id)
+
+    q = {
+        "queries": [
+            {"embedding": [1.0, 0.0], "k": 1},
+            {"embedding": [1.0, 0.0], "k": 2, "filters": {"source": "b"}},
+        ]
+    }
+    r = client.post(f"/libraries/{lib_id}/find-similar/batch", json=q)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["library_id"] == lib_id
+    assert [c["text"] for c in body["results"][0]["chunks"]] == ["x"]
+    assert [c["text"] for c in body["results"][1]["chunks"]] == ["y"]
+
+
+def test_library_metric(index_library):
+    r = client.post(
+        "/documents/",
+        json={
+            "metadata": {"title": "Doc 5"},
+            "chunks": [
+                {"text": "far", "embedding": [3.0, 4.0], "metadata": {"source": "a"}},
+                {"text": "near", "embedding": [0.3, 0.4], "metadata": {"source": "a"}},
+            ],
+        },
+    )
+    doc_id = r.json()["document_id"]
+    r = client.post(
+        "/libraries/",
+        json={
+            "metadata": {"name": "L", "description": "d"},
+            "documents": [doc_id],
+            "metric": "l2",
+        },
+    )
+    lib_id = r.json()["library_id"]
+    index_library(lib_id)
+
+    summary = client.get(f"/libraries/{lib_id}").json()
+    assert summary["metric"] == "l2"
+    assert summary["document_count"] == 1
+    assert "document_ids" not in summary
+    r = client.post(
+        f"/libraries/{lib_id}/find-similar", json={"embedding": [0.0, 0.0], "k": 2}
+    )
+    assert [c["text"] for c in r.json()["chunks"]] == ["near", "far"]
+
+    r = client.post("/libraries/", json={"metadata": {"name": "L"}, "metric": "x"})
+    assert r.status_code == 422
+
+
+def test_indexed_library_tracks_document_and_chunk_changes(index_library):
+    def create_document(text, embedding):
+        r = client.post(
+            "/documents/",
+            json={
+                "metadata": {"title": text},
+                "chunks": [
+                    {"text": text, "embedding": embedding, "metadata": {"source": "a"}}
+                ],
+            },
+        )
+        return r.json()["document_id"]
+
+    def search(lib_id):
+        r = client.post(
+            f"/libraries/{lib_id}/find-similar", json={"embedding": [0.0, 1.0], "k": 1}
+        )
+        return [c["text"] for c in r.json()["chunks"]]
+
+    first = create_document("first", [1.0, 0.0])
+    r = client.post(
+        "/libraries/",
+        json={"metadata": {"name": "L", "description": "d"}, "documents": [first]},
+    )
+    lib_id = r.json()["library_id"]
+    index_library(lib_id)
+
+    second = create_document("second", [0.0, 1.0])
+    r = client.post(f"/libraries/{lib_id}/documents/{second}")
+    assert r.status_code < 300
+    assert search(lib_id) == ["second"]
+
+    r = client.post(
+        f"/documents/{first}/chunks",
+        json={"text": "third", "embedding": [0.1, 1.0], "metadata": {}},
+    )
+    chunk_id = r.json()["chunk_id"]
+    client.delete(f"/libraries/{lib_id}/documents/{second}")
+    assert search(lib_id) == ["third"]
+
+    client.patch(
+        f"/documents/{first}/chunks/{chunk_id}", json={"embedding": [1.0, 0.0]}
+    )
+    assert search(lib_id) == ["first"]
+    client.delete(f"/documents/{first}/chunks/{chunk_id}")
+    r = client.get(f"/libraries/{lib_id}/chunks")
+    assert [json.loads(line)["text"] for line in r.text.splitlines()] == ["first"]
+
+
+def test_index_job_not_found():
+    r = client.post("/libraries/", json={"metadata": {"name": "L", "description": "d"}})
+    lib_id = r.json()["library_id"]
+
+    r = client.get(f"/libraries/{lib_id}/index/jobs/{lib_id}")
+    assert r.status_code == 404
+    r = client.patch("/libraries/00000000-0000-0000-0000-000000000000/index")
+    assert r.status_code == 404
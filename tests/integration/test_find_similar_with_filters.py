@@ -5,7 +5,7 @@ from app.main import app
 client = TestClient(app)
 
 
-def test_find_similar_with_filters_positive_match():
+def test_find_similar_with_filters_positive_match(index_library):
     # create two documents with different chunk sources
     payload1 = {
         "metadata": {"title": "Doc A"},
@@ -38,8 +38,7 @@ def test_find_similar_with_filters_positive_match():
     lib = r.json()
 
     # index library
-    r = client.patch(f"/libraries/{lib['library_id']}/index")
-    assert r.status_code == 204
+    assert index_library(lib["library_id"])["status"] == "succeeded"
 
     # search with filter for srcA -> expect only srcA chunk
     q = {"embedding": [1.0, 0.0], "k": 5, "filters": {"source": "srcA"}}
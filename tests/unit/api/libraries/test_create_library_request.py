@@ -11,7 +11,9 @@ from app.infrastructure import InMemoryDocumentRepository, InMemoryLibraryReposi
 def test_create_library_endpoint():
     library_repo = InMemoryLibraryRepository()
     handler = CreateLibraryHandler(
-        library_repo, InMemoryDocumentRepository(), vector_index_factory=lambda: None
+        library_repo,
+        InMemoryDocumentRepository(),
+        vector_index_factory=lambda **params: None,
     )
 
     req = CreateLibraryRequest(
@@ -29,7 +31,9 @@ def test_create_library_endpoint():
 def test_create_library_with_documents():
     library_repo = InMemoryLibraryRepository()
     handler = CreateLibraryHandler(
-        library_repo, InMemoryDocumentRepository(), vector_index_factory=lambda: None
+        library_repo,
+        InMemoryDocumentRepository(),
+        vector_index_factory=lambda **params: None,
     )
 
     did = str(DocumentId.generate())
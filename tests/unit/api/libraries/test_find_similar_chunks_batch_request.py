@@ -0,0 +1,43 @@
+import pytest
+from pydantic import ValidationError
+
+from app.api.libraries.find_similar_chunks import FindSimilarRequest
+from app.api.libraries.find_similar_chunks_batch import (
+    FindSimilarBatchRequest,
+    FindSimilarBatchResponse,
+    find_similar_chunks_batch,
+)
+from app.application.libraries import FindSimilarChunksBatchHandler
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.infrastructure import InMemoryLibraryRepository
+
+
+def test_find_similar_chunks_batch_presentation(library_factory, document_factory):
+    repo = InMemoryLibraryRepository()
+    lib = library_factory()
+    d = document_factory()
+    lib.index([IndexedChunk.from_chunk(c, d.id) for c in d.chunks])
+    repo.save(lib)
+
+    handler = FindSimilarChunksBatchHandler(repo)
+    embedding = list(lib.get_indexed_chunks()[0].embedding.values)
+    req = FindSimilarBatchRequest(
+        queries=[
+            FindSimilarRequest(embedding=embedding, k=1),
+            FindSimilarRequest(embedding=embedding, k=2, filters={"source": "x"}),
+        ]
+    )
+    response = find_similar_chunks_batch(
+        library_id=str(lib.id), req=req, handler=handler
+    )
+    res = FindSimilarBatchResponse.model_validate_json(response.body)
+
+    assert res.library_id == str(lib.id)
+    assert len(res.results) == 2
+    assert len(res.results[0].chunks) == 1
+    assert res.results[1].chunks == []
+
+
+def test_find_similar_batch_request_requires_queries():
+    with pytest.raises(ValidationError):
+        FindSimilarBatchRequest(queries=[])
@@ -1,5 +1,8 @@
+import numpy as np
+
 from app.api.libraries.find_similar_chunks import (
     FindSimilarRequest,
+    FindSimilarResponse,
     find_similar_chunks,
 )
 from app.application.libraries import FindSimilarChunksHandler
@@ -25,7 +28,8 @@ def test_find_similar_chunks_presentation(library_factory, document_factory):
         else [0.0],
         k=2,
     )
-    res = find_similar_chunks(library_id=str(lib.id), req=req, handler=handler)
+    response = find_similar_chunks(library_id=str(lib.id), req=req, handler=handler)
+    res = FindSimilarResponse.model_validate_json(response.body)
     assert res.library_id == str(lib.id)
     assert isinstance(res.chunks, list)
 
@@ -51,8 +55,29 @@ def test_find_similar_chunks_presentation_with_filters(
         k=2,
         filters={"source": "test"},
     )
-    res = find_similar_chunks(library_id=str(lib.id), req=req, handler=handler)
+    response = find_similar_chunks(library_id=str(lib.id), req=req, handler=handler)
+    res = FindSimilarResponse.model_validate_json(response.body)
     assert res.library_id == str(lib.id)
     assert isinstance(res.chunks, list)
     # ensure returned chunks (if any) conform to the requested filter
     assert all(c.metadata.source == "test" for c in res.chunks)
+
+
+def test_find_similar_chunks_embeddings_round_trip_exactly(
+    library_factory, document_factory
+):
+    repo = InMemoryLibraryRepository()
+    lib = library_factory()
+    d = document_factory()
+    lib.index([IndexedChunk.from_chunk(c, d.id) for c in d.chunks])
+    repo.save(lib)
+    stored = lib.get_indexed_chunks()[0].embedding.values
+
+    req = FindSimilarRequest(embedding=stored.tolist(), k=1)
+    response = find_similar_chunks(
+        library_id=str(lib.id), req=req, handler=FindSimilarChunksHandler(repo)
+    )
+    res = FindSimilarResponse.model_validate_json(response.body)
+
+    # Shortest float32 repr: decodes back to the very same float32 values
+    assert np.array_equal(np.asarray(res.chunks[0].embedding, np.float32), stored)
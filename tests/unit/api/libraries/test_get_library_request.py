@@ -3,14 +3,14 @@ from app.application.libraries import GetLibraryHandler
 from app.infrastructure import InMemoryLibraryRepository
 
 
-def test_get_library_presentation(library_factory):
+def test_get_library_presentation(library_factory, document_factory):
     repo = InMemoryLibraryRepository()
-    lib = library_factory()
+    lib = library_factory(documents=[document_factory(), document_factory()])
     repo.save(lib)
 
     handler = GetLibraryHandler(repo)
     res = get_library(library_id=str(lib.id), handler=handler)
     assert res.library_id == str(lib.id)
-    assert res.document_ids == [str(d) for d in lib.documents]
+    assert res.document_count == 2
     assert res.metadata.name == lib.metadata.name
-    assert isinstance(res.indexed_chunks, list)
+    assert res.indexed_chunk_count == 0
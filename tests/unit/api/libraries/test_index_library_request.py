@@ -1,24 +1,45 @@
+from concurrent.futures import Future
+
+from fastapi import Response
+
+from app.api.libraries.get_index_job import get_index_job
 from app.api.libraries.index_library import index_library
-from app.application.libraries import IndexLibraryHandler
-from app.infrastructure import InMemoryLibraryRepository
+from app.application.libraries import GetIndexJobHandler, IndexLibraryHandler
+from app.domain.libraries import LibraryIndexerService
+from app.infrastructure import (
+    InMemoryDocumentRepository,
+    InMemoryIndexJobRepository,
+    InMemoryLibraryRepository,
+)
 
 
-def test_index_library_endpoint(library_factory):
-    repo = InMemoryLibraryRepository()
+class DeferredExecutor:
+    def submit(self, fn, *args, **kwargs):
+        return Future()
 
-    class DummyIndexer:
-        def index(self, library):
-            # no-op index: mark library as indexed via domain method
-            try:
-                library.index([])
-            except Exception:
-                # ignore domain errors for this unit test
-                pass
 
-    handler = IndexLibraryHandler(repo, DummyIndexer())
+def test_index_library_endpoint(library_factory):
+    repo = InMemoryLibraryRepository()
+    jobs = InMemoryIndexJobRepository()
+    handler = IndexLibraryHandler(
+        repo,
+        LibraryIndexerService(InMemoryDocumentRepository()),
+        jobs,
+        DeferredExecutor(),
+    )
 
     lib = library_factory(name="L")
     repo.save(lib)
 
-    res = index_library(library_id=str(lib.id), handler=handler)
-    assert res is None
+    response = Response()
+    res = index_library(library_id=str(lib.id), response=response, handler=handler)
+    assert res.status == "pending"
+    assert response.headers["location"] == (
+        f"/libraries/{lib.id}/index/jobs/{res.job_id}"
+    )
+
+    job = get_index_job(
+        library_id=str(lib.id), job_id=res.job_id, handler=GetIndexJobHandler(jobs)
+    )
+    assert job.status == "pending"
+    assert job.started_at is None
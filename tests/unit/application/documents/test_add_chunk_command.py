@@ -5,7 +5,8 @@ from app.application.documents import (
     AddChunkHandler,
 )
 from app.errors import InvalidEntityError, NotFoundError
-from app.infrastructure import InMemoryDocumentRepository
+from app.domain.libraries import IndexedChunk
+from app.infrastructure import InMemoryDocumentRepository, InMemoryLibraryRepository
 
 
 def test_add_chunk_happy_path(document_factory):
@@ -69,3 +70,49 @@ def test_add_chunk_empty_text_raises(document_factory):
 
     with pytest.raises(InvalidEntityError):
         handler.handle(cmd)
+
+
+def test_add_chunk_rejected_by_a_library_leaves_the_document_unchanged(
+    document_factory, library_factory
+):
+    repo = InMemoryDocumentRepository()
+    lib_repo = InMemoryLibraryRepository()
+    doc = document_factory()
+    repo.save(doc)
+    lib = library_factory(documents=[doc])
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+    lib_repo.save(lib)
+
+    handler = AddChunkHandler(repo, lib_repo)
+    with pytest.raises(InvalidEntityError):
+        handler.handle(
+            AddChunkCommand(
+                document_id=str(doc.id),
+                text="wide",
+                embedding=[1.0, 0.0, 0.0],
+                metadata={},
+            )
+        )
+
+    assert repo.find_by_id(doc.id).chunk_count == 1
+    assert len(lib.get_indexed_chunks()) == 1
+
+
+def test_add_chunk_indexes_it_in_indexed_libraries(document_factory, library_factory):
+    repo = InMemoryDocumentRepository()
+    lib_repo = InMemoryLibraryRepository()
+    doc = document_factory()
+    repo.save(doc)
+    lib = library_factory(documents=[doc])
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+    lib_repo.save(lib)
+
+    handler = AddChunkHandler(repo, lib_repo)
+    result = handler.handle(
+        AddChunkCommand(
+            document_id=str(doc.id), text="New chunk", embedding=[1.0, 0.0], metadata={}
+        )
+    )
+
+    indexed = lib_repo.find_by_id(lib.id).get_indexed_chunks()
+    assert [str(c.id) for c in indexed][-1] == result.chunk_id
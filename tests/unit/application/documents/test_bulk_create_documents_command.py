@@ -0,0 +1,69 @@
+import pytest
+
+from app.application.documents import (
+    BulkCreateDocumentsCommand,
+    BulkCreateDocumentsHandler,
+    CreateDocumentCommand,
+)
+from app.domain.libraries import IndexedChunk, LibraryId
+from app.errors import NotFoundError
+from app.infrastructure import InMemoryDocumentRepository, InMemoryLibraryRepository
+
+
+def _command(text: str) -> CreateDocumentCommand:
+    return CreateDocumentCommand(
+        metadata={"title": "T"},
+        chunks=[{"text": text, "embedding": [1.0, 0.0], "metadata": {}}],
+    )
+
+
+def test_bulk_create_saves_valid_documents_and_reports_invalid_ones():
+    repo = InMemoryDocumentRepository()
+    handler = BulkCreateDocumentsHandler(repo)
+
+    result = handler.handle(
+        BulkCreateDocumentsCommand(
+            documents=[_command("a"), _command("   "), _command("b")]
+        )
+    )
+
+    first, rejected, last = result.outcomes
+    assert rejected.document_id is None and "empty" in rejected.error
+    assert repo.exists(first.document_id) and repo.exists(last.document_id)
+    assert len(repo.find_all()) == 2
+
+
+def test_bulk_create_adds_documents_to_indexed_library(
+    library_factory, document_factory
+):
+    document_repo = InMemoryDocumentRepository()
+    library_repo = InMemoryLibraryRepository()
+    existing = document_factory()
+    library = library_factory(documents=[existing])
+    library.index([IndexedChunk.from_chunk(c, existing.id) for c in existing.chunks])
+    library_repo.save(library)
+    handler = BulkCreateDocumentsHandler(document_repo, library_repo)
+
+    result = handler.handle(
+        BulkCreateDocumentsCommand(
+            documents=[_command("a"), _command("b")], library_id=str(library.id)
+        )
+    )
+
+    ids = [o.document_id for o in result.outcomes]
+    assert [str(d) for d in library.documents[-2:]] == ids
+    texts = {c.text for c in library.get_indexed_chunks()}
+    assert {"a", "b"} <= texts
+
+
+def test_bulk_create_with_missing_library_saves_nothing():
+    repo = InMemoryDocumentRepository()
+    handler = BulkCreateDocumentsHandler(repo, InMemoryLibraryRepository())
+
+    with pytest.raises(NotFoundError):
+        handler.handle(
+            BulkCreateDocumentsCommand(
+                documents=[_command("a")], library_id=str(LibraryId.generate())
+            )
+        )
+    assert repo.find_all() == []
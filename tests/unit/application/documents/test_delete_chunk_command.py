@@ -2,7 +2,8 @@ import pytest
 
 from app.application.documents import DeleteChunkCommand, DeleteChunkHandler
 from app.errors import NotFoundError
-from app.infrastructure import InMemoryDocumentRepository
+from app.domain.libraries import IndexedChunk
+from app.infrastructure import InMemoryDocumentRepository, InMemoryLibraryRepository
 
 
 def test_delete_chunk_happy_path(document_factory, chunk_factory):
@@ -55,3 +56,24 @@ def test_delete_chunk_not_found_raises(document_factory, chunk_factory):
                 document_id=str(doc.id), chunk_id="00000000-0000-0000-0000-000000000000"
             )
         )
+
+
+def test_delete_chunk_removes_it_from_indexed_libraries(
+    document_factory, chunk_factory, library_factory
+):
+    repo = InMemoryDocumentRepository()
+    lib_repo = InMemoryLibraryRepository()
+    c1 = chunk_factory(text="a")
+    c2 = chunk_factory(text="b")
+    doc = document_factory(chunks=[c1, c2])
+    repo.save(doc)
+    lib = library_factory(documents=[doc])
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in (c1, c2)])
+    lib_repo.save(lib)
+
+    handler = DeleteChunkHandler(repo, lib_repo)
+    handler.handle(DeleteChunkCommand(document_id=str(doc.id), chunk_id=str(c2.id)))
+
+    stored = lib_repo.find_by_id(lib.id)
+    assert stored.is_indexed
+    assert [c.id for c in stored.get_indexed_chunks()] == [c1.id]
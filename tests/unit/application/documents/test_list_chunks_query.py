@@ -0,0 +1,39 @@
+import pytest
+
+from app.application.documents import ListChunksHandler, ListChunksQuery
+from app.errors import NotFoundError
+from app.infrastructure import InMemoryDocumentRepository
+
+
+def test_list_chunks_pages_through_document(document_factory, chunk_factory):
+    repo = InMemoryDocumentRepository()
+    doc = document_factory(chunks=[chunk_factory(text=f"c{i}") for i in range(5)])
+    repo.save(doc)
+    handler = ListChunksHandler(repo)
+
+    texts, cursor = [], None
+    while True:
+        res = handler.handle(
+            ListChunksQuery(
+                document_id=str(doc.id),
+                cursor=cursor,
+                limit=2,
+                include_embedding=False,
+            )
+        )
+        assert len(res.chunks) <= 2
+        assert all("embedding" not in c for c in res.chunks)
+        texts += [c["text"] for c in res.chunks]
+        cursor = res.next_cursor
+        if cursor is None:
+            break
+
+    assert texts == [f"c{i}" for i in range(5)]
+
+
+def test_list_chunks_unknown_document_raises():
+    handler = ListChunksHandler(InMemoryDocumentRepository())
+    with pytest.raises(NotFoundError):
+        handler.handle(
+            ListChunksQuery(document_id="00000000-0000-0000-0000-000000000000")
+        )
@@ -4,8 +4,9 @@ from app.application.documents import (
     UpdateChunkCommand,
     UpdateChunkHandler,
 )
-from app.errors import NotFoundError
-from app.infrastructure import InMemoryDocumentRepository
+from app.errors import InvalidEntityError, NotFoundError
+from app.domain.libraries import IndexedChunk
+from app.infrastructure import InMemoryDocumentRepository, InMemoryLibraryRepository
 
 
 def test_update_chunk_happy_path(document_factory, chunk_factory):
@@ -47,3 +48,58 @@ def test_update_chunk_not_found_raises(document_factory, chunk_factory):
                 document_id=str(doc.id), chunk_id=fake_chunk_id, text="no"
             )
         )
+
+
+def test_update_chunk_refreshes_indexed_libraries(
+    document_factory, chunk_factory, library_factory
+):
+    repo = InMemoryDocumentRepository()
+    lib_repo = InMemoryLibraryRepository()
+    ch = chunk_factory(text="old")
+    doc = document_factory(chunks=[ch])
+    repo.save(doc)
+    lib = library_factory(documents=[doc])
+    lib.index([IndexedChunk.from_chunk(ch, doc.id)])
+    lib_repo.save(lib)
+
+    handler = UpdateChunkHandler(repo, lib_repo)
+    handler.handle(
+        UpdateChunkCommand(
+            document_id=str(doc.id),
+            chunk_id=str(ch.id),
+            text="new",
+            embedding=[0.0, 1.0],
+        )
+    )
+
+    (indexed,) = lib_repo.find_by_id(lib.id).get_indexed_chunks()
+    assert indexed.text == "new"
+    assert indexed.embedding.to_list() == [0.0, 1.0]
+
+
+def test_update_chunk_rejected_by_a_library_leaves_everything_unchanged(
+    document_factory, chunk_factory, library_factory
+):
+    repo = InMemoryDocumentRepository()
+    lib_repo = InMemoryLibraryRepository()
+    ch = chunk_factory(text="old")
+    doc = document_factory(chunks=[ch])
+    repo.save(doc)
+    indexed = library_factory(documents=[doc])
+    indexed.index([IndexedChunk.from_chunk(ch, doc.id)])
+    lib_repo.save(indexed)
+    handler = UpdateChunkHandler(repo, lib_repo)
+
+    with pytest.raises(InvalidEntityError):
+        handler.handle(
+            UpdateChunkCommand(
+                document_id=str(doc.id),
+                chunk_id=str(ch.id),
+                text="new",
+                embedding=[0.0, 1.0, 0.0],
+            )
+        )
+
+    assert repo.find_by_id(doc.id).get_chunk(ch.id).text == "old"
+    (chunk,) = indexed.get_indexed_chunks()
+    assert chunk.text == "old"
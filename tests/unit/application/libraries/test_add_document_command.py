@@ -4,6 +4,7 @@ from app.application.libraries import (
     AddDocumentCommand,
     AddDocumentHandler,
 )
+from app.domain.libraries import IndexedChunk
 from app.errors import InvalidEntityError
 from app.infrastructure import (
     InMemoryDocumentRepository,
@@ -81,3 +82,26 @@ def test_add_document_duplicate_raises(library_factory, document_factory):
 
     with pytest.raises(InvalidEntityError):
         handler.handle(cmd)
+
+
+def test_add_document_indexes_its_chunks_in_an_indexed_library(
+    library_factory, document_factory
+):
+    lib_repo = InMemoryLibraryRepository()
+    doc_repo = InMemoryDocumentRepository()
+    indexed_doc = document_factory()
+    lib = library_factory(documents=[indexed_doc])
+    lib.index([IndexedChunk.from_chunk(c, indexed_doc.id) for c in indexed_doc.chunks])
+    lib_repo.save(lib)
+    doc = document_factory()
+    doc_repo.save(doc)
+
+    handler = AddDocumentHandler(lib_repo, doc_repo)
+    handler.handle(AddDocumentCommand(library_id=str(lib.id), document_id=str(doc.id)))
+
+    stored = lib_repo.find_by_id(lib.id)
+    assert stored.is_indexed
+    assert {c.document_id for c in stored.get_indexed_chunks()} == {
+        indexed_doc.id,
+        doc.id,
+    }
@@ -6,7 +6,7 @@ from app.application.libraries import (
 )
 from app.domain.documents import Document, DocumentMetadata
 from app.domain.documents.document_id import DocumentId
-from app.domain.libraries import BruteForceIndex
+from app.domain.libraries import BruteForceIndex, DistanceMetric
 from app.errors import InvalidEntityError
 from app.infrastructure import InMemoryDocumentRepository, InMemoryLibraryRepository
 
@@ -17,7 +17,7 @@ def test_create_library_happy_path():
     handler = CreateLibraryHandler(
         library_repo,
         document_repo,
-        vector_index_factory=lambda: BruteForceIndex(),
+        vector_index_factory=lambda **params: BruteForceIndex(**params),
     )
 
     cmd = CreateLibraryCommand(metadata={"name": "L", "description": "desc"})
@@ -36,7 +36,7 @@ def test_create_library_with_documents():
     handler = CreateLibraryHandler(
         library_repo,
         document_repo,
-        vector_index_factory=lambda: BruteForceIndex(),
+        vector_index_factory=lambda **params: BruteForceIndex(**params),
     )
 
     did = str(DocumentId.generate())
@@ -61,10 +61,68 @@ def test_create_library_empty_name_raises():
     handler = CreateLibraryHandler(
         library_repo,
         document_repo,
-        vector_index_factory=lambda: BruteForceIndex(),
+        vector_index_factory=lambda **params: BruteForceIndex(**params),
     )
 
     cmd = CreateLibraryCommand(metadata={"name": "", "description": "desc"})
 
     with pytest.raises(InvalidEntityError):
         handler.handle(cmd)
+
+
+def test_create_library_passes_index_params_to_factory():
+    library_repo = InMemoryLibraryRepository()
+    received = {}
+
+    def factory(**params):
+        received.update(params)
+        return BruteForceIndex()
+
+    handler = CreateLibraryHandler(
+        library_repo, InMemoryDocumentRepository(), vector_index_factory=factory
+    )
+    handler.handle(
+        CreateLibraryCommand(
+            metadata={"name": "L", "description": "d"},
+            index_params={"m": 8, "ef_construction": 50},
+        )
+    )
+
+    assert received == {"m": 8, "ef_construction": 50, "metric": DistanceMetric.COSINE}
+
+
+def test_create_library_with_metric():
+    library_repo = InMemoryLibraryRepository()
+    handler = CreateLibraryHandler(
+        library_repo,
+        InMemoryDocumentRepository(),
+        vector_index_factory=lambda **params: BruteForceIndex(**params),
+    )
+
+    result = handler.handle(
+        CreateLibraryCommand(metadata={"name": "L", "description": "d"}, metric="l2")
+    )
+
+    assert library_repo.find_by_id(result.library_id).metric is DistanceMetric.L2
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        CreateLibraryCommand(
+            metadata={"name": "L", "description": "d"}, metric="hamming"
+        ),
+        CreateLibraryCommand(
+            metadata={"name": "L", "description": "d"}, index_params={"metric": "dot"}
+        ),
+    ],
+)
+def test_create_library_rejects_invalid_metric(command):
+    handler = CreateLibraryHandler(
+        InMemoryLibraryRepository(),
+        InMemoryDocumentRepository(),
+        vector_index_factory=lambda **params: BruteForceIndex(**params),
+    )
+
+    with pytest.raises(InvalidEntityError):
+        handler.handle(command)
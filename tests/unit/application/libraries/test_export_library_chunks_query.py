@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.application.libraries import (
+    ExportLibraryChunksHandler,
+    ExportLibraryChunksQuery,
+)
+from app.domain.libraries import IndexedChunk
+from app.errors import NotFoundError
+from app.infrastructure import InMemoryLibraryRepository
+
+
+def test_export_streams_indexed_chunks_in_batches(library_factory, document_factory):
+    repo = InMemoryLibraryRepository()
+    docs = [document_factory(), document_factory()]
+    lib = library_factory(documents=docs)
+    indexed = [IndexedChunk.from_chunk(c, d.id) for d in docs for c in d.chunks]
+    lib.index(indexed)
+    repo.save(lib)
+
+    res = ExportLibraryChunksHandler(repo).handle(
+        ExportLibraryChunksQuery(library_id=str(lib.id), batch_size=1)
+    )
+    batches = list(res.batches)
+
+    assert res.chunk_count == len(indexed)
+    assert [len(b) for b in batches] == [1] * len(indexed)
+    exported = [chunk for batch in batches for chunk in batch]
+    assert [c["chunk_id"] for c in exported] == [str(c.id) for c in indexed]
+    assert np.array_equal(exported[0]["embedding"], indexed[0].embedding.values)
+
+
+def test_export_snapshot_ignores_later_changes(library_factory, document_factory):
+    repo = InMemoryLibraryRepository()
+    doc = document_factory()
+    lib = library_factory(documents=[doc])
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+    repo.save(lib)
+
+    res = ExportLibraryChunksHandler(repo).handle(
+        ExportLibraryChunksQuery(
+            library_id=str(lib.id), include_text=False, include_embedding=False
+        )
+    )
+    lib.invalidate_index()
+
+    exported = [chunk for batch in res.batches for chunk in batch]
+    assert len(exported) == res.chunk_count == len(doc.chunks)
+    assert "text" not in exported[0] and "embedding" not in exported[0]
+
+
+def test_export_unknown_library_raises():
+    handler = ExportLibraryChunksHandler(InMemoryLibraryRepository())
+    with pytest.raises(NotFoundError):
+        handler.handle(
+            ExportLibraryChunksQuery(library_id="00000000-0000-0000-0000-000000000000")
+        )
@@ -1,4 +1,9 @@
-from app.application.libraries import FindSimilarChunksHandler, FindSimilarChunksQuery
+from app.application.libraries import (
+    FindSimilarChunksHandler,
+    FindSimilarChunksQuery,
+    QueryResultCache,
+)
+from app.domain.libraries import BruteForceIndex, Library
 from app.domain.libraries.indexed_chunk import IndexedChunk
 from app.errors import InvalidEntityError
 from app.infrastructure import InMemoryLibraryRepository
@@ -80,3 +85,62 @@ def test_find_similar_chunks_library_not_found():
         assert False, "expected InvalidEntityError"
     except InvalidEntityError:
         pass
+
+
+def test_find_similar_chunks_caches_until_the_library_changes(
+    library_factory, document_factory
+):
+    repo = InMemoryLibraryRepository()
+    lib = library_factory()
+    doc = document_factory()
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+    repo.save(lib)
+    cache = QueryResultCache()
+    handler = FindSimilarChunksHandler(repo, cache)
+    q = FindSimilarChunksQuery(
+        library_id=str(lib.id),
+        embedding=list(doc.chunks[0].embedding.values),
+        k=5,
+        filters={"source": "test"},
+    )
+
+    first = handler.handle(q)
+    assert handler.handle(q) is first
+    assert cache.stats().hits == 1
+
+    other = document_factory()
+    lib.add_document(
+        other.id, [IndexedChunk.from_chunk(c, other.id) for c in other.chunks]
+    )
+
+    refreshed = handler.handle(q)
+    assert refreshed is not first
+    assert len(refreshed.chunks) == len(first.chunks) + 1
+
+
+def test_find_similar_chunks_cache_misses_after_a_library_is_reloaded(
+    library_factory, document_factory
+):
+    repo = InMemoryLibraryRepository()
+    doc = document_factory()
+    lib = library_factory(documents=[doc])
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+    repo.save(lib)
+    handler = FindSimilarChunksHandler(repo, QueryResultCache())
+    q = FindSimilarChunksQuery(
+        library_id=str(lib.id), embedding=list(doc.chunks[0].embedding.values), k=5
+    )
+    first = handler.handle(q)
+
+    # A fresh copy with the same id and the same version, but other content
+    reloaded = Library(
+        id=lib.id, documents=[], metadata=lib.metadata, vector_index=BruteForceIndex()
+    )
+    other = document_factory()
+    reloaded.index([IndexedChunk.from_chunk(c, other.id) for c in other.chunks])
+    assert reloaded.index_version == lib.index_version
+    repo.save(reloaded)
+
+    refreshed = handler.handle(q)
+    assert refreshed is not first
+    assert {c["document_id"] for c in refreshed.chunks} == {str(other.id)}
@@ -0,0 +1,77 @@
+import pytest
+
+from app.application.libraries import (
+    FindSimilarChunksBatchHandler,
+    FindSimilarChunksBatchQuery,
+)
+from app.domain.common import Embedding
+from app.domain.documents import Chunk, ChunkId, ChunkMetadata
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.errors import InvalidEntityError, NotFoundError
+from app.infrastructure import InMemoryLibraryRepository
+
+
+def _indexed_library(library_factory, document_factory):
+    doc = document_factory(
+        chunks=[
+            Chunk(
+                id=ChunkId.generate(),
+                text=f"chunk {i}",
+                embedding=Embedding.from_list([1.0, float(i)]),
+                metadata=ChunkMetadata(source="a" if i % 2 else "b"),
+            )
+            for i in range(4)
+        ]
+    )
+    lib = library_factory()
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+    return lib
+
+
+def test_find_similar_chunks_batch_answers_each_query(
+    library_factory, document_factory
+):
+    repo = InMemoryLibraryRepository()
+    lib = _indexed_library(library_factory, document_factory)
+    repo.save(lib)
+
+    handler = FindSimilarChunksBatchHandler(repo)
+    res = handler.handle(
+        FindSimilarChunksBatchQuery(
+            library_id=str(lib.id),
+            queries=[
+                {"embedding": [1.0, 0.0], "k": 1},
+                {"embedding": [1.0, 3.0], "k": 4, "filters": {"source": "a"}},
+                {"embedding": [1.0, 0.0], "k": 4, "min_similarity": 0.99},
+            ],
+        )
+    )
+
+    assert res.library_id == str(lib.id)
+    assert len(res.results) == 3
+    assert [c["text"] for c in res.results[0]] == ["chunk 0"]
+    assert [c["text"] for c in res.results[1]] == ["chunk 3", "chunk 1"]
+    assert all(c["similarity"] >= 0.99 for c in res.results[2])
+
+
+def test_find_similar_chunks_batch_library_not_found():
+    handler = FindSimilarChunksBatchHandler(InMemoryLibraryRepository())
+
+    with pytest.raises(NotFoundError):
+        handler.handle(
+            FindSimilarChunksBatchQuery(
+                library_id="00000000-0000-0000-0000-000000000000",
+                queries=[{"embedding": [1.0], "k": 1}],
+            )
+        )
+
+
+def test_find_similar_chunks_batch_requires_queries(library_factory, document_factory):
+    repo = InMemoryLibraryRepository()
+    lib = _indexed_library(library_factory, document_factory)
+    repo.save(lib)
+
+    with pytest.raises(InvalidEntityError):
+        FindSimilarChunksBatchHandler(repo).handle(
+            FindSimilarChunksBatchQuery(library_id=str(lib.id), queries=[])
+        )
@@ -15,10 +15,9 @@ def test_get_library_happy_path(library_factory):
     res = handler.handle(GetLibraryQuery(library_id=str(lib.id)))
     assert res is not None
     assert res.library_id == str(lib.id)
-    assert res.document_ids == [str(d) for d in lib.documents]
+    assert res.document_count == 0
     assert res.metadata["name"] == lib.metadata.name
-    # indexed_chunks may be empty by default
-    assert isinstance(res.indexed_chunks, list)
+    assert not res.is_indexed and res.indexed_chunk_count == 0
 
 
 def test_get_library_not_found():
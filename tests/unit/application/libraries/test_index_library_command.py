@@ -1,6 +1,11 @@
+from concurrent.futures import Executor, Future
+
 import pytest
 
+from app.application.documents import UpdateChunkCommand, UpdateChunkHandler
 from app.application.libraries import (
+    GetIndexJobHandler,
+    GetIndexJobQuery,
     IndexLibraryCommand,
     IndexLibraryHandler,
 )
@@ -15,66 +20,251 @@ from app.domain.documents import (
 )
 from app.domain.libraries import (
     BruteForceIndex,
+    IndexJobId,
     Library,
     LibraryId,
+    LibraryIndexerService,
     LibraryMetadata,
 )
 from app.errors import NotFoundError
-from app.infrastructure import InMemoryLibraryRepository
+from app.infrastructure import (
+    InMemoryDocumentRepository,
+    InMemoryIndexJobRepository,
+    InMemoryLibraryRepository,
+)
 
 
-class FakeIndexer:
+class ManualExecutor(Executor):
+    """Holds submitted work until `run_all` is called."""
+
     def __init__(self):
-        self.called_with = None
+        self.pending = []
 
-    def index(self, library: Library) -> None:
-        self.called_with = library
+    def submit(self, fn, *args, **kwargs):
+        self.pending.append((fn, args, kwargs))
+        return Future()
 
+    def run_all(self):
+        while self.pending:
+            fn, args, kwargs = self.pending.pop(0)
+            fn(*args, **kwargs)
 
-def make_document_with_chunks():
-    c = Chunk(
-        id=ChunkId.generate(),
-        text="t",
-        embedding=Embedding.from_list([1.0, 0.0]),
-        metadata=ChunkMetadata(source="s"),
-    )
-    doc = Document(
-        id=DocumentId.generate(), chunks=[c], metadata=DocumentMetadata(title="T")
-    )
-    return doc
 
+class ChangingIndexer(LibraryIndexerService):
+    """Touches the library while collecting chunks, `changes` times."""
+
+    def __init__(self, document_repository, changes):
+        super().__init__(document_repository)
+        self.changes = changes
+
+    def collect_chunks(self, library):
+        chunks = super().collect_chunks(library)
+        if self.changes:
+            self.changes -= 1
+            library.upsert_chunks([])
+        return chunks
+
+
+class EditingIndexer(LibraryIndexerService):
+    """Runs `edit` once, after the chunks for the first build are collected."""
+
+    def __init__(self, document_repository, edit):
+        super().__init__(document_repository)
+        self.edit = edit
+
+    def collect_chunks(self, library):
+        chunks = super().collect_chunks(library)
+        edit, self.edit = self.edit, None
+        if edit is not None:
+            edit()
+        return chunks
+
+
+def make_document_with_chunks(*embeddings):
+    chunks = [
+        Chunk(
+            id=ChunkId.generate(),
+            text=f"t{i}",
+            embedding=Embedding.from_list(e),
+            metadata=ChunkMetadata(source="s"),
+        )
+        for i, e in enumerate(embeddings)
+    ]
+    return Document(
+        id=DocumentId.generate(), chunks=chunks, metadata=DocumentMetadata(title="T")
+    )
 
-def test_handler_calls_indexer_and_returns_library_id():
-    repo = InMemoryLibraryRepository()
-    # create and persist a library with one document
-    doc = make_document_with_chunks()
-    doc_id = doc.id
 
-    # create library and save it
+@pytest.fixture
+def setup():
+    doc_repo = InMemoryDocumentRepository()
+    lib_repo = InMemoryLibraryRepository()
+    jobs = InMemoryIndexJobRepository()
+    doc = make_document_with_chunks([1.0, 0.0], [0.0, 1.0])
+    doc_repo.save(doc)
     lib = Library(
         id=LibraryId.generate(),
-        documents=[doc_id],
+        documents=[doc.id],
         metadata=LibraryMetadata(name="L", description="d"),
         vector_index=BruteForceIndex(),
     )
-    repo.save(lib)
+    lib_repo.save(lib)
+    return doc_repo, lib_repo, jobs, lib
 
-    fake_indexer = FakeIndexer()
-    handler = IndexLibraryHandler(repo, fake_indexer)
 
-    cmd = IndexLibraryCommand(library_id=str(lib.id))
-    result = handler.handle(cmd)
+def job_status(jobs, lib, job_id):
+    return (
+        GetIndexJobHandler(jobs)
+        .handle(GetIndexJobQuery(library_id=str(lib.id), job_id=job_id))
+        .status
+    )
+
+
+def test_handler_builds_in_background_and_swaps_index(setup):
+    doc_repo, lib_repo, jobs, lib = setup
+    executor = ManualExecutor()
+    handler = IndexLibraryHandler(
+        lib_repo, LibraryIndexerService(doc_repo), jobs, executor
+    )
+    previous = lib.vector_index
 
-    assert result is None
-    assert fake_indexer.called_with is lib
+    result = handler.handle(IndexLibraryCommand(library_id=str(lib.id)))
+
+    assert result.status == "pending"
+    assert not lib.is_indexed
+    executor.run_all()
+
+    assert job_status(jobs, lib, result.job_id) == "succeeded"
+    assert lib.is_indexed
+    assert lib.vector_index is not previous
+    assert len(lib.get_indexed_chunks()) == 2
+
+
+def test_searches_use_previous_index_until_swap(setup):
+    doc_repo, lib_repo, jobs, lib = setup
+    LibraryIndexerService(doc_repo).index(lib)
+    doc_repo.find_by_id(lib.documents[0]).add_chunk(
+        Chunk(
+            id=ChunkId.generate(),
+            text="new",
+            embedding=Embedding.from_list([-1.0, 0.0]),
+            metadata=ChunkMetadata(source="s"),
+        )
+    )
+    executor = ManualExecutor()
+    handler = IndexLibraryHandler(
+        lib_repo, LibraryIndexerService(doc_repo), jobs, executor
+    )
+
+    handler.handle(IndexLibraryCommand(library_id=str(lib.id)))
+    query = Embedding.from_list([-1.0, 0.0])
+    old = lib.find_similar_chunks(query, k=3, min_similarity=-1.0)
+    assert [c.text for c, _ in old] == ["t1", "t0"]
+
+    executor.run_all()
+    assert lib.find_similar_chunks(query, k=1)[0][0].text == "new"
+
+
+def test_build_is_retried_when_library_changes_meanwhile(setup):
+    doc_repo, lib_repo, jobs, lib = setup
+    executor = ManualExecutor()
+    handler = IndexLibraryHandler(
+        lib_repo, ChangingIndexer(doc_repo, changes=1), jobs, executor
+    )
+
+    result = handler.handle(IndexLibraryCommand(library_id=str(lib.id)))
+    executor.run_all()
+
+    assert job_status(jobs, lib, result.job_id) == "succeeded"
+    assert lib.is_indexed
+
+
+def test_chunk_edited_during_first_build_is_not_lost(setup):
+    doc_repo, lib_repo, jobs, lib = setup
+    doc = doc_repo.find_by_id(lib.documents[0])
+    edit = UpdateChunkHandler(doc_repo, lib_repo)
+    executor = ManualExecutor()
+    indexer = EditingIndexer(
+        doc_repo,
+        lambda: edit.handle(
+            UpdateChunkCommand(
+                document_id=str(doc.id), chunk_id=str(doc.chunks[0].id), text="edited"
+            )
+        ),
+    )
+    handler = IndexLibraryHandler(lib_repo, indexer, jobs, executor)
+
+    result = handler.handle(IndexLibraryCommand(library_id=str(lib.id)))
+    executor.run_all()
+
+    assert job_status(jobs, lib, result.job_id) == "succeeded"
+    assert sorted(c.text for c in lib.get_indexed_chunks()) == ["edited", "t1"]
+
+
+def test_build_fails_when_library_keeps_changing(setup):
+    doc_repo, lib_repo, jobs, lib = setup
+    executor = ManualExecutor()
+    handler = IndexLibraryHandler(
+        lib_repo, ChangingIndexer(doc_repo, changes=10), jobs, executor
+    )
+
+    result = handler.handle(IndexLibraryCommand(library_id=str(lib.id)))
+    executor.run_all()
+
+    job = jobs.find_by_id(IndexJobId.from_string(result.job_id))
+    assert job.status.value == "failed"
+    assert "kept changing" in job.error
+    assert not lib.is_indexed
+
+
+def test_build_errors_are_reported_on_the_job(setup):
+    _, lib_repo, jobs, lib = setup
+    executor = ManualExecutor()
+    # The library's document is missing from this repository
+    handler = IndexLibraryHandler(
+        lib_repo, LibraryIndexerService(InMemoryDocumentRepository()), jobs, executor
+    )
+
+    result = handler.handle(IndexLibraryCommand(library_id=str(lib.id)))
+    executor.run_all()
+
+    job = jobs.find_by_id(IndexJobId.from_string(result.job_id))
+    assert job.status.value == "failed"
+    assert str(lib.documents[0]) in job.error
+    assert job.finished_at is not None
 
 
 def test_index_library_not_found():
-    repo = InMemoryLibraryRepository()
-    fake_indexer = FakeIndexer()
-    handler = IndexLibraryHandler(repo, fake_indexer)
+    handler = IndexLibraryHandler(
+        InMemoryLibraryRepository(),
+        LibraryIndexerService(InMemoryDocumentRepository()),
+        InMemoryIndexJobRepository(),
+        ManualExecutor(),
+    )
 
     cmd = IndexLibraryCommand(library_id=str(LibraryId.generate()))
 
     with pytest.raises(NotFoundError):
         handler.handle(cmd)
+
+
+def test_get_index_job_requires_matching_library(setup):
+    doc_repo, lib_repo, jobs, lib = setup
+    handler = IndexLibraryHandler(
+        lib_repo, LibraryIndexerService(doc_repo), jobs, ManualExecutor()
+    )
+    result = handler.handle(IndexLibraryCommand(library_id=str(lib.id)))
+
+    with pytest.raises(NotFoundError):
+        job_status(
+            jobs,
+            Library(
+                id=LibraryId.generate(),
+                documents=[],
+                metadata=LibraryMetadata(name="Other", description="d"),
+                vector_index=BruteForceIndex(),
+            ),
+            result.job_id,
+        )
+    with pytest.raises(NotFoundError):
+        job_status(jobs, lib, str(IndexJobId.generate()))
@@ -0,0 +1,22 @@
+from app.application.libraries import ListLibrariesHandler, ListLibrariesQuery
+from app.infrastructure import InMemoryLibraryRepository
+
+
+def test_list_libraries_pages_by_id(library_factory):
+    repo = InMemoryLibraryRepository()
+    libraries = [library_factory(documents=[]) for _ in range(5)]
+    for library in libraries:
+        repo.save(library)
+    handler = ListLibrariesHandler(repo)
+
+    pages, cursor = [], None
+    while True:
+        res = handler.handle(ListLibrariesQuery(cursor=cursor, limit=2))
+        pages.append([lib["library_id"] for lib in res.libraries])
+        cursor = res.next_cursor
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sum(pages, []) == sorted(str(lib.id) for lib in libraries)
+    assert res.libraries[0]["document_count"] == 0
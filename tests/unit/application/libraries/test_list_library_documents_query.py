@@ -0,0 +1,29 @@
+from app.application.libraries import (
+    ListLibraryDocumentsHandler,
+    ListLibraryDocumentsQuery,
+)
+from app.infrastructure import InMemoryDocumentRepository, InMemoryLibraryRepository
+
+
+def test_list_library_documents_pages_in_order_added(library_factory, document_factory):
+    library_repo = InMemoryLibraryRepository()
+    document_repo = InMemoryDocumentRepository()
+    docs = [document_factory(title=f"Doc {i}") for i in range(3)]
+    document_repo.save_many(docs)
+    library = library_factory(documents=docs)
+    library_repo.save(library)
+    handler = ListLibraryDocumentsHandler(library_repo, document_repo)
+
+    first = handler.handle(
+        ListLibraryDocumentsQuery(library_id=str(library.id), limit=2)
+    )
+    second = handler.handle(
+        ListLibraryDocumentsQuery(
+            library_id=str(library.id), cursor=first.next_cursor, limit=2
+        )
+    )
+
+    titles = [d["title"] for d in first.documents + second.documents]
+    assert titles == ["Doc 0", "Doc 1", "Doc 2"]
+    assert second.next_cursor is None
+    assert first.documents[0]["chunk_count"] == docs[0].chunk_count
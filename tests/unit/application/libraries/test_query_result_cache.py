@@ -0,0 +1,34 @@
+import pytest
+
+from app.application.libraries import QueryResultCache
+
+
+def test_cache_returns_stored_results_and_counts_lookups():
+    cache = QueryResultCache(max_entries=2)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.hit_ratio == pytest.approx(0.5)
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = QueryResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats().evictions == 1
+    assert cache.stats().size == 2
+
+
+def test_empty_cache_has_zero_hit_ratio():
+    assert QueryResultCache().stats().hit_ratio == 0.0
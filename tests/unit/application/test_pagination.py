@@ -0,0 +1,53 @@
+import pytest
+
+from app.application.pagination import decode_cursor, encode_cursor, page_of
+from app.errors import InvalidEntityError
+
+
+def _pages(items, limit):
+    pages, cursor = [], None
+    while True:
+        page, cursor = page_of(items, str, cursor, limit)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def test_page_of_walks_items_in_order():
+    assert _pages(list("abcde"), 2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert _pages(list("ab"), 2) == [["a", "b"]]
+    assert _pages([], 2) == [[]]
+
+
+def test_page_of_resumes_after_last_item_when_earlier_items_change():
+    items = list("abcdef")
+    page, cursor = page_of(items, str, None, 3)
+    assert page == ["a", "b", "c"]
+
+    items.remove("a")
+    assert page_of(items, str, cursor, 3)[0] == ["d", "e", "f"]
+    items.insert(0, "z")
+    assert page_of(items, str, cursor, 3)[0] == ["d", "e", "f"]
+
+
+def test_page_of_resumes_in_place_when_last_item_was_removed():
+    items = list("abcdef")
+    _, cursor = page_of(items, str, None, 3)
+    items.remove("c")
+    assert page_of(items, str, cursor, 3)[0] == ["d", "e", "f"]
+
+
+def test_page_of_pages_through_live_dict_views():
+    items = dict.fromkeys("abcde")
+    assert _pages(items.keys(), 2) == [["a", "b"], ["c", "d"], ["e"]]
+
+    page, cursor = page_of(items.keys(), str, None, 2)
+    del items["a"]
+    assert page_of(items.keys(), str, cursor, 2)[0] == ["c", "d"]
+
+
+def test_cursor_round_trips_and_rejects_garbage():
+    assert decode_cursor(encode_cursor("id", 7)) == ("id", 7)
+    for cursor in ("not a cursor", encode_cursor("id")[:-2] + "!!", ""):
+        with pytest.raises(InvalidEntityError):
+            decode_cursor(cursor)
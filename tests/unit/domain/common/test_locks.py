@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from app.domain.common import ReadWriteLock
+
+
+def _in_thread(fn):
+    thread = threading.Thread(target=fn, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    both_inside = threading.Barrier(2, timeout=2)
+
+    def read():
+        with lock.read():
+            both_inside.wait()
+
+    threads = [_in_thread(read), _in_thread(read)]
+    for thread in threads:
+        thread.join(2)
+    assert not both_inside.broken
+
+
+def test_writer_excludes_readers_until_released():
+    lock = ReadWriteLock()
+    entered = threading.Event()
+
+    def read():
+        with lock.read():
+            entered.set()
+
+    with lock.write():
+        reader = _in_thread(read)
+        assert not entered.wait(0.1)
+    assert entered.wait(2)
+    reader.join(2)
+
+
+def test_waiting_writer_holds_back_new_readers_but_not_nested_reads():
+    lock = ReadWriteLock()
+    written = threading.Event()
+    late_read = threading.Event()
+
+    def write():
+        with lock.write():
+            written.set()
+
+    def read():
+        with lock.read():
+            late_read.set()
+
+    with lock.read():
+        writer = _in_thread(write)
+        while not lock._waiting_writers:
+            pass
+        reader = _in_thread(read)
+        assert not late_read.wait(0.1)
+        with lock.read():  # would deadlock if nested reads queued
+            pass
+        assert not written.is_set()
+    writer.join(2)
+    reader.join(2)
+    assert written.is_set() and late_read.is_set()
+
+
+def test_writer_may_reenter_and_read():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+    with lock.write():  # fully released above
+        pass
+
+
+def test_read_cannot_be_upgraded():
+    lock = ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            with lock.write():
+                pass
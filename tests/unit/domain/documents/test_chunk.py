@@ -44,7 +44,7 @@ def test_chunk_update_text_and_embedding_and_metadata(chunk_factory):
 
     # update embedding
     c.update(embedding=[2.0, 3.0])
-    assert c.embedding.values == (2.0, 3.0)
+    assert c.embedding.to_list() == [2.0, 3.0]
 
     # update metadata: source and custom fields
     c.update(metadata={"source": "newsrc", "custom_fields": {"k": "v"}})
@@ -79,3 +79,13 @@ def test_matches_filter_unknown_key_is_ignored(chunk_factory):
     # unknown filter keys are ignored by the implementation and should not
     # cause a mismatch (legacy behavior preserved)
     assert c.matches_filter({"nonexistent": "value"})
+
+
+def test_to_dict_leaves_out_excluded_fields(chunk_factory):
+    c = chunk_factory()
+    assert set(c.to_dict()) == {"chunk_id", "text", "embedding", "metadata"}
+    assert set(c.to_dict(include_embedding=False)) == {"chunk_id", "text", "metadata"}
+    assert set(c.to_dict(include_text=False, include_embedding=False)) == {
+        "chunk_id",
+        "metadata",
+    }
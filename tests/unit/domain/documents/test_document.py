@@ -1,4 +1,6 @@
-from app.errors import NotFoundError
+import pytest
+
+from app.errors import InvalidEntityError, NotFoundError
 
 
 def test_document_allows_empty_initial_chunks(document_factory):
@@ -27,6 +29,41 @@ def test_document_add_remove_chunk(document_factory, chunk_factory):
     assert doc.chunk_count == 0
 
 
+def test_document_keeps_chunk_order_across_changes(document_factory, chunk_factory):
+    c1, c2, c3 = chunk_factory("one"), chunk_factory("two"), chunk_factory("three")
+    doc = document_factory(chunks=[c1, c2])
+
+    doc.add_chunk(c3)
+    doc.remove_chunk(c2.id)
+    doc.update_chunk(c1.id, text="first")
+
+    assert [c.text for c in doc.chunks] == ["first", "three"]
+    assert doc.get_chunk(c3.id) is c3
+    assert not doc.contains_chunk(c2.id)
+    with pytest.raises(InvalidEntityError):
+        doc.add_chunk(c1)
+    with pytest.raises(InvalidEntityError):
+        document_factory(chunks=[c1, c1])
+
+
+def test_chunk_changes_since_reports_net_changes(document_factory, chunk_factory):
+    c1, c2, c3 = chunk_factory("one"), chunk_factory("two"), chunk_factory("three")
+    doc = document_factory(chunks=[c1, c2])
+    version = doc.chunks_version
+
+    doc.add_chunk(c3)
+    doc.update_chunk(c1.id, text="first")
+    doc.remove_chunk(c2.id)
+    doc.remove_chunk(c3.id)
+    doc.add_chunk(c3)
+
+    changed, removed = doc.chunk_changes_since(version)
+    assert [c.text for c in changed] == ["first", "three"]
+    assert removed == [c2.id]
+    assert doc.chunk_changes_since(doc.chunks_version) == ([], [])
+    assert doc.chunk_changes_since(version - 1) is None
+
+
 def test_document_update_chunk_delegates(document_factory, chunk_factory):
     c = chunk_factory(text="old", page=1)
     doc = document_factory(chunks=[c])
@@ -1,3 +1,6 @@
+from array import array
+
+import numpy as np
 import pytest
 
 from app.domain.common.embedding import Embedding
@@ -30,3 +33,66 @@ def test_embedding_different_dimensions_error():
 
     with pytest.raises(InvalidEntityError):
         emb1.cosine_similarity(emb2)
+
+
+def test_embedding_is_backed_by_read_only_float32_array():
+    emb = Embedding.from_list([1.0, 2.0, 3.0])
+    assert emb.values.dtype == np.float32
+    with pytest.raises(ValueError):
+        emb.values[0] = 5.0
+
+
+def test_embedding_wraps_float32_buffers_without_copying():
+    buffer = array("f", [1.0, 2.0, 3.0])
+    emb = Embedding(buffer)
+    assert np.shares_memory(emb.values, np.asarray(buffer))
+
+    source = np.array([1.0, 2.0], dtype=np.float32)
+    assert np.shares_memory(Embedding(source).values, source)
+    # The caller's array stays writeable
+    source[0] = 4.0
+
+
+def test_embedding_from_buffer():
+    emb = Embedding.from_buffer(np.array([1.0, 2.0], dtype="<f4").tobytes())
+    assert emb.to_list() == [1.0, 2.0]
+
+    with pytest.raises(InvalidEntityError):
+        Embedding.from_buffer(b"\x00\x00\x80")
+
+
+def test_embedding_norm_is_cached():
+    emb = Embedding.from_list([3.0, 4.0])
+    assert emb.norm == pytest.approx(5.0)
+
+
+def test_embedding_equality_and_hash():
+    emb1 = Embedding.from_list([1.0, 2.0])
+    emb2 = Embedding(np.array([1.0, 2.0]))
+    assert emb1 == emb2
+    assert hash(emb1) == hash(emb2)
+    assert emb1 != Embedding.from_list([1.0, 3.0])
+
+
+@pytest.mark.parametrize("values", [[], ["a", "b"], [[1.0], [2.0]]])
+def test_embedding_rejects_invalid_values(values):
+    with pytest.raises(InvalidEntityError):
+        Embedding.from_list(values)
+
+
+def test_embedding_from_block_splits_a_flat_block():
+    block = np.array([3.0, 4.0, 1.0, 2.0, 2.0], dtype=np.float32)
+
+    first, second = Embedding.from_block(block, np.array([0, 2, 5]))
+
+    assert first == Embedding.from_list([3.0, 4.0])
+    assert second == Embedding.from_list([1.0, 2.0, 2.0])
+    assert first.norm == pytest.approx(5.0)
+    assert second.norm == pytest.approx(3.0)
+    assert np.shares_memory(first.values, block)
+
+
+@pytest.mark.parametrize("offsets", [[1, 5], [0, 2, 2, 5], [0, 4]])
+def test_embedding_from_block_rejects_invalid_offsets(offsets):
+    with pytest.raises(InvalidEntityError):
+        Embedding.from_block(np.ones(5, dtype=np.float32), np.array(offsets))
@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId
+from app.domain.libraries import BruteForceIndex
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.errors import InvalidEntityError
+
+
+def _chunk(values, source: str = "s") -> IndexedChunk:
+    return IndexedChunk(
+        id=ChunkId.generate(),
+        document_id=DocumentId.generate(),
+        text="t",
+        embedding=Embedding.from_list(values),
+        metadata=ChunkMetadata(source=source),
+    )
+
+
+def test_search_matches_per_chunk_cosine_ranking():
+    rng = np.random.default_rng(0)
+    chunks = [_chunk(list(rng.normal(size=8))) for _ in range(50)]
+    index = BruteForceIndex()
+    index.build(chunks)
+
+    query = Embedding.from_list(list(rng.normal(size=8)))
+    expected = sorted(chunks, key=lambda c: -c.similarity(query))[:5]
+
+    assert index.search(query, k=5) == expected
+
+
+def test_search_ignores_magnitude_of_embeddings():
+    near = _chunk([10.0, 0.0])
+    far = _chunk([0.1, 0.1])
+    index = BruteForceIndex()
+    index.build([far, near])
+
+    results = index.search(Embedding.from_list([1.0, 0.0]), k=2)
+    assert results == [near, far]
+
+
+def test_search_k_larger_than_index_returns_all():
+    chunks = [_chunk([float(i), 1.0]) for i in range(3)]
+    index = BruteForceIndex()
+    index.build(chunks)
+
+    assert len(index.search(Embedding.from_list([1.0, 1.0]), k=10)) == 3
+
+
+def test_search_ties_keep_insertion_order():
+    chunks = [_chunk([1.0, 0.0]) for _ in range(4)]
+    index = BruteForceIndex()
+    index.build(chunks)
+
+    assert index.search(Embedding.from_list([1.0, 0.0]), k=2) == chunks[:2]
+
+
+def test_search_zero_vectors_score_zero():
+    zero = _chunk([0.0, 0.0])
+    other = _chunk([-1.0, 0.0])
+    index = BruteForceIndex()
+    index.build([other, zero])
+
+    assert index.search(Embedding.from_list([1.0, 0.0]), k=1) == [zero]
+
+
+def test_search_with_filters_scores_only_matching_rows():
+    a = _chunk([1.0, 0.0], source="a")
+    b = _chunk([0.0, 1.0], source="b")
+    index = BruteForceIndex()
+    index.build([a, b])
+
+    results = index.search(
+        Embedding.from_list([1.0, 0.0]), k=2, filters={"source": "b"}
+    )
+    assert results == [b]
+    assert (
+        index.search(Embedding.from_list([1.0, 0.0]), k=2, filters={"source": "x"})
+        == []
+    )
+
+
+def test_search_dimension_mismatch_raises():
+    index = BruteForceIndex()
+    index.build([_chunk([1.0, 0.0])])
+
+    with pytest.raises(InvalidEntityError):
+        index.search(Embedding.from_list([1.0, 0.0, 0.0]), k=1)
+
+
+def test_search_batch_matches_individual_searches():
+    rng = np.random.default_rng(1)
+    chunks = [
+        _chunk(list(rng.normal(size=4)), source="a" if i % 2 else "b")
+        for i in range(30)
+    ]
+    index = BruteForceIndex()
+    index.build(chunks)
+
+    queries = [Embedding.from_list(list(rng.normal(size=4))) for _ in range(3)]
+    ks = [1, 4, 30]
+    filters = [None, {"source": "a"}, {"source": "missing"}]
+
+    batch = index.search_batch(queries, ks, filters)
+    assert batch == [index.search(q, k, f) for q, k, f in zip(queries, ks, filters)]
+    assert batch[2] == []
+
+
+def test_search_batch_requires_k_per_query():
+    index = BruteForceIndex()
+    index.build([_chunk([1.0, 0.0])])
+
+    with pytest.raises(InvalidEntityError):
+        index.search_batch([Embedding.from_list([1.0, 0.0])], [])
+
+
+@pytest.mark.parametrize("metric", ["cosine", "dot", "l2"])
+def test_search_ranks_by_metric(metric):
+    rng = np.random.default_rng(4)
+    chunks = [_chunk(list(rng.normal(size=6) * rng.uniform(0.1, 5))) for _ in range(80)]
+    index = BruteForceIndex(metric=metric)
+    index.build(chunks)
+
+    query = Embedding.from_list(list(rng.normal(size=6)))
+    expected = sorted(
+        chunks, key=lambda c: -index.metric.similarity(c.embedding, query)
+    )
+    assert index.search(query, k=5) == expected[:5]
+    assert index.search_batch([query], [5]) == [expected[:5]]
+
+
+def test_min_similarity_is_applied_before_truncating_to_k():
+    chunks = [_chunk([1.0, 0.0]), _chunk([-1.0, 0.0]), _chunk([0.9, 0.1])]
+    index = BruteForceIndex()
+    index.build(chunks)
+    query = Embedding.from_list([1.0, 0.0])
+
+    assert index.search(query, k=5, min_similarity=0.5) == [chunks[0], chunks[2]]
+    assert index.search_batch([query], [5], min_similarities=[0.995]) == [[chunks[0]]]
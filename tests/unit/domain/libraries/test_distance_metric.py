@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.libraries import DistanceMetric
+from app.domain.libraries.distance_metric import top_k
+from app.errors import InvalidEntityError
+
+
+def test_similarities():
+    a = Embedding.from_list([3.0, 0.0])
+    b = Embedding.from_list([0.0, 4.0])
+
+    assert DistanceMetric.COSINE.similarity(a, b) == pytest.approx(0.0)
+    assert DistanceMetric.DOT.similarity(a, a) == pytest.approx(9.0)
+    assert DistanceMetric.L2.similarity(a, b) == pytest.approx(1 / 6)
+    assert DistanceMetric.L2.similarity(a, a) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("metric", list(DistanceMetric))
+def test_scores_preserve_similarity_order(metric):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 6)) * rng.uniform(0.1, 3, size=(50, 1))
+    query = rng.normal(size=6)
+
+    scores = metric.scores(metric.prepare(query[None])[0], metric.prepare(vectors))
+    similarities = [metric.similarity(Embedding(v), Embedding(query)) for v in vectors]
+    assert np.array_equal(np.argsort(-scores), np.argsort(similarities)[::-1])
+
+
+@pytest.mark.parametrize("metric", list(DistanceMetric))
+def test_score_threshold_matches_similarity_threshold(metric):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(50, 4))
+    query = rng.normal(size=4)
+    similarities = np.array(
+        [metric.similarity(Embedding(v), Embedding(query)) for v in vectors]
+    )
+    threshold = float(np.median(similarities))
+
+    scores = metric.scores(metric.prepare(query[None])[0], metric.prepare(vectors))
+    passing = scores >= metric.score_threshold(threshold)
+    assert np.array_equal(passing, similarities >= threshold)
+
+
+def test_prepare_does_not_modify_input():
+    matrix = np.array([[3.0, 4.0]], dtype=np.float32)
+    prepared = DistanceMetric.COSINE.prepare(matrix)
+
+    assert prepared.tolist() == [[0.6000000238418579, 0.800000011920929]]
+    assert matrix.tolist() == [[3.0, 4.0]]
+
+
+def test_parse_rejects_unknown_metric():
+    assert DistanceMetric.parse("l2") is DistanceMetric.L2
+    with pytest.raises(InvalidEntityError):
+        DistanceMetric.parse("hamming")
+
+
+def test_top_k_orders_best_first_and_keeps_ties_stable():
+    scores = np.array([0.5, 0.9, 0.5, 0.1, 0.9], dtype=np.float32)
+
+    assert top_k(scores, 2).tolist() == [1, 4]
+    assert top_k(scores, 10).tolist() == [1, 4, 0, 2, 3]
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId
+from app.domain.libraries import BruteForceIndex, HNSWIndex
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.errors import IndexNotBuiltError, InvalidEntityError
+
+
+def _chunks(vectors, sources=None):
+    return [
+        IndexedChunk(
+            id=ChunkId.generate(),
+            document_id=DocumentId.generate(),
+            text=f"Chunk {i}",
+            embedding=Embedding.from_list(list(v)),
+            metadata=ChunkMetadata(source=sources[i] if sources else "s"),
+        )
+        for i, v in enumerate(vectors)
+    ]
+
+
+@pytest.fixture
+def random_chunks():
+    rng = np.random.default_rng(42)
+    return _chunks(rng.normal(size=(600, 16))), rng
+
+
+def test_search_recall_against_exact_index(random_chunks):
+    chunks, rng = random_chunks
+    hnsw = HNSWIndex(m=8, ef_construction=64, seed=7)
+    hnsw.build(chunks)
+    exact = BruteForceIndex()
+    exact.build(chunks)
+
+    hits = 0
+    queries = [Embedding.from_list(list(v)) for v in rng.normal(size=(20, 16))]
+    for q in queries:
+        expected = {c.id for c in exact.search(q, k=10)}
+        hits += len(expected & {c.id for c in hnsw.search(q, k=10)})
+
+    assert hits / (10 * len(queries)) >= 0.95
+
+
+def test_search_returns_exact_match_first(random_chunks):
+    chunks, _ = random_chunks
+    hnsw = HNSWIndex(m=8, ef_construction=64, seed=1)
+    hnsw.build(chunks)
+
+    target = chunks[123]
+    assert hnsw.search(target.embedding, k=1) == [target]
+
+
+def test_add_inserts_incrementally(random_chunks):
+    chunks, _ = random_chunks
+    hnsw = HNSWIndex(m=8, ef_construction=64, seed=3)
+    hnsw.build(chunks[:300])
+    hnsw.add(chunks[300:])
+
+    assert len(hnsw.get_chunks()) == len(chunks)
+    assert hnsw.search(chunks[450].embedding, k=1) == [chunks[450]]
+
+
+def test_add_rejects_dimension_mismatch(random_chunks):
+    chunks, _ = random_chunks
+    hnsw = HNSWIndex(seed=0)
+    hnsw.build(chunks[:10])
+
+    with pytest.raises(InvalidEntityError):
+        hnsw.add(_chunks([[1.0, 2.0]]))
+
+
+def test_ef_search_is_tunable_per_query(random_chunks):
+    chunks, _ = random_chunks
+    hnsw = HNSWIndex(m=8, ef_construction=64, ef_search=10, seed=5)
+    hnsw.build(chunks)
+
+    query = chunks[0].embedding
+    assert len(hnsw.search(query, k=40, ef_search=100)) == 40
+    with pytest.raises(InvalidEntityError):
+        hnsw.search(query, k=1, ef_search=0)
+
+
+def test_search_with_filters_only_returns_matches(random_chunks):
+    _, rng = random_chunks
+    vectors = rng.normal(size=(400, 8))
+    sources = ["even" if i % 2 == 0 else "odd" for i in range(400)]
+    chunks = _chunks(vectors, sources)
+    hnsw = HNSWIndex(m=8, ef_construction=64, seed=11)
+    hnsw.build(chunks)
+
+    query = Embedding.from_list(list(vectors[1]))
+    results = hnsw.search(query, k=5, filters={"source": "odd"})
+    assert len(results) == 5
+    assert results[0] == chunks[1]
+    assert all(c.metadata.source == "odd" for c in results)
+
+    selective = hnsw.search(query, k=5, filters={"source": "missing"})
+    assert selective == []
+
+
+def test_search_before_build_raises():
+    with pytest.raises(IndexNotBuiltError):
+        HNSWIndex().search(Embedding.from_list([1.0, 0.0]), k=1)
+
+
+def test_invalid_construction_params_raise():
+    with pytest.raises(InvalidEntityError):
+        HNSWIndex(m=1)
+    with pytest.raises(InvalidEntityError):
+        HNSWIndex(ef_construction=0)
+
+
+def test_clear_resets_graph(random_chunks):
+    chunks, _ = random_chunks
+    hnsw = HNSWIndex(seed=0)
+    hnsw.build(chunks[:20])
+    hnsw.clear()
+
+    assert hnsw.get_chunks() == []
+    with pytest.raises(IndexNotBuiltError):
+        hnsw.search(chunks[0].embedding, k=1)
+
+
+@pytest.mark.parametrize("metric", ["dot", "l2"])
+def test_search_ranks_by_metric(metric):
+    rng = np.random.default_rng(7)
+    chunks = _chunks(rng.normal(size=(300, 8)) * rng.uniform(0.2, 4, size=(300, 1)))
+    exact = BruteForceIndex(metric=metric)
+    exact.build(chunks)
+    index = HNSWIndex(metric=metric, seed=0)
+    index.build(chunks)
+
+    hits = 0
+    for _ in range(10):
+        query = Embedding.from_list(list(rng.normal(size=8)))
+        expected = set(c.id for c in exact.search(query, k=10))
+        hits += len(expected & set(c.id for c in index.search(query, k=10)))
+    assert hits / 100 >= 0.9
+
+
+def test_min_similarity_prunes_candidates(random_chunks):
+    chunks, rng = random_chunks
+    index = HNSWIndex(seed=0)
+    index.build(chunks)
+    query = Embedding.from_list(list(rng.normal(size=16)))
+
+    results = index.search(query, k=50, min_similarity=0.4)
+    assert results
+    assert all(c.similarity(query) >= 0.4 - 1e-6 for c in results)
@@ -0,0 +1,24 @@
+import pytest
+
+from app.domain.libraries import IndexJob, IndexJobId, IndexJobStatus, LibraryId
+from app.errors import InvalidEntityError
+
+
+def test_index_job_lifecycle():
+    job = IndexJob(id=IndexJobId.generate(), library_id=LibraryId.generate())
+    assert job.status is IndexJobStatus.PENDING
+    assert not job.is_finished
+
+    job.start()
+    assert job.status is IndexJobStatus.RUNNING
+    assert job.started_at is not None
+
+    job.fail("boom")
+    assert job.is_finished
+    assert job.error == "boom"
+    assert job.finished_at >= job.started_at
+
+
+def test_index_job_id_from_invalid_string_raises():
+    with pytest.raises(InvalidEntityError):
+        IndexJobId.from_string("not-a-uuid")
@@ -27,3 +27,8 @@ def test_to_dict_contains_expected_keys():
     ic = make_indexed_chunk()
     d = ic.to_dict()
     assert "chunk_id" in d and "document_id" in d and "text" in d and "embedding" in d
+
+
+def test_to_dict_leaves_out_excluded_fields():
+    d = make_indexed_chunk().to_dict(include_text=False, include_embedding=False)
+    assert set(d) == {"chunk_id", "document_id", "metadata"}
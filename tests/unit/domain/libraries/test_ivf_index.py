@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId
+from app.domain.libraries import BruteForceIndex, IVFIndex
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.errors import IndexNotBuiltError, InvalidEntityError
+
+
+def _chunks(vectors, sources=None):
+    return [
+        IndexedChunk(
+            id=ChunkId.generate(),
+            document_id=DocumentId.generate(),
+            text=f"Chunk {i}",
+            embedding=Embedding.from_list(list(v)),
+            metadata=ChunkMetadata(source=sources[i] if sources else "s"),
+        )
+        for i, v in enumerate(vectors)
+    ]
+
+
+@pytest.fixture
+def clustered():
+    """Points scattered around 10 well separated directions."""
+    rng = np.random.default_rng(3)
+    centers = rng.normal(size=(10, 16)) * 5
+    vectors = np.repeat(centers, 50, axis=0) + rng.normal(size=(500, 16))
+    return vectors, rng
+
+
+def test_build_files_every_chunk_in_one_list(clustered):
+    vectors, _ = clustered
+    index = IVFIndex(n_lists=10, seed=0)
+    index.build(_chunks(vectors))
+
+    assert index._offsets[0] == 0
+    assert index._offsets[-1] == len(vectors)
+    assert sorted(index._rows.tolist()) == list(range(len(vectors)))
+
+
+def test_search_recall_against_exact_index(clustered):
+    vectors, rng = clustered
+    chunks = _chunks(vectors)
+    ivf = IVFIndex(n_lists=20, nprobe=4, seed=0)
+    ivf.build(chunks)
+    exact = BruteForceIndex()
+    exact.build(chunks)
+
+    hits = 0
+    queries = [
+        Embedding.from_list(list(v + rng.normal(size=16))) for v in vectors[::50]
+    ]
+    for q in queries:
+        expected = {c.id for c in exact.search(q, k=10)}
+        hits += len(expected & {c.id for c in ivf.search(q, k=10)})
+
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_nprobe_covering_all_lists_is_exact(clustered):
+    vectors, rng = clustered
+    chunks = _chunks(vectors)
+    ivf = IVFIndex(n_lists=8, nprobe=1, seed=1)
+    ivf.build(chunks)
+    exact = BruteForceIndex()
+    exact.build(chunks)
+
+    q = Embedding.from_list(list(rng.normal(size=16)))
+    assert ivf.search(q, k=7, nprobe=8) == exact.search(q, k=7)
+    with pytest.raises(InvalidEntityError):
+        ivf.search(q, k=1, nprobe=0)
+
+
+def test_search_with_filters_probes_until_k_matches(clustered):
+    vectors, _ = clustered
+    sources = ["rare" if i == 499 else "common" for i in range(500)]
+    chunks = _chunks(vectors, sources)
+    ivf = IVFIndex(n_lists=10, nprobe=1, seed=2)
+    ivf.build(chunks)
+
+    q = Embedding.from_list(list(vectors[0]))
+    assert ivf.search(q, k=3, filters={"source": "rare"}) == [chunks[499]]
+    assert ivf.search(q, k=3, filters={"source": "missing"}) == []
+
+
+def test_n_lists_is_capped_by_chunk_count():
+    chunks = _chunks([[1.0, 0.0], [0.0, 1.0]])
+    ivf = IVFIndex(n_lists=50, seed=0)
+    ivf.build(chunks)
+
+    assert len(ivf._centroids) == 2
+    assert ivf.search(Embedding.from_list([1.0, 0.1]), k=1) == [chunks[0]]
+
+
+def test_n_lists_is_capped_by_training_sample(clustered):
+    vectors, _ = clustered
+    ivf = IVFIndex(n_lists=64, max_training_points=10, seed=0)
+    ivf.build(_chunks(vectors[:100]))
+
+    added = _chunks(vectors[100:110])
+    ivf.add(added)
+
+    assert len(ivf._centroids) == 10
+    assert len(ivf._offsets) == 11
+    assert ivf._offsets[-1] == 110
+    assert ivf.search(Embedding.from_list(list(vectors[105])), k=1) == [added[5]]
+
+
+def test_search_before_build_and_after_clear_raises(clustered):
+    vectors, _ = clustered
+    ivf = IVFIndex(seed=0)
+    q = Embedding.from_list(list(vectors[0]))
+    with pytest.raises(IndexNotBuiltError):
+        ivf.search(q, k=1)
+
+    ivf.build(_chunks(vectors[:20]))
+    ivf.clear()
+    assert ivf.get_chunks() == []
+    with pytest.raises(IndexNotBuiltError):
+        ivf.search(q, k=1)
+
+
+def test_invalid_construction_params_raise():
+    with pytest.raises(InvalidEntityError):
+        IVFIndex(n_lists=0)
+    with pytest.raises(InvalidEntityError):
+        IVFIndex(nprobe=0)
+
+
+@pytest.mark.parametrize("metric", ["dot", "l2"])
+def test_probing_every_list_matches_exact_search_for_metric(clustered, metric):
+    vectors, rng = clustered
+    chunks = _chunks(vectors)
+    exact = BruteForceIndex(metric=metric)
+    exact.build(chunks)
+    index = IVFIndex(metric=metric, n_lists=10, seed=0)
+    index.build(chunks)
+
+    query = Embedding.from_list(list(rng.normal(size=16) * 3))
+    assert index.search(query, k=10, nprobe=10) == exact.search(query, k=10)
+    assert index.search(query, k=10, min_similarity=0.0, nprobe=10) == exact.search(
+        query, k=10, min_similarity=0.0
+    )
@@ -0,0 +1,164 @@
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId
+from app.domain.libraries import DistanceMetric, KDTreeIndex
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.errors import InvalidEntityError
+
+
+def _chunk(values, source: str = "s") -> IndexedChunk:
+    return IndexedChunk(
+        id=ChunkId.generate(),
+        document_id=DocumentId.generate(),
+        text="t",
+        embedding=Embedding.from_list(values),
+        metadata=ChunkMetadata(source=source),
+    )
+
+
+@pytest.mark.parametrize("leaf_size", [1, 2, 32])
+def test_search_matches_exact_euclidean_ranking(leaf_size):
+    rng = np.random.default_rng(0)
+    chunks = [_chunk(list(rng.normal(size=6))) for _ in range(300)]
+    index = KDTreeIndex(metric="l2", leaf_size=leaf_size)
+    index.build(chunks)
+
+    for _ in range(5):
+        query = Embedding.from_list(list(rng.normal(size=6)))
+        expected = sorted(chunks, key=lambda c: c.distance(query))[:7]
+        assert index.search(query, k=7) == expected
+
+
+def test_search_with_filters_only_returns_matching_chunks():
+    rng = np.random.default_rng(1)
+    chunks = [
+        _chunk(list(rng.normal(size=4)), source="a" if i % 5 == 0 else "b")
+        for i in range(200)
+    ]
+    index = KDTreeIndex(metric="l2", leaf_size=8)
+    index.build(chunks)
+
+    query = Embedding.from_list([0.0, 0.0, 0.0, 0.0])
+    matching = [c for c in chunks if c.metadata.source == "a"]
+    expected = sorted(matching, key=lambda c: c.distance(query))[:5]
+
+    assert index.search(query, k=5, filters={"source": "a"}) == expected
+    assert index.search(query, k=5, filters={"source": "missing"}) == []
+
+
+def test_duplicate_embeddings_build_and_keep_insertion_order():
+    chunks = [_chunk([1.0, 1.0]) for _ in range(5000)]
+    index = KDTreeIndex(leaf_size=4)
+    index.build(chunks)
+
+    assert index.search(Embedding.from_list([1.0, 1.0]), k=3) == chunks[:3]
+    assert len(index.get_chunks()) == 5000
+
+
+def test_search_rejects_dimension_mismatch():
+    index = KDTreeIndex()
+    index.build([_chunk([1.0, 0.0])])
+
+    with pytest.raises(InvalidEntityError):
+        index.search(Embedding.from_list([1.0, 0.0, 0.0]), k=1)
+
+
+def test_leaf_size_must_be_positive():
+    with pytest.raises(InvalidEntityError):
+        KDTreeIndex(leaf_size=0)
+
+
+@pytest.mark.parametrize("metric", list(DistanceMetric))
+def test_search_ranks_by_library_metric(metric):
+    rng = np.random.default_rng(2)
+    chunks = [
+        _chunk(list(rng.normal(size=5) * rng.uniform(0.1, 5))) for _ in range(400)
+    ]
+    chunks.append(_chunk([0.0] * 5))
+    index = KDTreeIndex(metric=metric, leaf_size=8)
+    index.build(chunks)
+
+    for _ in range(5):
+        query = Embedding.from_list(list(rng.normal(size=5)))
+        expected = sorted(chunks, key=lambda c: -metric.similarity(c.embedding, query))
+        assert index.search(query, k=10) == expected[:10]
+
+
+@pytest.mark.parametrize("metric", list(DistanceMetric))
+def test_min_similarity_prunes_inside_the_index(metric):
+    rng = np.random.default_rng(3)
+    chunks = [_chunk(list(rng.normal(size=4))) for _ in range(300)]
+    index = KDTreeIndex(metric=metric, leaf_size=4)
+    index.build(chunks)
+
+    query = Embedding.from_list(list(rng.normal(size=4)))
+    similarities = sorted(
+        (metric.similarity(c.embedding, query) for c in chunks), reverse=True
+    )
+    threshold = similarities[6]
+
+    results = index.search(query, k=50, min_similarity=threshold)
+    assert len(results) == 7
+    assert all(
+        metric.similarity(c.embedding, query) >= threshold - 1e-6 for c in results
+    )
+
+
+@pytest.mark.parametrize("metric", list(DistanceMetric))
+def test_added_chunks_are_buffered_and_searched_next_to_the_tree(metric):
+    rng = np.random.default_rng(4)
+    chunks = [_chunk(list(rng.normal(size=5)), source="a") for _ in range(400)]
+    index = KDTreeIndex(metric=metric, leaf_size=8)
+    index.build(chunks)
+    tree = index._vectors
+
+    added = [
+        _chunk(list(rng.normal(size=5) * 0.5), source="a" if i % 2 else "b")
+        for i in range(50)
+    ]
+    for start in range(0, len(added), 10):
+        index.add(added[start : start + 10])
+    index.remove([chunks[0].id, added[1].id])
+    assert index._vectors is tree
+    assert len(index._added) == 50
+
+    live = [c for c in chunks + added if c.id not in (chunks[0].id, added[1].id)]
+    for _ in range(5):
+        query = Embedding.from_list(list(rng.normal(size=5)))
+        expected = sorted(live, key=lambda c: -metric.similarity(c.embedding, query))
+        assert index.search(query, k=10) == expected[:10]
+        matching = [c for c in expected if c.metadata.source == "b"]
+        assert index.search(query, k=3, filters={"source": "b"}) == matching[:3]
+
+
+def test_buffer_is_merged_into_the_tree_once_it_grows():
+    chunks = [_chunk([float(i), 0.0]) for i in range(40)]
+    index = KDTreeIndex(metric="l2", leaf_size=4)
+    index.build(chunks)
+
+    index.add([_chunk([float(i), 1.0]) for i in range(10)])
+    assert len(index._added) == 10
+    index.add([_chunk([-1.0, 0.0])])
+
+    assert len(index._added) == 0
+    assert len(index._vectors) == 51
+    assert index.search(Embedding.from_list([-1.0, 0.0]), k=1)[
+        0
+    ].embedding.to_list() == [
+        -1.0,
+        0.0,
+    ]
+
+
+def test_adding_a_longer_row_than_any_rebuilds_a_dot_product_tree():
+    chunks = [_chunk([1.0, 0.0]), _chunk([0.0, 1.0])]
+    index = KDTreeIndex(metric="dot", leaf_size=1)
+    index.build(chunks)
+    longest = _chunk([3.0, 3.0])
+
+    index.add([longest])
+
+    assert len(index._added) == 0
+    assert index.search(Embedding.from_list([1.0, 1.0]), k=1) == [longest]
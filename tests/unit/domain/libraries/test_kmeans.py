@@ -0,0 +1,38 @@
+import numpy as np
+
+from app.domain.libraries.indexes import kmeans
+
+
+def test_train_recovers_separated_clusters():
+    rng = np.random.default_rng(0)
+    centers = np.array([[10.0, 0.0], [0.0, 10.0], [-10.0, -10.0]], dtype=np.float32)
+    sample = np.repeat(centers, 40, axis=0) + rng.normal(size=(120, 2)).astype(
+        np.float32
+    )
+
+    centroids = kmeans.train(sample, 3, n_iter=25, rng=rng)
+
+    for center in centers:
+        assert np.min(np.linalg.norm(centroids - center, axis=1)) < 1.0
+
+
+def test_assign_euclidean_and_spherical_differ_on_magnitude():
+    centroids = np.array([[1.0, 0.0], [5.0, 5.0]], dtype=np.float32)
+    point = np.array([[0.9, 0.8]], dtype=np.float32)
+
+    assert kmeans.assign(point, centroids)[0] == 0
+    assert (
+        kmeans.assign(point, kmeans.normalize_rows(centroids), spherical=True)[0] == 1
+    )
+
+
+def test_train_caps_clusters_at_sample_size():
+    sample = np.eye(3, dtype=np.float32)
+    centroids = kmeans.train(sample, 10, n_iter=5, rng=np.random.default_rng(0))
+    assert centroids.shape == (3, 3)
+
+
+def test_normalize_rows_leaves_zero_rows():
+    matrix = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float32)
+    kmeans.normalize_rows(matrix)
+    np.testing.assert_allclose(matrix, [[0.6, 0.8], [0.0, 0.0]])
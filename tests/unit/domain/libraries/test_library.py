@@ -1,7 +1,12 @@
+import threading
+
 import pytest
 
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, DocumentId
 from app.domain.libraries import (
     BruteForceIndex,
+    DistanceMetric,
     IndexedChunk,
     Library,
     LibraryId,
@@ -40,6 +45,139 @@ def test_add_duplicate_document_raises(library_factory, document_factory):
         lib.add_document(doc.id)
 
 
+def test_add_documents_indexes_all_chunks_at_once(library_factory, document_factory):
+    indexed_doc = document_factory()
+    lib = library_factory(documents=[indexed_doc])
+    lib.index([IndexedChunk.from_chunk(c, indexed_doc.id) for c in indexed_doc.chunks])
+    docs = [document_factory(), document_factory()]
+    added = [IndexedChunk.from_chunk(c, d.id) for d in docs for c in d.chunks]
+
+    lib.add_documents([d.id for d in docs], added)
+
+    assert lib.documents[-2:] == [d.id for d in docs]
+    assert lib.get_indexed_chunks()[-len(added) :] == added
+    with pytest.raises(InvalidEntityError):
+        lib.add_documents([DocumentId.generate(), docs[0].id], [])
+    assert lib.document_count == 3
+
+
+def test_add_document_with_chunks_updates_index_in_place(
+    library_factory, document_factory
+):
+    indexed_doc = document_factory()
+    lib = library_factory(documents=[indexed_doc])
+    lib.index([IndexedChunk.from_chunk(c, indexed_doc.id) for c in indexed_doc.chunks])
+
+    doc = document_factory()
+    added = [IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks]
+    lib.add_document(doc.id, added)
+
+    assert lib.is_indexed
+    assert lib.get_indexed_chunks()[-len(added) :] == added
+
+
+def test_add_document_rejected_by_the_index_changes_nothing(
+    library_factory, document_factory
+):
+    indexed_doc = document_factory()
+    lib = library_factory(documents=[indexed_doc])
+    lib.index([IndexedChunk.from_chunk(c, indexed_doc.id) for c in indexed_doc.chunks])
+
+    doc = document_factory()
+    wrong = IndexedChunk.from_chunk(doc.chunks[0], doc.id)
+    wrong = IndexedChunk(
+        id=wrong.id,
+        document_id=doc.id,
+        text=wrong.text,
+        embedding=Embedding.from_list([1.0, 0.0, 0.0]),
+        metadata=wrong.metadata,
+    )
+    with pytest.raises(InvalidEntityError):
+        lib.add_document(doc.id, [wrong])
+    with pytest.raises(InvalidEntityError):
+        lib.add_documents([doc.id], [wrong])
+
+    assert not lib.contains_document(doc.id)
+    assert lib.documents == [indexed_doc.id]
+    assert len(lib.get_indexed_chunks()) == 1
+
+
+def test_remove_document_keeps_other_documents_indexed(
+    library_factory, document_factory
+):
+    kept, removed = document_factory(), document_factory()
+    lib = library_factory(documents=[kept, removed])
+    lib.index(
+        [IndexedChunk.from_chunk(c, d.id) for d in (kept, removed) for c in d.chunks]
+    )
+
+    lib.remove_document(removed.id)
+
+    assert lib.is_indexed
+    assert {c.document_id for c in lib.get_indexed_chunks()} == {kept.id}
+
+
+def test_remove_documents_drops_members_and_chunks_at_once(
+    library_factory, document_factory
+):
+    docs = [document_factory() for _ in range(4)]
+    lib = library_factory(documents=docs)
+    lib.index([IndexedChunk.from_chunk(c, d.id) for d in docs for c in d.chunks])
+
+    lib.remove_documents([docs[2].id, docs[0].id, DocumentId.generate()])
+
+    assert lib.documents == [docs[1].id, docs[3].id]
+    assert not lib.contains_document(docs[0].id)
+    assert {c.document_id for c in lib.get_indexed_chunks()} == {
+        docs[1].id,
+        docs[3].id,
+    }
+
+
+def test_documents_keep_insertion_order_and_reject_duplicates(
+    library_factory, document_factory
+):
+    first, second, third = (document_factory() for _ in range(3))
+    lib = library_factory(documents=[first, second])
+
+    lib.remove_document(first.id)
+    lib.add_document(third.id)
+    lib.add_document(first.id)
+
+    assert lib.documents == [second.id, third.id, first.id]
+    with pytest.raises(InvalidEntityError):
+        lib.documents = [first.id, first.id]
+
+
+def test_upsert_and_remove_chunks_are_noops_until_indexed(library_factory):
+    lib = library_factory()
+    chunks = _indexed_chunks([[1.0, 0.0]])
+
+    lib.upsert_chunks(chunks)
+    lib.remove_chunks([chunks[0].id])
+
+    assert not lib.is_indexed
+    assert lib.get_indexed_chunks() == []
+
+
+def test_upsert_chunks_replaces_indexed_chunk(library_factory):
+    lib = library_factory()
+    chunks = _indexed_chunks([[1.0, 0.0], [0.0, 1.0]])
+    lib.index(chunks)
+    moved = IndexedChunk(
+        id=chunks[0].id,
+        document_id=chunks[0].document_id,
+        text="moved",
+        embedding=Embedding.from_list([-1.0, 0.0]),
+    )
+
+    lib.upsert_chunks([moved])
+
+    results = lib.find_similar_chunks(Embedding.from_list([-1.0, 0.0]), k=1)
+    assert results[0][0].text == "moved"
+    assert len(lib.get_indexed_chunks()) == 2
+
+
 def test_remove_document_and_invalidate(library_factory, document_factory):
     doc = document_factory()
     lib = library_factory(documents=[doc])
@@ -185,3 +323,154 @@ def test_get_indexed_chunks_returns_chunks(
     assert isinstance(indexed, list)
     assert len(indexed) == 3
     assert indexed[0].text == chunks[0].text
+
+
+def test_find_similar_chunks_forwards_supported_search_params(
+    library_factory, document_factory
+):
+    from app.domain.libraries import HNSWIndex
+
+    lib = library_factory()
+    lib.vector_index = HNSWIndex(seed=0)
+    doc = document_factory()
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+
+    results = lib.find_similar_chunks(
+        doc.chunks[0].embedding, k=1, search_params={"ef_search": 10}
+    )
+    assert len(results) == 1
+
+
+def test_find_similar_chunks_rejects_unsupported_search_params(
+    library_factory, document_factory
+):
+    lib = library_factory()
+    doc = document_factory()
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+
+    with pytest.raises(InvalidEntityError):
+        lib.find_similar_chunks(
+            doc.chunks[0].embedding, k=1, search_params={"ef_search": 10}
+        )
+
+
+@pytest.mark.parametrize("value", ["abc", True, 1.5, None])
+def test_find_similar_chunks_rejects_non_integer_search_params(
+    library_factory, document_factory, value
+):
+    from app.domain.libraries import HNSWIndex
+
+    lib = library_factory()
+    lib.vector_index = HNSWIndex(seed=0)
+    doc = document_factory()
+    lib.index([IndexedChunk.from_chunk(c, doc.id) for c in doc.chunks])
+
+    with pytest.raises(InvalidEntityError):
+        lib.find_similar_chunks(
+            doc.chunks[0].embedding, k=1, search_params={"ef_search": value}
+        )
+
+
+def _indexed_chunks(embeddings):
+    document_id = DocumentId.generate()
+    return [
+        IndexedChunk(
+            id=ChunkId.generate(),
+            document_id=document_id,
+            text=f"Chunk {i}",
+            embedding=Embedding.from_list(e),
+        )
+        for i, e in enumerate(embeddings)
+    ]
+
+
+def test_find_similar_chunks_returns_k_chunks_above_threshold(library_factory):
+    lib = library_factory()
+    lib.index(_indexed_chunks([[-1.0, 0.0], [-0.9, 0.1], [1.0, 0.0], [0.8, 0.2]]))
+
+    results = lib.find_similar_chunks(
+        Embedding.from_list([1.0, 0.0]), k=3, min_similarity=0.5
+    )
+    assert [chunk.text for chunk, _ in results] == ["Chunk 2", "Chunk 3"]
+
+    results = lib.find_similar_chunks(
+        Embedding.from_list([1.0, 0.0]), k=3, min_similarity=-2.0
+    )
+    assert len(results) == 3
+
+
+def test_find_similar_chunks_scores_with_library_metric(library_factory):
+    lib = library_factory()
+    lib.vector_index = BruteForceIndex(metric="l2")
+    lib.index(_indexed_chunks([[3.0, 4.0], [0.3, 0.4]]))
+
+    results = lib.find_similar_chunks(Embedding.from_list([0.0, 0.0]), k=2)
+    assert [chunk.text for chunk, _ in results] == ["Chunk 1", "Chunk 0"]
+    assert results[0][1] == pytest.approx(1 / 1.5)
+    assert lib.metric is DistanceMetric.L2
+
+
+def test_build_index_leaves_live_index_untouched(library_factory):
+    lib = library_factory()
+    lib.index(_indexed_chunks([[1.0, 0.0]]))
+    live = lib.vector_index
+
+    built = lib.build_index(_indexed_chunks([[0.0, 1.0], [1.0, 1.0]]))
+
+    assert built is not live
+    assert type(built) is type(live)
+    assert len(lib.get_indexed_chunks()) == 1
+    assert lib.swap_index(built, lib.index_revision)
+    assert lib.vector_index is built
+    assert len(lib.get_indexed_chunks()) == 2
+
+
+def test_swap_index_rejects_builds_from_stale_snapshots(library_factory):
+    lib = library_factory()
+    revision = lib.index_revision
+    built = lib.build_index(_indexed_chunks([[1.0, 0.0]]))
+
+    lib.add_document(DocumentId.generate())
+
+    assert not lib.swap_index(built, revision)
+    assert not lib.is_indexed
+
+
+def test_mutations_wait_for_searches_in_progress(library_factory):
+    lib = library_factory()
+    lib.index(_indexed_chunks([[1.0, 0.0]]))
+    revision = lib.index_revision
+    swapped = threading.Event()
+
+    def swap():
+        assert lib.swap_index(lib.build_index(_indexed_chunks([[0.0, 1.0]])), revision)
+        swapped.set()
+
+    with lib.lock.read():
+        writer = threading.Thread(target=swap, daemon=True)
+        writer.start()
+        assert not swapped.wait(0.1)
+        # Nested reads by the searching thread never queue behind the writer
+        assert lib.get_indexed_chunks()[0].text == "Chunk 0"
+    writer.join(2)
+    assert swapped.is_set()
+    assert lib.get_indexed_chunks()[0].text == "Chunk 0"
+    assert lib.get_indexed_chunks()[0].embedding.values[1] == 1.0
+
+
+def test_membership_changes_since_reports_net_changes(library_factory):
+    kept, dropped, moved, added = (DocumentId.generate() for _ in range(4))
+    lib = library_factory(documents=[kept, dropped, moved])
+    version = lib.documents_version
+
+    lib.remove_documents([dropped, moved])
+    lib.add_documents([moved, added], [])
+    transient = DocumentId.generate()
+    lib.add_document(transient)
+    lib.remove_document(transient)
+
+    added_since, removed_since = lib.membership_changes_since(version)
+    assert added_since == [moved, added]
+    assert sorted(map(str, removed_since)) == sorted(map(str, [moved, dropped]))
+    assert lib.membership_changes_since(lib.documents_version) == ([], [])
+    assert lib.membership_changes_since(version - 1) is None
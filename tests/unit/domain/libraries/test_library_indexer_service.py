@@ -82,3 +82,28 @@ def test_indexer_service_raises_if_document_missing():
         service.index(fake_lib)
 
     assert str(missing_id) in str(excinfo.value)
+
+
+def test_indexer_service_fetches_documents_in_batches():
+    class CountingRepository(InMemoryDocumentRepository):
+        def __init__(self):
+            super().__init__()
+            self.batches = []
+
+        def find_by_id(self, document_id):
+            raise AssertionError("documents should be fetched in batches")
+
+        def find_by_ids(self, document_ids):
+            document_ids = list(document_ids)
+            self.batches.append(len(document_ids))
+            return [self._store[str(d)] for d in document_ids if str(d) in self._store]
+
+    repo = CountingRepository()
+    documents = [make_document_with_chunks(1) for _ in range(3)]
+    repo.save_many(documents)
+    fake_lib = FakeLibrary(documents=[d.id for d in documents])
+
+    chunks = LibraryIndexerService(repo).collect_chunks(fake_lib)
+
+    assert repo.batches == [3]
+    assert [c.id for c in chunks] == [d.chunks[0].id for d in documents]
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.domain.libraries.indexes.metadata_index import MetadataIndex
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def chunks():
+    rng = np.random.default_rng(0)
+    result = []
+    for i in range(300):
+        metadata = None
+        if i % 10:
+            metadata = ChunkMetadata(
+                source=f"s{rng.integers(4)}",
+                page_number=None if i % 7 == 0 else int(rng.integers(3)),
+                created_at=_START + timedelta(hours=int(rng.integers(50))),
+            )
+        result.append(
+            IndexedChunk(
+                id=ChunkId.generate(),
+                document_id=DocumentId.generate(),
+                text="t",
+                embedding=Embedding.from_list([1.0]),
+                metadata=metadata,
+            )
+        )
+    return result
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"source": "s1"},
+        {"source": "missing"},
+        {"page_number": 2},
+        {"page_number": None},
+        {"source": "s2", "page_number": 0},
+        {"created_after": _START + timedelta(hours=20)},
+        {"created_before": _START + timedelta(hours=10)},
+        {
+            "created_after": _START + timedelta(hours=10),
+            "created_before": _START + timedelta(hours=30),
+        },
+        {"source": "s0", "created_after": _START + timedelta(hours=25)},
+        {"created_after": _START + timedelta(hours=30), "created_before": _START},
+        {"unknown": 1},
+    ],
+)
+def test_rows_match_per_chunk_filtering(chunks, filters):
+    index = MetadataIndex.build(chunks)
+    expected = [i for i, c in enumerate(chunks) if c.matches_filter(filters)]
+
+    assert index.rows(filters).tolist() == expected
+    assert np.flatnonzero(index.mask(filters)).tolist() == expected
+
+
+def test_empty_filters_select_everything(chunks):
+    index = MetadataIndex.build(chunks)
+
+    assert index.rows(None) is None
+    assert index.mask({}) is None
+
+
+def test_naive_datetimes_are_read_as_utc(chunks):
+    index = MetadataIndex.build(chunks)
+    bound = _START + timedelta(hours=20)
+    expected = index.rows({"created_after": bound}).tolist()
+
+    assert (
+        index.rows({"created_after": bound.replace(tzinfo=None)}).tolist() == expected
+    )
+
+
+def test_deleted_rows_never_match(chunks):
+    index = MetadataIndex.build(chunks)
+    deleted = {chunk.id for chunk in chunks[::3]}
+
+    assert index.delete(list(deleted) + [ChunkId.generate()]) == len(deleted)
+
+    filters = {"source": "s1"}
+    expected = [
+        i
+        for i, c in enumerate(chunks)
+        if c.id not in deleted and c.matches_filter(filters)
+    ]
+    assert index.rows(filters).tolist() == expected
+    assert index.rows(None).tolist() == [
+        i for i, c in enumerate(chunks) if c.id not in deleted
+    ]
+    assert index.deleted_count == len(deleted)
+
+
+def test_extend_replaces_existing_chunks(chunks):
+    index = MetadataIndex.build(chunks[:10])
+    index.extend(chunks[5:20])
+
+    assert index.size == 25
+    assert index.deleted_count == 5
+    expected = [
+        row
+        for row, c in enumerate(chunks[:5] + [None] * 5 + chunks[5:20])
+        if c is not None and c.matches_filter({"source": "s0"})
+    ]
+    assert index.rows({"source": "s0"}).tolist() == expected
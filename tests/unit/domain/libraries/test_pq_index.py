@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId
+from app.domain.libraries import BruteForceIndex, PQIndex
+from app.domain.libraries.indexed_chunk import IndexedChunk
+from app.errors import IndexNotBuiltError, InvalidEntityError
+
+
+def _chunks(vectors, sources=None):
+    return [
+        IndexedChunk(
+            id=ChunkId.generate(),
+            document_id=DocumentId.generate(),
+            text=f"Chunk {i}",
+            embedding=Embedding.from_list(list(v)),
+            metadata=ChunkMetadata(source=sources[i] if sources else "s"),
+        )
+        for i, v in enumerate(vectors)
+    ]
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(9).normal(size=(400, 16))
+
+
+def test_build_stores_one_byte_per_subvector(vectors):
+    index = PQIndex(n_subvectors=4, n_centroids=32, seed=0)
+    index.build(_chunks(vectors))
+
+    assert index._codes.shape == (400, 4)
+    assert index._codes.dtype == np.uint8
+    assert index._codebooks.shape == (4, 32, 4)
+
+
+def test_rows_keep_codes_instead_of_embeddings(vectors):
+    chunks = _chunks(vectors)
+    index = PQIndex(n_subvectors=4, n_centroids=32, seed=0)
+    index.build(chunks)
+    index.add(_chunks(vectors[:5]))
+    index.remove([chunks[0].id])
+
+    assert all(row.embedding is None for row in index._chunks)
+    assert index._vectors is None
+    # Returned chunks carry an embedding decoded from their codes
+    returned = index.get_chunks()
+    assert [c.id for c in returned[:3]] == [c.id for c in chunks[1:4]]
+    decoded = np.stack([c.embedding.values for c in returned[:399]])
+    original = vectors[1:] / np.linalg.norm(vectors[1:], axis=1, keepdims=True)
+    assert np.mean(np.sum(decoded * original, axis=1)) > 0.8
+
+
+def test_side_array_keeps_exact_vectors_through_compaction(vectors):
+    chunks = _chunks(vectors)
+    index = PQIndex(n_subvectors=4, n_centroids=32, keep_vectors=True, seed=0)
+    index.build(chunks)
+    codebooks = index._codebooks
+    index.remove([c.id for c in chunks[:200]])
+
+    assert index._codebooks is codebooks
+    assert len(index._chunks) == len(index._codes) == len(index._vectors) == 200
+    returned = index.search(chunks[250].embedding, k=1, rerank=200)
+    assert [c.id for c in returned] == [chunks[250].id]
+    np.testing.assert_array_equal(
+        returned[0].embedding.values, chunks[250].embedding.values
+    )
+
+
+def test_search_with_rerank_matches_exact_top_results(vectors):
+    chunks = _chunks(vectors)
+    pq = PQIndex(n_subvectors=4, n_centroids=64, rerank=100, keep_vectors=True, seed=0)
+    pq.build(chunks)
+    exact = BruteForceIndex()
+    exact.build(chunks)
+
+    hits = 0
+    queries = [Embedding.from_list(list(v)) for v in vectors[:20] + 0.1]
+    for q in queries:
+        expected = {c.id for c in exact.search(q, k=5)}
+        hits += len(expected & {c.id for c in pq.search(q, k=5)})
+
+    assert hits / (5 * len(queries)) >= 0.9
+
+
+def test_rerank_is_tunable_per_query(vectors):
+    chunks = _chunks(vectors)
+    pq = PQIndex(n_subvectors=2, n_centroids=8, keep_vectors=True, seed=1)
+    pq.build(chunks)
+
+    target = chunks[17]
+    assert [c.id for c in pq.search(target.embedding, k=1, rerank=400)] == [target.id]
+    with pytest.raises(InvalidEntityError):
+        pq.search(target.embedding, k=1, rerank=-1)
+
+
+def test_rerank_requires_the_side_array(vectors):
+    pq = PQIndex(n_subvectors=2, n_centroids=8, seed=1)
+    pq.build(_chunks(vectors))
+
+    with pytest.raises(InvalidEntityError):
+        pq.search(Embedding.from_list(list(vectors[0])), k=1, rerank=10)
+    with pytest.raises(InvalidEntityError):
+        PQIndex(rerank=10)
+
+
+def test_dimension_not_divisible_by_subvectors_is_padded():
+    chunks = _chunks(np.random.default_rng(0).normal(size=(50, 10)))
+    pq = PQIndex(n_subvectors=4, n_centroids=16, rerank=50, keep_vectors=True, seed=0)
+    pq.build(chunks)
+
+    assert [c.id for c in pq.search(chunks[3].embedding, k=1)] == [chunks[3].id]
+
+
+def test_search_with_filters_only_scores_matching_rows(vectors):
+    sources = ["a" if i < 10 else "b" for i in range(len(vectors))]
+    chunks = _chunks(vectors, sources)
+    pq = PQIndex(n_subvectors=4, n_centroids=16, seed=0)
+    pq.build(chunks)
+
+    results = pq.search(chunks[300].embedding, k=20, filters={"source": "a"})
+    assert len(results) == 10
+    assert all(c.metadata.source == "a" for c in results)
+    assert pq.search(chunks[0].embedding, k=1, filters={"source": "z"}) == []
+
+
+def test_search_before_build_and_after_clear_raises(vectors):
+    pq = PQIndex(seed=0)
+    q = Embedding.from_list(list(vectors[0]))
+    with pytest.raises(IndexNotBuiltError):
+        pq.search(q, k=1)
+
+    pq.build(_chunks(vectors[:30]))
+    pq.clear()
+    assert pq.get_chunks() == []
+    with pytest.raises(IndexNotBuiltError):
+        pq.search(q, k=1)
+
+
+def test_invalid_construction_params_raise():
+    with pytest.raises(InvalidEntityError):
+        PQIndex(n_centroids=257)
+    with pytest.raises(InvalidEntityError):
+        PQIndex(n_subvectors=0)
+    with pytest.raises(InvalidEntityError):
+        PQIndex(rerank=-1)
+
+
+@pytest.mark.parametrize("metric", ["dot", "l2"])
+def test_full_rerank_matches_exact_search_for_metric(vectors, metric):
+    chunks = _chunks(vectors)
+    exact = BruteForceIndex(metric=metric)
+    exact.build(chunks)
+    index = PQIndex(
+        metric=metric, n_subvectors=4, n_centroids=16, keep_vectors=True, seed=0
+    )
+    index.build(chunks)
+
+    query = Embedding.from_list(list(vectors[0] + 0.1))
+    results = index.search(query, k=5, rerank=len(chunks))
+    assert [c.id for c in results] == [c.id for c in exact.search(query, k=5)]
@@ -94,3 +94,141 @@ def test_clear_index(sample_chunks):
     assert bf_index._chunks == []
     assert kd_index._root is None
     assert kd_index._dimension == 0
+
+
+def test_search_batch_defaults_to_individual_searches(sample_chunks):
+    kd_index = KDTreeIndex()
+    kd_index.build(sample_chunks)
+
+    queries = [
+        Embedding.from_list([1.0, 2.0, 3.0]),
+        Embedding.from_list([9.0, 18.0, 27.0]),
+    ]
+    results = kd_index.search_batch(queries, [2, 3], [None, {"source": "source9"}])
+
+    assert results[0] == kd_index.search(queries[0], k=2)
+    assert [c.metadata.source for c in results[1]] == ["source9"]
+
+
+def _all_indexes():
+    from app.domain.libraries import HNSWIndex, IVFIndex, PQIndex
+
+    return [
+        BruteForceIndex(),
+        KDTreeIndex(leaf_size=2),
+        HNSWIndex(seed=0),
+        IVFIndex(n_lists=2, nprobe=2, seed=0),
+        PQIndex(n_subvectors=3, n_centroids=8, rerank=20, keep_vectors=True, seed=0),
+    ]
+
+
+def _chunk(values, source="added"):
+    return IndexedChunk(
+        id=ChunkId.generate(),
+        document_id=DocumentId.generate(),
+        text="added",
+        embedding=Embedding.from_list(values),
+        metadata=ChunkMetadata(source=source),
+    )
+
+
+@pytest.mark.parametrize("index", _all_indexes(), ids=lambda i: type(i).__name__)
+def test_add_makes_chunks_searchable_without_rebuild(index, sample_chunks):
+    index.build(sample_chunks)
+    added = _chunk([-5.0, 4.0, 1.0])
+
+    index.add([added])
+
+    assert index.size == 11
+    assert index.search(added.embedding, k=1)[0].id == added.id
+    assert index.search(added.embedding, k=5, filters={"source": "added"}) == [added]
+
+
+@pytest.mark.parametrize("index", _all_indexes(), ids=lambda i: type(i).__name__)
+def test_add_replaces_chunks_with_the_same_id(index, sample_chunks):
+    index.build(sample_chunks)
+    original = sample_chunks[3]
+    replacement = IndexedChunk(
+        id=original.id,
+        document_id=original.document_id,
+        text="replaced",
+        embedding=Embedding.from_list([-5.0, 4.0, 1.0]),
+        metadata=ChunkMetadata(source="replaced"),
+    )
+
+    index.add([replacement])
+
+    assert index.size == 10
+    assert index.search(replacement.embedding, k=1)[0].text == "replaced"
+    assert index.search(replacement.embedding, k=5, filters={"source": "source3"}) == []
+    assert [c.text for c in index.get_chunks()].count("replaced") == 1
+
+
+@pytest.mark.parametrize("index", _all_indexes(), ids=lambda i: type(i).__name__)
+def test_remove_hides_chunks_from_search(index, sample_chunks):
+    index.build(sample_chunks)
+    removed = sample_chunks[1]
+
+    assert index.remove([removed.id, ChunkId.generate()]) == 1
+
+    assert index.size == 9
+    assert removed not in index.search(removed.embedding, k=10)
+    assert index.search(removed.embedding, k=3, filters={"source": "source1"}) == []
+    assert removed not in index.get_chunks()
+
+
+@pytest.mark.parametrize("index", _all_indexes(), ids=lambda i: type(i).__name__)
+def test_remove_compacts_once_tombstones_pile_up(index, sample_chunks):
+    index.build(sample_chunks)
+
+    index.remove([chunk.id for chunk in sample_chunks[:2]])
+    assert index._metadata.deleted_count == 2
+
+    index.remove([sample_chunks[2].id])
+    assert index._metadata.deleted_count == 0
+    assert index.get_chunks() == sample_chunks[3:]
+
+    index.remove([chunk.id for chunk in sample_chunks[3:]])
+    assert index.size == 0
+    with pytest.raises(IndexNotBuiltError):
+        index.search(sample_chunks[0].embedding, k=1)
+
+
+def test_add_to_empty_index_builds_it(sample_chunks):
+    index = BruteForceIndex()
+    index.add(sample_chunks[:3])
+    index.add(sample_chunks[3:])
+
+    assert index.get_chunks() == sample_chunks
+    assert index.search(
+        sample_chunks[4].embedding, k=1, filters={"source": "source4"}
+    ) == [sample_chunks[4]]
+
+
+@pytest.mark.parametrize("index", _all_indexes(), ids=lambda i: type(i).__name__)
+def test_spawn_copies_configuration_but_not_contents(index, sample_chunks):
+    index.build(sample_chunks)
+
+    spawned = index.spawn()
+
+    assert type(spawned) is type(index)
+    assert spawned.metric is index.metric
+    assert spawned.get_chunks() == []
+    with pytest.raises(IndexNotBuiltError):
+        spawned.search(sample_chunks[0].embedding, k=1)
+
+
+@pytest.mark.parametrize("index", _all_indexes(), ids=lambda i: type(i).__name__)
+def test_exported_state_restores_an_equivalent_index(index, sample_chunks):
+    index.build(sample_chunks)
+    index.add([_chunk([-5.0, 4.0, 1.0])])
+    index.remove([sample_chunks[3].id])
+
+    chunks, state = index.export_state()
+    restored = index.spawn()
+    restored.restore_state(chunks, state)
+
+    query = Embedding.from_list([-4.0, 4.0, 2.0])
+    assert restored.size == index.size
+    assert restored.search(query, k=4) == index.search(query, k=4)
+    assert sample_chunks[3] not in restored.search(query, k=20)
@@ -0,0 +1,113 @@
+import mmap
+
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId
+from app.domain.libraries import (
+    BruteForceIndex,
+    HNSWIndex,
+    IndexedChunk,
+    IVFIndex,
+    KDTreeIndex,
+    LibraryId,
+    PQIndex,
+)
+from app.infrastructure import IndexFileStore
+
+
+def _chunks(count=40):
+    rng = np.random.default_rng(0)
+    document_id = DocumentId.generate()
+    return [
+        IndexedChunk(
+            id=ChunkId.generate(),
+            document_id=document_id,
+            text=f"chunk {i}",
+            embedding=Embedding.from_list(rng.normal(size=4).tolist()),
+            metadata=ChunkMetadata(source="test"),
+        )
+        for i in range(count)
+    ]
+
+
+def _is_mapped(array):
+    while array is not None:
+        if isinstance(array, mmap.mmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        BruteForceIndex(),
+        KDTreeIndex(leaf_size=4),
+        HNSWIndex(seed=0),
+        IVFIndex(n_lists=4, seed=0),
+        PQIndex(n_subvectors=2, n_centroids=8, keep_vectors=True, seed=0),
+    ],
+    ids=lambda index: type(index).__name__,
+)
+def test_saved_index_is_opened_memory_mapped(tmp_path, index):
+    chunks = _chunks()
+    index.build(chunks)
+    store = IndexFileStore(tmp_path)
+    library_id = LibraryId.generate()
+
+    store.save(library_id, index)
+    opened = store.open(library_id)
+
+    assert type(opened) is type(index)
+    assert opened.params() == index.params()
+    query = chunks[3].embedding
+    expected = [c.id for c in index.search(query, 5)]
+    assert [c.id for c in opened.search(query, 5)] == expected
+    assert _is_mapped(opened.get_chunks()[0].embedding.values)
+
+
+def test_opened_index_can_be_updated_without_touching_the_files(tmp_path):
+    chunks = _chunks()
+    index = BruteForceIndex()
+    index.build(chunks[:30])
+    store = IndexFileStore(tmp_path)
+    library_id = LibraryId.generate()
+    store.save(library_id, index)
+
+    opened = store.open(library_id)
+    opened.add(chunks[30:])
+    opened.remove([chunks[0].id])
+
+    assert len(opened.get_chunks()) == 39
+    assert len(store.open(library_id).get_chunks()) == 30
+
+
+def test_save_replaces_the_previous_version(tmp_path):
+    chunks = _chunks()
+    store = IndexFileStore(tmp_path)
+    library_id = LibraryId.generate()
+    first, second = BruteForceIndex(), BruteForceIndex()
+    first.build(chunks[:10])
+    second.build(chunks)
+
+    store.save(library_id, first)
+    store.save(library_id, second)
+
+    assert len(store.open(library_id).get_chunks()) == 40
+    versions = [p for p in (tmp_path / str(library_id)).iterdir() if p.is_dir()]
+    assert len(versions) == 1
+
+
+def test_missing_or_deleted_index_opens_as_none(tmp_path):
+    store = IndexFileStore(tmp_path)
+    library_id = LibraryId.generate()
+    assert store.open(library_id) is None
+
+    index = BruteForceIndex()
+    index.build(_chunks(5))
+    store.save(library_id, index)
+    store.delete(library_id)
+
+    assert store.open(library_id) is None
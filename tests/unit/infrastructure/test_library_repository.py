@@ -1,3 +1,4 @@
+from app.domain.documents import DocumentId
 from app.errors import NotFoundError
 from app.infrastructure import InMemoryLibraryRepository
 
@@ -27,3 +28,70 @@ def test_inmemory_repository_crud(library_factory):
         assert False, "expected NotFoundError"
     except NotFoundError:
         pass
+
+
+def test_inmemory_repository_finds_libraries_by_document(
+    library_factory, document_factory
+):
+    repo = InMemoryLibraryRepository()
+    shared, other = document_factory(), document_factory()
+    first = library_factory(documents=[shared])
+    second = library_factory(documents=[shared, other])
+    repo.save(first)
+    repo.save(second)
+
+    assert {lib.id for lib in repo.find_by_document(shared.id)} == {
+        first.id,
+        second.id,
+    }
+    assert repo.find_by_document(other.id) == [second]
+
+    second.remove_document(shared.id)
+    repo.save(second)
+    first.add_document(other.id)
+    repo.save(first)
+    assert repo.find_by_document(shared.id) == [first]
+    assert {lib.id for lib in repo.find_by_document(other.id)} == {
+        first.id,
+        second.id,
+    }
+
+    repo.delete(first.id)
+    assert repo.find_by_document(shared.id) == []
+
+
+def test_inmemory_repository_catches_up_after_many_unsaved_changes(
+    library_factory,
+):
+    repo = InMemoryLibraryRepository()
+    library = library_factory()
+    repo.save(library)
+    kept = DocumentId.generate()
+    library.add_document(kept)
+
+    # More changes than the library keeps: the save compares every reference
+    for _ in range(1500):
+        document_id = DocumentId.generate()
+        library.add_document(document_id)
+        library.remove_document(document_id)
+    assert library.membership_changes_since(1) is None
+    repo.save(library)
+
+    assert repo.find_by_document(kept) == [library]
+    assert repo.find_by_document(document_id) == []
+
+
+def test_inmemory_repository_pages_by_id(library_factory):
+    repo = InMemoryLibraryRepository()
+    libraries = sorted(
+        (library_factory() for _ in range(5)), key=lambda lib: str(lib.id)
+    )
+    for library in reversed(libraries):
+        repo.save(library)
+    repo.save(libraries[0])
+
+    assert repo.find_page(None, 2) == libraries[:2]
+    assert repo.find_page(libraries[1].id, 2) == libraries[2:4]
+
+    repo.delete(libraries[2].id)
+    assert repo.find_page(libraries[1].id, 2) == libraries[3:]
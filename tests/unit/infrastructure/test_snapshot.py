@@ -0,0 +1,229 @@
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import (
+    Chunk,
+    ChunkId,
+    ChunkMetadata,
+    Document,
+    DocumentId,
+    DocumentMetadata,
+)
+from app.domain.libraries import (
+    BruteForceIndex,
+    HNSWIndex,
+    IndexedChunk,
+    IVFIndex,
+    KDTreeIndex,
+    Library,
+    LibraryId,
+    LibraryMetadata,
+    PQIndex,
+)
+from app.errors import ApplicationError
+from app.infrastructure import (
+    InMemoryDocumentRepository,
+    InMemoryLibraryRepository,
+    SnapshotService,
+)
+from app.infrastructure.snapshot import read_snapshot, write_snapshot
+
+
+def _document(count=12, offset=0):
+    chunks = [
+        Chunk(
+            id=ChunkId.generate(),
+            text=f"chunk {offset + i} — ü",
+            embedding=Embedding.from_list(
+                [float(offset + i), float((i * 7) % 5), float(i % 3) - 1.0]
+            ),
+            metadata=ChunkMetadata(
+                source=f"source{i % 3}",
+                page_number=i if i % 2 else None,
+                created_at=datetime(2024, 1, 1 + i, 12, 30, 15, 123456, timezone.utc),
+                custom_fields={"tag": i} if i % 4 == 0 else {},
+            ),
+        )
+        for i in range(count)
+    ]
+    return Document(
+        id=DocumentId.generate(),
+        chunks=chunks,
+        metadata=DocumentMetadata(title="Doc", author="Ann"),
+    )
+
+
+def _library(documents, index):
+    library = Library(
+        id=LibraryId.generate(),
+        documents=[d.id for d in documents],
+        metadata=LibraryMetadata(name="Library", description="Test"),
+        vector_index=index,
+    )
+    library.index(
+        [IndexedChunk.from_chunk(c, d.id) for d in documents for c in d.chunks]
+    )
+    return library
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        BruteForceIndex(),
+        KDTreeIndex(leaf_size=2),
+        HNSWIndex(seed=0),
+        IVFIndex(n_lists=3, seed=0),
+        PQIndex(n_subvectors=3, n_centroids=4, seed=0),
+    ],
+    ids=lambda i: type(i).__name__,
+)
+def test_snapshot_restores_libraries_without_rebuilding(tmp_path, index):
+    documents = [_document(), _document(offset=20)]
+    library = _library(documents, index)
+    library.remove_chunks([documents[0].chunks[0].id])
+    path = tmp_path / "snapshot.npz"
+
+    write_snapshot(path, documents, [library])
+    _, (restored,) = read_snapshot(path)
+
+    query = Embedding.from_list([4.0, 1.0, 0.0])
+    expected = library.find_similar_chunks(query, 5, min_similarity=-1.0)
+    actual = restored.find_similar_chunks(query, 5, min_similarity=-1.0)
+    assert restored.is_indexed
+    assert restored.index_revision == 0
+    assert restored.vector_index.params() == library.vector_index.params()
+    assert [(c.id, c.text) for c, _ in actual] == [(c.id, c.text) for c, _ in expected]
+    assert [s for _, s in actual] == pytest.approx([s for _, s in expected])
+    assert restored.metadata == library.metadata
+
+
+def test_snapshot_round_trips_documents(tmp_path):
+    documents = [_document(), _document(count=0)]
+    path = tmp_path / "snapshot.npz"
+
+    write_snapshot(path, documents, [])
+    restored, libraries = read_snapshot(path)
+
+    assert libraries == []
+    assert [d.id for d in restored] == [d.id for d in documents]
+    assert restored[0].metadata == documents[0].metadata
+    assert restored[1].chunks == []
+    for original, chunk in zip(documents[0].chunks, restored[0].chunks):
+        assert chunk.id == original.id
+        assert chunk.text == original.text
+        assert chunk.embedding == original.embedding
+        assert chunk.metadata == original.metadata
+
+
+def test_snapshot_is_synced_before_and_after_it_is_moved_into_place(
+    tmp_path, monkeypatch
+):
+    calls = []
+    fsync, replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append("fsync") or fsync(fd))
+    monkeypatch.setattr(
+        os, "replace", lambda *args: calls.append("replace") or replace(*args)
+    )
+
+    write_snapshot(tmp_path / "snapshot.npz", [_document()], [])
+
+    # The archive itself, then the directory entry pointing at it
+    assert calls == ["fsync", "replace", "fsync"]
+
+
+def test_snapshot_shares_chunk_data_with_index_rows(tmp_path):
+    document = _document()
+    library = _library([document], BruteForceIndex())
+    path = tmp_path / "snapshot.npz"
+
+    write_snapshot(path, [document], [library])
+    (restored,), (restored_library,) = read_snapshot(path)
+
+    row = restored_library.vector_index.get_chunks()[0]
+    assert row.embedding is restored.chunks[0].embedding
+    assert row.metadata is restored.chunks[0].metadata
+    with np.load(path) as archive:
+        assert archive["embeddings"].size == 12 * 3
+
+
+def test_snapshot_keeps_unindexed_libraries_unindexed(tmp_path):
+    document = _document()
+    library = _library([document], KDTreeIndex())
+    library.invalidate_index()
+    path = tmp_path / "snapshot.npz"
+
+    write_snapshot(path, [document], [library])
+    _, (restored,) = read_snapshot(path)
+
+    assert not restored.is_indexed
+    assert restored.documents == [document.id]
+
+
+def test_snapshot_rejects_unknown_versions(tmp_path):
+    path = tmp_path / "snapshot.npz"
+    np.savez(path, manifest=np.frombuffer(b'{"version": 99}', np.uint8))
+
+    with pytest.raises(ApplicationError):
+        read_snapshot(path)
+
+
+def test_snapshot_service_saves_and_restores_repositories(tmp_path):
+    path = tmp_path / "snapshot.npz"
+    documents, libraries = InMemoryDocumentRepository(), InMemoryLibraryRepository()
+    document = _document()
+    library = _library([document], BruteForceIndex())
+    documents.save(document)
+    libraries.save(library)
+
+    service = SnapshotService(path, documents, libraries, interval_seconds=3600)
+    service.start()
+    service.stop()
+
+    restored_documents = InMemoryDocumentRepository()
+    restored_libraries = InMemoryLibraryRepository()
+    restored = SnapshotService(path, restored_documents, restored_libraries)
+    assert restored.restore()
+    assert restored_documents.exists(document.id)
+    assert restored_libraries.find_by_id(library.id).is_indexed
+    assert not path.with_name("snapshot.npz.partial").exists()
+
+
+def test_snapshot_service_restore_without_snapshot(tmp_path):
+    service = SnapshotService(
+        tmp_path / "missing.npz",
+        InMemoryDocumentRepository(),
+        InMemoryLibraryRepository(),
+    )
+    assert not service.restore()
+
+
+def test_periodic_snapshots_continue_after_a_failed_save(tmp_path, caplog):
+    saved = threading.Event()
+
+    class FlakyLibraries(InMemoryLibraryRepository):
+        calls = 0
+
+        def find_all(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise OSError("No space left on device")
+            saved.set()
+            return super().find_all()
+
+    path = tmp_path / "snapshot.npz"
+    service = SnapshotService(
+        path, InMemoryDocumentRepository(), FlakyLibraries(), interval_seconds=0.01
+    )
+    service.start()
+    try:
+        assert saved.wait(5)
+    finally:
+        service.stop()
+
+    assert path.exists()
+    assert "Periodic snapshot" in caplog.text
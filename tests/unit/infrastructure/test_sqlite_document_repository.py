@@ -0,0 +1,166 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import (
+    Chunk,
+    ChunkId,
+    ChunkMetadata,
+    Document,
+    DocumentId,
+    DocumentMetadata,
+)
+from app.errors import NotFoundError
+from app.infrastructure import SqliteDatabase, SqliteDocumentRepository
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SqliteDatabase(tmp_path / "db.sqlite3")
+    yield database
+    database.close()
+
+
+def _document(*texts):
+    return Document(
+        id=DocumentId.generate(),
+        chunks=[
+            Chunk(
+                id=ChunkId.generate(),
+                text=text,
+                embedding=Embedding.from_list([float(i), 0.5, -1.0]),
+                metadata=ChunkMetadata(
+                    source="test",
+                    page_number=i or None,
+                    created_at=datetime(2024, 5, 1, 8, 0, i, 250, timezone.utc),
+                    custom_fields={"n": i},
+                ),
+            )
+            for i, text in enumerate(texts)
+        ],
+        metadata=DocumentMetadata(title="Doc", author="Ann"),
+    )
+
+
+def test_sqlite_document_repository_crud(database):
+    repo = SqliteDocumentRepository(database)
+    document = _document("a", "b")
+    assert not repo.exists(document.id)
+
+    repo.save(document)
+    assert repo.exists(document.id)
+
+    found = repo.find_by_id(document.id)
+    assert found.id == document.id
+    assert found.metadata == document.metadata
+    for chunk, original in zip(found.chunks, document.chunks, strict=True):
+        assert chunk.id == original.id
+        assert chunk.text == original.text
+        assert chunk.embedding == original.embedding
+        assert chunk.metadata == original.metadata
+
+    document.remove_chunk(document.chunks[0].id)
+    repo.save(document)
+    assert [c.text for c in repo.find_by_id(document.id).chunks] == ["b"]
+
+    repo.delete(document.id)
+    assert not repo.exists(document.id)
+    assert repo.find_by_id(document.id) is None
+    with pytest.raises(NotFoundError):
+        repo.delete(document.id)
+
+
+def test_find_by_ids_returns_existing_documents_in_order(database):
+    repo = SqliteDocumentRepository(database)
+    documents = [_document(f"doc {i}") for i in range(3)]
+    repo.save_many(documents)
+
+    found = repo.find_by_ids([documents[2].id, DocumentId.generate(), documents[0].id])
+
+    assert [d.id for d in found] == [documents[2].id, documents[0].id]
+    assert [d.chunks[0].text for d in found] == ["doc 2", "doc 0"]
+    assert {d.id for d in repo.find_all()} == {d.id for d in documents}
+
+
+def test_documents_survive_reopening_the_database(tmp_path, database):
+    document = _document("kept")
+    SqliteDocumentRepository(database).save(document)
+    database.close()
+
+    reopened = SqliteDatabase(tmp_path / "db.sqlite3")
+    try:
+        found = SqliteDocumentRepository(reopened).find_by_id(document.id)
+    finally:
+        reopened.close()
+
+    assert found.chunks[0].text == "kept"
+
+
+def test_concurrent_chunk_changes_share_one_document(database):
+    document_id = _document("a").id
+    SqliteDocumentRepository(database).save(
+        Document(
+            id=document_id, chunks=_document("a").chunks, metadata=_document().metadata
+        )
+    )
+    repo = SqliteDocumentRepository(database)
+
+    # Two requests load the document, change it and save it in turn
+    first, second = repo.find_by_id(document_id), repo.find_by_id(document_id)
+    first.add_chunk(_document("b").chunks[0])
+    second.add_chunk(_document("c").chunks[0])
+    repo.save(first)
+    repo.save(second)
+
+    assert first is second
+    reloaded = SqliteDocumentRepository(database).find_by_id(document_id)
+    assert [c.text for c in reloaded.chunks] == ["a", "b", "c"]
+
+
+def test_saves_write_only_changed_chunks_and_keep_their_order(database):
+    repo = SqliteDocumentRepository(database)
+    document = _document("a", "b", "c")
+    a, b, c = (chunk.id for chunk in document.chunks)
+    repo.save(document)
+
+    document.add_chunk(_document("d").chunks[0])
+    document.update_chunk(b, text="b, edited")
+    document.remove_chunk(a)
+    repo.save(document)
+    # Removed and added again: moves to the end
+    moved = document.get_chunk(c)
+    document.remove_chunk(c)
+    document.add_chunk(moved)
+    repo.save(document)
+
+    positions = database.connection().execute(
+        "SELECT position, text FROM chunks WHERE document_id = ? ORDER BY position",
+        (str(document.id),),
+    )
+    assert list(positions) == [(1, "b, edited"), (3, "d"), (4, "c")]
+    reloaded = SqliteDocumentRepository(database).find_by_id(document.id)
+    assert [ch.text for ch in reloaded.chunks] == ["b, edited", "d", "c"]
+    assert reloaded.chunks[0].embedding == document.get_chunk(b).embedding
+
+
+def test_threads_write_through_their_own_connections(database):
+    repo = SqliteDocumentRepository(database)
+    documents = [_document(f"doc {i}") for i in range(20)]
+    errors = []
+
+    def save(document):
+        try:
+            repo.save(document)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=save, args=(d,)) for d in documents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(repo.find_by_ids([d.id for d in documents])) == 20
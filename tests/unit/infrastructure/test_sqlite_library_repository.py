@@ -0,0 +1,218 @@
+import sqlite3
+
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import ChunkId, DocumentId
+from app.domain.libraries import (
+    HNSWIndex,
+    IndexedChunk,
+    Library,
+    LibraryId,
+    LibraryMetadata,
+)
+from app.errors import NotFoundError
+from app.infrastructure import IndexFileStore, SqliteDatabase, SqliteLibraryRepository
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SqliteDatabase(tmp_path / "db.sqlite3")
+    yield database
+    database.close()
+
+
+def _library():
+    return Library(
+        id=LibraryId.generate(),
+        documents=[DocumentId.generate(), DocumentId.generate()],
+        metadata=LibraryMetadata(name="Library", description="Test"),
+        vector_index=HNSWIndex(m=8, metric="dot"),
+    )
+
+
+def test_sqlite_library_repository_crud(database):
+    repo = SqliteLibraryRepository(database)
+    library = _library()
+    assert not repo.exists(library.id)
+
+    repo.save(library)
+    assert repo.exists(library.id)
+    assert repo.find_by_id(library.id) is library
+    assert repo.find_all() == [library]
+
+    repo.delete(library.id)
+    assert not repo.exists(library.id)
+    assert repo.find_by_id(library.id) is None
+    with pytest.raises(NotFoundError):
+        repo.delete(library.id)
+
+
+def test_sqlite_library_repository_find_page_seeks_by_id(database):
+    repo = SqliteLibraryRepository(database)
+    libraries = sorted((_library() for _ in range(3)), key=lambda lib: str(lib.id))
+    for library in libraries:
+        repo.save(library)
+
+    assert repo.find_page(None, 2) == libraries[:2]
+    assert repo.find_page(libraries[1].id, 2) == libraries[2:]
+    # A fresh repository loads only the requested page
+    assert [
+        lib.id
+        for lib in SqliteLibraryRepository(database).find_page(libraries[0].id, 1)
+    ] == [libraries[1].id]
+
+
+def test_sqlite_library_repository_finds_libraries_by_document(database):
+    repo = SqliteLibraryRepository(database)
+    first, second = _library(), _library()
+    second.add_document(first.documents[0])
+    repo.save(first)
+    repo.save(second)
+
+    found = repo.find_by_document(first.documents[0])
+
+    assert sorted(str(lib.id) for lib in found) == sorted(
+        [str(first.id), str(second.id)]
+    )
+    assert repo.find_by_document(first.documents[1]) == [first]
+    assert repo.find_by_document(DocumentId.generate()) == []
+
+
+def test_libraries_are_reloaded_with_their_settings(database):
+    library = _library()
+    SqliteLibraryRepository(database).save(library)
+
+    reloaded = SqliteLibraryRepository(database).find_by_id(library.id)
+
+    assert reloaded is not library
+    assert reloaded.documents == library.documents
+    assert reloaded.metadata == library.metadata
+    assert isinstance(reloaded.vector_index, HNSWIndex)
+    assert reloaded.vector_index.params() == library.vector_index.params()
+    assert not reloaded.is_indexed
+
+
+def test_saves_write_only_changed_references_and_keep_their_order(database):
+    library = _library()
+    first, second = library.documents
+    repo = SqliteLibraryRepository(database)
+    repo.save(library)
+    third, fourth = DocumentId.generate(), DocumentId.generate()
+
+    library.add_document(third)
+    library.remove_document(first)
+    repo.save(library)
+    library.add_documents([fourth], [])
+    # Removed and added again: moves to the end
+    library.remove_document(second)
+    library.add_document(second)
+    repo.save(library)
+
+    rows = database.connection().execute(
+        "SELECT position, document_id FROM library_documents"
+        " WHERE library_id = ? ORDER BY position",
+        (str(library.id),),
+    )
+    assert [p for p, _ in rows] == [2, 3, 4]
+    reloaded = SqliteLibraryRepository(database).find_by_id(library.id)
+    assert reloaded.documents == library.documents == [third, fourth, second]
+
+
+def test_libraries_saved_by_another_worker_are_reloaded(database):
+    library = _library()
+    repo = SqliteLibraryRepository(database)
+    repo.save(library)
+
+    other = SqliteLibraryRepository(database)
+    changed = other.find_by_id(library.id)
+    changed.update_metadata(name="Renamed")
+    other.save(changed)
+
+    reloaded = repo.find_by_id(library.id)
+    assert reloaded is not library
+    assert reloaded.metadata.name == "Renamed"
+    assert repo.find_by_id(library.id) is reloaded
+    other.delete(library.id)
+    assert repo.find_by_id(library.id) is None
+    assert not repo.exists(library.id)
+
+
+def test_databases_without_library_versions_are_migrated(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE libraries (id TEXT PRIMARY KEY, metadata TEXT NOT NULL,"
+            " index_type TEXT NOT NULL, index_params TEXT NOT NULL)"
+        )
+    connection.close()
+    database = SqliteDatabase(path)
+    try:
+        repo = SqliteLibraryRepository(database)
+        library = _library()
+        repo.save(library)
+        repo.save(library)
+        assert SqliteLibraryRepository(database).find_by_id(library.id).id == library.id
+    finally:
+        database.close()
+
+
+def _index(library, count=20):
+    library.index(
+        [
+            IndexedChunk(
+                id=ChunkId.generate(),
+                document_id=library.documents[i % 2],
+                text=f"chunk {i}",
+                embedding=Embedding.from_list([float(i), 1.0, float(i % 3)]),
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def test_built_indexes_are_reopened_from_the_index_store(database, tmp_path):
+    store = IndexFileStore(tmp_path / "indexes")
+    library = _library()
+    _index(library)
+    SqliteLibraryRepository(database, index_store=store).save(library)
+
+    reloaded = SqliteLibraryRepository(database, index_store=store).find_by_id(
+        library.id
+    )
+
+    assert reloaded.is_indexed
+    assert reloaded.metadata == library.metadata
+    query = Embedding.from_list([3.0, 1.0, 0.0])
+    assert [c.id for c in reloaded.vector_index.search(query, 3)] == [
+        c.id for c in library.vector_index.search(query, 3)
+    ]
+
+
+def test_changed_indexes_are_dropped_from_the_index_store(database, tmp_path):
+    store = IndexFileStore(tmp_path / "indexes")
+    repo = SqliteLibraryRepository(database, index_store=store)
+    library = _library()
+    _index(library)
+    repo.save(library)
+
+    library.remove_chunks([library.vector_index.get_chunks()[0].id])
+    repo.save(library)
+
+    assert store.open(library.id) is None
+    reloaded = SqliteLibraryRepository(database, index_store=store).find_by_id(
+        library.id
+    )
+    assert not reloaded.is_indexed
+
+
+def test_deleting_a_library_deletes_its_index_files(database, tmp_path):
+    store = IndexFileStore(tmp_path / "indexes")
+    repo = SqliteLibraryRepository(database, index_store=store)
+    library = _library()
+    _index(library)
+    repo.save(library)
+
+    repo.delete(library.id)
+
+    assert store.open(library.id) is None
@@ -0,0 +1,262 @@
+import threading
+import time
+
+import pytest
+
+from app.domain.common import Embedding
+from app.domain.documents import (
+    Chunk,
+    ChunkId,
+    ChunkMetadata,
+    Document,
+    DocumentId,
+    DocumentMetadata,
+)
+from app.domain.libraries import (
+    BruteForceIndex,
+    IndexedChunk,
+    Library,
+    LibraryId,
+    LibraryMetadata,
+)
+from app.infrastructure import (
+    InMemoryDocumentRepository,
+    InMemoryLibraryRepository,
+    LoggedDocumentRepository,
+    LoggedLibraryRepository,
+    SnapshotService,
+    WriteAheadLog,
+)
+from app.infrastructure.write_ahead_log import replay_write_ahead_log
+
+
+def _chunk(text, values):
+    return Chunk(
+        id=ChunkId.generate(),
+        text=text,
+        embedding=Embedding.from_list(values),
+        metadata=ChunkMetadata(source="test", page_number=1),
+    )
+
+
+def _document(*chunks):
+    return Document(
+        id=DocumentId.generate(),
+        chunks=list(chunks),
+        metadata=DocumentMetadata(title="Doc"),
+    )
+
+
+def _library():
+    return Library(
+        id=LibraryId.generate(),
+        documents=[],
+        metadata=LibraryMetadata(name="Library", description="Test"),
+        vector_index=BruteForceIndex(),
+    )
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = WriteAheadLog(tmp_path / "wal")
+    yield log
+    log.close()
+
+
+def _replay(tmp_path):
+    """Replay the log on disk into fresh repositories, as after a crash."""
+    documents, libraries = InMemoryDocumentRepository(), InMemoryLibraryRepository()
+    replay_write_ahead_log(WriteAheadLog(tmp_path / "wal"), documents, libraries)
+    return documents, libraries
+
+
+def test_records_round_trip_with_their_embeddings(log):
+    log.write({"type": "test", "n": 1}, [Embedding.from_list([1.0, 2.0])])
+    log.write({"type": "test", "n": 2})
+
+    (first, embeddings), (second, no_embeddings) = log.records()
+
+    assert first["n"] == 1 and second["n"] == 2
+    assert embeddings == [Embedding.from_list([1.0, 2.0])]
+    assert no_embeddings == []
+
+
+def test_torn_tail_is_ignored(tmp_path, log):
+    log.write({"type": "test", "n": 1})
+    log.write({"type": "test", "n": 2})
+    (segment,) = (tmp_path / "wal").glob("wal-*.log")
+    segment.write_bytes(segment.read_bytes()[:-3])
+
+    assert [header["n"] for header, _ in log.records()] == [1]
+
+
+def test_concurrent_writes_share_fsyncs(log, monkeypatch):
+    fsyncs = []
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.01)
+
+    monkeypatch.setattr("app.infrastructure.write_ahead_log.os.fsync", slow_fsync)
+    threads = [
+        threading.Thread(target=log.write, args=({"type": "test", "n": i},))
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(list(log.records())) == 20
+    assert len(fsyncs) < 20
+
+
+def test_rotate_and_discard_drop_older_segments(log):
+    log.write({"type": "test", "n": 1})
+    segment = log.rotate()
+    log.write({"type": "test", "n": 2})
+
+    log.discard_before(segment)
+
+    assert log.segments() == [segment]
+    assert [header["n"] for header, _ in log.records()] == [2]
+
+
+def test_document_saves_log_only_changed_chunks(log):
+    repo = LoggedDocumentRepository(InMemoryDocumentRepository(), log)
+    kept, updated, removed = (
+        _chunk("kept", [1.0, 0.0]),
+        _chunk("updated", [0.0, 1.0]),
+        _chunk("removed", [1.0, 1.0]),
+    )
+    document = _document(kept, updated, removed)
+    repo.save(document)
+
+    document.update_chunk(updated.id, text="changed")
+    document.remove_chunk(removed.id)
+    document.add_chunk(_chunk("added", [2.0, 0.0]))
+    repo.save(document)
+
+    (created, _), (changed, embeddings) = log.records()
+    assert created["full"] and len(created["upsert"]) == 3
+    assert not changed["full"]
+    assert [c["text"] for c in changed["upsert"]] == ["changed", "added"]
+    assert changed["delete"] == [str(removed.id)]
+    assert len(embeddings) == 2
+
+
+def test_replay_restores_documents_and_libraries(tmp_path, log):
+    documents = LoggedDocumentRepository(InMemoryDocumentRepository(), log)
+    libraries = LoggedLibraryRepository(InMemoryLibraryRepository(), log)
+    document = _document(_chunk("first", [1.0, 0.0]), _chunk("second", [0.0, 1.0]))
+    other = _document(_chunk("other", [1.0, 1.0]))
+    library = _library()
+    documents.save(document)
+    documents.save(other)
+    library.add_document(document.id)
+    library.add_document(other.id)
+    library.index(
+        [IndexedChunk.from_chunk(c, d.id) for d in (document, other) for c in d.chunks]
+    )
+    libraries.save(library)
+
+    document.update_chunk(document.chunks[0].id, text="first, edited")
+    document.add_chunk(_chunk("third", [2.0, 0.0]))
+    documents.save(document)
+    library.remove_document(other.id)
+    libraries.save(library)
+    documents.delete(other.id)
+
+    restored_documents, restored_libraries = _replay(tmp_path)
+
+    restored = restored_documents.find_by_id(document.id)
+    assert [c.text for c in restored.chunks] == [c.text for c in document.chunks]
+    assert [c.embedding for c in restored.chunks] == [
+        c.embedding for c in document.chunks
+    ]
+    assert restored.metadata == document.metadata
+    assert not restored_documents.exists(other.id)
+
+    restored_library = restored_libraries.find_by_id(library.id)
+    assert restored_library.documents == [document.id]
+    assert restored_library.is_indexed
+    assert restored_library.metadata == library.metadata
+    results = restored_library.find_similar_chunks(
+        Embedding.from_list([1.0, 0.0]), 5, min_similarity=-1.0
+    )
+    assert sorted(c.text for c, _ in results) == ["first, edited", "second", "third"]
+
+
+def test_replay_restores_the_order_of_documents_added_again(tmp_path, log):
+    libraries = LoggedLibraryRepository(InMemoryLibraryRepository(), log)
+    first, second = DocumentId.generate(), DocumentId.generate()
+    library = _library()
+    library.add_documents([first, second], [])
+    libraries.save(library)
+    library.remove_document(first)
+    library.add_document(first)
+    libraries.save(library)
+
+    _, restored = _replay(tmp_path)
+
+    assert restored.find_by_id(library.id).documents == [second, first]
+
+
+def test_replay_keeps_unindexed_libraries_unindexed(tmp_path, log):
+    libraries = LoggedLibraryRepository(InMemoryLibraryRepository(), log)
+    library = _library()
+    library.add_document(DocumentId.generate())
+    libraries.save(library)
+    libraries.delete(library.id)
+    kept = _library()
+    libraries.save(kept)
+
+    _, restored = _replay(tmp_path)
+
+    assert not restored.exists(library.id)
+    assert not restored.find_by_id(kept.id).is_indexed
+
+
+def test_snapshot_service_replays_the_log_on_top_of_the_snapshot(tmp_path, log):
+    documents, libraries = InMemoryDocumentRepository(), InMemoryLibraryRepository()
+    logged = LoggedDocumentRepository(documents, log)
+    service = SnapshotService(tmp_path / "snapshot.npz", documents, libraries, log=log)
+    document = _document(_chunk("before", [1.0, 0.0]))
+    logged.save(document)
+
+    service.save()
+    document.add_chunk(_chunk("after", [0.0, 1.0]))
+    logged.save(document)
+
+    assert len(list(log.records())) == 1
+    restored_documents = InMemoryDocumentRepository()
+    restored = SnapshotService(
+        tmp_path / "snapshot.npz",
+        restored_documents,
+        InMemoryLibraryRepository(),
+        log=WriteAheadLog(tmp_path / "wal"),
+    )
+    assert restored.restore()
+    assert [c.text for c in restored_documents.find_by_id(document.id).chunks] == [
+        "before",
+        "after",
+    ]
+
+
+def test_replay_keeps_snapshot_indexes_of_unchanged_libraries(tmp_path, log):
+    documents, libraries = InMemoryDocumentRepository(), InMemoryLibraryRepository()
+    document = _document(_chunk("chunk", [1.0, 0.0]))
+    library = _library()
+    library.add_document(document.id)
+    library.index([IndexedChunk.from_chunk(c, document.id) for c in document.chunks])
+    documents.save(document)
+    libraries.save(library)
+    live_index = library.vector_index
+
+    # First save after a restart logs the whole library
+    library.update_metadata(description="Renamed")
+    LoggedLibraryRepository(InMemoryLibraryRepository(), log).save(library)
+    replay_write_ahead_log(log, documents, libraries)
+
+    assert library.vector_index is live_index
+    assert library.metadata.description == "Renamed"
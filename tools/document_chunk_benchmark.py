@@ -0,0 +1,75 @@
+"""Time chunk CRUD on a single large document.
+
+Adds chunks one at a time (as AddChunkHandler does), then looks up,
+updates and removes chunks at random. With constant-time operations the
+per-operation cost stays flat as the document grows.
+
+    python tools/document_chunk_benchmark.py --chunks 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.domain.common import Embedding  # noqa: E402
+from app.domain.documents import (  # noqa: E402
+    Chunk,
+    ChunkId,
+    ChunkMetadata,
+    Document,
+    DocumentId,
+    DocumentMetadata,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--operations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    embedding = Embedding(np.ones(8, dtype=np.float32))
+    metadata = ChunkMetadata(source="benchmark")
+    chunks = [
+        Chunk(
+            id=ChunkId.generate(), text="text", embedding=embedding, metadata=metadata
+        )
+        for _ in range(args.chunks)
+    ]
+    document = Document(
+        id=DocumentId.generate(),
+        chunks=[],
+        metadata=DocumentMetadata(title="benchmark"),
+    )
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        document.add_chunk(chunk)
+    added = time.perf_counter() - start
+    print(f"add {args.chunks} chunks: {added:8.2f} s")
+
+    pick = random.Random(0)
+    ids = [c.id for c in pick.sample(chunks, args.operations)]
+    for name, operation in (
+        ("get_chunk", lambda i: document.get_chunk(i)),
+        ("contains_chunk", lambda i: document.contains_chunk(i)),
+        ("update_chunk", lambda i: document.update_chunk(i, text="new")),
+        ("remove_chunk", lambda i: document.remove_chunk(i)),
+    ):
+        start = time.perf_counter()
+        for chunk_id in ids:
+            operation(chunk_id)
+        per_op = (time.perf_counter() - start) / len(ids)
+        print(f"{name:15s} {per_op * 1e6:10.1f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time document membership changes on a single large library.
+
+Adds document references one at a time, saving the library after each
+one (as AddDocumentHandler does), then checks and removes documents at
+random, and finally adds and removes a batch in one call each. With
+constant-time membership the per-operation cost stays flat as the library
+grows.
+
+    python tools/library_membership_benchmark.py --documents 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.domain.documents import DocumentId  # noqa: E402
+from app.domain.libraries import (  # noqa: E402
+    BruteForceIndex,
+    Library,
+    LibraryId,
+    LibraryMetadata,
+)
+from app.infrastructure import InMemoryLibraryRepository  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    document_ids = [DocumentId.generate() for _ in range(args.documents)]
+    library = Library(
+        id=LibraryId.generate(),
+        documents=[],
+        metadata=LibraryMetadata(name="benchmark", description=""),
+        vector_index=BruteForceIndex(),
+    )
+
+    repository = InMemoryLibraryRepository()
+    repository.save(library)
+    start = time.perf_counter()
+    for document_id in document_ids:
+        library.add_document(document_id)
+        repository.save(library)
+    added = time.perf_counter() - start
+    print(f"add and save {args.documents} documents: {added:8.2f} s")
+
+    pick = random.Random(0)
+    ids = pick.sample(document_ids, args.operations)
+    for name, operation in (
+        ("contains_document", library.contains_document),
+        ("remove_document", library.remove_document),
+    ):
+        start = time.perf_counter()
+        for document_id in ids:
+            operation(document_id)
+        per_op = (time.perf_counter() - start) / len(ids)
+        print(f"{name:17s} {per_op * 1e6:10.1f} us/op")
+
+    start = time.perf_counter()
+    library.add_documents(ids, [])
+    library.remove_documents(ids)
+    elapsed = time.perf_counter() - start
+    print(f"add_documents + remove_documents ({len(ids)}): {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
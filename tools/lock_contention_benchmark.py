@@ -0,0 +1,119 @@
+"""Measure search and write throughput on shared libraries under contention.
+
+Compares the per-library read-write locks with a single repository-wide
+RLock held for each whole operation (the only way the old repositories could
+keep readers away from a library being mutated). Worker threads search
+random libraries and occasionally upsert a chunk into one.
+
+    python tools/lock_contention_benchmark.py --threads 8 --libraries 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.domain.common import Embedding  # noqa: E402
+from app.domain.documents import ChunkId, DocumentId  # noqa: E402
+from app.domain.libraries import (  # noqa: E402
+    BruteForceIndex,
+    IndexedChunk,
+    Library,
+    LibraryId,
+    LibraryMetadata,
+)
+
+
+def _chunks(rng: np.random.Generator, count: int, dimension: int) -> List[IndexedChunk]:
+    document_id = DocumentId.generate()
+    vectors = rng.normal(size=(count, dimension)).astype(np.float32)
+    return [
+        IndexedChunk(
+            id=ChunkId.generate(),
+            document_id=document_id,
+            text="",
+            embedding=Embedding.from_list(v.tolist()),
+        )
+        for v in vectors
+    ]
+
+
+def _libraries(args: argparse.Namespace) -> List[Library]:
+    rng = np.random.default_rng(0)
+    libraries = []
+    for i in range(args.libraries):
+        library = Library(
+            id=LibraryId.generate(),
+            documents=[],
+            metadata=LibraryMetadata(name=f"library {i}", description="benchmark"),
+            vector_index=BruteForceIndex(),
+        )
+        library.index(_chunks(rng, args.chunks, args.dimension))
+        libraries.append(library)
+    return libraries
+
+
+def run(args: argparse.Namespace, global_lock: bool) -> float:
+    """Return completed operations per second."""
+    libraries = _libraries(args)
+    lock = threading.RLock() if global_lock else None
+    rng = np.random.default_rng(1)
+    queries = [
+        Embedding.from_list(q.tolist())
+        for q in rng.normal(size=(64, args.dimension)).astype(np.float32)
+    ]
+    writes = _chunks(rng, 256, args.dimension)
+    done = [0] * args.threads
+    stop = threading.Event()
+
+    def work(n: int) -> None:
+        pick = random.Random(n)
+        while not stop.is_set():
+            library = pick.choice(libraries)
+            with lock if lock is not None else nullcontext():
+                if pick.random() < args.write_ratio:
+                    library.upsert_chunks([pick.choice(writes)])
+                else:
+                    library.find_similar_chunks(pick.choice(queries), k=10)
+            done[n] += 1
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(done) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--libraries", type=int, default=4)
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    baseline = run(args, global_lock=True)
+    per_library = run(args, global_lock=False)
+    print(f"repository-wide RLock: {baseline:10.1f} ops/s")
+    print(f"per-library RW locks:  {per_library:10.1f} ops/s")
+    print(f"speedup:               {per_library / baseline:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Time encoding a find-similar response, old path against the current one.
+
+The old path converted every embedding to Python floats, validated the
+chunks into the pydantic response model and dumped that model to JSON. The
+current path hands embedding rows to orjson as one float32 matrix.
+
+    python tools/serialization_benchmark.py --k 100 --dimension 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.api.libraries.find_similar_chunks import (  # noqa: E402
+    FindSimilarResponse,
+    encode_json,
+)
+from app.application.libraries.find_similar_chunks_query import (  # noqa: E402
+    similar_chunk_dicts,
+)
+from app.domain.common import Embedding  # noqa: E402
+from app.domain.documents import ChunkId, ChunkMetadata, DocumentId  # noqa: E402
+from app.domain.libraries import IndexedChunk  # noqa: E402
+
+
+def _hits(k: int, dimension: int) -> List[tuple[IndexedChunk, float]]:
+    rng = np.random.default_rng(0)
+    document_id = DocumentId.generate()
+    return [
+        (
+            IndexedChunk(
+                id=ChunkId.generate(),
+                document_id=document_id,
+                text="lorem ipsum " * 40,
+                embedding=Embedding(v),
+                metadata=ChunkMetadata(source="benchmark"),
+            ),
+            float(s),
+        )
+        for v, s in zip(
+            rng.normal(size=(k, dimension)).astype(np.float32), rng.random(k)
+        )
+    ]
+
+
+def time_ms(encode: Callable[[], bytes], repeat: int) -> tuple[float, int]:
+    """Return mean milliseconds per call and the encoded size in bytes."""
+    body = encode()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode()
+    return (time.perf_counter() - start) / repeat * 1e3, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    hits = _hits(args.k, args.dimension)
+
+    def pydantic_path() -> bytes:
+        chunks = [{**c.to_dict(), "similarity": s} for c, s in hits]
+        response = FindSimilarResponse(library_id="benchmark", chunks=chunks)
+        return response.model_dump_json(exclude_unset=True).encode()
+
+    def orjson_path() -> bytes:
+        chunks = similar_chunk_dicts(hits)
+        return encode_json({"library_id": "benchmark", "chunks": chunks})
+
+    old, old_size = time_ms(pydantic_path, args.repeat)
+    new, new_size = time_ms(orjson_path, args.repeat)
+    print(f"k={args.k}, dimension={args.dimension}")
+    print(f"pydantic: {old:8.2f} ms  {old_size / 1e6:6.2f} MB")
+    print(f"orjson:   {new:8.2f} ms  {new_size / 1e6:6.2f} MB")
+    print(f"speedup:  {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()